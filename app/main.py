@@ -1,10 +1,17 @@
-"""Application entry point for the Spectra desktop shell."""
+"""Application entry point for the Spectra desktop shell.
+
+``SpectraMainWindow`` is imported inside :func:`main` (and lazily via module
+``__getattr__`` for callers that import it from here) so the startup profiler
+can attribute its import cost. Pass ``--profile-startup`` to print per-phase
+import/construct timings once the first event-loop turn has run.
+"""
 
 from __future__ import annotations
 
+import logging
 import sys
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 import types
 
 try:
@@ -19,9 +26,12 @@ except ModuleNotFoundError as exc:
         raise exc from second_exc
 
 from app.logging_config import setup_logging
-from app.ui.main_window import SpectraMainWindow
 from app.ui.themes import ThemeDefinition, get_theme_definition
 from app.services import nist_asd_service as nist_asd_service_module
+from app.utils.startup_profile import StartupProfiler
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily, see __getattr__
+    from app.ui.main_window import SpectraMainWindow
 
 QtCore: Any
 QtGui: Any
@@ -47,6 +57,19 @@ nist_asd_service = nist_asd_service_module  # provides fetch_lines(), clear_cach
 theme: ThemeDefinition = get_theme_definition(None)
 
 
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
+
+def __getattr__(name: str) -> Any:
+    # Keep ``from app.main import SpectraMainWindow`` working without importing
+    # the whole UI (pyqtgraph, panels, services) when app.main is imported.
+    if name == "SpectraMainWindow":
+        from app.ui.main_window import SpectraMainWindow
+
+        return SpectraMainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _resolve_launch_theme(theme_key: str | None) -> ThemeDefinition:
     """Resolve ``theme_key`` and update the module-level ``theme`` export."""
 
@@ -85,6 +108,9 @@ def main(argv: list[str] | None = None) -> int:
 
     Returns an OS exit code (0 for normal shutdown).
     """
+    args = list(sys.argv if argv is None else argv)
+    profiler = StartupProfiler(enabled=PROFILE_STARTUP_FLAG in args)
+    args = [arg for arg in args if arg != PROFILE_STARTUP_FLAG]
     # Initialize baseline logging early so startup issues are captured
     logger = setup_logging()
     try:
@@ -94,16 +120,32 @@ def main(argv: list[str] | None = None) -> int:
     _install_exception_handler()
 
     # High-DPI scaling is automatic in Qt6; no need for deprecated attributes
-    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(argv or sys.argv)
-    app.setApplicationName("Spectra App")
-    app.setOrganizationName("Spectra")
+    with profiler.phase("create QApplication"):
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(args)
+        app.setApplicationName("Spectra App")
+        app.setOrganizationName("Spectra")
     try:
-        window: SpectraMainWindow = SpectraMainWindow(theme_key=theme.key)
-        window.show()
+        with profiler.phase("import main window"):
+            from app.ui.main_window import SpectraMainWindow
+        with profiler.phase("construct main window"):
+            window: SpectraMainWindow = SpectraMainWindow(theme_key=theme.key)
+        with profiler.phase("show main window"):
+            window.show()
         logger.info("Main window constructed and shown successfully")
     except Exception as exc:
         logger.exception("Failed to construct main window: %s", exc)
         return 1
+    if profiler.enabled:
+        def _report_startup() -> None:
+            profiler.mark("first event-loop turn (since launch)")
+            report = profiler.report()
+            # The console handler already echoes INFO; only print when it is muted
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(report)
+            else:
+                print(report, file=sys.stderr)
+
+        QtCore.QTimer.singleShot(0, _report_startup)
     code = app.exec()
     try:
         logger.info("Qt event loop exited with code %s", code)
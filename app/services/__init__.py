@@ -1,18 +1,62 @@
-"""Service layer for the Spectra application."""
-
-from .spectrum import Spectrum
-from .units_service import UnitError, UnitsService
-from .provenance_service import ProvenanceService
-from .data_ingest_service import DataIngestService
-from .overlay_service import OverlayService
-from .math_service import MathService
-from .reference_library import ReferenceLibrary
-from .store import LocalStore
-from .remote_data_service import RemoteDataService, RemoteRecord, RemoteDownloadResult, LocalSample
-from .line_shapes import LineShapeModel, LineShapeOutcome
-from .knowledge_log_service import KnowledgeLogEntry, KnowledgeLogService
-from .calibration_service import CalibrationService, CalibrationConfig
-from .quality_flags import QualityFlags
+"""Service layer for the Spectra application.
+
+Exports resolve lazily (PEP 562): ``from app.services import LocalStore`` only
+imports ``app.services.store``, so pulling in one service no longer drags the
+remote stack and every importer into the process at startup.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .spectrum import Spectrum
+    from .units_service import UnitError, UnitsService
+    from .provenance_service import ProvenanceService
+    from .data_ingest_service import DataIngestService
+    from .overlay_service import OverlayService
+    from .math_service import MathService
+    from .reference_library import ReferenceLibrary
+    from .store import LocalStore
+    from .fits_header_index import FitsHeaderIndex, FitsHeaderRecord
+    from .remote_data_service import RemoteDataService, RemoteRecord, RemoteDownloadResult, LocalSample
+    from .line_shapes import LineShapeModel, LineShapeOutcome
+    from .knowledge_log_service import KnowledgeLogEntry, KnowledgeLogService
+    from .calibration_service import CalibrationService, CalibrationConfig
+    from .quality_flags import QualityFlags
+    from .session_service import SessionState, SessionWriter, detach_session_arrays, load_session, save_session
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "Spectrum": ".spectrum",
+    "UnitError": ".units_service",
+    "UnitsService": ".units_service",
+    "ProvenanceService": ".provenance_service",
+    "DataIngestService": ".data_ingest_service",
+    "OverlayService": ".overlay_service",
+    "MathService": ".math_service",
+    "ReferenceLibrary": ".reference_library",
+    "LocalStore": ".store",
+    "FitsHeaderIndex": ".fits_header_index",
+    "FitsHeaderRecord": ".fits_header_index",
+    "RemoteDataService": ".remote_data_service",
+    "RemoteRecord": ".remote_data_service",
+    "RemoteDownloadResult": ".remote_data_service",
+    "LocalSample": ".remote_data_service",
+    "LineShapeModel": ".line_shapes",
+    "LineShapeOutcome": ".line_shapes",
+    "KnowledgeLogEntry": ".knowledge_log_service",
+    "KnowledgeLogService": ".knowledge_log_service",
+    "CalibrationService": ".calibration_service",
+    "CalibrationConfig": ".calibration_service",
+    "QualityFlags": ".quality_flags",
+    "SessionState": ".session_service",
+    "SessionWriter": ".session_service",
+    "detach_session_arrays": ".session_service",
+    "load_session": ".session_service",
+    "save_session": ".session_service",
+}
 
 __all__ = [
     "Spectrum",
@@ -24,6 +68,8 @@ __all__ = [
     "MathService",
     "ReferenceLibrary",
     "LocalStore",
+    "FitsHeaderIndex",
+    "FitsHeaderRecord",
     "RemoteDataService",
     "RemoteRecord",
     "RemoteDownloadResult",
@@ -35,4 +81,22 @@ __all__ = [
     "CalibrationService",
     "CalibrationConfig",
     "QualityFlags",
+    "SessionState",
+    "SessionWriter",
+    "detach_session_arrays",
+    "load_session",
+    "save_session",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
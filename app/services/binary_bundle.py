@@ -0,0 +1,315 @@
+"""Columnar binary export bundles (npz, Parquet, HDF5).
+
+Every format stores the same content: the provenance manifest, one record
+per spectrum (id, name, units, metadata, ``parents``/``transforms``) and the
+``x``, ``y``, ``uncertainty`` and ``quality_flags`` arrays in native binary
+form, so a bundle written by :meth:`ProvenanceService.write_binary_bundle`
+re-imports through :class:`BinaryBundleImporter` without text parsing and
+with its provenance intact.
+
+``npz``
+    Always available. ``spectra_bundle.npy`` (the manifest and records as
+    JSON) comes first so the file can be sniffed, followed by each array
+    concatenated over all spectra; records carry each spectrum's ``offset``
+    and ``length``. Arrays are streamed into the archive chunk by chunk.
+``parquet``
+    Needs ``pyarrow``. One row group per spectrum with list columns; the
+    JSON document lives in the schema metadata.
+``hdf5``
+    Needs ``h5py``. One group per spectrum under ``/spectra`` plus a
+    ``spectra_bundle`` byte dataset with the JSON document.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Sequence, Tuple
+import zipfile
+
+import numpy as np
+
+from .spectrum import Spectrum
+from .spectrum_storage import iter_chunks
+
+BINARY_FORMAT = "spectra-binary-v1"
+BINARY_SUFFIXES = {"npz": ".npz", "parquet": ".parquet", "hdf5": ".h5"}
+NPZ_BUNDLE_MEMBER = "spectra_bundle.npy"
+PARQUET_MAGIC = b"PAR1"
+_BUNDLE_KEY = "spectra_bundle"
+
+
+def _try_import_pyarrow():
+    try:  # pragma: no cover - optional dependency
+        import pyarrow  # type: ignore
+        import pyarrow.parquet  # type: ignore  # noqa: F401
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return pyarrow
+
+
+def _try_import_h5py():
+    try:  # pragma: no cover - optional dependency
+        import h5py  # type: ignore
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return h5py
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Binary formats that can be written with the installed packages."""
+    formats = ["npz"]
+    if _try_import_pyarrow() is not None:
+        formats.append("parquet")
+    if _try_import_h5py() is not None:
+        formats.append("hdf5")
+    return tuple(formats)
+
+
+def format_for_path(path: Path) -> str | None:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".hdf5":
+        return "hdf5"
+    return next((fmt for fmt, known in BINARY_SUFFIXES.items() if known == suffix), None)
+
+
+def write_bundle(
+    path: Path,
+    spectra: Sequence[Spectrum],
+    manifest: Mapping[str, Any],
+    fmt: str | None = None,
+) -> Path:
+    """Write ``spectra`` and ``manifest`` to ``path`` in ``fmt`` (default: by suffix)."""
+    path = Path(path)
+    fmt = fmt or format_for_path(path) or "npz"
+    writers = {"npz": _write_npz, "parquet": _write_parquet, "hdf5": _write_hdf5}
+    if fmt not in writers:
+        raise ValueError(f"Unknown binary bundle format {fmt!r}; expected one of {tuple(writers)}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    try:
+        writers[fmt](partial, list(spectra), dict(manifest))
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return path
+
+
+def read_bundle(source: Path | BinaryIO, fmt: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return ``(manifest, members)``; members hold the records plus arrays."""
+    readers = {"npz": _read_npz, "parquet": _read_parquet, "hdf5": _read_hdf5}
+    if fmt not in readers:
+        raise ValueError(f"Unknown binary bundle format {fmt!r}")
+    document, arrays = readers[fmt](source)
+    if document.get("format") != BINARY_FORMAT:
+        raise ValueError(f"Not a spectra binary bundle (format {document.get('format')!r})")
+    members: List[Dict[str, Any]] = []
+    for record, (x, y, uncertainty, quality_flags) in zip(document.get("members", []), arrays):
+        value_dtype = np.dtype(record.get("value_dtype", "float64"))
+        member = {key: value for key, value in record.items() if key not in ("offset", "length")}
+        member.update(
+            x=x,
+            y=y.astype(value_dtype, copy=False),
+            uncertainty=uncertainty.astype(value_dtype, copy=False) if uncertainty is not None else None,
+            quality_flags=quality_flags,
+        )
+        members.append(member)
+    return dict(document.get("manifest") or {}), members
+
+
+# ----------------------------------------------------------------------
+def _records(spectra: Sequence[Spectrum]) -> List[Dict[str, Any]]:
+    records: List[Dict[str, Any]] = []
+    offset = 0
+    for spectrum in spectra:
+        length = len(spectrum.x)
+        records.append(
+            {
+                "id": spectrum.id,
+                "name": spectrum.name,
+                "x_unit": spectrum.x_unit,
+                "y_unit": spectrum.y_unit,
+                "metadata": spectrum.metadata,
+                "source_path": str(spectrum.source_path) if spectrum.source_path is not None else None,
+                "parents": list(spectrum.parents),
+                "transforms": list(spectrum.transforms),
+                "value_dtype": np.dtype(spectrum.y.dtype).name,
+                "has_uncertainty": spectrum.uncertainty is not None,
+                "has_quality_flags": spectrum.quality_flags is not None,
+                "offset": offset,
+                "length": length,
+            }
+        )
+        offset += length
+    return records
+
+
+def _document(spectra: Sequence[Spectrum], manifest: Mapping[str, Any]) -> str:
+    payload = {"format": BINARY_FORMAT, "manifest": manifest, "members": _records(spectra)}
+    return json.dumps(payload, ensure_ascii=False, default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _value_dtype(spectra: Sequence[Spectrum]) -> np.dtype:
+    # Shared column type; each record restores its own precision on read
+    dtypes = [spectrum.y.dtype for spectrum in spectra]
+    return np.result_type(*dtypes) if dtypes else np.dtype(np.float64)
+
+
+# -- npz ---------------------------------------------------------------
+def _write_npz(path: Path, spectra: List[Spectrum], manifest: Dict[str, Any]) -> None:
+    value_dtype = _value_dtype(spectra)
+    columns = (
+        ("x", np.dtype(np.float64), lambda spec: spec.x, np.nan),
+        ("y", value_dtype, lambda spec: spec.y, np.nan),
+        ("uncertainty", value_dtype, lambda spec: spec.uncertainty, np.nan),
+        ("quality_flags", np.dtype(np.uint8), lambda spec: spec.quality_flags, 0),
+    )
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        # First member, so sniffing finds its name in the local header
+        with archive.open(NPZ_BUNDLE_MEMBER, "w") as handle:
+            document = np.frombuffer(_document(spectra, manifest).encode("utf-8"), dtype=np.uint8)
+            np.lib.format.write_array(handle, document, allow_pickle=False)
+        lengths = [len(spectrum.x) for spectrum in spectra]
+        for name, dtype, values_of, fill in columns:
+            header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (sum(lengths),)}
+            with archive.open(f"{name}.npy", "w", force_zip64=True) as handle:
+                np.lib.format.write_array_header_2_0(handle, header)
+                for spectrum, length in zip(spectra, lengths):
+                    values = values_of(spectrum)
+                    if values is None:
+                        handle.write(np.full(length, fill, dtype=dtype).tobytes())
+                        continue
+                    for chunk in iter_chunks(length):
+                        handle.write(np.ascontiguousarray(values[chunk], dtype=dtype).tobytes())
+
+
+def _read_npz(source: Path | BinaryIO) -> Tuple[Dict[str, Any], List[Tuple[Any, ...]]]:
+    with np.load(source, allow_pickle=False) as archive:
+        if NPZ_BUNDLE_MEMBER[:-4] not in archive.files:
+            raise ValueError("npz file has no spectra bundle record")
+        document = json.loads(archive[NPZ_BUNDLE_MEMBER[:-4]].tobytes().decode("utf-8"))
+        columns = {name: archive[name] for name in ("x", "y", "uncertainty", "quality_flags")}
+    arrays = []
+    for record in document.get("members", []):
+        rows = slice(record["offset"], record["offset"] + record["length"])
+        arrays.append(
+            (
+                columns["x"][rows],
+                columns["y"][rows],
+                columns["uncertainty"][rows] if record.get("has_uncertainty") else None,
+                columns["quality_flags"][rows] if record.get("has_quality_flags") else None,
+            )
+        )
+    return document, arrays
+
+
+# -- Parquet -------------------------------------------------------------
+def _require_pyarrow():
+    pa = _try_import_pyarrow()
+    if pa is None:
+        raise RuntimeError("Parquet bundles require the 'pyarrow' package. Install it to enable Parquet export/import.")
+    return pa
+
+
+def _write_parquet(path: Path, spectra: List[Spectrum], manifest: Dict[str, Any]) -> None:
+    pa = _require_pyarrow()
+    value_type = pa.from_numpy_dtype(_value_dtype(spectra))
+    types = {
+        "x": pa.large_list(pa.float64()),
+        "y": pa.large_list(value_type),
+        "uncertainty": pa.large_list(value_type),
+        "quality_flags": pa.large_list(pa.uint8()),
+    }
+    schema = pa.schema(
+        [(name, kind) for name, kind in types.items()],
+        metadata={_BUNDLE_KEY: _document(spectra, manifest)},
+    )
+
+    def column(values: Any, kind: Any) -> Any:
+        if values is None:
+            return pa.array([None], type=kind)
+        flat = pa.array(np.asarray(values, dtype=kind.value_type.to_pandas_dtype()), type=kind.value_type)
+        return pa.LargeListArray.from_arrays(pa.array([0, len(flat)], type=pa.int64()), flat)
+
+    with pa.parquet.ParquetWriter(path, schema) as writer:
+        # One row group per spectrum keeps a single spectrum in memory at a time
+        for spectrum in spectra:
+            arrays = [column(getattr(spectrum, name), kind) for name, kind in types.items()]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def _read_parquet(source: Path | BinaryIO) -> Tuple[Dict[str, Any], List[Tuple[Any, ...]]]:
+    pa = _require_pyarrow()
+    parquet = pa.parquet.ParquetFile(source)
+    raw = (parquet.schema_arrow.metadata or {}).get(_BUNDLE_KEY.encode())
+    if raw is None:
+        raise ValueError("Parquet file has no spectra bundle metadata")
+    document = json.loads(raw)
+
+    def values(table: Any, name: str) -> np.ndarray | None:
+        cells = table.column(name).combine_chunks()
+        if cells.null_count:
+            return None
+        return cells.flatten().to_numpy(zero_copy_only=False)
+
+    arrays = []
+    for index in range(parquet.num_row_groups):
+        table = parquet.read_row_group(index)
+        arrays.append(tuple(values(table, name) for name in ("x", "y", "uncertainty", "quality_flags")))
+    return document, arrays
+
+
+# -- HDF5 ----------------------------------------------------------------
+def _require_h5py():
+    h5py = _try_import_h5py()
+    if h5py is None:
+        raise RuntimeError("HDF5 bundles require the 'h5py' package. Install it to enable HDF5 export/import.")
+    return h5py
+
+
+def _write_hdf5(path: Path, spectra: List[Spectrum], manifest: Dict[str, Any]) -> None:
+    h5py = _require_h5py()
+    document = _document(spectra, manifest).encode("utf-8")
+    with h5py.File(path, "w") as handle:
+        # A dataset, not an attribute: attributes are capped at 64 KiB
+        handle.create_dataset(_BUNDLE_KEY, data=np.frombuffer(document, dtype=np.uint8))
+        group = handle.create_group("spectra")
+        for index, spectrum in enumerate(spectra):
+            member = group.create_group(f"{index:06d}")
+            for name in ("x", "y", "uncertainty", "quality_flags"):
+                values = getattr(spectrum, name)
+                if values is None:
+                    continue
+                dataset = member.create_dataset(name, shape=values.shape, dtype=values.dtype)
+                for chunk in iter_chunks(len(values)):
+                    dataset[chunk] = values[chunk]
+
+
+def _read_hdf5(source: Path | BinaryIO) -> Tuple[Dict[str, Any], List[Tuple[Any, ...]]]:
+    h5py = _require_h5py()
+    with h5py.File(source, "r") as handle:
+        if _BUNDLE_KEY not in handle:
+            raise ValueError("HDF5 file has no spectra bundle record")
+        document = json.loads(bytes(handle[_BUNDLE_KEY][()]).decode("utf-8"))
+        group = handle["spectra"]
+        arrays = []
+        for index in range(len(document.get("members", []))):
+            member = group[f"{index:06d}"]
+            arrays.append(
+                tuple(
+                    member[name][()] if name in member else None
+                    for name in ("x", "y", "uncertainty", "quality_flags")
+                )
+            )
+    return document, arrays
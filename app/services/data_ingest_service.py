@@ -2,18 +2,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Sequence, cast
+import uuid
 
 import numpy as np
 
-from .importers import CsvImporter, ExoplanetCsvImporter, FitsImporter, JcampImporter, SupportsImport, ModisHdfImporter
+from ..telemetry import span
+from .importers import BinaryBundleImporter, CsvImporter, ExoplanetCsvImporter, FitsImporter, JcampImporter, SupportsImport, ModisHdfImporter, SniffedFile
+from .importers.base import wavelength_selection
 from .spectrum import Spectrum
 from .store import LocalStore
 from .units_service import UnitsService
 
 
+# Sniff scores are 0..1; the extension's importer wins ties and weak matches
+_EXTENSION_BONUS = 0.2
+# Without a registered extension only a format signature is good enough
+_CONTENT_ONLY_MIN_SCORE = 0.5
+# "source" keeps y/uncertainty float32 when the importer produced float32
+PRECISIONS = ("float64", "source")
+
+
+def _select(selection: slice | np.ndarray, *arrays: Any) -> tuple[Any, ...]:
+    """Apply a :func:`wavelength_selection` index to each array, skipping ``None``."""
+    return tuple(None if values is None else np.asarray(values)[selection] for values in arrays)
+
+
 class OneOrMany(list):
     """List subclass that proxies attribute access to the sole element.
 
@@ -34,6 +50,10 @@ class DataIngestService:
 
     units_service: UnitsService
     store: LocalStore | None = None
+    # Spectra at least this large are moved into ``store`` and memory-mapped
+    map_threshold_bytes: int | None = None
+    # Value precision: "float64", or "source" to keep float32 sources float32
+    precision: str = "float64"
     _registry: Dict[str, SupportsImport] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
@@ -43,6 +63,8 @@ class DataIngestService:
             self.register_importer({'.jdx', '.dx', '.jcamp'}, JcampImporter())
             # HDF4 (MODIS Surface Reflectance) via dedicated importer
             self.register_importer({'.hdf'}, ModisHdfImporter())
+            # Binary export bundles written by ProvenanceService
+            self.register_importer({'.npz', '.parquet', '.h5', '.hdf5'}, BinaryBundleImporter())
         
         # Keep a reference to specialized importers for format detection
         self._exoplanet_csv_importer = ExoplanetCsvImporter()
@@ -56,26 +78,88 @@ class DataIngestService:
                 key = f'.{key}'
             self._registry[key] = importer
 
+    def select_importer(self, sniffed: SniffedFile) -> SupportsImport | None:
+        """Pick the importer whose ``sniff`` score for ``sniffed`` is highest.
+
+        Importers score the already-read prefix (magic bytes, header
+        signatures) between 0 and 1; the one registered for the file's
+        extension gets a small bonus, and one without ``sniff`` a neutral
+        0.5, so the extension decides unless the content clearly says
+        otherwise. Files with an unknown extension are accepted when some
+        importer recognises the content.
+        """
+        by_extension = self._registry.get(sniffed.suffix)
+        best: SupportsImport | None = None
+        best_score = 0.0
+        seen: set[int] = set()
+        for importer in [*self._registry.values(), self._exoplanet_csv_importer]:
+            if id(importer) in seen:
+                continue
+            seen.add(id(importer))
+            sniff = getattr(importer, "sniff", None)
+            if sniff is not None:
+                score = float(sniff(sniffed))
+            else:
+                score = 0.5 if importer is by_extension else 0.0
+            if importer is by_extension:
+                score += _EXTENSION_BONUS
+            if score > best_score:
+                best, best_score = importer, score
+        if by_extension is None and best_score < _CONTENT_ONLY_MIN_SCORE:
+            return None
+        return best or by_extension
+
     # Historical note: We previously attempted to gate storing by origin path.
     # That caused local imports to skip caching and broke tests expecting
     # LocalStore.record to be invoked. We now always record when a store exists.
 
-    def ingest(self, path: Path) -> List[Spectrum]:
-        """Read a file from disk and return canonical :class:`Spectrum` objects."""
+    def ingest(
+        self,
+        path: Path,
+        *,
+        wavelength_range: tuple[float, float] | None = None,
+        precision: str | None = None,
+    ) -> List[Spectrum]:
+        """Read a file from disk and return canonical :class:`Spectrum` objects.
+
+        ``wavelength_range`` (``(min_nm, max_nm)``) keeps only samples inside
+        the window. Importers that advertise ``supports_wavelength_range``
+        (FITS) apply it while reading so the rest of the file is never loaded;
+        for the others the parsed arrays are cropped before normalisation.
+
+        ``precision`` overrides the service's :attr:`precision` policy for
+        this file.
+        """
         ext = path.suffix.lower()
-        importer = self._registry.get(ext)
+        with span("ingest.sniff", ext=ext):
+            sniffed = SniffedFile.open(path)
+            importer = self.select_importer(sniffed)
         if importer is None:
             raise ValueError(f"No importer registered for extension {ext!r}")
-        
-        # For CSV files, try specialized importers first
-        if ext in {'.csv', '.txt'}:
-            # Try exoplanet CSV format
-            if self._exoplanet_csv_importer.can_read(path):
-                importer = self._exoplanet_csv_importer
+        return self._ingest_sniffed(sniffed, importer, wavelength_range=wavelength_range, precision=precision)
+
+    def _ingest_sniffed(
+        self,
+        sniffed: SniffedFile,
+        importer: SupportsImport,
+        *,
+        wavelength_range: tuple[float, float] | None = None,
+        precision: str | None = None,
+    ) -> List[Spectrum]:
+        path = sniffed.path
+        ext = sniffed.suffix
+        # In-memory payloads are written straight from the buffer into the store
+        payload = sniffed if sniffed.in_memory else None
 
         # Delegate to importer and surface a friendlier error for HDF4/MODIS
+        kwargs: Dict[str, Any] = {}
+        if getattr(importer, "supports_sniffed_source", False):
+            kwargs["source"] = sniffed
+        if wavelength_range is not None and getattr(importer, "supports_wavelength_range", False):
+            kwargs["wavelength_range"] = wavelength_range
         try:
-            raw = importer.read(path)
+            with span("ingest.read", importer=importer.__class__.__name__, ext=ext):
+                raw = importer.read(path, **kwargs)  # type: ignore[call-arg]
         except Exception as exc:
             # If this is an HDF file, provide actionable guidance
             if ext == '.hdf':
@@ -87,22 +171,45 @@ class DataIngestService:
         bundle_meta = raw.metadata.get("bundle") if isinstance(raw.metadata, dict) else None
         if isinstance(bundle_meta, dict):
             bundle_format = bundle_meta.get("format")
-            if bundle_format in ("spectra-export-v1", "pds3-multi-target", "spectra-wide-v1"):
+            if bundle_format in ("spectra-export-v1", "pds3-multi-target", "spectra-wide-v1", "fits-multi-extension", "jcamp-link"):
                 members = bundle_meta.get("members", [])
                 # Extract PDS metadata if present
                 pds_metadata = raw.metadata.get("pds_label") if bundle_format == "pds3-multi-target" else None
-                return self._ingest_bundle(path, importer, members, pds_metadata)
+                manifest = bundle_meta.get("manifest") if isinstance(bundle_meta.get("manifest"), dict) else None
+                return self._ingest_bundle(
+                    path,
+                    importer,
+                    members,
+                    pds_metadata,
+                    payload=payload,
+                    precision=precision,
+                    provenance_manifest=manifest,
+                    wavelength_range=None if "wavelength_range" in kwargs else wavelength_range,
+                )
         
-        spectrum = self._build_spectrum(
-            raw.name,
-            raw.x,
-            raw.y,
-            raw.x_unit,
-            raw.y_unit,
-            raw.metadata,
-            importer,
-            raw.source_path or path,
-        )
+        if wavelength_range is not None and not getattr(importer, "supports_wavelength_range", False):
+            selection = wavelength_selection(raw.x, raw.x_unit, wavelength_range)
+            if selection is not None:
+                raw.x, raw.y, raw.uncertainty, raw.quality_flags = _select(
+                    selection, raw.x, raw.y, raw.uncertainty, raw.quality_flags
+                )
+                raw.metadata["wavelength_range_nm"] = sorted(float(bound) for bound in wavelength_range)
+
+        with span("ingest.build", points=len(raw.x)):
+            spectrum = self._build_spectrum(
+                raw.name,
+                raw.x,
+                raw.y,
+                raw.x_unit,
+                raw.y_unit,
+                raw.metadata,
+                importer,
+                raw.source_path or path,
+                uncertainty=raw.uncertainty,
+                quality_flags=raw.quality_flags,
+                payload=payload,
+                precision=precision,
+            )
         # Always record into LocalStore when available; this retains provenance
         # and enables cache index lookups, regardless of file origin.
         # (record_store is handled by _build_spectrum)
@@ -110,51 +217,64 @@ class DataIngestService:
 
     def ingest_bytes(
         self,
-        content: bytes,
+        content: bytes | bytearray | memoryview,
         *,
         suggested_name: str | None = None,
         extension: str | None = None,
+        precision: str | None = None,
     ) -> List[Spectrum]:
         """Ingest spectra from an in-memory byte buffer.
 
-        Uses the file-based importer pipeline by writing the bytes to a
-        temporary file with an appropriate suffix inferred from
-        ``suggested_name`` or ``extension``. The temporary file is then
-        parsed via :meth:`ingest` and, when a :class:`LocalStore` is
-        configured, recorded into the persistent cache.
+        The buffer is sniffed and parsed in memory by importers that accept a
+        sniffed source (CSV, exoplanet CSV, JCAMP, FITS), and when a
+        :class:`LocalStore` is configured it is written into the cache
+        directly with the digest computed once. Only importers that need a
+        real file on disk (HDF4 via pyhdf/GDAL) still go through a temporary
+        file.
 
         Parameters
-        - content: Raw file bytes
+        - content: Raw file bytes (``bytes``, ``bytearray`` or ``memoryview``)
         - suggested_name: Optional filename hint (e.g. "spectrum.fits").
         - extension: Optional override like ".fits", ".csv", or ".jdx".
+        - precision: Optional override of the service's precision policy.
 
         Returns
         - List[Spectrum]: One or more canonical spectra
         """
-        import tempfile
-
         # Resolve a usable extension for importer lookup
         ext = None
         if extension and extension.strip():
             ext = extension.strip()
         elif suggested_name:
             ext = Path(suggested_name).suffix
-        if not ext:
-            raise ValueError("Unable to determine file type: provide 'suggested_name' or 'extension'.")
-
-        if not ext.startswith("."):
+        if ext and not ext.startswith("."):
             ext = f".{ext}"
 
-        if ext.lower() not in self._registry:
+        name = Path(suggested_name).name if suggested_name else "payload"
+        virtual_path = Path(name)
+        if ext and virtual_path.suffix.lower() != ext.lower():
+            virtual_path = Path(f"{virtual_path.stem}{ext}")
+
+        with span("ingest.sniff", ext=(ext or "").lower()):
+            sniffed = SniffedFile.from_bytes(content, virtual_path)
+            importer = self.select_importer(sniffed)
+        if importer is None:
+            if not ext:
+                raise ValueError("Unable to determine file type: provide 'suggested_name' or 'extension'.")
             raise ValueError(f"No importer registered for extension {ext!r}")
 
+        if getattr(importer, "supports_sniffed_source", False):
+            return self._ingest_sniffed(sniffed, importer, precision=precision)
+
+        import tempfile
+
         # Persist bytes to a temporary file and delegate to the file pipeline
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as handle:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=virtual_path.suffix) as handle:
             handle.write(content)
             temp_path = Path(handle.name)
 
         try:
-            return self.ingest(temp_path)
+            return self.ingest(temp_path, precision=precision)
         finally:
             try:
                 temp_path.unlink(missing_ok=True)
@@ -171,8 +291,8 @@ class DataIngestService:
     def _build_spectrum(
         self,
         name: str,
-        x: Sequence[float],
-        y: Sequence[float],
+        x: Sequence[float] | np.ndarray,
+        y: Sequence[float] | np.ndarray,
         x_unit: str,
         y_unit: str,
         metadata: Dict[str, Any] | None,
@@ -181,6 +301,10 @@ class DataIngestService:
         *,
         bundle_member: str | None = None,
         record_store: bool = True,
+        payload: SniffedFile | None = None,
+        uncertainty: Sequence[float] | np.ndarray | None = None,
+        quality_flags: Sequence[int] | np.ndarray | None = None,
+        precision: str | None = None,
     ) -> Spectrum:
         normalised_x_unit = self.units_service.normalise_x_unit(x_unit)
         normalised_y_unit = self.units_service.normalise_y_unit(y_unit)
@@ -202,12 +326,47 @@ class DataIngestService:
             if isinstance(bundle_meta, dict):
                 bundle_meta.setdefault('id', bundle_member)
         # Canonicalise wavelength axis to nm but preserve original intensity
-        x_arr = np.asarray(x, dtype=self.units_service.float_dtype)
-        y_arr = np.asarray(y, dtype=self.units_service.float_dtype)
-        x_nm = self.units_service._to_canonical_wavelength(x_arr, normalised_x_unit)  # type: ignore[attr-defined]
+        value_dtype = self._value_dtype(y, precision)
+        float_dtype = np.dtype(self.units_service.float_dtype)
         if normalised_x_unit != "nm":
             meta["x_conversion"] = f"{normalised_x_unit}→nm"
 
+        def to_nm(values: Any) -> np.ndarray:
+            x_arr = np.asarray(values, dtype=float_dtype)
+            if normalised_x_unit == "nm":
+                return x_arr
+            return self.units_service._to_canonical_wavelength(x_arr, normalised_x_unit)  # type: ignore[attr-defined]
+
+        spectrum_id: str | None = None
+        if self._maps_to_store(x, y, uncertainty, quality_flags, value_dtype):
+            # Large spectra are cast and converted chunk by chunk on their way
+            # into the store rather than as full-size copies in RAM
+            assert self.store is not None
+            spectrum_id = str(uuid.uuid4())
+            try:
+                arrays = self.store.map_arrays(
+                    spectrum_id,
+                    name,
+                    {"x": x, "y": y, "uncertainty": uncertainty, "quality_flags": quality_flags},
+                    dtypes={"x": float_dtype, "y": value_dtype, "uncertainty": value_dtype, "quality_flags": np.uint8},
+                    converters={"x": to_nm},
+                )
+            except BaseException:
+                self.store.release_arrays(spectrum_id)
+                raise
+            x_nm, y_arr = arrays["x"], arrays["y"]
+            uncertainty, quality_flags = arrays.get("uncertainty"), arrays.get("quality_flags")
+        else:
+            x_nm = to_nm(x)
+            y_arr = np.asarray(y, dtype=value_dtype)
+            if uncertainty is not None:
+                uncertainty = np.asarray(uncertainty, dtype=value_dtype)
+            if quality_flags is not None:
+                quality_flags = np.asarray(quality_flags, dtype=np.uint8)
+
+        # The importer's arrays are not used again, so the spectrum takes
+        # them over instead of copying every ingest
+
         spectrum = Spectrum.create(
             name=name,
             x=x_nm,
@@ -215,15 +374,23 @@ class DataIngestService:
             x_unit="nm",
             y_unit=normalised_y_unit,
             metadata=meta,
-            source_path=source_path,
+            # In-memory payloads only borrow a file name; no file backs them
+            source_path=None if payload is not None else source_path,
+            uncertainty=uncertainty,
+            quality_flags=quality_flags,
+            copy=False,
+            value_dtype=value_dtype,
         )
+        if spectrum_id is not None:
+            spectrum = replace(spectrum, id=spectrum_id)
         if self.store is not None and record_store:
             source_summary = {
                 "ingest": dict(meta.get("ingest", {})),
                 "source_units": dict(meta.get("source_units", {})),
             }
-            record = self.store.record(
+            record = self._record(
                 source_path,
+                payload,
                 x_unit=spectrum.x_unit,
                 y_unit=spectrum.y_unit,
                 source=source_summary,
@@ -241,12 +408,36 @@ class DataIngestService:
             )
         return spectrum
 
+    def _maps_to_store(self, x: Any, y: Any, uncertainty: Any, quality_flags: Any, value_dtype: np.dtype) -> bool:
+        """Whether the spectrum built from these arrays reaches ``map_threshold_bytes``."""
+        if self.store is None or self.map_threshold_bytes is None:
+            return False
+        nbytes = len(x) * np.dtype(self.units_service.float_dtype).itemsize
+        nbytes += (len(y) + (len(uncertainty) if uncertainty is not None else 0)) * value_dtype.itemsize
+        nbytes += len(quality_flags) if quality_flags is not None else 0
+        return nbytes >= self.map_threshold_bytes
+
+    def _value_dtype(self, values: Any, precision: str | None) -> np.dtype:
+        """Storage dtype for ``y``/``uncertainty`` under the precision policy."""
+        policy = precision or self.precision
+        if policy not in PRECISIONS:
+            raise ValueError(f"Unknown precision policy {policy!r}; expected one of {PRECISIONS}")
+        dtype = getattr(values, "dtype", None)
+        if policy == "source" and dtype is not None and dtype.kind == "f" and dtype.itemsize == 4:
+            return np.dtype(np.float32)
+        return np.dtype(self.units_service.float_dtype)
+
     def _ingest_bundle(
         self,
         bundle_path: Path,
         importer: SupportsImport,
         members: Sequence[Dict[str, Any]],
         pds_metadata: Dict[str, Any] | None = None,
+        *,
+        payload: SniffedFile | None = None,
+        precision: str | None = None,
+        provenance_manifest: Dict[str, Any] | None = None,
+        wavelength_range: tuple[float, float] | None = None,
     ) -> List[Spectrum]:
         spectra: List[Spectrum] = []
         member_ids: List[str] = []
@@ -254,9 +445,9 @@ class DataIngestService:
             x = member.get("x", [])
             y = member.get("y", [])
             if (
-                not isinstance(x, Sequence)
+                not isinstance(x, (Sequence, np.ndarray))
                 or isinstance(x, (str, bytes))
-                or not isinstance(y, Sequence)
+                or not isinstance(y, (Sequence, np.ndarray))
                 or isinstance(y, (str, bytes))
             ):
                 continue
@@ -264,11 +455,20 @@ class DataIngestService:
             spectrum_id = cast(str, member.get("id")) if isinstance(member.get("id"), str) else None
             x_unit = cast(str, member.get("x_unit")) if isinstance(member.get("x_unit"), str) else "nm"
             y_unit = cast(str, member.get("y_unit")) if isinstance(member.get("y_unit"), str) else "absorbance"
-            metadata = member.get("metadata") if isinstance(member.get("metadata"), dict) else {}
+            metadata = cast(Dict[str, Any], member.get("metadata")) if isinstance(member.get("metadata"), dict) else {}
+            uncertainty = member.get("uncertainty")
+            quality_flags = member.get("quality_flags")
+            selection = wavelength_selection(np.asarray(x), x_unit, wavelength_range)
+            if selection is not None and wavelength_range is not None:
+                x, y, uncertainty, quality_flags = _select(selection, x, y, uncertainty, quality_flags)
+                metadata["wavelength_range_nm"] = sorted(float(bound) for bound in wavelength_range)
             
             # Add PDS label metadata if available
             if pds_metadata:
                 metadata["pds_label"] = pds_metadata
+            # Binary bundles carry the manifest they were exported with
+            if provenance_manifest:
+                metadata["provenance_manifest"] = provenance_manifest
             
             resolved_name = name or f"{bundle_path.stem}-{spectrum_id or len(spectra)}"
             spectrum = self._build_spectrum(
@@ -282,14 +482,27 @@ class DataIngestService:
                 bundle_path,
                 bundle_member=spectrum_id,
                 record_store=False,
+                payload=payload,
+                uncertainty=uncertainty,
+                quality_flags=quality_flags,
+                precision=precision,
             )
+            parents = member.get("parents")
+            transforms = member.get("transforms")
+            if isinstance(parents, list) or isinstance(transforms, list):
+                spectrum = replace(
+                    spectrum,
+                    parents=tuple(str(parent) for parent in parents or ()),
+                    transforms=tuple(dict(t) for t in transforms or () if isinstance(t, dict)),
+                )
             spectra.append(spectrum)
             if spectrum_id:
                 member_ids.append(spectrum_id)
 
         if self.store is not None and spectra:
-            record = self.store.record(
+            record = self._record(
                 bundle_path,
+                payload,
                 x_unit="nm",
                 y_unit="absorbance",
                 source={"bundle_members": member_ids},
@@ -305,3 +518,9 @@ class DataIngestService:
                 spectra[idx] = spectrum.with_metadata(ingest=ingest_meta, cache_record=record)
 
         return OneOrMany(spectra)
+
+    def _record(self, source_path: Path, payload: SniffedFile | None, **kwargs: Any) -> Dict[str, Any]:
+        assert self.store is not None
+        if payload is not None:
+            return self.store.record(source_path, content=payload.data(), sha256=payload.sha256(), **kwargs)
+        return self.store.record(source_path, **kwargs)
@@ -0,0 +1,185 @@
+"""In-memory index of the Markdown guides shown in the Docs tab.
+
+Building the index reads every guide once, pulls out its title and category,
+and records an inverted index (token -> documents) so the Docs filter box can
+answer queries without touching the disk again. The index is pure Python and
+has no Qt dependency, which lets the main window build it on a worker thread
+during startup and hand the finished object to the GUI thread.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+import re
+from typing import Dict, Iterable, List, Sequence
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+# Large enough that any title hit outranks any number of body occurrences
+_TITLE_BONUS = 1_000_000.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lower-case alphanumeric tokens."""
+
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class DocEntry:
+    """A single guide: display title, category, location and cached Markdown."""
+
+    title: str
+    path: Path
+    category: str
+    text: str
+    mtime_ns: int = 0
+
+    def is_stale(self) -> bool:
+        """True when the file on disk changed after it was indexed."""
+
+        try:
+            return self.path.stat().st_mtime_ns != self.mtime_ns
+        except OSError:
+            return True
+
+
+@dataclass
+class DocsIndex:
+    """Titles, categories and a full-text inverted index over the user guides."""
+
+    entries: List[DocEntry] = field(default_factory=list)
+    # token -> {entry index: occurrences}
+    _postings: Dict[str, Dict[int, int]] = field(default_factory=dict, repr=False)
+    _title_tokens: List[frozenset[str]] = field(default_factory=list, repr=False)
+    _vocabulary: List[str] = field(default_factory=list, repr=False)
+    _by_path: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, docs_root: Path | None = None) -> "DocsIndex":
+        """Index ``docs_root/user/*.md`` (falling back to INDEX.md/README.md)."""
+
+        root = Path(docs_root) if docs_root is not None else Path(__file__).resolve().parents[2] / "docs"
+        user_docs = root / "user"
+        candidates: List[Path] = []
+        if user_docs.exists():
+            candidates.extend(sorted(user_docs.glob("*.md")))
+        # If user docs are empty, fall back to a minimal curated landing page
+        if not candidates:
+            for fallback in (root / "INDEX.md", root / "README.md"):
+                if fallback.exists():
+                    candidates.append(fallback)
+
+        entries: List[DocEntry] = []
+        for path in candidates:
+            try:
+                mtime_ns = path.stat().st_mtime_ns
+                text = path.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            entries.append(
+                DocEntry(
+                    title=_title_for(path, text),
+                    path=path,
+                    category=_category_for(path, root),
+                    text=text,
+                    mtime_ns=mtime_ns,
+                )
+            )
+        return cls.from_entries(entries)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[DocEntry]) -> "DocsIndex":
+        index = cls(entries=list(entries))
+        for position, entry in enumerate(index.entries):
+            counts = Counter(tokenize(entry.text))
+            title_tokens = frozenset(tokenize(entry.title))
+            for token in title_tokens:
+                counts.setdefault(token, 1)
+            for token, count in counts.items():
+                index._postings.setdefault(token, {})[position] = count
+            index._title_tokens.append(title_tokens)
+            index._by_path[str(entry.path)] = position
+        index._vocabulary = sorted(index._postings)
+        return index
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def grouped(self) -> List[tuple[str, List[DocEntry]]]:
+        """Entries grouped by category: User first, then alphabetical; titles sorted."""
+
+        groups: Dict[str, List[DocEntry]] = {}
+        for entry in self.entries:
+            groups.setdefault(entry.category, []).append(entry)
+        ordered = sorted(groups, key=lambda name: (name != "User", name))
+        return [(name, sorted(groups[name], key=lambda e: e.title.lower())) for name in ordered]
+
+    def entry_for(self, path: Path | str) -> DocEntry | None:
+        position = self._by_path.get(str(path))
+        return self.entries[position] if position is not None else None
+
+    def search(self, query: str) -> List[DocEntry]:
+        """Return entries matching every term in ``query``, best matches first.
+
+        Each term matches indexed tokens by prefix, so ``"unc"`` finds
+        "uncertainty". Title hits outrank body hits; ties fall back to the
+        total number of occurrences and then the title.
+        """
+
+        terms = tokenize(query)
+        if not terms:
+            return list(self.entries)
+        scores: Dict[int, float] | None = None
+        for term in terms:
+            term_scores = self._term_scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pos: scores[pos] + score for pos, score in term_scores.items() if pos in scores}
+            if not scores:
+                return []
+        assert scores is not None
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.entries[item[0]].title.lower()))
+        return [self.entries[pos] for pos, _ in ranked]
+
+    # ------------------------------------------------------------------
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for token in self._expand_prefix(term):
+            for position, count in self._postings[token].items():
+                bonus = _TITLE_BONUS if token in self._title_tokens[position] else 0.0
+                scores[position] = max(scores.get(position, 0.0), bonus) + count
+        return scores
+
+    def _expand_prefix(self, term: str) -> Sequence[str]:
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, term)
+        stop = start
+        while stop < len(vocabulary) and vocabulary[stop].startswith(term):
+            stop += 1
+        return vocabulary[start:stop]
+
+
+def _title_for(path: Path, text: str) -> str:
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("# "):
+            return stripped.lstrip("# ").strip()
+    return path.stem.replace("_", " ").replace("-", " ").strip().title()
+
+
+def _category_for(path: Path, docs_root: Path) -> str:
+    pstr = str(path).lower()
+    if str(docs_root / "user").lower() in pstr:
+        return "User"
+    history = docs_root / "history"
+    if history.exists() and str(history.resolve()).lower() in pstr:
+        return "History"
+    if any(tok in pstr for tok in ("developer", "dev/", "specs/", "reviews/")):
+        return "Developer"
+    return "Other"
@@ -0,0 +1,441 @@
+"""Header-only FITS catalogue for browsing the library without loading data.
+
+FITS headers are plain ASCII: 80-character cards packed into 2880-byte
+records, ending with an ``END`` card. :func:`read_fits_headers` parses those
+records directly and seeks past each HDU's data block using BITPIX/NAXISn/
+PCOUNT/GCOUNT, so not a single array is decoded (astropy is not even
+imported).
+
+:class:`FitsHeaderIndex` summarises every FITS file in a :class:`LocalStore`
+and the ``samples/`` tree into :class:`FitsHeaderRecord` rows (target,
+instrument, telescope and wavelength coverage from WCS/TDMIN/TDMAX keywords)
+and caches them on disk keyed by sha256. Store files reuse the digest already
+recorded in the store index; other files are hashed once and remembered by
+path, size and mtime, so a warm refresh only stats the files.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from app.constants import REPO_ROOT, SPECTRAL_FILE_EXTENSIONS
+
+from .store import LocalStore
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 2880
+CARD_SIZE = 80
+CACHE_VERSION = 1
+FITS_EXTENSIONS: Tuple[str, ...] = tuple(ext for ext in SPECTRAL_FILE_EXTENSIONS if ext in {".fits", ".fit", ".fts"})
+# Guard against runaway reads on corrupt files with no END card
+_MAX_HEADER_BLOCKS = 1000
+
+# Factors to nm for spectral axis units found in CUNITn/TUNITn/XUNITS
+_UNIT_TO_NM: Dict[str, float] = {
+    "nm": 1.0,
+    "nanometer": 1.0,
+    "nanometers": 1.0,
+    "angstrom": 0.1,
+    "angstroms": 0.1,
+    "a": 0.1,
+    "aa": 0.1,
+    "0.1nm": 0.1,
+    "um": 1000.0,
+    "micron": 1000.0,
+    "microns": 1000.0,
+    "m": 1e9,
+    "mm": 1e6,
+    "cm": 1e7,
+}
+_SPECTRAL_CTYPES = ("WAVE", "AWAV", "LAMBDA", "WAVELENGTH")
+_WAVELENGTH_COLUMNS = {"wave", "wavelength", "lambda", "lam", "wavelen"}
+
+
+def _parse_value(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("'"):
+        # Strings end at the first single quote not doubled ('' is an escaped quote)
+        out: List[str] = []
+        i = 1
+        while i < len(text):
+            ch = text[i]
+            if ch == "'":
+                if i + 1 < len(text) and text[i + 1] == "'":
+                    out.append("'")
+                    i += 2
+                    continue
+                break
+            out.append(ch)
+            i += 1
+        return "".join(out).rstrip()
+    value = text.split("/", 1)[0].strip()
+    if value == "T":
+        return True
+    if value == "F":
+        return False
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.replace("D", "E"))
+    except ValueError:
+        return value
+
+
+def _parse_header(raw: bytes) -> Tuple[Dict[str, Any], bool]:
+    header: Dict[str, Any] = {}
+    for offset in range(0, len(raw), CARD_SIZE):
+        card = raw[offset : offset + CARD_SIZE].decode("ascii", errors="replace")
+        keyword = card[:8].strip()
+        if keyword == "END":
+            return header, True
+        if card[8:10] == "= " and keyword:
+            header.setdefault(keyword, _parse_value(card[10:]))
+    return header, False
+
+
+def _data_size(header: Mapping[str, Any]) -> int:
+    naxis = int(header.get("NAXIS", 0) or 0)
+    if naxis == 0:
+        return 0
+    bitpix = abs(int(header.get("BITPIX", 8) or 8))
+    # Random-groups primaries set NAXIS1 = 0 and skip it
+    dims = [int(header.get(f"NAXIS{axis}", 0) or 0) for axis in range(1, naxis + 1)]
+    if dims[0] == 0 and header.get("GROUPS"):
+        dims = dims[1:]
+    count = math.prod(dims) if dims else 0
+    pcount = int(header.get("PCOUNT", 0) or 0)
+    gcount = int(header.get("GCOUNT", 1) or 1)
+    size = bitpix // 8 * gcount * (pcount + count)
+    return size + (-size % BLOCK_SIZE)
+
+
+def read_fits_headers(path: Path, *, max_hdus: int | None = None) -> List[Dict[str, Any]]:
+    """Return the keyword dictionaries of every HDU in ``path`` (data skipped)."""
+    headers: List[Dict[str, Any]] = []
+    with Path(path).open("rb") as handle:
+        handle.seek(0, os.SEEK_END)
+        file_size = handle.tell()
+        handle.seek(0)
+        while handle.tell() < file_size and (max_hdus is None or len(headers) < max_hdus):
+            header: Dict[str, Any] = {}
+            for _ in range(_MAX_HEADER_BLOCKS):
+                block = handle.read(BLOCK_SIZE)
+                if len(block) < BLOCK_SIZE:
+                    return headers
+                parsed, done = _parse_header(block)
+                for key, value in parsed.items():
+                    header.setdefault(key, value)
+                if done:
+                    break
+            else:
+                raise ValueError(f"{path}: header without END card")
+            if not headers and header.get("SIMPLE") is not True:
+                raise ValueError(f"{path} is not a FITS file")
+            headers.append(header)
+            handle.seek(_data_size(header), os.SEEK_CUR)
+    return headers
+
+
+def _unit_to_nm(unit: Any) -> float | None:
+    if not isinstance(unit, str):
+        return None
+    key = unit.strip().lower().replace("µ", "u").replace("å", "angstrom")
+    return _UNIT_TO_NM.get(key)
+
+
+def _wcs_coverage(header: Mapping[str, Any]) -> Tuple[float, float] | None:
+    """Spectral coverage in nm from the axis-1 linear WCS of an image HDU."""
+    ctype = str(header.get("CTYPE1", "") or "").upper()
+    length = header.get("NAXIS1")
+    crval = header.get("CRVAL1")
+    cdelt = header.get("CDELT1", header.get("CD1_1"))
+    if not isinstance(length, int) or length <= 0:
+        return None
+    if not isinstance(crval, (int, float)) or not isinstance(cdelt, (int, float)) or isinstance(cdelt, bool):
+        return None
+    unit = header.get("CUNIT1") or header.get("WAT1_001", "")
+    scale = _unit_to_nm(unit)
+    if scale is None and isinstance(unit, str) and "units=angstroms" in unit.lower():
+        scale = 0.1
+    if scale is None:
+        if not ctype.startswith(_SPECTRAL_CTYPES) and not ctype.startswith("LINEAR"):
+            return None
+        # FITS WCS default for WAVE axes is metres; IRAF LINEAR spectra are Angstrom
+        scale = 1e9 if ctype.startswith(_SPECTRAL_CTYPES) else 0.1
+    crpix = float(header.get("CRPIX1", 1.0) or 1.0)
+    start = float(crval) + (1.0 - crpix) * float(cdelt)
+    stop = float(crval) + (length - crpix) * float(cdelt)
+    return min(start, stop) * scale, max(start, stop) * scale
+
+
+def _table_coverage(header: Mapping[str, Any]) -> Tuple[float, float] | None:
+    """Coverage in nm from TDMINn/TDMAXn of a wavelength column."""
+    for index in range(1, int(header.get("TFIELDS", 0) or 0) + 1):
+        name = str(header.get(f"TTYPE{index}", "") or "").strip().lower()
+        ucd = str(header.get(f"TUCD{index}", "") or "").lower()
+        if name not in _WAVELENGTH_COLUMNS and not ucd.startswith("em.wl"):
+            continue
+        lo, hi = header.get(f"TDMIN{index}"), header.get(f"TDMAX{index}")
+        scale = _unit_to_nm(header.get(f"TUNIT{index}", "nm") or "nm")
+        if isinstance(lo, (int, float)) and isinstance(hi, (int, float)) and scale is not None:
+            return min(lo, hi) * scale, max(lo, hi) * scale
+    return None
+
+
+def _keyword_coverage(header: Mapping[str, Any]) -> Tuple[float, float] | None:
+    """ESO Phase 3 WAVELMIN/WAVELMAX keywords (already in nm)."""
+    lo, hi = header.get("WAVELMIN"), header.get("WAVELMAX")
+    if isinstance(lo, (int, float)) and isinstance(hi, (int, float)):
+        return float(min(lo, hi)), float(max(lo, hi))
+    return None
+
+
+@dataclass(frozen=True)
+class FitsHeaderRecord:
+    """One FITS file summarised from its headers."""
+
+    sha256: str
+    path: str
+    target: str = ""
+    instrument: str = ""
+    telescope: str = ""
+    wavelength_min_nm: float | None = None
+    wavelength_max_nm: float | None = None
+    hdus: int = 0
+    keywords: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_headers(cls, sha256: str, path: Path, headers: Sequence[Mapping[str, Any]]) -> "FitsHeaderRecord":
+        def first(*keys: str) -> str:
+            for header in headers:
+                for key in keys:
+                    value = header.get(key)
+                    if isinstance(value, str) and value.strip():
+                        return value.strip()
+            return ""
+
+        spans = [
+            span
+            for header in headers
+            for span in (_wcs_coverage(header), _table_coverage(header), _keyword_coverage(header))
+            if span is not None
+        ]
+        keywords = {
+            key: value
+            for header in reversed(list(headers))
+            for key, value in header.items()
+            if key in {"OBJECT", "INSTRUME", "TELESCOP", "DATE-OBS", "EXPTIME", "FILTER", "GRATING", "OBSERVER", "RA", "DEC", "RA_OBJ", "DEC_OBJ"}
+        }
+        return cls(
+            sha256=sha256,
+            path=str(path),
+            target=first("OBJECT", "TARGNAME", "TARGET"),
+            instrument=first("INSTRUME"),
+            telescope=first("TELESCOP", "MISSION"),
+            wavelength_min_nm=min(lo for lo, _ in spans) if spans else None,
+            wavelength_max_nm=max(hi for _, hi in spans) if spans else None,
+            hdus=len(headers),
+            keywords=keywords,
+        )
+
+    def covers(self, lower_nm: float | None, upper_nm: float | None) -> bool:
+        """True when the file's coverage overlaps ``[lower_nm, upper_nm]``."""
+        if self.wavelength_min_nm is None or self.wavelength_max_nm is None:
+            return False
+        if lower_nm is not None and self.wavelength_max_nm < lower_nm:
+            return False
+        if upper_nm is not None and self.wavelength_min_nm > upper_nm:
+            return False
+        return True
+
+
+def _default_cache_path() -> Path:
+    try:
+        from app.utils.path_alias import PathAlias  # lazy import to avoid cycles
+
+        cache_root = PathAlias.resolve("storage://cache")
+    except Exception:
+        cache_root = REPO_ROOT / "downloads"
+    return Path(cache_root) / "_cache" / "fits_headers.json"
+
+
+class FitsHeaderIndex:
+    """Queryable, disk-cached catalogue of FITS headers.
+
+    ``refresh()`` scans the store and sample roots; ``query()`` filters the
+    in-memory records. Parsed headers live under ``records`` (sha256 → row)
+    and the path fingerprints under ``files`` (path → size/mtime/sha256).
+    """
+
+    def __init__(
+        self,
+        store: LocalStore | None = None,
+        *,
+        roots: Iterable[Path] | None = None,
+        cache_path: Path | None = None,
+    ) -> None:
+        self.store = store
+        self.roots = [Path(root) for root in (roots if roots is not None else [REPO_ROOT / "samples"])]
+        self.cache_path = Path(cache_path) if cache_path is not None else _default_cache_path()
+        self._records: Dict[str, FitsHeaderRecord] = {}
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[str, FitsHeaderRecord] = {}
+        self._dirty = False
+        self._load_cache()
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def __iter__(self) -> Iterator[FitsHeaderRecord]:
+        return iter(self._by_path.values())
+
+    def record_for(self, path: Path) -> FitsHeaderRecord | None:
+        return self._by_path.get(str(Path(path)))
+
+    def refresh(self, paths: Iterable[Path] | None = None) -> int:
+        """(Re)index ``paths`` or every FITS file in the store and roots.
+
+        Returns the number of files whose headers had to be parsed; files
+        unchanged since the last refresh come straight from the cache.
+        """
+        known_digests: Dict[str, str] = {}
+        if paths is None:
+            candidates: List[Path] = []
+            if self.store is not None:
+                for digest, entry in self.store.list_entries().items():
+                    stored = Path(str(entry.get("stored_path", "")))
+                    if stored.suffix.lower() in FITS_EXTENSIONS:
+                        candidates.append(stored)
+                        known_digests[str(stored)] = digest
+            for root in self.roots:
+                if root.is_dir():
+                    candidates.extend(p for p in root.rglob("*") if p.suffix.lower() in FITS_EXTENSIONS)
+        else:
+            candidates = [Path(p) for p in paths]
+
+        parsed = 0
+        by_path: Dict[str, FitsHeaderRecord] = {}
+        for path in candidates:
+            key = str(path)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            fingerprint = self._files.get(key)
+            sha: str | None = known_digests.get(key)
+            if fingerprint and fingerprint.get("size") == stat.st_size and fingerprint.get("mtime_ns") == stat.st_mtime_ns:
+                sha = sha or fingerprint.get("sha256")
+            if not sha:
+                try:
+                    sha = LocalStore._sha256(path)
+                except OSError as exc:
+                    logger.debug("Skipping unreadable FITS file %s: %s", path, exc)
+                    continue
+            current = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+            if fingerprint != current:
+                self._files[key] = current
+                self._dirty = True
+            record = self._records.get(sha)
+            if record is None:
+                try:
+                    headers = read_fits_headers(path)
+                except (OSError, ValueError) as exc:
+                    logger.debug("Skipping unreadable FITS header %s: %s", path, exc)
+                    continue
+                record = FitsHeaderRecord.from_headers(sha, path, headers)
+                self._records[sha] = record
+                self._dirty = True
+                parsed += 1
+            # The same bytes may live at several paths (store copy + sample)
+            by_path[key] = record if record.path == key else FitsHeaderRecord(**{**asdict(record), "path": key})
+        if paths is None:
+            self._dirty = self._dirty or set(by_path) != set(self._by_path)
+            self._by_path = by_path
+        else:
+            self._by_path.update(by_path)
+        self.save()
+        return parsed
+
+    def query(
+        self,
+        *,
+        target: str | None = None,
+        instrument: str | None = None,
+        telescope: str | None = None,
+        wavelength_nm: Tuple[float | None, float | None] | float | None = None,
+    ) -> List[FitsHeaderRecord]:
+        """Records matching every given filter.
+
+        Text filters are case-insensitive substrings; ``wavelength_nm`` is a
+        single wavelength or a ``(lower, upper)`` range the file must overlap.
+        """
+        if isinstance(wavelength_nm, (int, float)):
+            wavelength_nm = (float(wavelength_nm), float(wavelength_nm))
+        needles = [
+            (attr, value.strip().lower())
+            for attr, value in (("target", target), ("instrument", instrument), ("telescope", telescope))
+            if value and value.strip()
+        ]
+        results = []
+        for record in self._by_path.values():
+            if any(needle not in getattr(record, attr).lower() for attr, needle in needles):
+                continue
+            if wavelength_nm is not None and not record.covers(*wavelength_nm):
+                continue
+            results.append(record)
+        return sorted(results, key=lambda r: (r.target.lower(), r.path))
+
+    def distinct(self, attr: str) -> List[str]:
+        """Sorted unique non-empty values of ``target``/``instrument``/``telescope``."""
+        return sorted({getattr(record, attr) for record in self._by_path.values() if getattr(record, attr)}, key=str.lower)
+
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> None:
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return
+        if payload.get("version") != CACHE_VERSION:
+            return
+        for sha, row in payload.get("records", {}).items():
+            try:
+                self._records[sha] = FitsHeaderRecord(**row)
+            except TypeError:
+                continue
+        self._files = {key: dict(value) for key, value in payload.get("files", {}).items()}
+        for key, fingerprint in self._files.items():
+            record = self._records.get(str(fingerprint.get("sha256")))
+            if record is not None:
+                self._by_path[key] = record if record.path == key else FitsHeaderRecord(**{**asdict(record), "path": key})
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        files = {key: value for key, value in self._files.items() if key in self._by_path}
+        live = {value["sha256"] for value in files.values()}
+        payload = {
+            "version": CACHE_VERSION,
+            "records": {sha: asdict(record) for sha, record in self._records.items() if sha in live},
+            "files": files,
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(payload, default=str), encoding="utf-8")
+            tmp.replace(self.cache_path)
+            self._dirty = False
+        except OSError as exc:
+            logger.warning("Could not write FITS header cache %s: %s", self.cache_path, exc)
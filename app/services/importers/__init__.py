@@ -1,18 +1,22 @@
 """Importer classes for different file formats."""
 
 from .base import ImporterResult, SupportsImport
+from .binary_bundle_importer import BinaryBundleImporter
 from .csv_importer import CsvImporter
 from .exoplanet_csv_importer import ExoplanetCsvImporter
 from .fits_importer import FitsImporter
 from .jcamp_importer import JcampImporter
 from .modis_hdf_importer import ModisHdfImporter
+from .sniff import SniffedFile
 
 __all__ = [
     "ImporterResult",
     "SupportsImport",
+    "BinaryBundleImporter",
     "CsvImporter",
     "ExoplanetCsvImporter",
     "FitsImporter",
     "JcampImporter",
     "ModisHdfImporter",
+    "SniffedFile",
 ]
@@ -20,6 +20,8 @@ class ImporterResult:
     y_unit: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     source_path: Path | None = None
+    uncertainty: np.ndarray | None = None
+    quality_flags: np.ndarray | None = None
 
 
 class SupportsImport(Protocol):
@@ -27,3 +29,43 @@ class SupportsImport(Protocol):
 
     def read(self, path: Path) -> ImporterResult:  # pragma: no cover - interface
         ...
+
+
+# Scale factors from the wavelength tokens importers emit to nanometres
+_WAVELENGTH_TO_NM = {"nm": 1.0, "angstrom": 0.1, "um": 1000.0, "mm": 1e6, "m": 1e9}
+
+
+def wavelength_selection(
+    x: np.ndarray,
+    x_unit: str,
+    wavelength_range: tuple[float, float] | None,
+) -> slice | np.ndarray | None:
+    """Index selecting ``x`` samples that fall inside ``wavelength_range`` (nm).
+
+    Returns ``None`` when no range is requested or ``x`` is not a wavelength
+    axis (time, pixels), a contiguous ``slice`` when ``x`` is monotonic (the
+    usual case, so importers can read just that window of the other columns)
+    and a boolean mask otherwise.
+    """
+    if wavelength_range is None:
+        return None
+    unit = str(x_unit or "").strip().lower()
+    values = np.asarray(x, dtype=np.float64)
+    if unit in _WAVELENGTH_TO_NM:
+        x_nm = values * _WAVELENGTH_TO_NM[unit]
+    elif unit in {"cm^-1", "cm-1", "1/cm"}:
+        with np.errstate(divide="ignore"):
+            x_nm = 1e7 / values
+    else:
+        return None
+    lo, hi = sorted(float(bound) for bound in wavelength_range)
+    if x_nm.size > 1:
+        steps = np.diff(x_nm)
+        if np.all(steps >= 0):
+            return slice(int(np.searchsorted(x_nm, lo, "left")), int(np.searchsorted(x_nm, hi, "right")))
+        if np.all(steps <= 0):
+            reversed_nm = x_nm[::-1]
+            start = int(np.searchsorted(reversed_nm, lo, "left"))
+            stop = int(np.searchsorted(reversed_nm, hi, "right"))
+            return slice(x_nm.size - stop, x_nm.size - start)
+    return (x_nm >= lo) & (x_nm <= hi)
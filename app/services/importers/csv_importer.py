@@ -12,7 +12,9 @@ from typing import Dict, Iterable, List, Sequence, Tuple, cast
 import numpy as np
 
 from .base import ImporterResult
-from ..pds_label_parser import parse_pds_label
+from .sniff import SniffedFile
+from .. import pds_table
+from ..pds_label_parser import PDSColumn, PDSLabel, parse_pds_label
 
 _NUMERIC_RE = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
 
@@ -106,28 +108,43 @@ def _reset_layout_cache() -> None:
 class CsvImporter:
     """Read spectral data from loosely formatted delimited text files."""
 
-    def read(self, path: Path) -> ImporterResult:
+    supports_sniffed_source = True
+
+    def sniff(self, source: SniffedFile) -> float:
+        """Generic fallback for any text; dedicated formats score higher."""
+        if source.looks_binary():
+            return 0.0
+        return 0.1
+
+    def read(self, path: Path, *, source: SniffedFile | None = None) -> ImporterResult:
         """Parse ``path`` and return raw spectral arrays.
 
         The importer accepts traditional CSV files as well as scientific data
         exports that interleave prose, comments, or additional descriptor
         columns. Numeric detection is performed row-by-row so the importer can
         recover the dominant two-column trace even when the original file
-        contains extra values.
+        contains extra values. ``source`` is the buffer the ingest service
+        already read while sniffing, so the file is not opened again.
         """
 
-        lines = path.read_text(encoding="utf-8").splitlines()
-        
-        # Try PDS3 table format first (checks for companion .lbl file)
-        pds_result = self._try_parse_pds_table(path, lines)
+        # Try PDS3 table format first (checks for companion .lbl file); binary
+        # tables must be caught before the content is decoded as text
+        pds_result = self._try_parse_pds_table(path, source=source)
         if pds_result is not None:
             return pds_result
+
+        if source is not None:
+            lines = source.lines()
+        else:
+            lines = path.read_text(encoding="utf-8").splitlines()
         
-        wide_bundle = self._try_parse_wide_bundle(path, lines)
+        # Both bundle layouts look at the same comment-free lines
+        filtered = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        wide_bundle = self._try_parse_wide_bundle(path, lines, filtered)
         if wide_bundle is not None:
             return wide_bundle
 
-        bundle_result = self._try_parse_export_bundle(path, lines)
+        bundle_result = self._try_parse_export_bundle(path, lines, filtered)
         if bundle_result is not None:
             return bundle_result
 
@@ -287,14 +304,21 @@ class CsvImporter:
 
     # ------------------------------------------------------------------
     def _try_parse_pds_table(
-        self, path: Path, lines: Sequence[str]
+        self, path: Path, lines: Sequence[str] | None = None, *, source: SniffedFile | None = None
     ) -> ImporterResult | None:
         """Parse PDS3 table with companion .lbl file defining multi-column structure.
         
         Returns a bundle-style result containing all target spectra if a .lbl file
         is found and parsed successfully. Returns None if no PDS label exists.
+
+        The label's column offsets drive a bulk structured-dtype read
+        (:mod:`app.services.pds_table`); tables whose bytes do not match the
+        label fall back to whitespace splitting.
         """
-        # Look for companion .lbl file
+        # Look for companion .lbl file; in-memory payloads have no directory
+        # to look in, and a same-named label in the cwd is unrelated
+        if source is not None and source.in_memory:
+            return None
         label_path = path.with_suffix(".lbl")
         if not label_path.exists():
             return None
@@ -316,48 +340,33 @@ class CsvImporter:
         if not target_cols:
             return None
         
-        # Parse data - use whitespace-delimited parsing as PDS labels sometimes
-        # have incorrect byte specifications (especially for values >1000)
-        data_values: Dict[str, List[float]] = {"wavelength": []}
-        for target_name, _ in target_cols:
-            data_values[target_name] = []
-        
-        # Map column numbers to extraction
-        wl_col_num = wavelength_col.column_number - 1  # Convert to 0-indexed
-        target_col_nums = {name: col.column_number - 1 for name, col in target_cols}
-        
-        for line in lines:
-            if not line.strip():
-                continue
-            try:
-                # Split on whitespace
-                fields = line.split()
-                if len(fields) < len(label.columns):
-                    continue
-                
-                # Extract wavelength
-                wavelength = float(fields[wl_col_num])
-                data_values["wavelength"].append(wavelength)
-                
-                # Extract each target's data
-                for target_name, col_idx in target_col_nums.items():
-                    value = float(fields[col_idx]) if fields[col_idx] else np.nan
-                    data_values[target_name].append(value)
-            
-            except (ValueError, IndexError):
-                # Skip malformed lines
-                continue
-        
-        if not data_values["wavelength"]:
+        columns = [wavelength_col] + [col for _, col in target_cols]
+        data = source.data() if source is not None else None
+        engine = "binary" if label.interchange_format.upper() == "BINARY" else "fixed-width"
+        table = pds_table.read_table(label, columns, path=None if data is not None else path, data=data)
+        if table is None and engine == "binary":
+            return None
+        if table is None:
+            # PDS labels sometimes have incorrect byte specifications
+            # (especially for values >1000), so split on whitespace instead
+            engine = "whitespace"
+            if data is None:
+                data = path.read_bytes()
+            table = pds_table.split_table(label, columns, data)
+        if table is None:
+            if lines is None:
+                lines = source.lines() if source is not None else path.read_text(encoding="utf-8").splitlines()
+            table = self._split_pds_lines(label, columns, lines)
+        if table is None:
             return None
         
         # Convert wavelength to nm if needed
-        wl_array = np.array(data_values["wavelength"])
+        wl_array = table[wavelength_col.name]
         wl_unit = wavelength_col.unit or "nm"
         wl_unit_lower = wl_unit.lower()
         if "nanometer" in wl_unit_lower or "nm" in wl_unit_lower:
             x_unit = "nm"
-        elif "micron" in wl_unit_lower or "um" in wl_unit_lower or "µm" in wl_unit_lower:
+        elif "micron" in wl_unit_lower or "micrometer" in wl_unit_lower or "um" in wl_unit_lower or "µm" in wl_unit_lower:
             x_unit = "µm"
         elif "angstrom" in wl_unit_lower or "a" == wl_unit_lower:
             x_unit = "Å"
@@ -367,7 +376,7 @@ class CsvImporter:
         # Build bundle with all targets
         members_payload: List[Dict[str, object]] = []
         for target_name, col in target_cols:
-            y_array = np.array(data_values[target_name])
+            y_array = table[col.name]
             
             # Filter out NaN/inf values
             mask = np.isfinite(wl_array) & np.isfinite(y_array)
@@ -385,8 +394,8 @@ class CsvImporter:
             members_payload.append({
                 "id": f"{label.product_name}_{target_name}",
                 "name": f"{target_name} ({label.product_name})",
-                "x": x_clean.tolist(),
-                "y": y_clean.tolist(),
+                "x": x_clean,
+                "y": y_clean,
                 "x_unit": x_unit,
                 "y_unit": y_unit,
             })
@@ -406,6 +415,7 @@ class CsvImporter:
                 "stop_time": label.stop_time,
                 "note": label.note,
             },
+            "pds_table": {"engine": engine, "rows": int(wl_array.size)},
             "bundle": {
                 "format": "pds3-multi-target",
                 "members": members_payload,
@@ -423,13 +433,36 @@ class CsvImporter:
             metadata=metadata,
             source_path=path,
         )
+
+    def _split_pds_lines(
+        self, label: PDSLabel, columns: Sequence[PDSColumn], lines: Sequence[str]
+    ) -> Dict[str, np.ndarray] | None:
+        """Row-by-row whitespace split for tables with ragged rows."""
+        values: Dict[str, List[float]] = {column.name: [] for column in columns}
+        for line in lines:
+            if not line.strip():
+                continue
+            fields = line.split()
+            if len(fields) < len(label.columns):
+                continue
+            try:
+                row = [float(fields[column.column_number - 1]) for column in columns]
+            except (ValueError, IndexError):
+                # Skip malformed lines
+                continue
+            for column, value in zip(columns, row):
+                values[column.name].append(value)
+        if not values[columns[0].name]:
+            return None
+        return {name: np.asarray(column_values, dtype=float) for name, column_values in values.items()}
     
     def _try_parse_export_bundle(
-        self, path: Path, lines: Sequence[str]
+        self, path: Path, lines: Sequence[str], filtered: Sequence[str] | None = None
     ) -> ImporterResult | None:
         """Detect Spectra provenance bundle CSV exports."""
 
-        filtered = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        if filtered is None:
+            filtered = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
         if not filtered:
             return None
 
@@ -512,7 +545,7 @@ class CsvImporter:
         )
 
     def _try_parse_wide_bundle(
-        self, path: Path, lines: Sequence[str]
+        self, path: Path, lines: Sequence[str], filtered: Sequence[str] | None = None
     ) -> ImporterResult | None:
         """Detect the wide export format generated by :class:`ProvenanceService`."""
 
@@ -535,7 +568,8 @@ class CsvImporter:
             if isinstance(data, dict) and data.get("id"):
                 member_meta[str(data["id"])] = data
 
-        filtered = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        if filtered is None:
+            filtered = [line for line in lines if line.strip() and not line.lstrip().startswith("#")]
         if not filtered:
             return None
 
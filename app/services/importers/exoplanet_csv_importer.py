@@ -13,36 +13,41 @@ from typing import Dict, List
 import numpy as np
 
 from .base import ImporterResult
+from .sniff import SniffedFile
 
 
 class ExoplanetCsvImporter:
     """Import exoplanet spectra with CENTRALWAVELNG/BANDWIDTH format."""
 
+    supports_sniffed_source = True
+
     def can_read(self, path: Path) -> bool:
-        """Check if this file appears to be an exoplanet spectrum CSV.
-        
-        Returns True if the first non-comment line contains CENTRALWAVELNG
-        or similar exoplanet spectrum headers.
-        """
+        """Check if this file appears to be an exoplanet spectrum CSV."""
         try:
-            with path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    # Check for exoplanet-specific headers
-                    line_upper = line.upper()
-                    if "CENTRALWAVELNG" in line_upper or "CENTRALWAVE" in line_upper:
-                        return True
-                    # If we hit data rows without finding the header, bail
-                    if any(c.isdigit() for c in line[:20]):
-                        return False
-                    break
-        except (OSError, UnicodeDecodeError):
-            pass
-        return False
+            return self.sniff(SniffedFile.open(path)) > 0
+        except OSError:
+            return False
+
+    def sniff(self, source: SniffedFile) -> float:
+        """Score ``source`` by its header row.
 
-    def read(self, path: Path) -> ImporterResult:
+        Matches when the first non-comment line contains CENTRALWAVELNG or
+        similar exoplanet spectrum headers.
+        """
+        if source.looks_binary():
+            return 0.0
+        for line in source.head_lines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            # Check for exoplanet-specific headers
+            line_upper = line.upper()
+            if "CENTRALWAVELNG" in line_upper or "CENTRALWAVE" in line_upper:
+                return 0.9
+            break
+        return 0.0
+
+    def read(self, path: Path, *, source: SniffedFile | None = None) -> ImporterResult:
         """Parse exoplanet CSV and return spectrum data.
         
         Expected columns:
@@ -52,8 +57,11 @@ class ExoplanetCsvImporter:
         
         If no flux column exists, uses row index as placeholder Y values.
         """
-        with path.open("r", encoding="utf-8") as f:
-            lines = [line for line in f if line.strip() and not line.strip().startswith("#")]
+        if source is not None:
+            raw_lines = source.lines()
+        else:
+            raw_lines = path.read_text(encoding="utf-8").splitlines()
+        lines = [line for line in raw_lines if line.strip() and not line.strip().startswith("#")]
         
         if not lines:
             raise ValueError(f"No data found in {path}")
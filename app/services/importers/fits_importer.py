@@ -1,18 +1,54 @@
-"""FITS importer for one-dimensional spectra."""
+"""FITS importer for one-dimensional spectra.
+
+Files are opened memory-mapped with lazily loaded HDUs, so picking the
+spectral HDU only parses headers and a read touches just the bytes of the
+chosen columns (or image rows). Plain float table columns come back as
+read-only views of the file itself, so their pages are read only when the
+values are used (e.g. streamed chunk by chunk into the store for large
+spectra). With ``wavelength_range`` the x axis is read first and only the
+matching window of the flux column is used, which keeps large
+multi-extension JWST/SpeX products cheap to preview.
+"""
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Iterable
 
 import numpy as np
 
-try:  # pragma: no cover - optional dependency in CI
-    from astropy.io import fits  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover - optional dependency in CI
-    fits = None  # type: ignore[assignment]
+from ..quality_flags import QualityFlags
+from .base import ImporterResult, wavelength_selection
+from .sniff import FITS_MAGIC, SniffedFile
 
-from .base import ImporterResult
+if TYPE_CHECKING:  # annotations only; the runtime import is deferred below
+    from astropy.io import fits
+
+# astropy.io.fits is by far the heaviest import in the ingest stack; resolve it
+# on the first FITS read instead of when the importer registry is imported.
+_fits_module: Any = None
+
+
+def _load_fits() -> Any:
+    global _fits_module
+    if _fits_module is None:
+        try:  # pragma: no cover - optional dependency in CI
+            from astropy.io import fits as _fits
+        except ModuleNotFoundError:  # pragma: no cover - optional dependency in CI
+            return None
+        _fits_module = _fits
+    return _fits_module
+
+
+def _float_values(values: Any) -> np.ndarray:
+    """Native-endian float copy; float32 data stays float32.
+
+    Whether float32 survives into the spectrum is decided by the ingest
+    precision policy, so the importer does not widen it up front.
+    """
+    array = np.asarray(values)
+    single = array.dtype.kind == "f" and array.dtype.itemsize == 4
+    return np.array(array, dtype=np.float32 if single else np.float64)
 
 
 class FitsImporter:
@@ -23,6 +59,15 @@ class FitsImporter:
     that can be interpreted as (x[, y[, err]]).
     """
 
+    # DataIngestService passes ``wavelength_range`` through to importers that opt in
+    supports_wavelength_range = True
+    # In-memory payloads (``ingest_bytes``) are parsed from their buffer
+    supports_sniffed_source = True
+
+    def sniff(self, source: SniffedFile) -> float:
+        # Data is memory-mapped from the path, so only the header is sniffed
+        return 1.0 if source.prefix.startswith(FITS_MAGIC) else 0.0
+
     _WAVELENGTH_COLUMNS: Iterable[str] = (
         "wavelength",
         "wave",
@@ -55,107 +100,357 @@ class FitsImporter:
         "data",  # Sometimes FITS uses generic "DATA" column
     )
     _ERROR_TOKENS: tuple[str, ...] = ("err", "error", "unc", "uncert", "sigma", "stddev")
+    # Binary-table float formats whose stored bytes are the values
+    _PLAIN_FORMATS: frozenset[str] = frozenset({"E", "D"})
+    _QUALITY_COLUMNS: tuple[str, ...] = ("dq", "quality", "qual", "dqflags", "qualityflags", "flags", "mask")
+    # Image extensions that accompany a science array rather than hold a spectrum
+    _COMPANION_EXTNAMES: frozenset[str] = frozenset({"ERR", "ERROR", "SIGMA", "VAR", "IVAR", "DQ", "QUALITY", "MASK", "WAVE", "WAVELENGTH"})
+    # JWST DQ bits that have a direct QualityFlags equivalent; other set bits map to QUESTIONABLE
+    _JWST_DQ_BITS: tuple[tuple[int, QualityFlags], ...] = (
+        (1, QualityFlags.BAD_PIXEL),  # DO_NOT_USE
+        (2, QualityFlags.SATURATED),
+        (4, QualityFlags.COSMIC_RAY),  # JUMP_DET
+    )
 
     def _require_fits(self):
-        if fits is None:
+        fits_mod = _load_fits()
+        if fits_mod is None:
             raise RuntimeError(
                 "FITS support requires the 'astropy' package. Install it to enable FITS ingestion."
             )
-        return fits
-
-    def read(self, path: Path) -> ImporterResult:
+        return fits_mod
+
+    def read(
+        self,
+        path: Path,
+        *,
+        wavelength_range: tuple[float, float] | None = None,
+        source: SniffedFile | None = None,
+    ) -> ImporterResult:
+        """Read every spectrum in ``path`` in a single open.
+
+        Each table HDU with wavelength/flux columns becomes one spectrum, or
+        one per row when the columns are vectors (echelle orders). Without a
+        usable table, image HDUs are used instead, including Spextool
+        ``(orders, channels, N)`` cubes. Error and DQ/quality columns or
+        channels become ``uncertainty`` and ``quality_flags``. When more than
+        one spectrum is found, the result carries a ``fits-multi-extension``
+        bundle that :class:`DataIngestService` fans out.
+
+        ``wavelength_range`` is ``(min_nm, max_nm)``; when the x axis is a
+        wavelength/wavenumber only samples inside it are loaded.
+
+        Files on disk are memory-mapped, and plain float table columns are
+        returned as views of the file (big-endian, read-only) rather than
+        copies; an in-memory ``source`` is read from its buffer without a
+        temporary file.
+        """
         path = Path(path)
         fits_mod = self._require_fits()
-        with fits_mod.open(path, memmap=False) as hdul:
-            table_hdu = self._select_table_hdu(hdul)
-            if table_hdu is not None:
-                hdu = table_hdu
-                data = hdu.data
-                if data is None:
-                    raise ValueError(f"No tabular data found in {path}")
-
-                wave_col = self._find_column(hdu, self._WAVELENGTH_COLUMNS)
-                flux_col = self._find_column(hdu, self._FLUX_COLUMNS)
-
-                x = self._column_to_array(data[wave_col], flatten=True)
-                y = self._column_to_array(data[flux_col], flatten=True)
-
-                x_unit_raw = self._column_unit(hdu, wave_col) or ""
-                flux_unit_raw = self._column_unit(hdu, flux_col) or hdu.header.get("BUNIT", "")
-                x_unit = self._normalise_wavelength_unit(x_unit_raw)
-                flux_unit = self._normalise_flux_unit(flux_unit_raw)
-
-                name = hdu.header.get("OBJECT", path.stem)
-                metadata = {
-                    "x_label": wave_col,
-                    "y_label": flux_col,
-                    "fits_header": {key: hdu.header.get(key) for key in ("OBJECT", "INSTRUME", "TELESCOP", "TIMESYS") if key in hdu.header},
-                    "fits_columns": {"x": wave_col, "y": flux_col},
+        if source is not None and source.in_memory:
+            opened = fits_mod.open(source.buffer(), lazy_load_hdus=True)
+        else:
+            opened = fits_mod.open(path, memmap=True, lazy_load_hdus=True)
+        with opened as hdul:
+            mapped_path = None if source is not None and source.in_memory else path
+            members = self._scan_spectral_hdus(hdul, path, wavelength_range, mapped_path=mapped_path)
+        if wavelength_range is not None:
+            # Orders/extensions entirely outside the window are dropped
+            members = [member for member in members if member["x"].size] or members[:1]
+
+        for member in members:
+            selection = member.pop("selection", None)
+            total_points = member.pop("total_points", None)
+            if selection is not None:
+                member["metadata"]["fits_selection"] = {
+                    "wavelength_range_nm": [float(bound) for bound in sorted(wavelength_range or ())],
+                    "points": int(member["x"].size),
+                    "total_points": int(total_points),
                 }
-                if flux_unit_raw:
-                    metadata["original_flux_unit"] = str(flux_unit_raw)
-                if x_unit_raw:
-                    metadata["original_x_unit"] = str(x_unit_raw)
-                # Special-case: time-like axes (BJD/MJD/HJD/TIME) → mark unit accordingly
-                x_unit = self._coerce_time_like_unit(x_unit, wave_col, hdu)
-            else:
-                # Fallback: attempt to parse primary/image HDU arrays
-                hdu = self._select_image_hdu(hdul)
-                if hdu is None or hdu.data is None:
-                    raise ValueError("No suitable HDU found for spectral data")
-                x, y, img_meta = self._extract_from_image_hdu(hdu)
-                # Units from header keywords
-                # Prefer axis 1 unit for x, BUNIT for y
-                # Also check XUNITS (used by SpeX) and YUNITS
-                x_unit_raw = hdu.header.get("CUNIT1") or hdu.header.get("WAVEUNIT") or hdu.header.get("XUNITS") or ""
-                flux_unit_raw = hdu.header.get("BUNIT") or hdu.header.get("YUNITS") or ""
-                x_unit = self._normalise_wavelength_unit(x_unit_raw)
-                flux_unit = self._normalise_flux_unit(flux_unit_raw)
-                name = hdu.header.get("OBJECT", path.stem)
-                metadata = {
-                    "x_label": img_meta.get("x_label", "x"),
-                    "y_label": img_meta.get("y_label", "y"),
-                    "fits_header": {key: hdu.header.get(key) for key in ("OBJECT", "INSTRUME", "TELESCOP", "CTYPE1", "CUNIT1") if key in hdu.header},
-                    "fits_image_shape": tuple(getattr(hdu.data, "shape", ()) or ()),
-                }
-                if flux_unit_raw:
-                    metadata["original_flux_unit"] = str(flux_unit_raw)
-                if x_unit_raw:
-                    metadata["original_x_unit"] = str(x_unit_raw)
-                x_unit = self._coerce_time_like_unit(x_unit, str(metadata.get("x_label", "")), hdu)
-
-        y_unit = self._normalise_intensity_unit(flux_unit)
+            member["x_unit"] = str(member["x_unit"]).lower()
+            member["y_unit"] = self._normalise_intensity_unit(member.pop("flux_unit"))
+
+        first = members[0]
+        metadata = first["metadata"]
+        if len(members) > 1:
+            metadata = dict(metadata)
+            metadata["bundle"] = {
+                "format": "fits-multi-extension",
+                "members": members,
+                "source_path": str(path),
+            }
         return ImporterResult(
-            name=name,
-            x=x,
-            y=y,
-            x_unit=str(x_unit).lower(),
-            y_unit=y_unit,
+            name=first["name"],
+            x=first["x"],
+            y=first["y"],
+            x_unit=first["x_unit"],
+            y_unit=first["y_unit"],
             metadata=metadata,
             source_path=path,
+            uncertainty=first.get("uncertainty"),
+            quality_flags=first.get("quality_flags"),
         )
 
     def description(self) -> str:
         return "FITS binary table importer"
 
-    def _select_table_hdu(self, hdulist: "fits.HDUList") -> "fits.BinTableHDU" | None:
+    def _scan_spectral_hdus(
+        self,
+        hdulist: "fits.HDUList",
+        path: Path,
+        wavelength_range: tuple[float, float] | None,
+        *,
+        mapped_path: Path | None = None,
+    ) -> list[dict[str, Any]]:
         fits_mod = self._require_fits()
-        for hdu in hdulist:
-            if isinstance(hdu, fits_mod.BinTableHDU) and hdu.data is not None:
-                return hdu
-        return None
+        primary_header = hdulist[0].header if len(hdulist) else {}
+        members: list[dict[str, Any]] = []
+        # Decide from headers alone; touching ``hdu.data`` would map every extension
+        table_error: ValueError | None = None
+        for index, hdu in enumerate(hdulist):
+            if not isinstance(hdu, fits_mod.BinTableHDU) or not self._has_data(hdu):
+                continue
+            try:
+                members.extend(
+                    self._table_members(hdu, index, path, primary_header, wavelength_range, mapped_path=mapped_path)
+                )
+            except ValueError as exc:
+                # Auxiliary tables (ASDF metadata, apertures) lack spectral columns
+                table_error = table_error or exc
+        if members:
+            return self._label_members(members)
+        if table_error is not None:
+            raise table_error
+
+        image_error: ValueError | None = None
+        for index, hdu in enumerate(hdulist):
+            if not isinstance(hdu, (fits_mod.PrimaryHDU, fits_mod.ImageHDU)) or not self._has_data(hdu):
+                continue
+            if str(hdu.name or "").upper() in self._COMPANION_EXTNAMES:
+                continue
+            try:
+                members.extend(self._image_members(hdu, index, path, primary_header, wavelength_range))
+            except ValueError as exc:
+                image_error = image_error or exc
+        if members:
+            return self._label_members(members)
+        if image_error is not None:
+            raise image_error
+        raise ValueError("No suitable HDU found for spectral data")
+
+    def _label_members(self, members: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Give bundle members stable ids and distinguishable names."""
+        if len(members) == 1:
+            return members
+        hdus = {member["hdu"] for member in members}
+        for member in members:
+            order = member.get("order")
+            parts = [] if len(hdus) == 1 else [member["extname"] or f"HDU {member['hdu']}"]
+            if order is not None:
+                parts.append(f"order {order}")
+            member["id"] = f"hdu{member['hdu']}" + (f"-order{order}" if order is not None else "")
+            member["name"] = f"{member['name']} ({', '.join(parts)})"
+            member["metadata"]["fits_member"] = {"hdu": member["hdu"], "extname": member["extname"], "order": order}
+        return members
+
+    def _table_members(
+        self,
+        hdu: "fits.BinTableHDU",
+        index: int,
+        path: Path,
+        primary_header: Any,
+        wavelength_range: tuple[float, float] | None,
+        *,
+        mapped_path: Path | None = None,
+    ) -> list[dict[str, Any]]:
+        # A memmapped FITS_rec: column access below is a view until copied
+        data = hdu.data
+        if data is None:
+            raise ValueError(f"No tabular data found in {path}")
+        records = self._mapped_records(hdu, data, mapped_path) if mapped_path is not None else None
+
+        def column(name: str, rows: Any, selection: Any = None, keep_float32: bool = True) -> np.ndarray:
+            if records is not None and self._plain_column(hdu, name):
+                # Our own mapping outlives the HDU list, so no copy is needed
+                view = records[name][rows].reshape(-1)
+                return view if selection is None else view[selection]
+            return self._column_to_array(
+                data[name][rows], flatten=True, selection=selection, keep_float32=keep_float32
+            )
 
-    def _select_image_hdu(self, hdulist: "fits.HDUList") -> "fits.PrimaryHDU | fits.ImageHDU | None":
-        fits_mod = self._require_fits()
-        # Prefer primary with data, else first ImageHDU with data
-        primary = hdulist[0] if len(hdulist) else None
-        if isinstance(primary, (fits_mod.PrimaryHDU, fits_mod.ImageHDU)) and getattr(primary, "data", None) is not None:
-            return primary
-        for hdu in hdulist:
-            if isinstance(hdu, (fits_mod.ImageHDU,)) and getattr(hdu, "data", None) is not None:
-                return hdu
+        wave_col = self._find_column(hdu, self._WAVELENGTH_COLUMNS)
+        flux_col = self._find_column(hdu, self._FLUX_COLUMNS)
+        error_col = self._find_error_column(hdu, flux_col)
+        quality_col = self._find_quality_column(hdu)
+
+        x_unit_raw = self._column_unit(hdu, wave_col) or ""
+        flux_unit_raw = self._column_unit(hdu, flux_col) or hdu.header.get("BUNIT", "")
+        x_unit = self._normalise_wavelength_unit(x_unit_raw)
+        flux_unit = self._normalise_flux_unit(flux_unit_raw)
+
+        metadata: dict[str, Any] = {
+            "x_label": wave_col,
+            "y_label": flux_col,
+            "fits_header": {key: hdu.header.get(key) for key in ("OBJECT", "INSTRUME", "TELESCOP", "TIMESYS") if key in hdu.header},
+            "fits_columns": {"x": wave_col, "y": flux_col},
+        }
+        if error_col:
+            metadata["fits_columns"]["uncertainty"] = error_col
+        if quality_col:
+            metadata["fits_columns"]["quality"] = quality_col
+        if flux_unit_raw:
+            metadata["original_flux_unit"] = str(flux_unit_raw)
+        if x_unit_raw:
+            metadata["original_x_unit"] = str(x_unit_raw)
+        # Special-case: time-like axes (BJD/MJD/HJD/TIME) → mark unit accordingly
+        member_x_unit = self._coerce_time_like_unit(x_unit, wave_col, hdu)
+        name = hdu.header.get("OBJECT", primary_header.get("OBJECT", path.stem))
+
+        wave = data[wave_col]
+        # Echelle products store one order per row in vector columns
+        per_row = len(data) > 1 and np.ndim(wave) == 2 and np.shape(wave)[1] > 1
+        order_numbers = self._order_numbers(hdu.header, primary_header, len(data)) if per_row else [None]
+
+        members: list[dict[str, Any]] = []
+        for row, order in enumerate(order_numbers):
+            rows: Any = row if per_row else slice(None)
+            # Copied wavelengths become float64: float32 cannot resolve fine grids
+            x = column(wave_col, rows, keep_float32=False)
+            selection = wavelength_selection(x, x_unit, wavelength_range)
+            y = column(flux_col, rows, selection)
+            member: dict[str, Any] = {
+                "name": name,
+                "x": x if selection is None else x[selection],
+                "y": y,
+                "x_unit": member_x_unit,
+                "flux_unit": flux_unit,
+                "metadata": {**metadata, "fits_columns": dict(metadata["fits_columns"])},
+                "hdu": index,
+                "extname": hdu.name,
+                "order": order,
+                "selection": selection,
+                "total_points": x.size,
+            }
+            if error_col:
+                sigma = column(error_col, rows, selection)
+                if sigma.size == y.size:
+                    member["uncertainty"] = sigma
+            if quality_col:
+                dq = column(quality_col, rows, selection)
+                if dq.size == y.size:
+                    member["quality_flags"] = self._quality_flags(dq, primary_header, hdu.header)
+            members.append(member)
+        return members
+
+    def _image_members(
+        self,
+        hdu: "fits.ImageBaseHDU",
+        index: int,
+        path: Path,
+        primary_header: Any,
+        wavelength_range: tuple[float, float] | None,
+    ) -> list[dict[str, Any]]:
+        # Units from header keywords
+        # Prefer axis 1 unit for x, BUNIT for y
+        # Also check XUNITS (used by SpeX) and YUNITS
+        x_unit_raw = hdu.header.get("CUNIT1") or hdu.header.get("WAVEUNIT") or hdu.header.get("XUNITS") or ""
+        flux_unit_raw = hdu.header.get("BUNIT") or hdu.header.get("YUNITS") or ""
+        x_unit = self._normalise_wavelength_unit(x_unit_raw)
+        flux_unit = self._normalise_flux_unit(flux_unit_raw)
+        name = hdu.header.get("OBJECT", primary_header.get("OBJECT", path.stem))
+
+        members: list[dict[str, Any]] = []
+        for entry in self._extract_from_image_hdu(hdu, x_unit=x_unit, wavelength_range=wavelength_range):
+            metadata: dict[str, Any] = {
+                "x_label": entry.pop("x_label"),
+                "y_label": entry.pop("y_label"),
+                "fits_header": {key: hdu.header.get(key) for key in ("OBJECT", "INSTRUME", "TELESCOP", "CTYPE1", "CUNIT1") if key in hdu.header},
+                "fits_image_shape": self._image_shape(hdu),
+            }
+            if flux_unit_raw:
+                metadata["original_flux_unit"] = str(flux_unit_raw)
+            if x_unit_raw:
+                metadata["original_x_unit"] = str(x_unit_raw)
+            flags = entry.pop("quality", None)
+            if flags is not None:
+                entry["quality_flags"] = self._quality_flags(flags, primary_header, hdu.header)
+            entry.update(
+                name=name,
+                x_unit=self._coerce_time_like_unit(x_unit, str(metadata["x_label"]), hdu),
+                flux_unit=flux_unit,
+                metadata=metadata,
+                hdu=index,
+                extname=hdu.name,
+            )
+            members.append(entry)
+        return members
+
+    def _find_error_column(self, hdu: "fits.BinTableHDU", flux_col: str) -> str | None:
+        """Uncertainty column for ``flux_col`` (e.g. PDCSAP_FLUX_ERR, FLUX_ERROR, ERR)."""
+        flux_key = self._normalise_column_key(flux_col)
+        # Longest first so "error" is stripped before "err"
+        tokens = sorted({*self._ERROR_TOKENS, "uncertainty"}, key=len, reverse=True)
+        generic: str | None = None
+        for column in hdu.columns.names or []:
+            key = self._normalise_column_key(column)
+            if column == flux_col or not self._looks_like_error_column(key):
+                continue
+            stem = key
+            for token in tokens:
+                stem = stem.replace(token, "")
+            if stem == flux_key:
+                return column
+            # Errors of another quantity (WAVELENGTH_ERR, SAP_FLUX_ERR) do not qualify
+            if stem in {"", "flux"} and generic is None:
+                generic = column
+        return generic
+
+    def _find_quality_column(self, hdu: "fits.BinTableHDU") -> str | None:
+        by_key = {self._normalise_column_key(column): column for column in hdu.columns.names or []}
+        for candidate in self._QUALITY_COLUMNS:
+            if candidate in by_key:
+                return by_key[candidate]
         return None
 
+    def _quality_flags(self, values: np.ndarray, *headers: Any) -> np.ndarray:
+        """Map a mission DQ/quality array onto :class:`QualityFlags` bits."""
+        dq = np.nan_to_num(np.asarray(values, dtype=np.float64)).astype(np.int64)
+        flags = np.where(dq != 0, int(QualityFlags.QUESTIONABLE), int(QualityFlags.GOOD)).astype(np.uint8)
+        telescope = next((str(h.get("TELESCOP", "")).strip().upper() for h in headers if h.get("TELESCOP")), "")
+        if telescope == "JWST":
+            flags[:] = QualityFlags.GOOD
+            remaining = dq.copy()
+            for bit, flag in self._JWST_DQ_BITS:
+                hit = (dq & bit) != 0
+                flags[hit] |= np.uint8(flag)
+                remaining &= ~bit
+            flags[remaining != 0] |= np.uint8(QualityFlags.QUESTIONABLE)
+        return flags
+
+    def _order_numbers(self, header: Any, primary_header: Any, count: int) -> list[int]:
+        """Echelle order numbers from ORDERS/SPORDER keywords, else 1..count."""
+        for source in (header, primary_header):
+            raw = source.get("ORDERS")
+            if raw:
+                try:
+                    numbers = [int(token) for token in str(raw).replace(" ", ",").split(",") if token]
+                except ValueError:
+                    continue
+                if len(numbers) == count:
+                    return numbers
+        return list(range(1, count + 1))
+
+    def _has_data(self, hdu: "fits.hdu.base._BaseHDU") -> bool:
+        naxis = int(hdu.header.get("NAXIS", 0) or 0)
+        if naxis == 0:
+            return False
+        return all(int(hdu.header.get(f"NAXIS{axis}", 0) or 0) > 0 for axis in range(1, naxis + 1))
+
+    def _image_shape(self, hdu: "fits.ImageBaseHDU") -> tuple[int, ...]:
+        """numpy-ordered data shape from NAXISn, without reading the data."""
+        naxis = int(hdu.header.get("NAXIS", 0) or 0)
+        return tuple(int(hdu.header.get(f"NAXIS{axis}", 0) or 0) for axis in range(naxis, 0, -1))
+
     def _find_column(self, hdu: "fits.BinTableHDU", candidates: Iterable[str]) -> str:
         columns = list(hdu.columns.names or [])
         normalised = {self._normalise_column_key(col): col for col in columns}
@@ -197,6 +492,21 @@ class FitsImporter:
             f"Available columns: {available}"
         )
 
+    def _mapped_records(self, hdu: "fits.BinTableHDU", data: Any, path: Path) -> np.ndarray | None:
+        """The table rows mapped read-only straight from ``path``, or None."""
+        try:
+            offset = int(hdu.fileinfo()["datLoc"])
+            return np.memmap(path, dtype=data.dtype, mode="r", offset=offset, shape=(len(data),))
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def _plain_column(self, hdu: "fits.BinTableHDU", name: str) -> bool:
+        """Whether the stored bytes of ``name`` are its values (no scaling/heap)."""
+        column = hdu.columns[name]
+        if column.bscale not in (None, 1) or column.bzero not in (None, 0):
+            return False
+        return str(column.format).lstrip("0123456789") in self._PLAIN_FORMATS
+
     def _column_unit(self, hdu: "fits.BinTableHDU", column: str) -> str | None:
         try:
             unit = hdu.columns[column].unit
@@ -206,7 +516,14 @@ class FitsImporter:
             return str(unit)
         return None
 
-    def _column_to_array(self, column_data: object, *, flatten: bool) -> np.ndarray:
+    def _column_to_array(
+        self,
+        column_data: object,
+        *,
+        flatten: bool,
+        selection: slice | np.ndarray | None = None,
+        keep_float32: bool = True,
+    ) -> np.ndarray:
         if hasattr(column_data, "to_value"):
             try:
                 column_data = column_data.to_value()
@@ -214,9 +531,13 @@ class FitsImporter:
                 pass
 
         array = np.asanyarray(column_data)
+        if selection is not None:
+            # Index the memmapped view first so only the selected bytes are read
+            array = array.reshape(-1)[selection]
         if np.ma.isMaskedArray(array):
             array = np.ma.filled(array, np.nan)
-        array = np.asarray(array, dtype=np.float64)
+        # Copy: astropy's memmap is released when the HDU list closes
+        array = _float_values(array) if keep_float32 else np.array(array, dtype=np.float64)
         if flatten or array.ndim == 1:
             return array.reshape(-1)
         if array.ndim == 2 and 1 in array.shape:
@@ -288,40 +609,59 @@ class FitsImporter:
         return unit.strip()
 
     # ------------------ Image HDU helpers ------------------
-    def _extract_from_image_hdu(self, hdu: "fits.ImageBaseHDU") -> tuple[np.ndarray, np.ndarray, dict[str, str]]:
-        """Extract (x, y) arrays from an image-like HDU.
+    def _extract_from_image_hdu(
+        self,
+        hdu: "fits.ImageBaseHDU",
+        *,
+        x_unit: str = "",
+        wavelength_range: tuple[float, float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Extract one ``x``/``y`` entry per spectrum in an image-like HDU.
 
         Supports common cases:
+        - 3D array shaped (orders, C, N) as written by Spextool: one entry per
+          order with channels x, y[, err[, flags]]
         - 2D array shaped (N, 2) or (N, 3): columns represent x, y[, err]
         - 2D array shaped (2, N) or (3, N): rows represent x, y[, err]
         - 1D array with WCS keywords: synthesise x via CRVAL1/CRPIX1/CDELT1
+
+        Rows are read through ``hdu.section`` so only the channels used (and,
+        with ``wavelength_range``, only the selected window) come off disk.
         """
-        data = np.asanyarray(hdu.data)
-        meta: dict[str, str] = {}
-        if data.ndim == 2:
-            n0, n1 = data.shape
+        shape = self._image_shape(hdu)
+        section = hdu.section
+        labels = {"x_label": hdu.header.get("CTYPE1", "x"), "y_label": hdu.header.get("BTYPE", "y")}
+        if len(shape) == 3 and shape[1] in (2, 3, 4) and shape[2] > 3:
+            orders = self._order_numbers(hdu.header, {}, shape[0])
+            entries = []
+            for plane, order in enumerate(orders):
+                entry = self._channel_vectors(
+                    lambda channel, window=slice(None), plane=plane: section[plane, channel, window],
+                    shape[1],
+                    x_unit,
+                    wavelength_range,
+                )
+                entries.append({**entry, **labels, "order": order if shape[0] > 1 else None})
+            return entries
+        if len(shape) == 2 and 1 not in shape:
+            n0, n1 = shape
             # Orient as (N, C)
-            arr = data
-            if n0 in (2, 3) and n1 > 3:
-                arr = data.T
-                n0, n1 = arr.shape
-            if n1 in (2, 3) and n0 >= 2:
-                x = np.asarray(arr[:, 0], dtype=float)
-                y = np.asarray(arr[:, 1], dtype=float)
-                # If x is not monotonic but y is, swap
-                if not self._is_monotonic(x) and self._is_monotonic(y):
-                    x, y = y, x
-                meta["x_label"] = hdu.header.get("CTYPE1", "x")
-                meta["y_label"] = hdu.header.get("BTYPE", "y")
-                return x.reshape(-1), y.reshape(-1), meta
-        if data.ndim == 1 or (data.ndim == 2 and 1 in data.shape):
-            # Flatten and use WCS-like keywords to construct x
-            y = np.asarray(data).reshape(-1).astype(float)
+            by_rows = n0 in (2, 3) and n1 > 3
+            length, channels = (n1, n0) if by_rows else (n0, n1)
+            if channels in (2, 3) and length >= 2:
+
+                def fetch(channel: int, window: Any = slice(None)) -> Any:
+                    return section[channel, window] if by_rows else section[window, channel]
+
+                entry = self._channel_vectors(fetch, channels, x_unit, wavelength_range)
+                return [{**entry, **labels, "order": None}]
+        if len(shape) == 1 or (len(shape) == 2 and 1 in shape):
+            # Use WCS-like keywords to construct x before touching the data
+            n = int(np.prod(shape))
             crval = self._safe_float(hdu.header.get("CRVAL1"))
             cdelt = self._safe_float(hdu.header.get("CDELT1"))
             crpix = self._safe_float(hdu.header.get("CRPIX1"))
             if cdelt is not None and (crval is not None or crpix is not None):
-                n = y.size
                 # FITS uses 1-based pixel coordinates
                 indices = np.arange(1, n + 1, dtype=float)
                 if crpix is None:
@@ -331,20 +671,77 @@ class FitsImporter:
                 x = crval + (indices - crpix) * cdelt
             else:
                 # Fallback: ordinal index
-                x = np.arange(y.size, dtype=float)
-            meta["x_label"] = hdu.header.get("CTYPE1", "x")
-            meta["y_label"] = hdu.header.get("BTYPE", "y")
-            return x.reshape(-1), y.reshape(-1), meta
+                x = np.arange(n, dtype=float)
+            selection = wavelength_selection(x, x_unit, wavelength_range)
+            window = selection if isinstance(selection, slice) else slice(None)
+            if len(shape) == 1:
+                raw = section[window]
+            elif shape[0] == 1:
+                raw = section[0, window]
+            else:
+                raw = section[window, 0]
+            y = _float_values(raw).reshape(-1)
+            if selection is not None and not isinstance(selection, slice):
+                y = y[selection]
+            return [
+                {
+                    "x": x if selection is None else x[selection],
+                    "y": y,
+                    "selection": selection,
+                    "total_points": n,
+                    "order": None,
+                    **labels,
+                }
+            ]
         # Unsupported shape
         raise ValueError("Unsupported FITS image data shape for spectral extraction")
 
+    def _channel_vectors(
+        self,
+        fetch: Any,
+        channels: int,
+        x_unit: str,
+        wavelength_range: tuple[float, float] | None,
+    ) -> dict[str, Any]:
+        """Read x/y[/err[/flags]] channels via ``fetch(channel, window)``."""
+        x = np.array(fetch(0), dtype=float).reshape(-1)
+        y: np.ndarray | None = None
+        # If x is not monotonic but y is, swap
+        if not self._is_monotonic(x):
+            y = _float_values(fetch(1)).reshape(-1)
+            if self._is_monotonic(y):
+                x, y = y, x
+        selection = wavelength_selection(x, x_unit, wavelength_range)
+
+        def _load(channel: int) -> np.ndarray:
+            if isinstance(selection, slice):
+                return _float_values(fetch(channel, selection)).reshape(-1)
+            values = _float_values(fetch(channel)).reshape(-1)
+            return values if selection is None else values[selection]
+
+        if y is None:
+            y = _load(1)
+        elif selection is not None:
+            y = y[selection]
+        entry: dict[str, Any] = {
+            "x": x if selection is None else x[selection],
+            "y": y,
+            "selection": selection,
+            "total_points": x.size,
+        }
+        if channels >= 3:
+            entry["uncertainty"] = _load(2)
+        if channels >= 4:
+            entry["quality"] = _load(3)
+        return entry
+
     def _is_monotonic(self, arr: np.ndarray) -> bool:
         if arr.size < 3:
             return False
         diffs = np.diff(arr)
-        return bool(diffs.size) and (np.all(diffs >= 0) or np.all(diffs <= 0))
+        return bool(diffs.size) and bool(np.all(diffs >= 0) or np.all(diffs <= 0))
 
-    def _safe_float(self, value: object) -> float | None:
+    def _safe_float(self, value: Any) -> float | None:
         try:
             if value is None:
                 return None
@@ -2,127 +2,313 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+import re
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
 from .base import ImporterResult
+from .sniff import SniffedFile
+
+# ASDF pseudo-digits (JCAMP-DX 4.24 §5.9). Each starts a new token:
+#   SQZ  @ A-I / a-i  -> absolute value with leading digit 0, +1..+9, -1..-9
+#   DIF  % J-R / j-r  -> difference from the previous ordinate
+#   DUP  S-Z, s       -> repeat count (1..9) for the previous token
+_SQZ = {"@": " 0", **{c: f" {i}" for i, c in enumerate("ABCDEFGHI", 1)}, **{c: f" -{i}" for i, c in enumerate("abcdefghi", 1)}}
+_DIF = {"%": " D0", **{c: f" D{i}" for i, c in enumerate("JKLMNOPQR", 1)}, **{c: f" D-{i}" for i, c in enumerate("jklmnopqr", 1)}}
+_DUP = {c: f" R{i}" for i, c in enumerate("STUVWXYZs", 1)}
+_ASDF_TABLE = str.maketrans({**_SQZ, **_DIF, **_DUP, "?": " ? ", ",": " ", ";": " ", "\t": " "})
+_AFFN_TABLE = str.maketrans({"?": " ? ", ",": " ", ";": " ", "\t": " "})
+# E/e double as SQZ digits and AFFN exponents; any other pseudo-digit means ASDF
+_COMPRESSED = re.compile(r"[@A-DF-Ia-df-i%J-Rj-rS-Zs]")
+_LDR = re.compile(r"^[ \t]*##([^=\n]*)=([^\n]*)$", re.MULTILINE)
+_COMMENT = re.compile(r"\$\$[^\n]*")
+_LINE_MARK = "|"
+
+_KIND_X, _KIND_ABS, _KIND_DIF, _KIND_DUP = 0, 1, 2, 3
+_DATA_LABELS = {"XYDATA", "XYPOINTS", "PEAKTABLE", "DATATABLE"}
+# JCAMP spells units out; map the common ones onto UnitsService tokens
+_UNIT_ALIASES = {
+    "1/cm": "cm^-1",
+    "nanometers": "nm",
+    "micrometers": "um",
+    "microns": "um",
+    "angstroms": "angstrom",
+}
+
+
+def _label_key(label: str) -> str:
+    """JCAMP labels ignore case, spaces, dashes, underscores and slashes."""
+    return re.sub(r"[\s\-_/]", "", label).upper()
+
+
+@dataclass
+class _Block:
+    header: Dict[str, str] = field(default_factory=dict)
+    keys: Dict[str, str] = field(default_factory=dict)
+    form: str = ""
+    data: str = ""
+
+    def number(self, key: str) -> float | None:
+        try:
+            return float(self.keys[key].replace("D", "E"))
+        except (KeyError, ValueError):
+            return None
 
 
 class JcampImporter:
-    """Parse a minimal subset of the JCAMP-DX specification.
-
-    The parser focuses on the structures commonly encountered in laboratory
-    spectra: ``##XUNITS``, ``##YUNITS``, and ``##XYDATA`` blocks. Multi-value
-    rows inside ``##XYDATA`` are expanded using ``##DELTAX`` if present; when no
-    spacing is provided, the importer falls back to emitting a single sample per
-    row. The goal is to provide predictable behaviour for regression tests
-    without attempting to implement the entire JCAMP dialect.
+    """Parse JCAMP-DX spectra, including ASDF-compressed and LINK files.
+
+    ``##XYDATA=(X++(Y..Y))`` tables may use any mix of AFFN, SQZ, DIF and DUP
+    encodings. Each data table is decoded in one go: the text is rewritten
+    into plain tokens with ``str.translate``, parsed by numpy, DUP runs are
+    expanded with ``np.repeat`` and DIF chains resolved with a cumulative
+    sum; Y-check values at line starts are verified and dropped. X comes from
+    ``FIRSTX``/``LASTX``/``NPOINTS`` when they agree with the decoded count,
+    otherwise from the per-line abscissae. ``(X,Y)``/``(XY..XY)`` pair tables
+    are read directly. ``##DATA TYPE=LINK`` files with several spectral
+    blocks come back as a ``jcamp-link`` bundle.
     """
 
     _DEFAULT_X_UNIT = "cm^-1"
     _DEFAULT_Y_UNIT = "absorbance"
 
-    def read(self, path: Path) -> ImporterResult:
-        path = Path(path)
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        header, samples = self._parse(text)
+    supports_sniffed_source = True
 
-        x_unit = header.get("XUNITS", self._DEFAULT_X_UNIT)
-        y_unit = header.get("YUNITS", self._DEFAULT_Y_UNIT)
-        name = header.get("TITLE", path.stem)
+    def sniff(self, source: SniffedFile) -> float:
+        """JCAMP files open with labelled data records such as ``##TITLE=``."""
+        head = source.head_text().lstrip("\ufeff \t\r\n")
+        if not head.startswith("##"):
+            return 0.0
+        return 0.9 if _label_key(head[2:].split("=", 1)[0]) in {"TITLE", "JCAMPDX"} else 0.5
 
-        x_values, y_values = samples
-        if not x_values or not y_values:
+    def read(self, path: Path, *, source: SniffedFile | None = None) -> ImporterResult:
+        path = Path(path)
+        if source is not None:
+            text = source.text(errors="ignore")
+        else:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        members: List[Dict[str, Any]] = []
+        for block in self._blocks(text):
+            if not block.form or not block.data.strip():
+                continue
+            x_values, y_values, data_meta = self._decode(block)
+            if x_values.size == 0:
+                continue
+            header = dict(block.header)
+            members.append(
+                {
+                    "id": f"block{len(members) + 1}",
+                    "name": header.get("TITLE", path.stem) or path.stem,
+                    "x": x_values,
+                    "y": y_values,
+                    "x_unit": self._unit(header.get("XUNITS"), self._DEFAULT_X_UNIT),
+                    "y_unit": self._unit(header.get("YUNITS"), self._DEFAULT_Y_UNIT),
+                    "metadata": {
+                        "jcamp_header": header,
+                        "jcamp_data": data_meta,
+                        "source_format": "JCAMP-DX",
+                    },
+                }
+            )
+        if not members:
             raise ValueError(f"No spectral samples found in JCAMP file {path}")
 
-        metadata: Dict[str, object] = {
-            "jcamp_header": header,
-            "source_format": "JCAMP-DX",
-        }
-
+        first = members[0]
+        metadata = first["metadata"]
+        if len(members) > 1:
+            metadata = dict(metadata)
+            metadata["bundle"] = {"format": "jcamp-link", "members": members, "source_path": str(path)}
         return ImporterResult(
-            name=name,
-            x=np.asarray(x_values, dtype=np.float64),
-            y=np.asarray(y_values, dtype=np.float64),
-            x_unit=x_unit.lower(),
-            y_unit=y_unit.lower(),
+            name=first["name"],
+            x=first["x"],
+            y=first["y"],
+            x_unit=first["x_unit"],
+            y_unit=first["y_unit"],
             metadata=metadata,
             source_path=path,
         )
 
     # ------------------------------------------------------------------
-    def _parse(self, text: str) -> Tuple[Dict[str, str], Tuple[List[float], List[float]]]:
-        header: Dict[str, str] = {}
-        x_samples: List[float] = []
-        y_samples: List[float] = []
-
-        in_xydata = False
-        delta_x: float | None = None
+    def _blocks(self, text: str) -> List[_Block]:
+        """Split ``text`` into blocks, one per ``##TITLE`` … ``##END``.
 
-        for raw_line in text.splitlines():
-            line = raw_line.strip()
-            if not line:
+        Only the labelled data records are visited in Python; data tables
+        are taken as single slices of ``text`` between two labels.
+        """
+        blocks: List[_Block] = []
+        stack: List[_Block] = []
+        current: _Block | None = None
+        matches = list(_LDR.finditer(text))
+        for index, match in enumerate(matches):
+            label, value = match.group(1).strip(), match.group(2)
+            key = _label_key(label)
+            body_end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+            body = text[match.end() : body_end]
+            if key == "TITLE" or current is None:
+                if current is not None:
+                    # A TITLE inside an open block starts a nested LINK child
+                    stack.append(current)
+                current = _Block()
+                blocks.append(current)
+            if key == "END":
+                current = stack.pop() if stack else None
                 continue
-
-            if line.startswith("##"):
-                key, _, value = line[2:].partition("=")
-                key_upper = key.strip().upper()
-                value = value.strip()
-
-                if key_upper == "XYDATA":
-                    in_xydata = True
-                    continue
-                if key_upper in {"END", "END="}:
-                    break
-                if key_upper == "DELTAX":
-                    try:
-                        delta_x = float(value)
-                    except ValueError:
-                        delta_x = None
-                    continue
-
-                header[key_upper] = value
+            if key in _DATA_LABELS:
+                current.form = value.strip()
+                current.data = body
                 continue
+            value = _COMMENT.sub("", value + body).strip()
+            current.header[label.upper()] = value
+            current.keys[key] = value
+        return blocks
 
-            if not in_xydata:
-                continue
+    def _decode(self, block: _Block) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        form = block.form.replace(" ", "").upper()
+        x_factor = block.number("XFACTOR") or 1.0
+        y_factor = block.number("YFACTOR") or 1.0
+        values, kinds, lines, compressed = self._tokenise(block.data)
+        meta: Dict[str, Any] = {"form": block.form, "compressed": compressed}
 
-            tokens = self._split_tokens(line)
-            if len(tokens) < 2:
-                continue
+        if "++" not in form:
+            # (X,Y) / (XY..XY) pair tables
+            pairs = values[kinds != _KIND_DUP]
+            usable = pairs.size - pairs.size % 2
+            pairs = pairs[:usable].reshape(-1, 2)
+            return pairs[:, 0] * x_factor, pairs[:, 1] * y_factor, meta
 
-            try:
-                start_x = float(tokens[0])
-            except ValueError:
-                continue
+        # DUP: the token before each repeat count occurs ``count`` times in total
+        dup = np.flatnonzero(kinds == _KIND_DUP)
+        if dup.size:
+            repeats = np.ones(values.size, dtype=np.int64)
+            repeats[dup[dup > 0] - 1] = values[dup[dup > 0]].astype(np.int64)
+            repeats[dup] = 0
+            values, kinds, lines = (np.repeat(a, repeats) for a in (values, kinds, lines))
 
-            y_values: List[float] = []
-            for token in tokens[1:]:
-                try:
-                    y_values.append(float(token))
-                except ValueError:
-                    continue
+        is_x = kinds == _KIND_X
+        line_x = values[is_x]
+        y_tokens = values[~is_x]
+        y_kinds = kinds[~is_x]
+        y_lines = lines[~is_x]
+        if y_tokens.size == 0:
+            return np.empty(0), np.empty(0), meta
 
-            if not y_values:
-                continue
+        # Resolve DIF chains: every ordinate is its segment's absolute value
+        # plus the running sum of differences since
+        missing = np.isnan(y_tokens)
+        filled = np.where(missing, 0.0, y_tokens)
+        running = np.cumsum(filled)
+        positions = np.arange(filled.size)
+        seg_start = np.maximum.accumulate(np.where(y_kinds != _KIND_DIF, positions, 0))
+        y_all = np.where(y_kinds == _KIND_DIF, running - (running[seg_start] - filled[seg_start]), filled)
+        y_all[missing] = np.nan
 
-            if len(y_values) == 1 or delta_x is None:
-                x_samples.append(start_x)
-                y_samples.append(y_values[0])
+        # Point index within its line, for abscissae when X is not analytic
+        line_starts = np.flatnonzero(np.r_[True, y_lines[1:] != y_lines[:-1]])
+        counts = np.diff(np.r_[line_starts, y_lines.size])
+        within = positions - np.repeat(line_starts, counts)
+
+        # A line following one that ended in DIF form opens with a Y-check
+        # repeat of that last ordinate. Some writers omit it, so NPOINTS
+        # decides when it is available; otherwise only matching values go
+        candidates = line_starts[1:]
+        checks = candidates[y_kinds[candidates - 1] == _KIND_DIF]
+        first_x, last_x = block.number("FIRSTX"), block.number("LASTX")
+        npoints = block.number("NPOINTS")
+        keep = np.ones(y_all.size, dtype=bool)
+        if checks.size:
+            matched = np.isclose(y_all[checks], y_all[checks - 1], equal_nan=True)
+            if npoints is None or int(npoints) != y_all.size:
+                meta["ycheck_failures"] = int(np.count_nonzero(~matched))
+                if npoints is None or int(npoints) != y_all.size - checks.size:
+                    checks = checks[matched]
+                keep[checks] = False
+        y_values = y_all[keep] * y_factor
+
+        if first_x is not None and last_x is not None and npoints is not None and int(npoints) == y_values.size:
+            x_values = np.linspace(first_x, last_x, y_values.size) if y_values.size > 1 else np.array([first_x])
+            meta["x_source"] = "FIRSTX/LASTX/NPOINTS"
+            return x_values, y_values, meta
+
+        # NPOINTS disagrees with the table, so trust the per-line abscissae
+        # and take the step from DELTAX or the first two lines
+        second_is_check = line_starts.size > 1 and not keep[line_starts[1]]
+        if block.number("DELTAX") is not None:
+            step = float(block.number("DELTAX"))  # type: ignore[arg-type]
+        elif line_x.size > 1:
+            step = float((line_x[1] - line_x[0]) * x_factor / max(counts[0] - int(second_is_check), 1))
+        elif first_x is not None and last_x is not None and y_values.size > 1:
+            step = (last_x - first_x) / (y_values.size - 1)
+        else:
+            step = 0.0
+        x_start = np.repeat(line_x[: line_starts.size] * x_factor, counts[: line_x.size])
+        x_values = (x_start + within[: x_start.size] * step)[keep[: x_start.size]]
+        meta["x_source"] = "line abscissae"
+        return x_values, y_values[: x_values.size], meta
+
+    def _tokenise(self, data: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+        """Decode a data table into (values, kinds, line ids, compressed)."""
+        data = data.replace("\r", "")
+        if "$$" in data:
+            data = _COMMENT.sub("", data)
+        compressed = bool(_COMPRESSED.search(data))
+        if not compressed and "?" not in data:
+            # Plain AFFN, the common case: parse the split text directly, with
+            # NaN marking line breaks (nan/inf spellings would read as ASDF)
+            text = "nan " + data.translate(_AFFN_TABLE).replace("\n", " nan ")
+            try:
+                values = np.array(text.split(), dtype=np.float64)
+            except ValueError:
+                pass  # signs as separators or stray text: decode token by token
             else:
-                current_x = start_x
-                for y in y_values:
-                    x_samples.append(current_x)
-                    y_samples.append(y)
-                    current_x += delta_x
+                is_line = np.isnan(values)
+                kinds = np.full(values.size, _KIND_ABS, dtype=np.int8)
+                kinds[np.flatnonzero(is_line[:-1]) + 1] = _KIND_X
+                keep = ~is_line
+                return values[keep], kinds[keep], np.cumsum(is_line)[keep], False
+        if compressed:
+            # PAC form: signs separate values; no exponents in ASDF data
+            data = re.sub(r"([+-])", r" \1", data).translate(_ASDF_TABLE)
+        else:
+            data = re.sub(r"(?<![EeDd])([+-])", r" \1", data).translate(_AFFN_TABLE)
+        data = f"{_LINE_MARK} " + data.replace("\n", f" {_LINE_MARK} ")
+        tokens = np.array(data.split())
+        if tokens.size == 0:
+            empty = np.empty(0)
+            return empty, empty.astype(np.int8), empty.astype(np.int64), compressed
+
+        lead = tokens.astype("U1")
+        is_line = lead == _LINE_MARK
+        is_dif = lead == "D"
+        is_dup = lead == "R"
+        body = np.where(is_dif | is_dup, np.char.lstrip(tokens, "DR"), tokens)
+        body[is_line | (lead == "?")] = "nan"
+        try:
+            values = body.astype(np.float64)
+        except ValueError:
+            values = np.array([self._safe_float(token) for token in body], dtype=np.float64)
 
-        return header, (x_samples, y_samples)
+        kinds = np.full(tokens.size, _KIND_ABS, dtype=np.int8)
+        kinds[is_dif] = _KIND_DIF
+        kinds[is_dup] = _KIND_DUP
+        first_on_line = np.flatnonzero(is_line) + 1
+        kinds[first_on_line[first_on_line < tokens.size]] = _KIND_X
+        lines = np.cumsum(is_line)
+        keep = ~is_line
+        # Stray text that is not a number is dropped rather than failing the file
+        keep &= ~(np.isnan(values) & (lead != "?"))
+        return values[keep], kinds[keep], lines[keep], compressed
 
-    def _split_tokens(self, line: str) -> List[str]:
-        separators: Iterable[str] = {",", " ", "\t"}
-        for sep in separators:
-            line = line.replace(sep, " ")
-        return [token for token in line.split(" ") if token]
+    @staticmethod
+    def _unit(value: str | None, default: str) -> str:
+        unit = (value or default).strip().lower()
+        return _UNIT_ALIASES.get(unit, unit)
 
+    @staticmethod
+    def _safe_float(token: str) -> float:
+        try:
+            return float(token)
+        except ValueError:
+            return float("nan")
@@ -0,0 +1,107 @@
+"""Content sniffing shared by the importers.
+
+``DataIngestService`` reads a bounded prefix of every file once, asks each
+registered importer how confident it is that the bytes are its format (magic
+numbers, header signatures) and hands the winner the same
+:class:`SniffedFile`, so text importers parse the already-read buffer instead
+of opening the file again. Files smaller than the prefix are therefore read
+exactly once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from pathlib import Path
+from typing import List
+
+
+# Large enough for headers and the first screen of any text format; files
+# below this size are fully buffered by the first read
+PREFIX_BYTES = 64 * 1024
+
+FITS_MAGIC = b"SIMPLE  ="
+HDF4_MAGIC = b"\x0e\x03\x13\x01"
+HDF5_MAGIC = b"\x89HDF\r\n\x1a\n"
+
+
+class SniffedFile:
+    """A file's leading bytes plus lazy access to the rest of its content.
+
+    ``from_bytes`` wraps a payload that never touched the disk (downloads,
+    ``ingest_bytes``); ``path`` is then only a name hint and
+    :attr:`in_memory` is true.
+    """
+
+    def __init__(self, path: Path, prefix: bytes, *, complete: bool) -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+        self.in_memory = False
+        self._data: bytes | memoryview | None = prefix if complete else None
+        self._lines: List[str] | None = None
+        self._sha256: str | None = None
+
+    @classmethod
+    def from_bytes(cls, content: bytes | bytearray | memoryview, path: Path) -> "SniffedFile":
+        """Wrap ``content`` without copying ``bytes`` or ``memoryview`` input."""
+        data: bytes | memoryview = content if isinstance(content, bytes) else memoryview(content).cast("B")
+        sniffed = cls(path, bytes(data[:PREFIX_BYTES]), complete=True)
+        sniffed._data = data
+        sniffed.in_memory = True
+        return sniffed
+
+    @classmethod
+    def open(cls, path: Path, prefix_bytes: int = PREFIX_BYTES) -> "SniffedFile":
+        with Path(path).open("rb") as handle:
+            prefix = handle.read(prefix_bytes)
+            complete = len(prefix) < prefix_bytes
+            if not complete and not handle.read(1):
+                complete = True
+        return cls(path, prefix, complete=complete)
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix.lower()
+
+    def data(self) -> bytes | memoryview:
+        """Full file content; only the bytes after the prefix are read again."""
+        if self._data is None:
+            with self.path.open("rb") as handle:
+                handle.seek(len(self.prefix))
+                self._data = self.prefix + handle.read()
+        return self._data
+
+    def buffer(self) -> io.BytesIO:
+        # BytesIO shares a bytes object until written to
+        return io.BytesIO(self.data())
+
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.data()).hexdigest()
+        return self._sha256
+
+    def text(self, errors: str = "strict") -> str:
+        """Decoded content with universal newlines, like ``Path.read_text``."""
+        text = str(self.data(), "utf-8", errors)
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def lines(self) -> List[str]:
+        """Strictly decoded lines, cached for every importer that asks."""
+        if self._lines is None:
+            self._lines = self.text().splitlines()
+        return list(self._lines)
+
+    # ------------------------------------------------------------------
+    def head_text(self) -> str:
+        """The prefix decoded leniently; a cut multi-byte character is dropped."""
+        return self.prefix.decode("utf-8", errors="ignore")
+
+    def head_lines(self) -> List[str]:
+        lines = self.head_text().splitlines()
+        if self._data is None and lines:
+            # The last line of a partial prefix is probably truncated
+            lines = lines[:-1]
+        return lines
+
+    def looks_binary(self) -> bool:
+        return b"\0" in self.prefix[:8192]
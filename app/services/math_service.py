@@ -7,10 +7,16 @@ from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
+from ..telemetry import timed
 from .spectrum import Spectrum
 from .units_service import UnitsService
 
 
+def _value_dtype(*spectra: Spectrum) -> np.dtype:
+    # Results are computed in float64 and stored at the widest input precision
+    return np.result_type(*(spectrum.value_dtype for spectrum in spectra))
+
+
 @dataclass
 class MathService:
     """Provide subtraction and ratio operations with provenance logging."""
@@ -18,6 +24,7 @@ class MathService:
     units_service: UnitsService
     epsilon: float = 1e-9
 
+    @timed("math.subtract")
     def subtract(self, a: Spectrum, b: Spectrum) -> Tuple[Spectrum | None, Dict[str, object]]:
         """Compute ``a - b`` if non-trivial, otherwise suppress result.
         
@@ -94,9 +101,12 @@ class MathService:
             metadata=metadata,
             uncertainty=result_sigma_converted,
             quality_flags=result_flags,
+            copy=False,
+            value_dtype=_value_dtype(a, b),
         )
         return spectrum, {'status': 'ok', 'operation': 'subtract', 'result_id': spectrum.id}
 
+    @timed("math.ratio")
     def ratio(self, a: Spectrum, b: Spectrum) -> Tuple[Spectrum, Dict[str, object]]:
         """Compute ``a / b`` with epsilon protection and uncertainty propagation.
         
@@ -177,6 +187,8 @@ class MathService:
             metadata=metadata,
             uncertainty=result_sigma_converted,
             quality_flags=result_flags,
+            copy=False,
+            value_dtype=_value_dtype(a, b),
         )
         return spectrum, {
             'status': 'ok',
@@ -185,6 +197,7 @@ class MathService:
             'masked_points': int(mask.sum()),
         }
 
+    @timed("math.normalized_difference")
     def normalized_difference(self, a: Spectrum, b: Spectrum) -> Tuple[Spectrum | None, Dict[str, object]]:
         """Compute the normalized difference (A - B) / (A + B).
 
@@ -287,6 +300,8 @@ class MathService:
             metadata=metadata,
             uncertainty=result_sigma_converted,
             quality_flags=result_flags,
+            copy=False,
+            value_dtype=_value_dtype(a, b),
         )
         return spectrum, {
             'status': 'ok',
@@ -447,6 +462,7 @@ class MathService:
         
         return a_flags_interp, b_flags_interp
 
+    @timed("math.average")
     def average(self, spectra: List[Spectrum], name: str | None = None) -> Tuple[Spectrum, Dict[str, object]]:
         """Compute average of multiple spectra by interpolating to common wavelength grid.
         
@@ -473,11 +489,13 @@ class MathService:
             }
             result = Spectrum.create(
                 name=result_name,
-                x=spec.x.copy(),
-                y=spec.y.copy(),
+                x=spec.x,
+                y=spec.y,
                 x_unit=spec.x_unit,
                 y_unit=spec.y_unit,
                 metadata=metadata,
+                copy=False,
+                value_dtype=spec.value_dtype,
             )
             return result, {'status': 'ok', 'operation': 'average', 'result_id': result.id, 'count': 1}
 
@@ -590,6 +608,8 @@ class MathService:
             metadata=metadata,
             uncertainty=result_sigma_converted,
             quality_flags=result_flags,
+            copy=False,
+            value_dtype=_value_dtype(*spectra),
         )
 
         return result, {
@@ -600,6 +620,7 @@ class MathService:
             'wavelength_range': [float(min_wl), float(max_wl)],
         }
 
+    @timed("math.smooth")
     def smooth(self, spec: Spectrum, window_size: int = 5, method: str = 'moving_average') -> Tuple[Spectrum, Dict[str, object]]:
         """Apply smoothing to a spectrum.
         
@@ -644,7 +665,7 @@ class MathService:
         # Propagate uncertainty (smoothing reduces uncertainty by ~1/√N)
         result_sigma = None
         if spec.uncertainty is not None:
-            result_sigma = spec.uncertainty / np.sqrt(window_size)
+            result_sigma = np.asarray(spec.uncertainty, dtype=np.float64) / np.sqrt(window_size)
         
         metadata: Dict[str, Any] = {
             'operation': {
@@ -688,7 +709,9 @@ class MathService:
             y_unit=spec.y_unit,
             metadata=metadata,
             uncertainty=result_sigma_converted,
-            quality_flags=spec.quality_flags.copy() if spec.quality_flags is not None else None,
+            quality_flags=spec.quality_flags,
+            copy=False,
+            value_dtype=spec.value_dtype,
         )
         
         return result, {
@@ -699,6 +722,7 @@ class MathService:
             'window_size': window_size,
         }
 
+    @timed("math.derivative")
     def derivative(self, spec: Spectrum, order: int = 1) -> Tuple[Spectrum, Dict[str, object]]:
         """Compute derivative of a spectrum.
         
@@ -749,13 +773,15 @@ class MathService:
         
         result = Spectrum.create(
             name=f"d{order}({spec.name})/d{spec.x_unit}{order if order > 1 else ''}",
-            x=spec.x.copy(),
+            x=spec.x,
             y=deriv,
             x_unit=spec.x_unit,
             y_unit=deriv_unit,
             metadata=metadata,
             uncertainty=result_sigma,
-            quality_flags=spec.quality_flags.copy() if spec.quality_flags is not None else None,
+            quality_flags=spec.quality_flags,
+            copy=False,
+            value_dtype=spec.value_dtype,
         )
         
         return result, {
@@ -765,6 +791,7 @@ class MathService:
             'order': order,
         }
 
+    @timed("math.integral")
     def integral(self, spec: Spectrum, method: str = 'cumulative') -> Tuple[Spectrum | None, Dict[str, object]]:
         """Compute integral of a spectrum.
         
@@ -787,11 +814,13 @@ class MathService:
             # Uncertainty propagation (cumulative, so uncertainties add in quadrature)
             result_sigma = None
             if spec.uncertainty is not None:
+                # Quadrature sums in float64 even for float32 spectra
+                sigma = np.asarray(spec.uncertainty, dtype=np.float64)
                 result_sigma = np.zeros_like(y_canon)
                 for i in range(1, len(y_canon)):
                     dx = x_canon[i] - x_canon[i-1]
                     # Propagate uncertainty assuming independent errors
-                    sigma_contrib = 0.5 * np.sqrt(spec.uncertainty[i]**2 + spec.uncertainty[i-1]**2) * dx
+                    sigma_contrib = 0.5 * np.sqrt(sigma[i]**2 + sigma[i-1]**2) * dx
                     result_sigma[i] = np.sqrt(result_sigma[i-1]**2 + sigma_contrib**2)
             
             integral_unit = f"{spec.y_unit}·{spec.x_unit}"
@@ -812,7 +841,7 @@ class MathService:
             
             # For integrals, we keep the result in canonical units (nm) for x
             # and use the compound unit for y (no unit conversion needed)
-            result_x = spec.x.copy()  # Keep original x values
+            result_x = spec.x  # Keep original x values (shared if mapped, copied otherwise)
             result_y = integral
             
             # Uncertainty stays in the same compound units (no conversion)
@@ -826,7 +855,9 @@ class MathService:
                 y_unit=integral_unit,
                 metadata=metadata,
                 uncertainty=result_sigma_converted,
-                quality_flags=spec.quality_flags.copy() if spec.quality_flags is not None else None,
+                quality_flags=spec.quality_flags,
+                copy=False,
+                value_dtype=spec.value_dtype,
             )
             
             return result, {
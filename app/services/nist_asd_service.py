@@ -4,12 +4,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-import importlib.util
 import math
 import re
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from app.services.line_list_cache import LineListCache
+from app.telemetry import timed
+from app.utils.lazy_imports import module_available
 
 # Global cache instance shared across all NIST queries
 _CACHE: Optional[LineListCache] = None
@@ -172,10 +173,7 @@ DEFAULT_UPPER_WAVELENGTH_NM = 750.0
 def dependencies_available() -> bool:
     """Return True if astroquery.nist and astropy.units are present without importing them."""
     try:
-        return (
-            importlib.util.find_spec("astroquery.nist") is not None
-            and importlib.util.find_spec("astropy.units") is not None
-        )
+        return module_available("astroquery.nist") and module_available("astropy.units")
     except Exception:
         return False
 
@@ -419,6 +417,7 @@ def _resolve_wavelength_unit(label: str) -> Tuple[Any, str]:
         return u.nm, "nm"
 
 
+@timed("nist.fetch_lines")
 def fetch_lines(
     identifier: str,
     *,
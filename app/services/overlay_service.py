@@ -8,6 +8,7 @@ from typing import Any, Dict, Iterable, List, Optional, cast
 import numpy as np
 
 from .spectrum import Spectrum
+from .spectrum_storage import abs_max, abs_trapezoid, envelope
 from .units_service import UnitsService
 from .line_shapes import LineShapeModel
 
@@ -46,7 +47,16 @@ class OverlayService:
         y_unit: str,
         *,
         normalization: str = "None",
+        max_points: int | None = None,
     ) -> List[Dict[str, object]]:
+        """Overlay-ready views of ``spectrum_ids`` in the requested units.
+
+        With ``max_points`` each longer spectrum is reduced to its min/max
+        envelope (about ``2 * max_points`` samples) before line shapes and unit
+        conversion, so memory-mapped products are read chunk by chunk and
+        never copied at full size. Normalisation scales are always computed
+        from the full data.
+        """
         views: List[Dict[str, object]] = []
         for sid in spectrum_ids:
             spectrum = self._spectra[sid]
@@ -57,8 +67,15 @@ class OverlayService:
                 spectrum.y_unit,
                 metadata=None,
             )
-            working_y, norm_meta = self._apply_normalization(canonical_x, canonical_y, normalization)
-            working_x = np.array(canonical_x, dtype=np.float64, copy=True)
+            scale, norm_meta = self._normalization_scale(canonical_x, canonical_y, normalization)
+            decimation: Optional[Dict[str, int]] = None
+            if max_points is not None and canonical_x.size > max_points:
+                points = int(canonical_x.size)
+                canonical_x, canonical_y = envelope(canonical_x, canonical_y, max_points)
+                decimation = {"points": points, "max_points": int(max_points), "kept": int(canonical_x.size)}
+            # to_canonical already returned private (or read-only mapped) arrays
+            working_x = canonical_x
+            working_y = canonical_y / scale if scale is not None else canonical_y
             raw_line_shapes = spectrum.metadata.get("line_shapes")
             line_shape_specs = cast(Optional[List[Dict[str, Any]]], raw_line_shapes if isinstance(raw_line_shapes, list) else None)
             line_shape_metadata: Optional[Dict[str, Any]] = None
@@ -89,6 +106,9 @@ class OverlayService:
             if conversion_meta:
                 metadata = dict(metadata)
                 metadata["display_conversions"] = dict(conversion_meta)
+            if decimation is not None:
+                metadata = dict(metadata)
+                metadata["decimation"] = decimation
             view: Dict[str, object] = {
                 "id": spectrum.id,
                 "name": spectrum.name,
@@ -97,7 +117,7 @@ class OverlayService:
                 "x_unit": x_unit,
                 "y_unit": y_unit,
                 "metadata": metadata,
-                "x_canonical": np.array(working_x, copy=True),
+                "x_canonical": working_x,
                 "y_canonical": working_y,
             }
             views.append(view)
@@ -110,29 +130,44 @@ class OverlayService:
         mode: str,
     ) -> tuple[np.ndarray, Optional[Dict[str, object]]]:
         data = np.asarray(canonical_y, dtype=np.float64)
-        x = np.asarray(canonical_x, dtype=np.float64)
-        if mode.lower() in {"none", "", "identity"}:
-            return data.copy(), None
+        scale, meta = self._normalization_scale(canonical_x, data, mode)
+        if scale is None:
+            return data.copy(), meta
+        return data / scale, meta
 
-        finite_mask = np.isfinite(data) & np.isfinite(x)
-        if not np.any(finite_mask):
-            return data.copy(), {"mode": mode, "applied": False, "reason": "no-finite-values"}
+    def _normalization_scale(
+        self,
+        canonical_x: np.ndarray,
+        canonical_y: np.ndarray,
+        mode: str,
+    ) -> tuple[Optional[float], Optional[Dict[str, object]]]:
+        """Divisor for ``mode`` (``None`` if not applied) and its metadata.
 
+        The reductions run chunk by chunk, so mapped spectra are scanned
+        without a full-size temporary.
+        """
         mode_lower = mode.lower()
+        if mode_lower in {"none", "", "identity"}:
+            return None, None
+
         if mode_lower == "max":
-            scale = float(np.nanmax(np.abs(data[finite_mask])))
+            scale = abs_max(canonical_y, canonical_x)
+            if np.isnan(scale):
+                return None, {"mode": mode, "applied": False, "reason": "no-finite-values"}
             if not np.isfinite(scale) or scale <= 0.0:
-                return data.copy(), {"mode": "max", "applied": False, "reason": "degenerate-scale"}
-            return data / scale, {"mode": "max", "applied": True, "scale": scale}
+                return None, {"mode": "max", "applied": False, "reason": "degenerate-scale"}
+            return scale, {"mode": "max", "applied": True, "scale": scale}
 
         if mode_lower == "area":
-            x_finite = x[finite_mask]
-            y_finite = np.abs(data[finite_mask])
-            if x_finite.size < 2:
-                return data.copy(), {"mode": "area", "applied": False, "reason": "insufficient-samples"}
-            area = float(np.trapezoid(y_finite, x_finite))
+            area, samples = abs_trapezoid(canonical_x, canonical_y)
+            if samples == 0:
+                return None, {"mode": mode, "applied": False, "reason": "no-finite-values"}
+            if samples < 2:
+                return None, {"mode": "area", "applied": False, "reason": "insufficient-samples"}
             if not np.isfinite(area) or area <= 0.0:
-                return data.copy(), {"mode": "area", "applied": False, "reason": "degenerate-area"}
-            return data / area, {"mode": "area", "applied": True, "scale": area, "basis": "abs-trapz"}
+                return None, {"mode": "area", "applied": False, "reason": "degenerate-area"}
+            return area, {"mode": "area", "applied": True, "scale": area, "basis": "abs-trapz"}
 
-        return data.copy(), {"mode": mode, "applied": False, "reason": "unknown-mode"}
+        if np.isnan(abs_max(canonical_y, canonical_x)):
+            return None, {"mode": mode, "applied": False, "reason": "no-finite-values"}
+        return None, {"mode": mode, "applied": False, "reason": "unknown-mode"}
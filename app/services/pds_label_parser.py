@@ -2,14 +2,21 @@
 
 Parses .lbl files that describe the structure of companion .tab files,
 extracting column definitions, target names, and metadata for proper ingestion.
+
+Labels are tokenised once by a single ODL scanner into an :class:`OdlNode`
+tree (nested ``OBJECT``/``GROUP`` blocks, pointers, ``<units>``). Trees are
+cached per file and keyed on modification time, so bulk imports that share
+labels or ``^STRUCTURE`` format files parse each of them only once.
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 
 @dataclass
@@ -42,6 +49,9 @@ class PDSLabel:
     columns: list[PDSColumn]
     rows: int
     row_bytes: int
+    interchange_format: str = "ASCII"
+    record_bytes: int = 0
+    table_offset: int = 0  # bytes from the start of ``data_file`` to row 1
     
     def get_wavelength_column(self) -> PDSColumn | None:
         """Return the wavelength column (prefer air wavelength over vacuum)."""
@@ -78,147 +88,320 @@ class PDSLabel:
         return targets
 
 
-def parse_pds_label(label_path: Path) -> PDSLabel | None:
-    """Parse a PDS3 .lbl file and return structured metadata.
-    
-    Returns None if the file is not a valid PDS3 label or cannot be parsed.
+@dataclass
+class OdlNode:
+    """One ``OBJECT``/``GROUP`` block (or the label root) of an ODL tree.
+
+    Attribute values keep the literal label text: quotes are removed,
+    ``{sets}`` and ``(sequences)`` become lists and a trailing ``<unit>`` is
+    stored separately in :attr:`units`. Keys are upper-cased. Cached trees
+    are shared between callers and must be treated as read-only.
+    """
+
+    kind: str  # "ROOT", "OBJECT" or "GROUP"
+    name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    units: dict[str, str] = field(default_factory=dict)
+    children: list["OdlNode"] = field(default_factory=list)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.attributes.get(key.upper(), default)
+
+    def walk(self) -> Iterator["OdlNode"]:
+        """This node and all nested blocks, depth first in label order."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def find(self, name: str) -> "OdlNode | None":
+        return next(iter(self.find_all(name)), None)
+
+    def find_all(self, name: str) -> list["OdlNode"]:
+        """Nested blocks (not this one) whose object name is ``name``."""
+        name = name.upper()
+        return [node for node in self.walk() if node is not self and node.name == name]
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<comment>/\*.*?(?:\*/|$))
+    | "(?P<string>[^"]*)"
+    | '(?P<symbol>[^']*)'
+    | <(?P<unit>[^>]*)>
+    | (?P<punct>[=(){},])
+    | (?P<word>(?:[^\s=(){},"'<>/]|/(?!\*))+)
+    """,
+    re.VERBOSE | re.MULTILINE,
+)
+_BLOCK_KEYS = {"OBJECT", "GROUP"}
+_END_BLOCK_KEYS = {"END_OBJECT", "END_GROUP"}
+_EQUALS = ("punct", "=")
+
+
+def parse_odl(text: str) -> OdlNode:
+    """Tokenise ODL ``text`` in one pass and build its object tree.
+
+    Parsing is lenient: stray tokens are skipped, unbalanced ``END_OBJECT``
+    statements are ignored and parsing stops at the ``END`` statement.
+    """
+    tokens: list[tuple[str, str]] = []
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        # Every alternative is a named group, so each match names its kind
+        assert kind is not None
+        if kind != "comment":
+            tokens.append((kind, match.group(kind)))
+    root = OdlNode("ROOT", "")
+    stack = [root]
+    pos = 0
+    count = len(tokens)
+    while pos < count:
+        kind, key = tokens[pos]
+        pos += 1
+        if kind != "word":
+            continue
+        key = key.upper()
+        if pos < count and tokens[pos] == _EQUALS:
+            value, unit, pos = _read_value(tokens, pos + 1)
+        elif key == "END":
+            break
+        elif key in _END_BLOCK_KEYS:
+            value, unit = None, None
+        else:
+            continue
+
+        if key in _BLOCK_KEYS:
+            node = OdlNode(key, (_text(value) or "").upper())
+            stack[-1].children.append(node)
+            stack.append(node)
+        elif key in _END_BLOCK_KEYS:
+            if len(stack) > 1:
+                stack.pop()
+        else:
+            stack[-1].attributes[key] = value
+            if unit:
+                stack[-1].units[key] = unit
+    return root
+
+
+def _read_value(tokens: list[tuple[str, str]], pos: int) -> tuple[Any, str | None, int]:
+    """Read one value starting at ``pos``; returns (value, unit, next position)."""
+    if pos >= len(tokens):
+        return None, None, pos
+    kind, text = tokens[pos]
+    if kind == "punct":
+        if text not in "({":
+            return None, None, pos
+        closing = ")" if text == "(" else "}"
+        items: list[Any] = []
+        unit = None
+        pos += 1
+        while pos < len(tokens):
+            kind, text = tokens[pos]
+            if kind == "punct" and text == closing:
+                pos += 1
+                break
+            if kind == "punct" and text == ",":
+                pos += 1
+                continue
+            if kind == "punct" and text not in "({":
+                break  # unterminated list; leave the rest to the statement loop
+            item, item_unit, pos = _read_value(tokens, pos)
+            items.append(item)
+            unit = item_unit or unit
+        return items, unit, pos
+    pos += 1
+    if kind == "unit":
+        return None, text.strip().upper(), pos
+    unit = None
+    if pos < len(tokens) and tokens[pos][0] == "unit":
+        unit = tokens[pos][1].strip().upper()
+        pos += 1
+    return text, unit, pos
+
+
+# ----------------------------------------------------------------------
+# Parsed-file cache: path -> (mtime_ns, size, tree)
+_ODL_CACHE: "OrderedDict[str, tuple[int, int, OdlNode]]" = OrderedDict()
+_ODL_CACHE_SIZE = 512
+_ODL_CACHE_LOCK = threading.Lock()
+
+
+def _reset_odl_cache() -> None:
+    """Testing helper to clear the in-process label cache."""
+
+    with _ODL_CACHE_LOCK:
+        _ODL_CACHE.clear()
+
+
+def load_odl(path: Path) -> OdlNode | None:
+    """Parse the ODL file at ``path``, reusing the tree while it is unchanged.
+
+    Returns None if the file cannot be read.
     """
-    if not label_path.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return None
-    
+    key = str(path.absolute())
+    with _ODL_CACHE_LOCK:
+        cached = _ODL_CACHE.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _ODL_CACHE.move_to_end(key)
+            return cached[2]
     try:
-        content = label_path.read_text(encoding="utf-8", errors="replace")
-    except Exception:
+        content = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
         return None
+    root = parse_odl(content)
+    with _ODL_CACHE_LOCK:
+        _ODL_CACHE[key] = (stat.st_mtime_ns, stat.st_size, root)
+        _ODL_CACHE.move_to_end(key)
+        while len(_ODL_CACHE) > _ODL_CACHE_SIZE:
+            _ODL_CACHE.popitem(last=False)
+    return root
+
+
+def parse_pds_label(label_path: Path) -> PDSLabel | None:
+    """Parse a PDS3 .lbl file and return structured metadata.
     
-    # Check for PDS3 marker
-    if "PDS_VERSION_ID" not in content or "PDS3" not in content:
+    Returns None if the file is not a valid PDS3 label or cannot be parsed.
+    The label tree comes from :func:`load_odl`, so re-importing a product
+    whose label has not changed skips tokenising.
+    """
+    root = load_odl(label_path)
+    if root is None or "PDS3" not in (_text(root.get("PDS_VERSION_ID")) or "").upper():
         return None
-    
-    # Extract basic metadata
-    version_id = _extract_value(content, "PDS_VERSION_ID") or "PDS3"
-    data_file = _extract_value(content, r'\^TABLE') or ""
-    data_file = data_file.strip('"')
-    
-    # Extract target names (can be a list)
-    target_raw = _extract_value(content, "TARGET_NAME") or ""
-    target_names = _parse_target_list(target_raw)
-    
-    instrument_name = _extract_value(content, "INSTRUMENT_NAME") or ""
-    instrument_host = _extract_value(content, "INSTRUMENT_HOST_NAME") or ""
-    start_time = _extract_value(content, "START_TIME")
-    stop_time = _extract_value(content, "STOP_TIME")
-    product_name = _extract_value(content, "PRODUCT_NAME") or ""
-    
-    # Extract NOTE field (may span multiple lines)
-    note = _extract_multiline_value(content, "NOTE")
-    
-    # Parse TABLE object - extract ROWS and ROW_BYTES from within TABLE block
-    table_match = re.search(r'OBJECT\s*=\s*TABLE\s*(.*?)\s*END_OBJECT\s*=\s*TABLE', 
-                           content, re.DOTALL | re.IGNORECASE)
-    if table_match:
-        table_block = table_match.group(1)
-        rows = int(_extract_value(table_block, "ROWS") or "0")
-        row_bytes = int(_extract_value(table_block, "ROW_BYTES") or "0")
+
+    version_id = _text(root.get("PDS_VERSION_ID")) or "PDS3"
+    record_bytes = _int(root.get("RECORD_BYTES"))
+    data_file, table_offset = _table_pointer(root, record_bytes)
+
+    # ROWS, ROW_BYTES and the columns come from the first TABLE object
+    table = root.find("TABLE")
+    if table is not None:
+        rows = _int(table.get("ROWS"))
+        row_bytes = _int(table.get("ROW_BYTES"))
+        interchange_format = (_text(table.get("INTERCHANGE_FORMAT")) or "ASCII").upper()
+        column_nodes = _column_nodes(table, label_path.parent)
     else:
         rows = 0
         row_bytes = 0
-    
-    # Parse COLUMN objects
-    columns = _parse_columns(content)
-    
+        interchange_format = "ASCII"
+        column_nodes = root.find_all("COLUMN")
+
+    # NOTE usually sits at the top level but some missions put it in TABLE
+    note = next((node.get("NOTE") for node in root.walk() if "NOTE" in node.attributes), None)
+
     return PDSLabel(
         version_id=version_id,
         data_file=data_file,
-        target_names=target_names,
-        instrument_name=instrument_name,
-        instrument_host=instrument_host,
-        start_time=start_time,
-        stop_time=stop_time,
-        product_name=product_name,
-        note=note,
-        columns=columns,
+        target_names=_target_list(root.get("TARGET_NAME")),
+        instrument_name=_text(root.get("INSTRUMENT_NAME")) or "",
+        instrument_host=_text(root.get("INSTRUMENT_HOST_NAME")) or "",
+        start_time=_text(root.get("START_TIME")),
+        stop_time=_text(root.get("STOP_TIME")),
+        product_name=_text(root.get("PRODUCT_NAME")) or "",
+        note=_text(note),
+        columns=_build_columns(column_nodes),
         rows=rows,
         row_bytes=row_bytes,
+        interchange_format=interchange_format,
+        record_bytes=record_bytes,
+        table_offset=table_offset,
     )
 
 
-def _extract_value(content: str, key: str) -> str | None:
-    """Extract a simple KEY = VALUE pair from PDS label content."""
-    # Match KEY = VALUE (handle quoted strings and unquoted values)
-    pattern = rf'{key}\s*=\s*([^\n]+)'
-    match = re.search(pattern, content)
-    if not match:
+def _text(value: Any) -> str | None:
+    """Scalar value as a single-line string (multi-line strings collapsed)."""
+    if value is None or isinstance(value, list):
         return None
-    value = match.group(1).strip()
-    # Remove trailing comments and clean up
-    value = value.split('/')[0].strip()  # Remove inline comments
-    value = value.strip('"').strip()
+    value = " ".join(str(value).split())
     return value if value else None
 
 
-def _extract_multiline_value(content: str, key: str) -> str | None:
-    """Extract a multiline quoted value like NOTE = \"...\"."""
-    pattern = rf'{key}\s*=\s*"([^"]*(?:\n[^"]*)*)"'
-    match = re.search(pattern, content, re.MULTILINE)
-    if not match:
-        return None
-    # Clean up the multiline string
-    value = match.group(1)
-    # Remove excessive whitespace while preserving structure
-    value = re.sub(r'\s+', ' ', value).strip()
-    return value if value else None
+def _int(value: Any, default: int = 0) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return default
 
 
-def _parse_target_list(target_raw: str) -> list[str]:
-    """Parse TARGET_NAME which can be single value or {A, B, C} list."""
-    target_raw = target_raw.strip()
-    if not target_raw:
-        return []
-    
-    # Check for curly brace list syntax
-    if target_raw.startswith('{') and target_raw.endswith('}'):
-        # Extract items between braces
-        inner = target_raw[1:-1]
-        targets = [t.strip().capitalize() for t in inner.split(',')]
-        return [t for t in targets if t]
-    
-    # Single target
-    return [target_raw.capitalize()] if target_raw else []
+def _table_pointer(root: OdlNode, record_bytes: int) -> tuple[str, int]:
+    """Split ``^TABLE`` into (file name, byte offset of the first row).
+
+    Handles ``"FILE.TAB"``, ``("FILE.TAB", 3)`` (1-based record),
+    ``("FILE.TAB", 1201 <BYTES>)`` and attached-label forms ``12``/``600 <BYTES>``.
+    """
+    value = root.get("^TABLE")
+    in_bytes = root.units.get("^TABLE") == "BYTES"
+    if isinstance(value, list):
+        name = str(value[0]).strip() if value else ""
+        position = value[1] if len(value) > 1 else None
+    elif value is not None and str(value).strip().isdigit():
+        name, position = "", value
+    else:
+        name, position = (str(value).strip() if value is not None else ""), None
+    start = _int(position, default=0) if position is not None else 0
+    if start <= 0:
+        return name, 0
+    if in_bytes:
+        return name, start - 1
+    return name, (start - 1) * record_bytes
+
+
+def _target_list(value: Any) -> list[str]:
+    """TARGET_NAME can be a single value or a {A, B, C} set."""
+    items = value if isinstance(value, list) else [value]
+    targets = (_text(item) for item in items)
+    return [target.capitalize() for target in targets if target]
 
 
-def _parse_columns(content: str) -> list[PDSColumn]:
-    """Extract all COLUMN objects from the PDS label."""
+def _column_nodes(table: OdlNode, label_dir: Path) -> list[OdlNode]:
+    """COLUMN objects of ``table``, including those in ``^STRUCTURE`` files."""
+    nodes = table.find_all("COLUMN")
+    for node in table.walk():
+        structure = _text(node.get("^STRUCTURE"))
+        if not structure:
+            continue
+        structure_path = _find_structure_file(label_dir, structure)
+        if structure_path is None:
+            continue
+        included = load_odl(structure_path)
+        if included is not None:
+            nodes.extend(included.find_all("COLUMN"))
+    return nodes
+
+
+def _find_structure_file(label_dir: Path, name: str) -> Path | None:
+    """Locate a format file next to the label or in a volume LABEL directory."""
+    directories = [label_dir] + [parent / sub for parent in label_dir.parents for sub in ("LABEL", "label")]
+    for directory in directories:
+        for candidate in dict.fromkeys((name, name.upper(), name.lower())):
+            path = directory / candidate
+            if path.is_file():
+                return path
+    return None
+
+
+def _build_columns(nodes: list[OdlNode]) -> list[PDSColumn]:
     columns = []
-    
-    # Find all OBJECT = COLUMN ... END_OBJECT = COLUMN blocks
-    column_pattern = r'OBJECT\s*=\s*COLUMN\s*(.*?)\s*END_OBJECT\s*=\s*COLUMN'
-    column_blocks = re.findall(column_pattern, content, re.DOTALL | re.IGNORECASE)
-    
-    for block in column_blocks:
+    for node in nodes:
         try:
-            name = _extract_value(block, "NAME") or "Unknown"
-            col_num = int(_extract_value(block, "COLUMN_NUMBER") or "0")
-            unit = _extract_value(block, "UNIT")
+            unit = _text(node.get("UNIT"))
             if unit and unit.upper() == "NULL":
                 unit = None
-            data_type = _extract_value(block, "DATA_TYPE") or "ASCII_REAL"
-            start_byte = int(_extract_value(block, "START_BYTE") or "1")
-            num_bytes = int(_extract_value(block, "BYTES") or "0")
-            fmt = _extract_value(block, "FORMAT") or ""
-            description = _extract_multiline_value(block, "DESCRIPTION") or ""
-            
             columns.append(PDSColumn(
-                name=name,
-                column_number=col_num,
+                name=_text(node.get("NAME")) or "Unknown",
+                column_number=int(node.get("COLUMN_NUMBER", "0")),
                 unit=unit,
-                data_type=data_type,
-                start_byte=start_byte,
-                bytes=num_bytes,
-                format=fmt,
-                description=description,
+                data_type=_text(node.get("DATA_TYPE")) or "ASCII_REAL",
+                start_byte=int(node.get("START_BYTE", "1")),
+                bytes=int(node.get("BYTES", "0")),
+                format=_text(node.get("FORMAT")) or "",
+                description=_text(node.get("DESCRIPTION")) or "",
             ))
-        except (ValueError, AttributeError):
+        except (TypeError, ValueError):
             # Skip malformed column definitions
             continue
     
@@ -2,20 +2,50 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from importlib import metadata
+import io
+import os
 from pathlib import Path
 import csv
 import shutil
-from typing import Iterable, Dict, Any, List, Optional, Callable
+from typing import Iterable, Dict, Any, List, Mapping, Optional, Callable, Sequence, TypeVar
 import hashlib
 import json
 
 import numpy as np
 
+from . import binary_bundle
 from .spectrum import Spectrum
 
+# Rows formatted per write; bounds memory for million-point spectra
+CSV_CHUNK_ROWS = 1 << 16
+_CSV_BUFFER_BYTES = 1 << 20
+_ROW_END = "\r\n"  # csv.writer's default line terminator
+# Large reads let hashlib release the GIL so hashing threads overlap
+_HASH_BLOCK_BYTES = 1 << 20
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _format_floats(values: np.ndarray) -> List[str]:
+    """Format a column the way ``csv.writer`` formats ``float(value)``."""
+    return list(map(repr, np.asarray(values, dtype=np.float64).tolist()))
+
+
+def _csv_fields(fields: Sequence[object]) -> str:
+    """Quote constant cells once with ``csv.writer`` rules, without the row end."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="").writerow(fields)
+    return buffer.getvalue()
+
+
+def _open_csv(path: Path) -> io.TextIOWrapper:
+    return path.open('w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES)
+
 
 @dataclass
 class ProvenanceService:
@@ -23,6 +53,7 @@ class ProvenanceService:
 
     app_name: str = "SpectraApp"
     app_version: str = "0.1.0"
+    max_workers: Optional[int] = None
 
     def create_manifest(
         self,
@@ -33,7 +64,8 @@ class ProvenanceService:
         """Create a provenance manifest for the provided spectra."""
 
         spectra_list = list(spectra)
-        source_entries = [self._source_entry(spec) for spec in spectra_list]
+        digests = self._source_digests(spectra_list)
+        source_entries = [self._source_entry(spec, digests) for spec in spectra_list]
         manifest = {
             "version": "1.0",
             "app": self._app_metadata(),
@@ -59,8 +91,14 @@ class ProvenanceService:
         csv_path: Path | None = None,
         png_path: Path | None = None,
         png_writer: Callable[[Path], None] | None = None,
+        binary_formats: Sequence[str] = (),
     ) -> Dict[str, Any]:
-        """Create a provenance bundle containing manifest, data, and plot artefacts."""
+        """Create a provenance bundle containing manifest, data, and plot artefacts.
+
+        ``binary_formats`` (``"npz"``, ``"parquet"``, ``"hdf5"``) additionally
+        writes the spectra as columnar binary files next to the manifest; see
+        :meth:`write_binary_bundle`.
+        """
 
         spectra_list = list(spectra)
         manifest_path = Path(manifest_path)
@@ -77,6 +115,16 @@ class ProvenanceService:
 
         self._annotate_manifest_sources(manifest, base_dir, per_spectrum_csvs, copied_sources)
 
+        binary_paths = {
+            fmt: manifest_path.with_suffix(binary_bundle.BINARY_SUFFIXES[fmt]) for fmt in binary_formats
+        }
+        if binary_paths:
+            manifest["binary_exports"] = {
+                fmt: str(path.relative_to(base_dir)) for fmt, path in binary_paths.items()
+            }
+        for fmt, path in binary_paths.items():
+            self.write_binary_bundle(path, spectra_list, fmt=fmt, manifest=manifest)
+
         self.save_manifest(manifest, manifest_path)
 
         csv_file = Path(csv_path) if csv_path is not None else manifest_path.with_suffix('.csv')
@@ -97,6 +145,7 @@ class ProvenanceService:
             spectra_list,
             per_spectrum_csvs,
             copied_sources,
+            binary_paths,
         )
 
         return {
@@ -107,8 +156,32 @@ class ProvenanceService:
             "log_path": log_path,
             "spectra_dir": spectra_dir if per_spectrum_csvs else None,
             "sources_dir": sources_dir if copied_sources else None,
+            "binary_paths": binary_paths,
         }
 
+    def write_binary_bundle(
+        self,
+        path: Path,
+        spectra: Iterable[Spectrum],
+        *,
+        fmt: str | None = None,
+        manifest: Dict[str, Any] | None = None,
+    ) -> Path:
+        """Write spectra, uncertainties, flags and provenance as one binary file.
+
+        ``fmt`` is ``"npz"`` (always available), ``"parquet"`` (needs
+        ``pyarrow``) or ``"hdf5"`` (needs ``h5py``); by default it follows
+        the suffix of ``path``. The file re-imports through
+        :class:`DataIngestService` with parents, transforms and ``manifest``.
+        """
+
+        spectra_list = list(spectra)
+        if not spectra_list:
+            raise ValueError("No spectra supplied for binary export")
+        if manifest is None:
+            manifest = self.create_manifest(spectra_list)
+        return binary_bundle.write_bundle(Path(path), spectra_list, manifest, fmt)
+
     # ------------------------------------------------------------------
     def _write_csv(self, path: Path, spectra: Iterable[Spectrum]) -> None:
         """Write a combined CSV where wavelength/intensity lead each row.
@@ -122,31 +195,22 @@ class ProvenanceService:
 
         path.parent.mkdir(parents=True, exist_ok=True)
         spectra_list = list(spectra)
-        with path.open('w', newline='', encoding='utf-8') as handle:
-            writer = csv.writer(handle)
-            writer.writerow(
-                [
-                    'wavelength_nm',
-                    'intensity',
-                    'spectrum_id',
-                    'spectrum_name',
-                    'point_index',
-                    'x_unit',
-                    'y_unit',
-                ]
-            )
+        header = ['wavelength_nm', 'intensity', 'spectrum_id', 'spectrum_name', 'point_index', 'x_unit', 'y_unit']
+        with _open_csv(path) as handle:
+            handle.write(_csv_fields(header) + _ROW_END)
             for spectrum in spectra_list:
-                for idx, (x_val, y_val) in enumerate(zip(spectrum.x, spectrum.y)):
-                    writer.writerow(
-                        [
-                            float(x_val),
-                            float(y_val),
-                            spectrum.id,
-                            spectrum.name,
-                            idx,
-                            spectrum.x_unit,
-                            spectrum.y_unit,
-                        ]
+                middle = f",{_csv_fields([spectrum.id, spectrum.name])},"
+                tail = f",{_csv_fields([spectrum.x_unit, spectrum.y_unit])}{_ROW_END}"
+                length = min(len(spectrum.x), len(spectrum.y))
+                for start in range(0, length, CSV_CHUNK_ROWS):
+                    stop = min(start + CSV_CHUNK_ROWS, length)
+                    xs = _format_floats(spectrum.x[start:stop])
+                    ys = _format_floats(spectrum.y[start:stop])
+                    handle.write(
+                        "".join(
+                            f"{x},{y}{middle}{idx}{tail}"
+                            for idx, x, y in zip(range(start, stop), xs, ys)
+                        )
                     )
 
     def write_wide_csv(self, path: Path, spectra: Iterable[Spectrum]) -> Path:
@@ -162,7 +226,7 @@ class ProvenanceService:
             raise ValueError("No spectra supplied for wide CSV export")
 
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open('w', encoding='utf-8', newline='') as handle:
+        with _open_csv(path) as handle:
             handle.write('# spectra-wide-v1\n')
             for spectrum in spectra_list:
                 meta = {
@@ -173,23 +237,28 @@ class ProvenanceService:
                 }
                 handle.write(f"# member {json.dumps(meta, ensure_ascii=False)}\n")
 
-            writer = csv.writer(handle)
             header: List[str] = []
             for spectrum in spectra_list:
                 header.append(f"wavelength_nm::{spectrum.id}")
                 header.append(f"intensity::{spectrum.id}")
-            writer.writerow(header)
-
-            max_length = max(len(spec.x) for spec in spectra_list)
-            for row_index in range(max_length):
-                row: List[object] = []
-                for spectrum in spectra_list:
-                    if row_index < len(spectrum.x):
-                        row.append(float(spectrum.x[row_index]))
-                        row.append(float(spectrum.y[row_index]))
-                    else:
-                        row.extend(["", ""])
-                writer.writerow(row)
+            handle.write(_csv_fields(header) + _ROW_END)
+
+            # Spectra shorter than the longest one leave their cells empty
+            lengths = [min(len(spec.x), len(spec.y)) for spec in spectra_list]
+            max_length = max(lengths)
+            for start in range(0, max_length, CSV_CHUNK_ROWS):
+                stop = min(start + CSV_CHUNK_ROWS, max_length)
+                columns: List[Sequence[str]] = []
+                for spectrum, length in zip(spectra_list, lengths):
+                    filled = max(0, min(stop, length) - start)
+                    cells: List[str] = []
+                    if filled:
+                        xs = _format_floats(spectrum.x[start : start + filled])
+                        ys = _format_floats(spectrum.y[start : start + filled])
+                        cells = [f"{x},{y}" for x, y in zip(xs, ys)]
+                    cells.extend([","] * (stop - start - filled))
+                    columns.append(cells)
+                handle.write("".join(",".join(row) + _ROW_END for row in zip(*columns)))
 
         return path
 
@@ -249,11 +318,14 @@ class ProvenanceService:
         composite_counts = counts[mask]
 
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open('w', encoding='utf-8', newline='') as handle:
-            writer = csv.writer(handle)
-            writer.writerow(['wavelength_nm', 'intensity', 'source_count'])
-            for x_val, y_val, count in zip(composite_x, composite_y, composite_counts):
-                writer.writerow([float(x_val), float(y_val), int(count)])
+        with _open_csv(path) as handle:
+            handle.write(_csv_fields(['wavelength_nm', 'intensity', 'source_count']) + _ROW_END)
+            for start in range(0, composite_x.size, CSV_CHUNK_ROWS):
+                rows = slice(start, start + CSV_CHUNK_ROWS)
+                xs = _format_floats(composite_x[rows])
+                ys = _format_floats(composite_y[rows])
+                counts_text = map(str, composite_counts[rows].tolist())
+                handle.write("".join(f"{x},{y},{n}{_ROW_END}" for x, y, n in zip(xs, ys, counts_text)))
 
         return path
 
@@ -263,32 +335,107 @@ class ProvenanceService:
         if not spectra_list:
             return mapping
         directory.mkdir(parents=True, exist_ok=True)
-        for spectrum in spectra_list:
-            filename = f"{self._slugify(spectrum.name)}-{spectrum.id}.csv"
-            dest = directory / filename
-            with dest.open('w', newline='', encoding='utf-8') as handle:
-                writer = csv.writer(handle)
-                writer.writerow(['wavelength_nm', 'intensity'])
-                for x_val, y_val in zip(spectrum.x, spectrum.y):
-                    writer.writerow([float(x_val), float(y_val)])
+        targets = [
+            (spectrum, directory / f"{self._slugify(spectrum.name)}-{spectrum.id}.csv")
+            for spectrum in spectra_list
+        ]
+        self._map_parallel(lambda target: self._write_xy_csv(*target), targets)
+        for spectrum, dest in targets:
             mapping[spectrum.id] = dest
         return mapping
 
+    def _write_xy_csv(self, spectrum: Spectrum, path: Path) -> None:
+        length = min(len(spectrum.x), len(spectrum.y))
+        with _open_csv(path) as handle:
+            handle.write(_csv_fields(['wavelength_nm', 'intensity']) + _ROW_END)
+            for start in range(0, length, CSV_CHUNK_ROWS):
+                stop = min(start + CSV_CHUNK_ROWS, length)
+                xs = _format_floats(spectrum.x[start:stop])
+                ys = _format_floats(spectrum.y[start:stop])
+                handle.write("".join(f"{x},{y}{_ROW_END}" for x, y in zip(xs, ys)))
+
+    def _map_parallel(self, func: Callable[[_T], _R], items: Sequence[_T]) -> List[_R]:
+        """``map`` over a thread pool for the export's file-bound steps.
+
+        CSV formatting holds the GIL, but file writes, copies and large
+        hash updates release it, so threads beyond the core count still
+        keep the disk busy.
+        """
+        workers = self.max_workers or min(len(items), (os.cpu_count() or 1) + 4)
+        if workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+                return list(pool.map(func, items))
+        return [func(item) for item in items]
+
     def _copy_sources(self, directory: Path, spectra: Iterable[Spectrum]) -> Dict[str, Path]:
-        mapping: Dict[str, Path] = {}
+        targets: List[tuple[str, Path, Path]] = []
         for spectrum in spectra:
             src = spectrum.source_path
             if src is None or not src.exists():
                 continue
-            if not directory.exists():
-                directory.mkdir(parents=True, exist_ok=True)
             filename = f"{self._slugify(spectrum.name)}-{spectrum.id}{src.suffix}"
-            dest = directory / filename
-            shutil.copy2(src, dest)
-            mapping[spectrum.id] = dest
-        return mapping
-
-    def _source_entry(self, spectrum: Spectrum) -> Dict[str, Any]:
+            targets.append((spectrum.id, src, directory / filename))
+        if targets:
+            directory.mkdir(parents=True, exist_ok=True)
+        self._map_parallel(lambda target: self._link_or_copy(target[1], target[2]), targets)
+        return {spec_id: dest for spec_id, _src, dest in targets}
+
+    @staticmethod
+    def _link_or_copy(src: Path, dest: Path) -> None:
+        """Hard-link ``src`` into the bundle when on the same volume, else copy it."""
+        if dest.exists():
+            if os.path.samefile(src, dest):
+                return
+            dest.unlink()
+        try:
+            if src.stat().st_dev == dest.parent.stat().st_dev:
+                os.link(src, dest)
+                return
+        except OSError:
+            # Filesystems without hard links (FAT, some network shares)
+            pass
+        shutil.copy2(src, dest)
+
+    def _source_digests(self, spectra: Sequence[Spectrum]) -> Dict[Path, str]:
+        """SHA-256 of every source file, hashing only those not already known.
+
+        Digests recorded by :class:`LocalStore` at ingest are reused when the
+        record still names this file at its current size; the rest are hashed
+        in parallel.
+        """
+        digests: Dict[Path, str] = {}
+        pending: List[Path] = []
+        for spectrum in spectra:
+            path = spectrum.source_path
+            if path is None or path in digests or path in pending or not path.exists():
+                continue
+            recorded = self._recorded_sha256(spectrum.metadata, path)
+            if recorded is not None:
+                digests[path] = recorded
+            else:
+                pending.append(path)
+        digests.update(zip(pending, self._map_parallel(self._sha256, pending)))
+        return digests
+
+    @staticmethod
+    def _recorded_sha256(metadata: Mapping[str, Any], path: Path) -> str | None:
+        record = metadata.get("cache_record")
+        if not isinstance(record, Mapping) or not isinstance(record.get("sha256"), str):
+            return None
+        # Metadata carried over from another file, or a source edited or
+        # replaced since ingest, no longer matches its record
+        if record.get("original_path") != str(path):
+            return None
+        stat = path.stat()
+        if (
+            record.get("bytes") != stat.st_size
+            or record.get("mtime_ns") != stat.st_mtime_ns
+            or record.get("inode") != stat.st_ino
+        ):
+            return None
+        return record["sha256"]
+
+    def _source_entry(self, spectrum: Spectrum, digests: Mapping[Path, str] | None = None) -> Dict[str, Any]:
         entry: Dict[str, Any] = {
             "id": spectrum.id,
             "name": spectrum.name,
@@ -304,7 +451,7 @@ class ProvenanceService:
             entry.update({
                 "path": str(spectrum.source_path),
                 "size_bytes": spectrum.source_path.stat().st_size,
-                "checksum_sha256": self._sha256(spectrum.source_path),
+                "checksum_sha256": (digests or {}).get(spectrum.source_path) or self._sha256(spectrum.source_path),
             })
         return entry
 
@@ -344,7 +491,7 @@ class ProvenanceService:
     def _sha256(self, path: Path) -> str:
         h = hashlib.sha256()
         with path.open('rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
+            for chunk in iter(lambda: f.read(_HASH_BLOCK_BYTES), b''):
                 h.update(chunk)
         return h.hexdigest()
 
@@ -356,6 +503,7 @@ class ProvenanceService:
         spectra: Iterable[Spectrum],
         per_spectrum_csvs: Dict[str, Path],
         copied_sources: Dict[str, Path],
+        binary_paths: Dict[str, Path] | None = None,
     ) -> None:
         timestamp = datetime.now(timezone.utc).isoformat()
         spectra_list = list(spectra)
@@ -373,6 +521,8 @@ class ProvenanceService:
                 )
         lines.append(f"[{timestamp}] Manifest saved -> {manifest_path.name}")
         lines.append(f"[{timestamp}] Aggregate CSV saved -> {combined_csv.name}")
+        for fmt, path in (binary_paths or {}).items():
+            lines.append(f"[{timestamp}] Binary bundle ({fmt}) saved -> {path.name}")
         log_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
 
     def _slugify(self, name: str) -> str:
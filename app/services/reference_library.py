@@ -130,6 +130,23 @@ class ReferenceLibrary:
         return entries
 
     # ------------------------------------------------------------------
+    def preload(self) -> int:
+        """Parse every bundled dataset into the cache and return how many loaded.
+
+        Safe to call from a worker thread at startup so the first visit to the
+        Reference tab does not pay for JSON parsing. Missing or malformed files
+        are skipped here and will raise on first real access as before.
+        """
+
+        loaded = 0
+        for path in (self.paths.hydrogen, self.paths.ir_groups, self.paths.jwst_targets, self.paths.line_shapes):
+            try:
+                self._load_json(path)
+            except (OSError, ValueError):
+                continue
+            loaded += 1
+        return loaded
+
     def _load_json(self, path: Path) -> Mapping[str, Any]:
         key = str(path)
         if key not in self._cache:
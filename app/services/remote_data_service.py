@@ -16,24 +16,23 @@ from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence
 from urllib.parse import quote, urlencode, urlparse
 
+from ..telemetry import span
 from . import nist_asd_service
 from .store import LocalStore
 
-try:  # Optional dependency – requests may be absent in minimal installs
-    import requests
-except Exception:  # pragma: no cover - handled by dependency guards
-    requests = None  # type: ignore[assignment]
-
-# Lazy import sentinels for heavy optional dependencies; avoid importing at module load
+# Lazy import sentinels for heavy optional dependencies; avoid importing at module load.
+# ``requests`` may also be absent in minimal installs.
+requests = None  # type: ignore[assignment]
 astroquery_mast = None  # type: ignore[assignment]
 astroquery_nexsci = None  # type: ignore[assignment]
 
-# Probe availability without importing the modules eagerly
-import importlib.util as _importlib_util
+# Probe availability without importing the modules eagerly (find_spec on a
+# dotted name would import the parent package, e.g. all of astroquery)
+from app.utils.lazy_imports import module_available as _module_available
 
 def _spec_exists(module_name: str) -> bool:
     try:
-        return _importlib_util.find_spec(module_name) is not None
+        return _module_available(module_name)
     except Exception:
         return False
 
@@ -42,6 +41,15 @@ def _has_module(module_name: str) -> bool:
     return _spec_exists(module_name)
 
 
+def _import_requests():
+    global requests
+    if requests is None:
+        import requests as _requests  # type: ignore
+
+        requests = _requests
+    return requests
+
+
 def _import_mast():
     global astroquery_mast
     if astroquery_mast is None:
@@ -643,13 +651,17 @@ class RemoteDataService:
         *,
         include_imaging: bool = False,
     ) -> List[RemoteRecord]:
-        if provider == self.PROVIDER_NIST:
-            return self._search_nist(query)
-        if provider == self.PROVIDER_MAST:
-            return self._search_mast(query, include_imaging=include_imaging)
-        if provider == self.PROVIDER_EXOSYSTEMS:
-            return self._search_exosystems(query, include_imaging=include_imaging)
-        raise ValueError(f"Unsupported provider: {provider}")
+        with span("remote.search", provider=provider) as timing:
+            if provider == self.PROVIDER_NIST:
+                records = self._search_nist(query)
+            elif provider == self.PROVIDER_MAST:
+                records = self._search_mast(query, include_imaging=include_imaging)
+            elif provider == self.PROVIDER_EXOSYSTEMS:
+                records = self._search_exosystems(query, include_imaging=include_imaging)
+            else:
+                raise ValueError(f"Unsupported provider: {provider}")
+            timing.set(results=len(records))
+        return records
 
     # ------------------------------------------------------------------
     def download(
@@ -668,7 +680,8 @@ class RemoteDataService:
                 cached=True,
             )
 
-        fetch_path = self._fetch_remote(record, progress=progress)
+        with span("remote.download", provider=record.provider):
+            fetch_path = self._fetch_remote(record, progress=progress)
 
         x_unit, y_unit = record.resolved_units()
         remote_metadata = {
@@ -1660,12 +1673,12 @@ class RemoteDataService:
     def _ensure_session(self):
         if self.session is not None:
             return self.session
-        if requests is None:
+        if not self._has_requests():
             raise RuntimeError(
                 "The 'requests' package is required for remote downloads. "
                 "Install it via `pip install -r requirements.txt` or `poetry install --with remote`."
             )
-        self.session = requests.Session()
+        self.session = _import_requests().Session()
         return self.session
 
     def _ensure_mast(self):
@@ -1688,7 +1701,7 @@ class RemoteDataService:
         return self._has_mast_support() and self._has_exoplanet_archive() and self._has_requests()
 
     def _has_requests(self) -> bool:
-        return requests is not None or self.session is not None
+        return requests is not None or self.session is not None or _has_module("requests")
 
     def _has_astroquery(self) -> bool:
         return _has_module("astroquery.mast") and _has_pandas()
@@ -0,0 +1,261 @@
+"""Binary workspace sessions: every loaded spectrum plus the view state.
+
+A session is a single zip archive:
+
+``manifest.json``
+    Format tag, spectrum records (ids, units, metadata, provenance
+    ``parents``/``transforms``) and an opaque ``ui`` mapping the window fills
+    with colours, visibility, normalisation and calibration settings.
+``arrays/<spectrum id>/<field>.npy``
+    ``x``, ``y``, ``uncertainty`` and ``quality_flags`` as ``.npy`` members,
+    stored uncompressed and 64-byte aligned.
+
+:class:`SessionWriter` streams each spectrum's arrays into the archive as it
+is added and writes the manifest last, so saving never builds the session in
+memory. :func:`load_session` reads the manifest and maps the array members
+straight out of the archive read-only, so restoring is independent of data
+size and samples are paged in when first drawn or computed on.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import struct
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Mapping
+import zipfile
+
+import numpy as np
+
+from .spectrum import Spectrum
+from .spectrum_storage import ARRAY_FIELDS
+
+SESSION_FORMAT = "spectra-session-v1"
+MANIFEST_NAME = "manifest.json"
+
+# Local file header fields before the name, and the zip64 sizes extra block
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_ZIP64_EXTRA_SIZE = 20
+# Private extra-field id used only to pad member data to _ALIGNMENT
+_PADDING_EXTRA_ID = 0xD935
+_ALIGNMENT = 64
+
+
+@dataclass
+class SessionState:
+    """Spectra restored from a session and the window state saved with them."""
+
+    spectra: List[Spectrum]
+    ui: Dict[str, Any] = field(default_factory=dict)
+    created: str | None = None
+
+
+class SessionWriter:
+    """Write a session archive one spectrum at a time.
+
+    Output goes to ``<path>.part`` and replaces ``path`` only on a clean
+    :meth:`close`, so a failed save never clobbers the previous session.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._partial = self.path.with_name(self.path.name + ".part")
+        self._zip = zipfile.ZipFile(self._partial, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+        self._records: List[Dict[str, Any]] = []
+        self._closed = False
+
+    def __enter__(self) -> "SessionWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._closed:
+            return
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, spectrum: Spectrum) -> None:
+        arrays: Dict[str, str] = {}
+        for name in ARRAY_FIELDS:
+            values = getattr(spectrum, name)
+            if values is None:
+                continue
+            member = f"arrays/{spectrum.id}/{name}.npy"
+            self._write_array(member, np.asarray(values))
+            arrays[name] = member
+        self._records.append(
+            {
+                "id": spectrum.id,
+                "name": spectrum.name,
+                "x_unit": spectrum.x_unit,
+                "y_unit": spectrum.y_unit,
+                "metadata": _jsonable(spectrum.metadata),
+                "source_path": str(spectrum.source_path) if spectrum.source_path is not None else None,
+                "parents": list(spectrum.parents),
+                "transforms": _jsonable(list(spectrum.transforms)),
+                "arrays": arrays,
+            }
+        )
+
+    def close(self, ui: Mapping[str, Any] | None = None) -> Path:
+        manifest = {
+            "format": SESSION_FORMAT,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "spectra": self._records,
+            "ui": _jsonable(dict(ui or {})),
+        }
+        self._zip.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False))
+        self._zip.close()
+        self._closed = True
+        os.replace(self._partial, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._zip.close()
+        self._closed = True
+        self._partial.unlink(missing_ok=True)
+
+    def _write_array(self, member: str, values: np.ndarray) -> None:
+        info = zipfile.ZipInfo(member, date_time=datetime.now().timetuple()[:6])
+        info.compress_type = zipfile.ZIP_STORED
+        # Pad the local header so the array data (after the 64-byte multiple
+        # .npy header) starts on an aligned offset and maps without copies
+        assert self._zip.fp is not None
+        header_end = self._zip.fp.tell() + _LOCAL_HEADER.size + len(member.encode("utf-8")) + _ZIP64_EXTRA_SIZE
+        padding = (-(header_end + 4)) % _ALIGNMENT
+        info.extra = struct.pack("<HH", _PADDING_EXTRA_ID, padding) + b"\0" * padding
+        with self._zip.open(info, "w", force_zip64=True) as handle:
+            np.lib.format.write_array(handle, values, allow_pickle=False)
+
+
+def save_session(
+    path: Path,
+    spectra: Iterable[Spectrum],
+    ui: Mapping[str, Any] | None = None,
+) -> Path:
+    """Write ``spectra`` and the ``ui`` state to the session archive ``path``."""
+    with SessionWriter(path) as writer:
+        for spectrum in spectra:
+            writer.add(spectrum)
+        return writer.close(ui)
+
+
+def load_session(path: Path) -> SessionState:
+    """Restore a session; arrays are memory-mapped from the archive, not read."""
+    path = Path(path)
+    with zipfile.ZipFile(path) as archive:
+        try:
+            manifest = json.loads(archive.read(MANIFEST_NAME))
+        except KeyError as exc:
+            raise ValueError(f"{path.name} is not a session file (no {MANIFEST_NAME})") from exc
+        if manifest.get("format") != SESSION_FORMAT:
+            raise ValueError(f"Unsupported session format: {manifest.get('format')!r}")
+        mapping = np.memmap(path, dtype=np.uint8, mode="r") if path.stat().st_size else None
+        spectra: List[Spectrum] = []
+        for record in manifest.get("spectra", []):
+            arrays = {
+                name: _member_array(archive, mapping, member)
+                for name, member in dict(record.get("arrays") or {}).items()
+            }
+            source_path = record.get("source_path")
+            spectra.append(
+                Spectrum(
+                    id=str(record["id"]),
+                    name=str(record.get("name", "")),
+                    x=arrays["x"],
+                    y=arrays["y"],
+                    x_unit=str(record.get("x_unit", "nm")),
+                    y_unit=str(record.get("y_unit", "absorbance")),
+                    metadata=dict(record.get("metadata") or {}),
+                    source_path=Path(source_path) if source_path else None,
+                    parents=tuple(record.get("parents") or ()),
+                    transforms=tuple(record.get("transforms") or ()),
+                    uncertainty=arrays.get("uncertainty"),
+                    quality_flags=arrays.get("quality_flags"),
+                )
+            )
+    return SessionState(spectra=spectra, ui=dict(manifest.get("ui") or {}), created=manifest.get("created"))
+
+
+def detach_session_arrays(spectra: Iterable[Spectrum], path: Path) -> List[Spectrum]:
+    """``spectra`` with any arrays mapped from the session file ``path`` copied into memory.
+
+    Use before saving over the session the spectra were loaded from: saving
+    replaces the archive, which Windows refuses while it is mapped, and the
+    old mapping would otherwise keep the replaced file alive.
+    """
+    target = os.path.realpath(path)
+    detached: List[Spectrum] = []
+    for spectrum in spectra:
+        copies: Dict[str, Any] = {}
+        for name in ARRAY_FIELDS:
+            values = getattr(spectrum, name)
+            if values is not None and _mapped_file(values) == target:
+                copy = np.array(values)
+                copy.flags.writeable = False
+                copies[name] = copy
+        detached.append(replace(spectrum, **copies) if copies else spectrum)
+    return detached
+
+
+def _mapped_file(array: np.ndarray) -> str | None:
+    base: Any = array
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap) and base.filename is not None:
+            return os.path.realpath(base.filename)
+        base = base.base
+    return None
+
+
+def _member_array(archive: zipfile.ZipFile, mapping: np.memmap | None, member: str) -> np.ndarray:
+    info = archive.getinfo(member)
+    with archive.open(info) as handle:
+        version = np.lib.format.read_magic(handle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+        header_size = handle.tell()
+    if info.compress_type != zipfile.ZIP_STORED or mapping is None or dtype.hasobject or 0 in shape:
+        # Compressed or empty members cannot be mapped; read them whole
+        with archive.open(info) as handle:
+            array = np.lib.format.read_array(handle, allow_pickle=False)
+        array.flags.writeable = False
+        return array
+    local = _LOCAL_HEADER.unpack(mapping[info.header_offset : info.header_offset + _LOCAL_HEADER.size].tobytes())
+    data_offset = info.header_offset + _LOCAL_HEADER.size + local[-2] + local[-1] + header_size
+    return np.ndarray(
+        shape,
+        dtype=dtype,
+        buffer=mapping,
+        offset=data_offset,
+        order="F" if fortran_order else "C",
+    )
+
+
+def _jsonable(value: Any) -> Any:
+    """Best-effort conversion of metadata into JSON types."""
+    if isinstance(value, Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value)
@@ -9,10 +9,43 @@ import uuid
 
 import numpy as np
 
+from .spectrum_storage import is_memory_mapped, is_read_only_mapping
+
+
+# Storage precisions accepted for y/uncertainty; x is always float64
+VALUE_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
 
 def _blank_metadata() -> Dict[str, Any]:
     return {}
 
+
+def _value_dtype(dtype: Any) -> np.dtype:
+    resolved = np.dtype(np.float64 if dtype is None else dtype)
+    if resolved not in VALUE_DTYPES:
+        raise ValueError(f"Unsupported spectrum value dtype: {resolved}")
+    return resolved
+
+
+def _own(values: Any, dtype: Any, copy: bool = True) -> np.ndarray:
+    """Read-only array for a spectrum field.
+
+    With ``copy`` the spectrum gets a private copy; without it the caller
+    hands ``values`` over and it is adopted as is unless a dtype conversion
+    is needed. Read-only memory-mapped arrays are always shared. The result
+    is marked read-only either way, which is what makes sharing safe.
+    """
+    if is_read_only_mapping(values) and values.dtype == dtype:
+        return values
+    array = np.array(values, dtype=dtype, copy=True) if copy else np.asarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def _own_optional(values: Any, dtype: Any, copy: bool = True) -> np.ndarray | None:
+    return _own(values, dtype, copy) if values is not None else None
+
+
 if TYPE_CHECKING:  # pragma: no cover - used only for typing
     from .units_service import UnitsService
 
@@ -61,21 +94,51 @@ class Spectrum:
         source_path: Path | None = None,
         uncertainty: np.ndarray | None = None,
         quality_flags: np.ndarray | None = None,
+        copy: bool = True,
+        value_dtype: Any = None,
     ) -> "Spectrum":
-        """Factory that records the provided units without conversion."""
+        """Factory that records the provided units without conversion.
+
+        Arrays are copied unless ``copy=False``, in which case the caller
+        transfers ownership and they are taken by reference. Either way they
+        end up read-only. Read-only memory-mapped arrays (see
+        :meth:`LocalStore.map_spectrum`) stay on disk and are always shared.
+
+        ``y`` and ``uncertainty`` are stored as ``value_dtype`` (float64 by
+        default, or float32 to halve the footprint of large spectra).
+        """
+        value_dtype = _value_dtype(value_dtype)
         return Spectrum(
             id=str(uuid.uuid4()),
             name=name,
-            x=np.array(x, dtype=np.float64, copy=True),
-            y=np.array(y, dtype=np.float64, copy=True),
+            x=_own(x, np.float64, copy),
+            y=_own(y, value_dtype, copy),
             x_unit=str(x_unit),
             y_unit=str(y_unit),
             metadata=dict(metadata or {}),
             source_path=source_path,
-            uncertainty=np.array(uncertainty, dtype=np.float64, copy=True) if uncertainty is not None else None,
-            quality_flags=np.array(quality_flags, dtype=np.uint8, copy=True) if quality_flags is not None else None,
+            uncertainty=_own_optional(uncertainty, value_dtype, copy),
+            quality_flags=_own_optional(quality_flags, np.uint8, copy),
         )
 
+    @property
+    def is_memory_mapped(self) -> bool:
+        """True if any array is backed by a file rather than held in RAM."""
+        return any(is_memory_mapped(array) for array in self._arrays())
+
+    @property
+    def value_dtype(self) -> np.dtype:
+        """Storage precision of ``y`` and ``uncertainty``."""
+        return self.y.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays())
+
+    def _arrays(self) -> Tuple[np.ndarray, ...]:
+        arrays = (self.x, self.y, self.uncertainty, self.quality_flags)
+        return tuple(array for array in arrays if array is not None)
+
     # ------------------------------------------------------------------
     def view(self, units_service: "UnitsService", x_unit: str, y_unit: str) -> Dict[str, Any]:
         """Return a view of the spectrum converted to the requested units."""
@@ -105,23 +168,39 @@ class Spectrum:
         y_unit: str | None = None,
         uncertainty: np.ndarray | None = None,
         quality_flags: np.ndarray | None = None,
+        copy: bool = True,
+        value_dtype: Any = None,
     ) -> "Spectrum":
-        """Create a derived spectrum preserving provenance and selected units."""
+        """Create a derived spectrum preserving provenance and selected units.
+
+        Arrays of this spectrum passed through unchanged (typically ``x``
+        when the grid is kept) are shared rather than copied; the others
+        follow the ownership rules of :meth:`create`. The value precision
+        defaults to this spectrum's.
+        """
+        value_dtype = _value_dtype(self.value_dtype if value_dtype is None else value_dtype)
         return Spectrum(
             id=str(uuid.uuid4()),
             name=name,
-            x=np.array(x, dtype=np.float64, copy=True),
-            y=np.array(y, dtype=np.float64, copy=True),
+            x=self._inherit(x, self.x, np.float64, copy),
+            y=self._inherit(y, self.y, value_dtype, copy),
             x_unit=x_unit if x_unit is not None else self.x_unit,
             y_unit=y_unit if y_unit is not None else self.y_unit,
             metadata=dict(self.metadata),
             source_path=self.source_path,
             parents=self.parents + (self.id,),
             transforms=self.transforms + (transform,),
-            uncertainty=np.array(uncertainty, dtype=np.float64, copy=True) if uncertainty is not None else None,
-            quality_flags=np.array(quality_flags, dtype=np.uint8, copy=True) if quality_flags is not None else None,
+            uncertainty=self._inherit(uncertainty, self.uncertainty, value_dtype, copy),
+            quality_flags=self._inherit(quality_flags, self.quality_flags, np.uint8, copy),
         )
 
+    @staticmethod
+    def _inherit(values: Any, parent: np.ndarray | None, dtype: Any, copy: bool) -> Any:
+        # The parent's arrays are already read-only, so handing them on is safe
+        if values is not None and values is parent and parent.dtype == dtype:
+            return parent
+        return _own_optional(values, dtype, copy)
+
     def with_metadata(self, **metadata_updates: Any) -> "Spectrum":
         """Return a new spectrum with metadata updated in a copy."""
         new_metadata = dict(self.metadata)
@@ -0,0 +1,177 @@
+"""Memory-mapped backing for spectra larger than RAM.
+
+:meth:`LocalStore.map_spectrum` writes a spectrum's arrays as ``.npy`` files
+under ``<data_dir>/arrays/<spectrum id>/`` and returns an equivalent
+:class:`Spectrum` whose arrays are read-only ``np.memmap`` views of them, so
+the operating system pages samples in on access instead of every product
+living in RAM. ``Spectrum.create``/``derive`` keep such arrays as they are:
+a derived spectrum shares the mapped arrays it does not change and only the
+arrays a transform produces are held in memory.
+
+The reductions below walk arrays ``CHUNK_SIZE`` samples at a time so that
+normalisation and plot decimation of a mapped spectrum never materialise a
+full-size temporary.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Mapping
+
+import numpy as np
+
+# Samples per chunk (8 MiB of float64)
+CHUNK_SIZE = 1 << 20
+
+ARRAY_FIELDS = ("x", "y", "uncertainty", "quality_flags")
+
+
+def is_memory_mapped(array: object) -> bool:
+    """True if ``array`` is, or is a view of, a memory-mapped file."""
+    base = array
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            return True
+        base = base.base
+    return isinstance(base, mmap.mmap)
+
+
+def is_read_only_mapping(array: object) -> bool:
+    """Mapped arrays that can be shared instead of copied."""
+    return isinstance(array, np.ndarray) and not array.flags.writeable and is_memory_mapped(array)
+
+
+def iter_chunks(length: int, chunk_size: int | None = None) -> Iterator[slice]:
+    chunk_size = chunk_size or CHUNK_SIZE
+    for start in range(0, length, chunk_size):
+        yield slice(start, min(start + chunk_size, length))
+
+
+def write_arrays(
+    directory: Path,
+    arrays: Mapping[str, np.ndarray | None],
+    *,
+    dtypes: Mapping[str, np.dtype] | None = None,
+    converters: Mapping[str, Callable[[np.ndarray], np.ndarray]] | None = None,
+) -> Dict[str, Path]:
+    """Write each array to ``<name>.npy`` in ``directory``, chunk by chunk.
+
+    ``dtypes`` and ``converters`` (e.g. a unit conversion) are applied one
+    chunk at a time, so the source arrays never need a full-size converted
+    copy before they reach the disk.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, Path] = {}
+    for name, array in arrays.items():
+        if array is None:
+            continue
+        path = directory / f"{name}.npy"
+        partial = directory / f"{name}.npy.part"
+        array = np.asarray(array)
+        dtype = np.dtype((dtypes or {}).get(name, array.dtype))
+        convert = (converters or {}).get(name)
+        if array.size == 0:
+            with partial.open("wb") as handle:
+                np.save(handle, array.astype(dtype))
+        else:
+            target = np.lib.format.open_memmap(partial, mode="w+", dtype=dtype, shape=array.shape)
+            for chunk in iter_chunks(len(array)):
+                target[chunk] = array[chunk] if convert is None else convert(array[chunk])
+            target.flush()
+            del target
+        os.replace(partial, path)
+        written[name] = path
+    return written
+
+
+def open_arrays(directory: Path) -> Dict[str, np.ndarray]:
+    """Map every array written by :func:`write_arrays` read-only."""
+    arrays: Dict[str, np.ndarray] = {}
+    for name in ARRAY_FIELDS:
+        path = directory / f"{name}.npy"
+        if not path.exists():
+            continue
+        try:
+            arrays[name] = np.load(path, mmap_mode="r")
+        except ValueError:
+            # Empty arrays cannot be mapped
+            arrays[name] = np.load(path)
+    return arrays
+
+
+# ----------------------------------------------------------------------
+def abs_max(y: np.ndarray, x: np.ndarray | None = None) -> float:
+    """Largest ``|y|`` over samples where ``y`` (and ``x``) are finite; NaN if none."""
+    best = np.nan
+    for chunk in iter_chunks(len(y)):
+        values = np.abs(np.asarray(y[chunk], dtype=np.float64))
+        mask = np.isfinite(values)
+        if x is not None:
+            mask &= np.isfinite(x[chunk])
+        if mask.any():
+            best = np.fmax(best, float(values[mask].max()))
+    return float(best)
+
+
+def abs_trapezoid(x: np.ndarray, y: np.ndarray) -> tuple[float, int]:
+    """Trapezoid area under ``|y|`` over the finite samples, and their count.
+
+    Matches ``np.trapezoid(abs(y[m]), x[m])`` with ``m`` the finite mask; the
+    segment joining the last sample of one chunk to the first of the next is
+    carried over explicitly.
+    """
+    area = 0.0
+    count = 0
+    previous: tuple[float, float] | None = None
+    for chunk in iter_chunks(len(y)):
+        xs = np.asarray(x[chunk], dtype=np.float64)
+        ys = np.abs(np.asarray(y[chunk], dtype=np.float64))
+        mask = np.isfinite(xs) & np.isfinite(ys)
+        xs = xs[mask]
+        ys = ys[mask]
+        if xs.size == 0:
+            continue
+        if previous is not None:
+            area += (xs[0] - previous[0]) * (ys[0] + previous[1]) / 2.0
+        if xs.size > 1:
+            area += float(np.trapezoid(ys, xs))
+        previous = (float(xs[-1]), float(ys[-1]))
+        count += xs.size
+    return float(area), count
+
+
+def envelope(x: np.ndarray, y: np.ndarray, max_points: int) -> tuple[np.ndarray, np.ndarray]:
+    """Min/max decimation to about ``2 * max_points`` samples.
+
+    Each bin of ``ceil(n / max_points)`` samples becomes its minimum and
+    maximum at the bin's first ``x`` so peaks survive; leftover samples are
+    kept as they are. Short inputs are returned unchanged.
+    """
+    n = len(x)
+    if max_points <= 0 or n <= max_points:
+        return x, y
+    step = int(np.ceil(n / max_points))
+    if step <= 1:
+        return x, y
+    trim = n - (n % step)
+    bins = trim // step
+    x_out = np.empty(bins * 2 + (n - trim), dtype=x.dtype)
+    y_out = np.empty(x_out.size, dtype=y.dtype)
+    # Chunks hold whole bins so no bin straddles two reads
+    chunk_bins = max(1, CHUNK_SIZE // step)
+    for start_bin in range(0, bins, chunk_bins):
+        stop_bin = min(start_bin + chunk_bins, bins)
+        rows = slice(start_bin * step, stop_bin * step)
+        block = np.asarray(y[rows]).reshape(-1, step)
+        out = slice(start_bin * 2, stop_bin * 2)
+        x_out[out][0::2] = x[rows][::step]
+        x_out[out][1::2] = x[rows][::step]
+        with np.errstate(invalid="ignore"):
+            y_out[out][0::2] = np.fmin.reduce(block, axis=1)
+            y_out[out][1::2] = np.fmax.reduce(block, axis=1)
+    if trim < n:
+        x_out[bins * 2 :] = x[trim:]
+        y_out[bins * 2 :] = y[trim:]
+    return x_out, y_out
@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 import hashlib
 import json
@@ -12,7 +12,12 @@ from pathlib import Path
 import shutil
 import time
 import sys
-from typing import Any, Callable, Dict, Mapping, MutableMapping
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, MutableMapping
+
+from .spectrum_storage import open_arrays, write_arrays
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .spectrum import Spectrum
 
 
 _INDEX_TEMPLATE: Dict[str, Any] = {"version": 1, "items": {}}
@@ -75,10 +80,27 @@ class LocalStore:
         source: Mapping[str, Any] | None = None,
         manifest_path: Path | None = None,
         alias: str | None = None,
+        content: bytes | memoryview | None = None,
+        sha256: str | None = None,
     ) -> Dict[str, Any]:
+        """Copy ``source_path`` into the store and index it by checksum.
+
+        When the caller already holds the file in memory, pass it as
+        ``content`` (with its ``sha256`` if known): the bytes are written
+        straight into the store and ``source_path`` only names the original.
+        """
         source_path = Path(source_path)
-        stored_path = self._copy_into_store(source_path, alias=alias)
-        checksum = self._sha256(stored_path)
+        # Stat before hashing so an edit racing the copy can only make the
+        # record look stale, never vouch for a checksum of older content.
+        # In-memory content never came from ``source_path``: whatever a file
+        # of that name holds is unrelated, so nothing on disk is vouched for
+        source_stat: os.stat_result | None = None
+        if content is None:
+            try:
+                source_stat = source_path.stat()
+            except OSError:
+                source_stat = None
+        stored_path, checksum = self._copy_into_store(source_path, alias=alias, content=content, checksum=sha256)
 
         index = self.load_index()
         items: MutableMapping[str, Any] = index.setdefault("items", {})  # type: ignore[assignment]
@@ -114,6 +136,11 @@ class LocalStore:
                 "updated": self._timestamp(),
             }
         )
+        if source_stat is not None:
+            entry.update({"mtime_ns": source_stat.st_mtime_ns, "inode": source_stat.st_ino})
+        else:
+            entry.pop("mtime_ns", None)
+            entry.pop("inode", None)
         if manifest_path is not None:
             entry["manifest_path"] = str(manifest_path)
         items[checksum] = entry
@@ -123,14 +150,121 @@ class LocalStore:
     def list_entries(self) -> Dict[str, Any]:
         return self.load_index().get("items", {})
 
+    def map_spectrum(self, spectrum: "Spectrum") -> "Spectrum":
+        """Move ``spectrum``'s arrays into the store and memory-map them.
+
+        The returned spectrum keeps the same id and provenance, but its
+        arrays are read-only views of ``arrays/<id>/*.npy`` and are paged
+        in from disk on access. Already mapped spectra are returned as is.
+        """
+        if spectrum.is_memory_mapped:
+            return spectrum
+        arrays = self.map_arrays(
+            spectrum.id,
+            spectrum.name,
+            {
+                "x": spectrum.x,
+                "y": spectrum.y,
+                "uncertainty": spectrum.uncertainty,
+                "quality_flags": spectrum.quality_flags,
+            },
+        )
+        return replace(
+            spectrum,
+            x=arrays["x"],
+            y=arrays["y"],
+            uncertainty=arrays.get("uncertainty"),
+            quality_flags=arrays.get("quality_flags"),
+        )
+
+    def map_arrays(
+        self,
+        spectrum_id: str,
+        name: str,
+        arrays: Mapping[str, Any],
+        *,
+        dtypes: Mapping[str, Any] | None = None,
+        converters: Mapping[str, Callable[[Any], Any]] | None = None,
+    ) -> Dict[str, Any]:
+        """Write arrays for ``spectrum_id`` under ``arrays/<id>`` and map them.
+
+        Values are cast (``dtypes``) and converted (``converters``) chunk by
+        chunk while they are written, so an importer's arrays go straight to
+        disk without a full-size converted copy in RAM first.
+        """
+        directory = self.data_dir / "arrays" / spectrum_id
+        write_arrays(directory, arrays, dtypes=dtypes, converters=converters)
+        mapped = open_arrays(directory)
+        index = self.load_index()
+        arrays_index: MutableMapping[str, Any] = index.setdefault("arrays", {})  # type: ignore[assignment]
+        arrays_index[spectrum_id] = {
+            "name": name,
+            "directory": str(directory),
+            "points": int(mapped["x"].size),
+            "bytes": sum(int(array.nbytes) for array in mapped.values()),
+            "created": self._timestamp(),
+        }
+        self.save_index(index)
+        return mapped
+
+    def release_arrays(self, spectrum_id: str) -> bool:
+        """Drop the mapped arrays of ``spectrum_id`` and their index entry.
+
+        Call once the spectrum is no longer loaded. Files that are still
+        mapped elsewhere (Windows refuses to delete them) are left for
+        :meth:`prune_arrays`.
+        """
+        index = self.load_index()
+        arrays_index = index.get("arrays")
+        entry = arrays_index.pop(spectrum_id, None) if isinstance(arrays_index, dict) else None
+        if entry is not None:
+            self.save_index(index)
+        directory = self.data_dir / "arrays" / spectrum_id
+        existed = directory.exists()
+        shutil.rmtree(directory, ignore_errors=True)
+        return entry is not None or existed
+
+    def prune_arrays(self) -> int:
+        """Remove ``arrays/<id>`` directories without an index entry, and vice versa.
+
+        Returns the number of directories removed.
+        """
+        index = self.load_index()
+        arrays_index = index.get("arrays")
+        indexed: Dict[str, Any] = arrays_index if isinstance(arrays_index, dict) else {}
+        root = self.data_dir / "arrays"
+        removed = 0
+        if root.is_dir():
+            for directory in root.iterdir():
+                if directory.is_dir() and directory.name not in indexed:
+                    shutil.rmtree(directory, ignore_errors=True)
+                    removed += not directory.exists()
+        missing = [key for key in indexed if not (root / key).is_dir()]
+        for key in missing:
+            del indexed[key]
+        if missing:
+            self.save_index(index)
+        return removed
+
     # ------------------------------------------------------------------
-    def _copy_into_store(self, source_path: Path, alias: str | None = None) -> Path:
-        checksum = self._sha256(source_path)
+    def _copy_into_store(
+        self,
+        source_path: Path,
+        alias: str | None = None,
+        *,
+        content: bytes | memoryview | None = None,
+        checksum: str | None = None,
+    ) -> tuple[Path, str]:
+        if checksum is None:
+            checksum = hashlib.sha256(content).hexdigest() if content is not None else self._sha256(source_path)
         target_dir = self.data_dir / "files" / checksum[:2]
         target_dir.mkdir(parents=True, exist_ok=True)
         filename = alias or source_path.name
         target_path = target_dir / filename
-        if not target_path.exists():
+        if content is not None:
+            if not target_path.exists():
+                target_path.write_bytes(content)
+        elif not target_path.exists():
             try:
                 shutil.copy2(source_path, target_path)
             except PermissionError:
@@ -141,7 +275,7 @@ class LocalStore:
                     shutil.copy2(source_path, target_path)
                 except PermissionError:
                     shutil.copyfile(source_path, target_path)
-        return target_path
+        return target_path, checksum
 
     @staticmethod
     def _sha256(path: Path) -> str:
@@ -14,6 +14,8 @@ from typing import Any, Dict, Tuple, TYPE_CHECKING
 
 import numpy as np
 
+from ..telemetry import timed
+
 if TYPE_CHECKING:
     from .spectrum import Spectrum
 else:
@@ -28,6 +30,12 @@ class UnitError(ValueError):
     """Raised when an unsupported unit is encountered."""
 
 
+def _unchanged(data: np.ndarray) -> np.ndarray:
+    # Spectrum arrays are read-only (and may be memory-mapped), so an identity
+    # conversion can hand them back instead of copying
+    return data if not data.flags.writeable else data.copy()
+
+
 @dataclass
 class UnitsService:
     """Perform conversions between spectral units without mutating inputs."""
@@ -40,6 +48,7 @@ class UnitsService:
 
         return self.convert_arrays(spectrum.x, spectrum.y, spectrum.x_unit, spectrum.y_unit, x_unit, y_unit)
 
+    @timed("units.convert_arrays")
     def convert_arrays(
         self,
         x: np.ndarray,
@@ -56,12 +65,15 @@ class UnitsService:
         src_y = self._normalise_y_unit(src_y_unit)
         dst_y = self._normalise_y_unit(dst_y_unit)
 
-        canonical_x = self._to_canonical_wavelength(np.asarray(x, dtype=self.float_dtype), src_x)
+        canonical_x = self._to_canonical_wavelength(self._working(x), src_x)
         intensity_meta: Dict[str, Any] = {}
-        canonical_y = self._to_canonical_intensity(np.asarray(y, dtype=self.float_dtype), src_y, intensity_meta)
+        canonical_y = self._to_canonical_intensity(self._working(y), src_y, intensity_meta)
 
         converted_x = self._from_canonical_wavelength(canonical_x, dst_x)
         converted_y = self._from_canonical_intensity(canonical_y, dst_y)
+        if getattr(y, "dtype", None) == np.float32:
+            # Computed in float64, handed back in the caller's storage precision
+            converted_y = converted_y.astype(np.float32)
 
         metadata: Dict[str, Any] = {}
         # Always include source units for traceability, even when no numeric conversion occurs
@@ -119,8 +131,8 @@ class UnitsService:
         source_units = canon_metadata.setdefault("source_units", {})
         source_units.update({"x": self._normalise_x_unit(x_unit), "y": self._normalise_y_unit(y_unit)})
 
-        canonical_x = self._to_canonical_wavelength(np.asarray(x, dtype=self.float_dtype), x_unit)
-        canonical_y = self._to_canonical_intensity(np.asarray(y, dtype=self.float_dtype), y_unit, canon_metadata)
+        canonical_x = self._to_canonical_wavelength(self._working(x), x_unit)
+        canonical_y = self._to_canonical_intensity(self._working(y), y_unit, canon_metadata)
         return canonical_x, canonical_y, canon_metadata
 
     def normalise_x_unit(self, unit: str) -> str:
@@ -133,11 +145,23 @@ class UnitsService:
 
         return self._normalise_y_unit(unit)
 
+    def _working(self, values: Any) -> np.ndarray:
+        """``values`` in the working precision (float64 unless configured).
+
+        Float32 spectra are upcast here so inversions and log transforms run
+        in full precision. The upcast is already a private copy, so it is
+        marked read-only and identity conversions return it as is.
+        """
+        array = np.asarray(values, dtype=self.float_dtype)
+        if array.flags.writeable and not np.may_share_memory(array, values):
+            array.flags.writeable = False
+        return array
+
     # --- Wavelength helpers ---------------------------------------------
     def _to_canonical_wavelength(self, data: np.ndarray, src: str) -> np.ndarray:
         unit = self._normalise_x_unit(src)
         if unit == "nm":
-            return data.copy()
+            return _unchanged(data)
         if unit in {"um", "µm"}:
             return data * 1e3
         if unit in {"angstrom", "å", "Å"}:
@@ -196,7 +220,7 @@ class UnitsService:
         unit = self._normalise_y_unit(src)
         meta = metadata if metadata is not None else None
         if unit in {"absorbance", "a10"}:
-            return data.copy()
+            return _unchanged(data)
         if unit in {"transmittance", "t"}:
             if meta is not None:
                 meta.setdefault("intensity_conversion", {})
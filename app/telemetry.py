@@ -0,0 +1,270 @@
+"""Span timing for Spectra's hot paths.
+
+Wrap work in ``with span("ingest.read", importer="CsvImporter"):`` or decorate
+a function with ``@timed("math.average")``. Every finished span feeds a
+per-name histogram (count, total, min/max and log2 buckets for percentiles)
+and, up to a bounded number, a timeline event for Chrome's trace viewer.
+
+Telemetry is off by default and costs one attribute check per span when
+disabled. Like ``SPECTRA_LOG_LEVEL`` it is controlled by environment
+variables:
+
+- SPECTRA_TELEMETRY: ``1``/``on``/``json`` records timings and writes a JSON
+  summary at exit; ``chrome``/``trace`` also writes a Chrome trace
+  (open it at chrome://tracing or https://ui.perfetto.dev).
+- SPECTRA_TELEMETRY_FILE: summary path (default
+  ``<SPECTRA_LOG_DIR or exports/logs>/telemetry.json``). The trace goes next
+  to it with a ``.trace.json`` suffix.
+
+Call :func:`configure` to toggle it at runtime (tests, benchmarks, a debug
+menu) and :meth:`Telemetry.export_json` /
+:meth:`Telemetry.export_chrome_trace` to write results on demand.
+"""
+from __future__ import annotations
+
+import atexit
+from collections import deque
+from dataclasses import dataclass, field
+import functools
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, TypeVar
+
+from .constants import DEFAULT_LOG_DIR
+
+ENV_TOGGLE = "SPECTRA_TELEMETRY"
+ENV_OUTPUT = "SPECTRA_TELEMETRY_FILE"
+# Timeline events kept for Chrome traces; histograms are unbounded in count
+MAX_TRACE_EVENTS = 100_000
+
+_ON_VALUES = {"1", "true", "yes", "on", "json"}
+_TRACE_VALUES = {"chrome", "trace"}
+
+logger = logging.getLogger("spectra.telemetry")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Histogram:
+    """Running timing statistics for one span name (durations in seconds)."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+    # bucket b holds durations in [2**(b-1), 2**b) microseconds; bucket 0 is < 1 µs
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        micros = seconds * 1e6
+        bucket = 0 if micros < 1.0 else int(math.floor(math.log2(micros))) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Approximate the ``q`` quantile (0..1) as the upper edge of its bucket."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.max, (2.0**bucket) / 1e6)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "min_s": self.min if self.count else 0.0,
+            "max_s": self.max,
+            "p50_s": self.percentile(0.50),
+            "p95_s": self.percentile(0.95),
+            "p99_s": self.percentile(0.99),
+            "buckets_us": {str(2**b if b else 1): n for b, n in sorted(self.buckets.items())},
+        }
+
+
+class _NullSpan:
+    """Shared no-op returned while telemetry is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def set(self, **attrs: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_telemetry", "name", "attrs", "_start")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]) -> None:
+        self._telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        self._start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = getattr(exc_type, "__name__", str(exc_type))
+        self._telemetry._record(self.name, self._start, end, self.attrs)
+
+    def set(self, **attrs: Any) -> None:
+        """Attach attributes discovered inside the span (e.g. a row count)."""
+        self.attrs.update(attrs)
+
+
+class Telemetry:
+    """Collects span timings; one process-wide instance lives in :data:`TELEMETRY`."""
+
+    def __init__(self, enabled: bool = False, *, trace: bool = False) -> None:
+        self.enabled = enabled
+        self.trace = trace
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=MAX_TRACE_EVENTS)
+        self._origin = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    def span(self, name: str, **attrs: Any) -> Any:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    def timed(self, name: str | None = None) -> Callable[[F], F]:
+        """Decorator form of :meth:`span`; defaults to ``module.qualname``."""
+
+        def _decorator(func: F) -> F:
+            span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def _wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name, {}):
+                    return func(*args, **kwargs)
+
+            return _wrapper  # type: ignore[return-value]
+
+        return _decorator
+
+    def _record(self, name: str, start: float, end: float, attrs: Mapping[str, Any]) -> None:
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.add(end - start)
+            self._events.append(
+                {
+                    "name": name,
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "tid": threading.get_ident(),
+                    "args": dict(attrs),
+                }
+            )
+
+    # ------------------------------------------------------------------
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._events.clear()
+            self._origin = time.perf_counter()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: hist.as_dict() for name, hist in sorted(self._histograms.items())}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Complete ("X") events in the Chrome trace-event JSON format."""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {"ph": "X", "pid": pid, "cat": event["name"].split(".", 1)[0], **event}
+                for event in self._events
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_json(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"pid": os.getpid(), "spans": self.summary()}
+        path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+        return path
+
+    def export_chrome_trace(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str), encoding="utf-8")
+        return path
+
+
+def _default_output() -> Path:
+    explicit = os.environ.get(ENV_OUTPUT)
+    if explicit:
+        return Path(explicit)
+    log_dir = os.environ.get("SPECTRA_LOG_DIR")
+    return (Path(log_dir) if log_dir else DEFAULT_LOG_DIR) / "telemetry.json"
+
+
+def _export_at_exit() -> None:
+    if not TELEMETRY.enabled or not TELEMETRY.summary():
+        return
+    try:
+        summary_path = TELEMETRY.export_json(_default_output())
+        logger.info("Telemetry summary written to %s", summary_path)
+        if TELEMETRY.trace:
+            trace_path = TELEMETRY.export_chrome_trace(summary_path.with_suffix(".trace.json"))
+            logger.info("Telemetry trace written to %s", trace_path)
+    except Exception:  # pragma: no cover - never fail interpreter shutdown
+        logger.exception("Failed to export telemetry")
+
+
+def configure(enabled: bool, *, trace: Optional[bool] = None) -> Telemetry:
+    """Turn telemetry on or off at runtime and return the global instance."""
+    TELEMETRY.enabled = enabled
+    if trace is not None:
+        TELEMETRY.trace = trace
+    return TELEMETRY
+
+
+_toggle = os.environ.get(ENV_TOGGLE, "").strip().lower()
+TELEMETRY = Telemetry(enabled=_toggle in _ON_VALUES | _TRACE_VALUES, trace=_toggle in _TRACE_VALUES)
+atexit.register(_export_at_exit)
+
+# Module-level shorthands used throughout the services and UI
+span = TELEMETRY.span
+timed = TELEMETRY.timed
+
+
+def summary() -> Dict[str, Dict[str, Any]]:
+    return TELEMETRY.summary()
+
+
+def top_spans(limit: int = 10) -> List[tuple[str, Dict[str, Any]]]:
+    """Span names ordered by total time, for quick log/console reports."""
+    return sorted(TELEMETRY.summary().items(), key=lambda item: item[1]["total_s"], reverse=True)[:limit]
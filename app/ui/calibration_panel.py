@@ -83,6 +83,23 @@ class CalibrationPanel(QtWidgets.QWidget):
         # Keep enable state in sync
         self.enable_fwhm.toggled.connect(self.fwhm_spin.setEnabled)
 
+    def set_config(self, config: dict) -> None:
+        """Show ``config`` (same keys as the signal payload) and emit it once."""
+        target = config.get("target_fwhm")
+        controls = (self.enable_fwhm, self.fwhm_spin, self.rv_spin, self.frame_combo)
+        for control in controls:
+            control.blockSignals(True)
+        try:
+            self.enable_fwhm.setChecked(target is not None)
+            self.fwhm_spin.setEnabled(target is not None)
+            self.fwhm_spin.setValue(float(target or 0.0))
+            self.rv_spin.setValue(float(config.get("rv_kms", 0.0) or 0.0))
+            self.frame_combo.setCurrentText(str(config.get("frame") or "observer"))
+        finally:
+            for control in controls:
+                control.blockSignals(False)
+        self._on_changed()
+
     def _on_changed(self) -> None:
         target = float(self.fwhm_spin.value()) if self.enable_fwhm.isChecked() else None
         payload = {
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Tuple
+
 from app.qt_compat import get_qt
+from app.services.binary_bundle import available_formats
 
 QtCore, QtGui, QtWidgets, _ = get_qt()
 
@@ -15,6 +18,7 @@ class ExportCenterOptions:
     plot_png: bool
     plot_svg: bool
     plot_csv: bool
+    binary_formats: Tuple[str, ...] = ()
 
 
 class ExportCenterDialog(QtWidgets.QDialog):
@@ -47,6 +51,16 @@ class ExportCenterDialog(QtWidgets.QDialog):
         self.chk_composite.setEnabled(allow_composite)
         layout.addWidget(self.chk_composite)
 
+        # Binary formats whose writer packages are installed
+        labels = {"npz": "NumPy npz", "parquet": "Parquet", "hdf5": "HDF5"}
+        self.chk_binary = {}
+        for fmt in available_formats():
+            checkbox = QtWidgets.QCheckBox(
+                f"Binary bundle ({labels[fmt]}: spectra, uncertainty, flags, provenance)"
+            )
+            layout.addWidget(checkbox)
+            self.chk_binary[fmt] = checkbox
+
         sep = QtWidgets.QFrame()
         sep.setFrameShape(QtWidgets.QFrame.Shape.HLine)
         layout.addWidget(sep)
@@ -73,4 +87,5 @@ class ExportCenterDialog(QtWidgets.QDialog):
             plot_png=self.chk_plot_png.isChecked(),
             plot_svg=self.chk_plot_svg.isChecked(),
             plot_csv=self.chk_plot_csv.isChecked(),
+            binary_formats=tuple(fmt for fmt, checkbox in self.chk_binary.items() if checkbox.isChecked()),
         )
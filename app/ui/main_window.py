@@ -22,15 +22,18 @@ preserving behavior.
 from __future__ import annotations
 
 import os
+import re
 from collections import OrderedDict
+from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
 import numpy as np
 import pyqtgraph as pg
 
 from app.qt_compat import get_qt
-from app.utils.analysis import peak_near
+from app.telemetry import timed
+from app.utils.analysis import find_peaks, peak_near
 from app.services import (
     UnitsService,
     ProvenanceService,
@@ -45,18 +48,29 @@ from app.services import (
     KnowledgeLogService,
     RemoteDataService,
         CalibrationService,
+    FitsHeaderIndex,
+    FitsHeaderRecord,
+    detach_session_arrays,
+    load_session,
+    save_session,
 )
+from app.services.binary_bundle import BINARY_SUFFIXES
+from app.services.docs_index import DocsIndex
+from app.services.fits_header_index import FITS_EXTENSIONS
 from app.ui.plot_pane import PlotPane, TraceStyle
-from app.ui.remote_data_panel import RemoteDataPanel
 from app.ui.dataset_panel import DatasetPanel
 from app.ui.reference_panel import ReferencePanel
 from app.ui.merge_panel import MergePanel
 from app.ui.history_panel import HistoryPanel
 from app.ui.calibration_panel import CalibrationPanel
-from app.ui.nist_lines_panel import NistLinesPanel
 from app.ui.styles import apply_pyqtgraph_theme, get_app_stylesheet
 from app.ui.themes import default_theme_key, get_theme_definition, iter_theme_definitions
 from app.utils.error_handling import ui_action
+from app.workers.preload import PreloadWorker
+
+if TYPE_CHECKING:  # pragma: no cover - imported lazily on first use
+    from app.ui.nist_lines_panel import NistLinesPanel
+    from app.ui.remote_data_panel import RemoteDataPanel
 
 
 QtCore: Any
@@ -80,6 +94,16 @@ if Slot is None:
 
 SAMPLES_DIR = Path(__file__).resolve().parents[2] / "samples"
 PLOT_MAX_POINTS_KEY = "plot/max_points"
+# Spectra larger than this are memory-mapped from the store instead of held in RAM
+MAPPED_SPECTRUM_BYTES = 256 * 1024 * 1024
+# Keep float32 detector data (most FITS flux columns) in float32
+INGEST_PRECISION = "source"
+# Library rows keep the file they list under this role (UserRole is the ingest path)
+LIBRARY_PATH_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+# Library filter words such as "656nm" or "400-700nm" select FITS coverage
+_WAVELENGTH_FILTER_RE = re.compile(r"^(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?nm$")
+# "Find all peaks" keeps lines at or above this SNR (prominence / noise sigma).
+PEAK_MIN_SNR = 10.0
 
 
 class SpectraMainWindow(QtWidgets.QMainWindow):
@@ -123,7 +147,15 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         _store_override = os.environ.get("SPECTRA_STORE_DIR")
         self._default_store_dir = Path(_store_override) if _store_override else (self._app_root / "downloads")
         self.store: LocalStore | None = None if self._persistence_disabled else LocalStore(base_dir=self._default_store_dir)
-        self.ingest_service = DataIngestService(self.units_service, store=self.store)
+        self.ingest_service = DataIngestService(
+            self.units_service,
+            store=self.store,
+            map_threshold_bytes=MAPPED_SPECTRUM_BYTES,
+            precision=INGEST_PRECISION,
+        )
+        if self.store is not None:
+            # Mapped arrays whose release could not delete them (still open)
+            self.store.prune_arrays()
         remote_store = self.store
         if remote_store is None:
             # Fall back to app-local downloads directory even when persistence is toggled off
@@ -201,6 +233,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         self.library_detail: QtWidgets.QPlainTextEdit | None = None
         self.library_hint: QtWidgets.QLabel | None = None
         self._library_entries: Dict[str, Mapping[str, Any]] = {}
+        self._fits_header_index: FitsHeaderIndex | None = None
         self._library_tab_index: int | None = None
         self._use_uniform_palette = False
         self._uniform_color = QtGui.QColor("#4F6D7A")
@@ -211,11 +244,20 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         # Docs UI
         self.docs_list: QtWidgets.QListWidget | None = None
         self.doc_viewer: QtWidgets.QPlainTextEdit | None = None
+        self.docs_filter: QtWidgets.QLineEdit | None = None
+        # Built on a worker thread at startup; see _start_background_preload
+        self._docs_index: DocsIndex | None = None
+        self._preload_thread: Optional[QtCore.QThread] = None
+        self._preload_worker: Optional[QtCore.QObject] = None
 
         # Async NIST fetch state
         self._nist_thread: Optional[QtCore.QThread] = None
         self._nist_worker: Optional[QtCore.QObject] = None
 
+        # Automatic line lists from "Find all peaks": spec_id -> PEAK_DTYPE array
+        self._peak_tables: Dict[str, np.ndarray] = {}
+        self._peak_marker_items: List[pg.GraphicsObject] = []
+
         self._setup_ui()
         self._setup_menu()
         self._apply_theme_by_key(self._theme_key, persist=False)
@@ -225,7 +267,8 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
         self._wire_shortcuts()
-        self._load_docs_if_needed()  # Pre-load documentation so it's ready immediately
+        # Index docs and parse reference JSONs off the GUI thread so both panes open instantly
+        self._start_background_preload()
         # self._load_default_samples()  # Disabled: users prefer empty workspace on launch
         # Ensure visibility in offscreen test environments so isVisible() checks pass
         try:
@@ -297,6 +340,11 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         library_container = QtWidgets.QWidget()
         library_layout = QtWidgets.QVBoxLayout(library_container)
         library_layout.setContentsMargins(4, 4, 4, 4)
+        self.library_search = QtWidgets.QLineEdit()
+        self.library_search.setPlaceholderText("Filter by file, target, instrument or 400-700nm")
+        self.library_search.setClearButtonEnabled(True)
+        self.library_search.textChanged.connect(self._apply_library_filter)
+        library_layout.addWidget(self.library_search)
         self.library_view = QtWidgets.QTreeWidget()
         self.library_view.setHeaderLabels(["File", "Origin"])
         library_layout.addWidget(self.library_view)
@@ -316,8 +364,17 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         docs_container = QtWidgets.QWidget()
         docs_layout = QtWidgets.QHBoxLayout(docs_container)
         docs_layout.setContentsMargins(4, 4, 4, 4)
+        docs_left = QtWidgets.QWidget()
+        docs_left_layout = QtWidgets.QVBoxLayout(docs_left)
+        docs_left_layout.setContentsMargins(0, 0, 0, 0)
+        self.docs_filter = QtWidgets.QLineEdit()
+        self.docs_filter.setPlaceholderText("Search documentation…")
+        self.docs_filter.setClearButtonEnabled(True)
+        self.docs_filter.textChanged.connect(self._on_docs_filter_changed)
         self.docs_list = QtWidgets.QListWidget()
         self.docs_list.currentRowChanged.connect(self._on_doc_selected)
+        docs_left_layout.addWidget(self.docs_filter)
+        docs_left_layout.addWidget(self.docs_list, 1)
         # Use a rich text viewer so we can render Markdown nicely; fall back to plain text if needed
         # QTextEdit supports setMarkdown in Qt 5.14+ / Qt6; QTextBrowser is also suitable.
         try:
@@ -326,7 +383,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         except Exception:
             # Fallback for environments lacking QTextEdit
             self.doc_viewer = QtWidgets.QPlainTextEdit(readOnly=True)
-        docs_layout.addWidget(self.docs_list, 1)
+        docs_layout.addWidget(docs_left, 1)
         docs_layout.addWidget(self.doc_viewer, 2)
         # Expose for tests
         self.tab_docs = docs_container
@@ -372,15 +429,13 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         self.calibration_panel.configChanged.connect(self._on_calibration_changed)
         self.inspector_tabs.addTab(self.calibration_panel, "Calibration")
 
-        # Remote Data tab
-        self.remote_data_panel = RemoteDataPanel(
-            self.remote_data_service,
-            self.ingest_service,
-            self
-        )
-        self.remote_data_panel.spectra_imported.connect(self._handle_remote_spectra_imported)
-        self.remote_data_panel.status_message.connect(self._log)
-        self.inspector_tabs.addTab(self.remote_data_panel, "Remote Data")
+        # Remote Data tab: the panel is built on first activation because it pulls
+        # in the remote workers and probes optional archive dependencies
+        self.remote_data_panel: RemoteDataPanel | None = None
+        self._remote_data_tab = QtWidgets.QWidget()
+        remote_tab_layout = QtWidgets.QVBoxLayout(self._remote_data_tab)
+        remote_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.inspector_tabs.addTab(self._remote_data_tab, "Remote Data")
         
         # Merge/Average tab (moved into MergePanel)
         self.merge_panel = MergePanel(self)
@@ -447,23 +502,23 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             self.history_panel.copyRequested.connect(self._copy_history_entries)
         if hasattr(self.history_panel, "exportRequested"):
             self.history_panel.exportRequested.connect(self._export_history_entries)
-        # Initialize search state and populate view
+        # Initialize search state; the knowledge log is read when the dock is first
+        # shown (or on the next history refresh) rather than during startup
         self._history_search = ""
-        self._refresh_history_view()
+        self._history_entries = []
+        self._history_loaded = False
+        self.history_dock.visibilityChanged.connect(self._on_history_dock_visibility)
 
-        # NIST Lines dock (separate from main Datasets)
+        # NIST Lines dock (separate from main Datasets). The panel itself is built
+        # on first use; see the nist_lines_panel property.
         self.nist_lines_dock = QtWidgets.QDockWidget("NIST Lines", self)
         self.nist_lines_dock.setObjectName("dock-nist-lines")
-        self.nist_lines_panel = NistLinesPanel(self)
-        self.nist_lines_dock.setWidget(self.nist_lines_panel)
+        self._nist_lines_panel: NistLinesPanel | None = None
         self.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, self.nist_lines_dock)
         # Don't auto-show; open when first NIST fetch completes
         self.nist_lines_dock.hide()
-        
-        # Wire NIST Lines panel signals
-        self.nist_lines_panel.visibilityChanged.connect(self._on_nist_visibility_changed)
-        self.nist_lines_panel.removeRequested.connect(self._on_nist_remove_requested)
-        self.nist_lines_panel.clearAllRequested.connect(self._on_nist_clear_all_requested)
+        # Shown via the View menu before any fetch: build the panel then
+        self.nist_lines_dock.visibilityChanged.connect(self._on_nist_lines_dock_visibility)
 
         # Plot toolbar
         self.plot_toolbar = QtWidgets.QToolBar("Plot")
@@ -523,6 +578,13 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         self.action_find_peak.triggered.connect(self._on_find_peak_near_cursor)
         self.plot_toolbar.addAction(self.action_find_peak)
 
+        self.action_find_all_peaks = QtGui.QAction("Find all peaks", self)
+        self.action_find_all_peaks.setToolTip(
+            f"Detect peaks (SNR ≥ {PEAK_MIN_SNR:g}) in every visible trace and mark them on the plot"
+        )
+        self.action_find_all_peaks.triggered.connect(self._on_find_all_peaks)
+        self.plot_toolbar.addAction(self.action_find_all_peaks)
+
         # Status bar
         self.statusBar().showMessage("Ready")
 
@@ -776,6 +838,8 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
     # ----------------------------- NIST Lines helpers ------------------
     def _on_unit_changed(self, unit: str) -> None:
         """Refresh NIST collections when unit changes."""
+        # Peak markers are placed in display units; drop them rather than misplace them
+        self._clear_peak_markers()
         # Redraw all visible NIST collections with new unit
         for collection_id in list(self._nist_plot_items.keys()):
             if self.nist_lines_panel.is_visible(collection_id):
@@ -896,6 +960,56 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         self._center_view_on_x(xp)
         self.statusBar().showMessage(f"Peak near cursor at x≈{xp:.6g} {unit}, y≈{float(yp):.6g}")
 
+    @ui_action("Failed to find peaks")
+    def _on_find_all_peaks(self) -> None:
+        """Build a line list for every visible trace and mark the peaks."""
+        self._clear_peak_markers()
+        self._peak_tables = {}
+        unit = self.unit_combo.currentText() if self.unit_combo is not None else "nm"
+        total = 0
+        for key, trace in list(getattr(self.plot, "_traces", {}).items()):
+            if not trace or not bool(trace.get("visible", True)):
+                continue
+            x_disp = self.plot._x_nm_to_disp(np.asarray(trace.get("x_nm"), dtype=float))
+            y_disp = np.asarray(trace.get("y"), dtype=float)
+            if x_disp.size >= 2 and x_disp[-1] < x_disp[0]:
+                x_disp = x_disp[::-1]
+                y_disp = y_disp[::-1]
+            peaks = find_peaks(x_disp, y_disp, min_snr=PEAK_MIN_SNR)
+            self._peak_tables[key] = peaks
+            total += int(peaks.size)
+            alias = str(trace.get("alias", key))
+            if peaks.size == 0:
+                self._log("Peaks", f"{alias}: no peaks above SNR {PEAK_MIN_SNR:g}")
+                continue
+            strongest = peaks[np.argsort(peaks["prominence"])[::-1][:5]]
+            summary = ", ".join(f"{p['centroid']:.6g} (SNR {p['snr']:.3g})" for p in strongest)
+            self._log("Peaks", f"{alias}: {peaks.size} peaks [{unit}]; strongest: {summary}")
+            style: TraceStyle | None = trace.get("style")  # type: ignore[assignment]
+            color = style.color if style is not None else QtGui.QColor("white")
+            marker = pg.ScatterPlotItem(
+                x=peaks["x"],
+                y=peaks["height"],
+                symbol="t",
+                size=8,
+                pen=pg.mkPen(color),
+                brush=pg.mkBrush(color),
+            )
+            self.plot.add_graphics_item(marker, ignore_bounds=True)
+            self._peak_marker_items.append(marker)
+        if not self._peak_tables:
+            self.statusBar().showMessage("No visible spectra to search for peaks")
+            return
+        self.statusBar().showMessage(f"Found {total} peaks across {len(self._peak_tables)} trace(s)")
+
+    def _clear_peak_markers(self) -> None:
+        for item in self._peak_marker_items:
+            try:
+                self.plot.remove_graphics_item(item)
+            except Exception:
+                pass
+        self._peak_marker_items = []
+
     def _center_view_on_x(self, x_center: float) -> None:
         """Pan the view to center on x_center, preserving current width."""
         try:
@@ -1095,6 +1209,16 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         export_center_action.triggered.connect(self.export_center)
         file_menu.addAction(export_center_action)
 
+        open_session_action = QtGui.QAction("Open Sess&ion…", self)
+        open_session_action.setShortcut("Ctrl+Shift+O")
+        open_session_action.triggered.connect(self.open_session)
+        file_menu.addAction(open_session_action)
+
+        save_session_action = QtGui.QAction("Save Sessi&on…", self)
+        save_session_action.setShortcut("Ctrl+Shift+S")
+        save_session_action.triggered.connect(self.save_session)
+        file_menu.addAction(save_session_action)
+
         file_menu.addSeparator()
         exit_action = QtGui.QAction("E&xit", self)
         exit_action.triggered.connect(self.close)
@@ -1437,12 +1561,43 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             self._on_doc_selected(0)
         # If no docs, silently succeed
 
+    def _ensure_remote_data_panel(self) -> RemoteDataPanel:
+        """Build the Remote Data panel inside its placeholder tab on first use."""
+        if self.remote_data_panel is None:
+            from app.ui.remote_data_panel import RemoteDataPanel
+
+            panel = RemoteDataPanel(self.remote_data_service, self.ingest_service, self)
+            panel.spectra_imported.connect(self._handle_remote_spectra_imported)
+            panel.status_message.connect(self._log)
+            self._remote_data_tab.layout().addWidget(panel)
+            self.remote_data_panel = panel
+        return self.remote_data_panel
+
+    @property
+    def nist_lines_panel(self) -> NistLinesPanel:
+        """NIST Lines dock contents, built the first time they are needed."""
+        if self._nist_lines_panel is None:
+            from app.ui.nist_lines_panel import NistLinesPanel
+
+            panel = NistLinesPanel(self)
+            panel.visibilityChanged.connect(self._on_nist_visibility_changed)
+            panel.removeRequested.connect(self._on_nist_remove_requested)
+            panel.clearAllRequested.connect(self._on_nist_clear_all_requested)
+            self.nist_lines_dock.setWidget(panel)
+            self._nist_lines_panel = panel
+        return self._nist_lines_panel
+
+    def _on_nist_lines_dock_visibility(self, visible: bool) -> None:
+        if visible:
+            _ = self.nist_lines_panel  # builds the panel on first access
+
     @ui_action("Failed to open Remote Data tab")
     def show_remote_data_tab(self) -> None:
         # Switch to the Remote Data tab in Inspector dock
         self.inspector_dock.raise_()
         try:
-            index = self.inspector_tabs.indexOf(self.remote_data_panel)
+            self._ensure_remote_data_panel()
+            index = self.inspector_tabs.indexOf(self._remote_data_tab)
             if index != -1:
                 self.inspector_tabs.setCurrentIndex(index)
         except Exception:
@@ -1454,7 +1609,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             self,
             "Open Spectrum(s)",
             str(SAMPLES_DIR),
-            "Data files (*.csv *.txt *.dat *.fits *.fit *.fts *.jdx *.dx *.jcamp);;All files (*.*)",
+            "Data files (*.csv *.txt *.dat *.fits *.fit *.fts *.jdx *.dx *.jcamp *.npz *.parquet *.h5 *.hdf5);;All files (*.*)",
         )
         if not path_strs:
             return
@@ -1476,6 +1631,99 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             return
         self._ingest_path(Path(path_str))
 
+    @ui_action("Failed to save session")
+    def save_session(self) -> None:
+        """Write every loaded spectrum and the current view state to a session file."""
+        spectra = self.overlay_service.list()
+        if not spectra:
+            QtWidgets.QMessageBox.information(self, "Session", "No spectra to save.")
+            return
+        path_str, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self,
+            "Save Session",
+            str(self._default_store_dir / "session.spectra"),
+            "Spectra sessions (*.spectra);;All files (*.*)",
+        )
+        if not path_str:
+            return
+        path = Path(path_str)
+        # Saving over the session these spectra are mapped from replaces that
+        # file, so their arrays move into memory first; redrawing swaps the
+        # plot traces (which keep mapped views) onto the copies too
+        detached = detach_session_arrays(spectra, path)
+        if any(copy is not spectrum for copy, spectrum in zip(detached, spectra)):
+            for spectrum in detached:
+                self.overlay_service.add(spectrum)
+            self._refresh_plot()
+        spectra = detached
+        path = save_session(path, spectra, self._session_ui_state())
+        self._log("Session", f"Saved {len(spectra)} spectra to {path}")
+
+    @ui_action("Failed to open session")
+    def open_session(self) -> None:
+        """Replace the workspace with the spectra and view state of a session file."""
+        path_str, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self,
+            "Open Session",
+            str(self._default_store_dir),
+            "Spectra sessions (*.spectra);;All files (*.*)",
+        )
+        if not path_str:
+            return
+        self._restore_session(Path(path_str))
+
+    def _session_ui_state(self) -> Dict[str, Any]:
+        return {
+            "colors": {spec_id: color.name() for spec_id, color in self._spectrum_colors.items()},
+            "visibility": dict(self._visibility),
+            "unit": self.unit_combo.currentText() if self.unit_combo is not None else "nm",
+            "normalization": self.norm_combo.currentText() if self.norm_combo is not None else "None",
+            "global_normalization": bool(self.norm_global_checkbox.isChecked()),
+            "y_scale": self.y_scale_combo.currentText() if self.y_scale_combo is not None else "Linear",
+            "calibration": asdict(self.calibration_service.config),
+        }
+
+    def _restore_session(self, path: Path) -> None:
+        # Arrays stay mapped from the session file; only the manifest is read here
+        state = load_session(path)
+        ui = state.ui
+        self._clear_all_datasets()
+        calibration = dict(ui.get("calibration") or {})
+        if calibration:
+            self.calibration_panel.set_config(calibration)
+        if self.norm_combo is not None:
+            self.norm_combo.setCurrentText(str(ui.get("normalization", "None")))
+        self.norm_global_checkbox.setChecked(bool(ui.get("global_normalization", False)))
+        if self.y_scale_combo is not None:
+            self.y_scale_combo.setCurrentText(str(ui.get("y_scale", "Linear")))
+        colors = dict(ui.get("colors") or {})
+        self.plot.begin_bulk_update()
+        try:
+            for spectrum in state.spectra:
+                self.overlay_service.add(spectrum)
+                color = colors.get(spectrum.id)
+                self._add_spectrum(
+                    spectrum,
+                    defer_refresh=True,
+                    color=QtGui.QColor(color) if color else None,
+                )
+            if self.unit_combo is not None:
+                self.unit_combo.setCurrentText(str(ui.get("unit", "nm")))
+            self._refresh_plot()
+        finally:
+            self.plot.end_bulk_update()
+        for spec_id, visible in dict(ui.get("visibility") or {}).items():
+            alias_item = self._dataset_items.get(spec_id)
+            if visible or alias_item is None or alias_item.parent() is None:
+                continue
+            # Unchecking the row routes through _on_dataset_item_changed
+            visible_item = alias_item.parent().child(alias_item.row(), 1)
+            if visible_item is not None:
+                visible_item.setCheckState(QtCore.Qt.CheckState.Unchecked)
+        self._update_math_selectors()
+        self._refresh_library_view()
+        self._log("Session", f"Restored {len(state.spectra)} spectra from {path}")
+
     @ui_action("Export failed")
     def export_center(self) -> None:
         """Unified export entry-point to write manifest, CSVs, and plot artifacts."""
@@ -1491,7 +1739,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
             return
         opts = dialog.result()
-        if not any([opts.manifest, opts.wide_csv, opts.composite_csv, opts.plot_png, opts.plot_svg, opts.plot_csv]):
+        if not any([opts.manifest, opts.wide_csv, opts.composite_csv, opts.plot_png, opts.plot_svg, opts.plot_csv, opts.binary_formats]):
             return
         base_str, _ = QtWidgets.QFileDialog.getSaveFileName(
             self,
@@ -1509,8 +1757,18 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
                     spectra,
                     base.with_suffix(".json"),
                     png_writer=lambda p: self.plot.export_png(p),
+                    binary_formats=opts.binary_formats,
                 )
                 self._log("Export", f"Bundle written: {outcome.get('manifest_path')}")
+                for binary_path in (outcome.get("binary_paths") or {}).values():
+                    self._log("Export", f"Binary bundle written: {binary_path}")
+            # Binary bundles on their own (the manifest is embedded in each)
+            elif opts.binary_formats:
+                for fmt in opts.binary_formats:
+                    binary_path = self.provenance_service.write_binary_bundle(
+                        base.with_suffix(BINARY_SUFFIXES[fmt]), spectra, fmt=fmt
+                    )
+                    self._log("Export", f"Binary bundle written: {binary_path}")
             # Wide CSV
             if opts.wide_csv:
                 self.provenance_service.write_wide_csv(base.with_name(base.stem + "-wide.csv"), spectra)
@@ -1652,6 +1910,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
                     identifier = str(remote.get("identifier") or remote.get("id") or "")
                     origin = provider if not identifier else f"{provider} – {identifier}"
                 item = QtWidgets.QTreeWidgetItem([name, origin])
+                item.setData(0, LIBRARY_PATH_ROLE, str(record.get("stored_path", "")))
                 self.library_view.addTopLevelItem(item)
         else:
             # Backwards-compatible placeholder row when no cache entries exist
@@ -1677,10 +1936,13 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
                         child = QtWidgets.QTreeWidgetItem([p.name, "samples/"])
                         # stash absolute path for activation
                         child.setData(0, QtCore.Qt.ItemDataRole.UserRole, str(p))
+                        child.setData(0, LIBRARY_PATH_ROLE, str(p))
                         samples_root.addChild(child)
                     samples_root.setExpanded(True)
         except Exception:
             pass
+        self._describe_library_fits(effective_store)
+        self._apply_library_filter()
 
         # Double-click to ingest sample files
         # Reconnect signal (disconnect first if already connected)
@@ -1698,6 +1960,100 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
+    def _library_items(self) -> List[QtWidgets.QTreeWidgetItem]:
+        if self.library_view is None:
+            return []
+        items: List[QtWidgets.QTreeWidgetItem] = []
+        for index in range(self.library_view.topLevelItemCount()):
+            item = self.library_view.topLevelItem(index)
+            items.append(item)
+            items.extend(item.child(row) for row in range(item.childCount()))
+        return items
+
+    def _library_record(self, item: QtWidgets.QTreeWidgetItem) -> FitsHeaderRecord | None:
+        path = item.data(0, LIBRARY_PATH_ROLE)
+        if not path or self._fits_header_index is None:
+            return None
+        return self._fits_header_index.record_for(Path(str(path)))
+
+    def _describe_library_fits(self, store: LocalStore | None) -> None:
+        """Index the headers of the listed FITS files and show them as tooltips."""
+        index = self._fits_header_index
+        if index is None or index.store is not store:
+            cache_path = store.data_dir / "_cache" / "fits_headers.json" if store is not None else None
+            index = self._fits_header_index = FitsHeaderIndex(store, roots=[], cache_path=cache_path)
+        items = self._library_items()
+        try:
+            # Store files reuse their recorded digests; listed samples are added on top
+            index.refresh()
+            samples = [
+                Path(str(path))
+                for path in (item.data(0, LIBRARY_PATH_ROLE) for item in items)
+                if path and Path(str(path)).suffix.lower() in FITS_EXTENSIONS and index.record_for(Path(str(path))) is None
+            ]
+            if samples:
+                index.refresh(samples)
+        except (OSError, ValueError) as exc:
+            self._log("Library", f"FITS header index unavailable: {exc}")
+            return
+        for item in items:
+            record = self._library_record(item)
+            if record is None:
+                continue
+            lines = [
+                f"{label}: {value}"
+                for label, value in (("Target", record.target), ("Instrument", record.instrument), ("Telescope", record.telescope))
+                if value
+            ]
+            if record.wavelength_min_nm is not None and record.wavelength_max_nm is not None:
+                lines.append(f"Coverage: {record.wavelength_min_nm:.1f}–{record.wavelength_max_nm:.1f} nm")
+            item.setToolTip(0, "\n".join(lines) or f"{record.hdus} HDU(s)")
+
+    def _apply_library_filter(self, text: str | None = None) -> None:
+        """Show library rows matching every filter word.
+
+        Words match the file name, origin and the FITS target, instrument and
+        telescope; ``656nm`` or ``400-700nm`` keep FITS files whose header
+        coverage overlaps that wavelength window.
+        """
+        if self.library_view is None:
+            return
+        if text is None:
+            text = self.library_search.text() if self.library_search is not None else ""
+        words: List[str] = []
+        windows: List[tuple[float, float]] = []
+        for word in text.lower().split():
+            match = _WAVELENGTH_FILTER_RE.match(word)
+            if match:
+                lower = float(match.group(1))
+                windows.append((lower, float(match.group(2) or lower)))
+            else:
+                words.append(word)
+
+        def matches(item: QtWidgets.QTreeWidgetItem) -> bool:
+            record = self._library_record(item)
+            fields = [item.text(0), item.text(1)]
+            if record is not None:
+                fields += [record.target, record.instrument, record.telescope]
+            haystack = " ".join(fields).lower()
+            if any(word not in haystack for word in words):
+                return False
+            return all(record is not None and record.covers(*window) for window in windows)
+
+        filtering = bool(words or windows)
+        for index in range(self.library_view.topLevelItemCount()):
+            item = self.library_view.topLevelItem(index)
+            if item.childCount() == 0:
+                item.setHidden(filtering and not matches(item))
+                continue
+            shown = 0
+            for row in range(item.childCount()):
+                child = item.child(row)
+                visible = not filtering or matches(child)
+                child.setHidden(not visible)
+                shown += visible
+            item.setHidden(filtering and shown == 0)
+
     def _on_library_item_activated(self, item: QtWidgets.QTreeWidgetItem, _col: int) -> None:
         try:
             path_str = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
@@ -1836,8 +2192,14 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             self._refresh_history_view()
 
     # Public helper used by tests
-    def _add_spectrum(self, spectrum: Spectrum, *, defer_refresh: bool = False) -> None:
-        color = self._next_palette_color()
+    def _add_spectrum(
+        self,
+        spectrum: Spectrum,
+        *,
+        defer_refresh: bool = False,
+        color: QtGui.QColor | None = None,
+    ) -> None:
+        color = color if color is not None and color.isValid() else self._next_palette_color()
         self._spectrum_colors[spectrum.id] = color
         style = TraceStyle(color=color, width=1.0, show_in_legend=True)
         
@@ -2021,6 +2383,8 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
                     rows_to_remove.append((index.row(), index.parent()))
                     break
         
+        self._release_mapped_arrays(spec_ids_to_remove)
+
         # Remove from overlay service
         for spec_id in spec_ids_to_remove:
             try:
@@ -2065,6 +2429,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
 
         # Collect all spectrum IDs
         spec_ids_to_remove = list(self._dataset_items.keys())
+        self._release_mapped_arrays(spec_ids_to_remove)
 
         # Remove from overlay service and plot
         for spec_id in spec_ids_to_remove:
@@ -2094,6 +2459,18 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         # Log the removal
         self._log("Datasets", f"Cleared all {len(spec_ids_to_remove)} dataset(s)")
 
+    def _release_mapped_arrays(self, spec_ids: Iterable[str]) -> None:
+        """Delete the store's mapped array files of spectra being unloaded."""
+        if self.store is None:
+            return
+        for spec_id in spec_ids:
+            try:
+                spectrum = self.overlay_service.get(spec_id)
+            except KeyError:
+                continue
+            if spectrum.is_memory_mapped:
+                self.store.release_arrays(spec_id)
+
     def _on_doc_selected(self, row: int) -> None:
         if self.docs_list is None or self.doc_viewer is None:
             return
@@ -2104,11 +2481,11 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         # advance to the next real document item so the smoke test sees content.
         data = item.data(QtCore.Qt.ItemDataRole.UserRole)
         if not data:
-            # Try to find the next item with a path
+            # Try to find the next visible item with a path
             next_row = row + 1
             while next_row < self.docs_list.count():
                 it = self.docs_list.item(next_row)
-                if it and it.data(QtCore.Qt.ItemDataRole.UserRole):
+                if it and it.data(QtCore.Qt.ItemDataRole.UserRole) and not it.isHidden():
                     self.docs_list.setCurrentRow(next_row)
                     return  # The signal will retrigger with a real item
                 next_row += 1
@@ -2116,16 +2493,22 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
             prev_row = row - 1
             while prev_row >= 0:
                 it = self.docs_list.item(prev_row)
-                if it and it.data(QtCore.Qt.ItemDataRole.UserRole):
+                if it and it.data(QtCore.Qt.ItemDataRole.UserRole) and not it.isHidden():
                     self.docs_list.setCurrentRow(prev_row)
                     return
                 prev_row -= 1
             return
         path = Path(str(data))
-        try:
-            text = path.read_text(encoding="utf-8")
-        except Exception:
-            text = ""
+        # The index already holds every guide's Markdown; only hit the disk if it is
+        # missing or the file was edited since startup
+        entry = self._docs_index.entry_for(path) if self._docs_index is not None else None
+        if entry is not None and not entry.is_stale():
+            text = entry.text
+        else:
+            try:
+                text = path.read_text(encoding="utf-8")
+            except Exception:
+                text = ""
         # Try to render Markdown when supported; otherwise show as plain text
         try:
             if hasattr(self.doc_viewer, "setMarkdown"):
@@ -2136,73 +2519,116 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         except Exception:
             self.doc_viewer.setPlainText(text)
 
+    def _start_background_preload(self) -> None:
+        """Build the docs index and warm the reference cache on a worker thread."""
+        if self._preload_thread is not None:
+            return
+        worker = PreloadWorker(self.reference_library)
+        thread = QtCore.QThread(self)
+        self._preload_worker = worker
+        self._preload_thread = thread
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self._on_preload_finished)
+        worker.failed.connect(lambda message: self._log("Docs", f"Background preload failed: {message}"))
+
+        def _cleanup(*_args: object) -> None:
+            if thread.isRunning():
+                thread.quit()
+            worker.deleteLater()
+            thread.deleteLater()
+            if self._preload_worker is worker:
+                self._preload_worker = None
+                self._preload_thread = None
+
+        worker.finished.connect(lambda *_: QtCore.QTimer.singleShot(0, _cleanup))
+        worker.failed.connect(lambda *_: QtCore.QTimer.singleShot(0, _cleanup))
+        thread.start()
+
+    def _wait_for_preload(self) -> None:
+        thread = self._preload_thread
+        if thread is not None and thread.isRunning():
+            thread.quit()
+            thread.wait()
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:  # type: ignore[override]
+        # The preload is short, but the QThread must not outlive the window
+        self._wait_for_preload()
+        self._release_mapped_arrays([spectrum.id for spectrum in self.overlay_service.list()])
+        super().closeEvent(event)
+
+    def _on_preload_finished(self, index: object) -> None:
+        if not isinstance(index, DocsIndex):
+            return
+        # A synchronous build (docs opened before the worker finished) wins
+        if self._docs_index is None:
+            self._docs_index = index
+        self._load_docs_if_needed()
+
     def _load_docs_if_needed(self) -> None:
         if self.docs_list is None:
             return
         if self.docs_list.count() > 0:
             return
-        # Prefer user-facing docs only (avoid surfacing outdated developer/history docs)
-        root_docs = Path(__file__).resolve().parents[2] / "docs"
-        user_docs = root_docs / "user"
-        # Collect docs and assign categories for nicer grouping in the list
-        def _category_for(path: Path) -> str:
-            pstr = str(path).lower()
-            if str(user_docs).lower() in pstr:
-                return "User"
-            if (root_docs / "history").exists() and str((root_docs / "history").resolve()).lower() in pstr:
-                return "History"
-            if any(tok in pstr for tok in ("developer", "dev/", "specs/", "reviews/")):
-                return "Developer"
-            return "Other"
-
-        def _title_for(path: Path) -> str:
-            try:
-                text = path.read_text(encoding="utf-8", errors="ignore")
-                for line in text.splitlines():
-                    l = line.strip()
-                    if l.startswith("# "):
-                        return l.lstrip("# ").strip()
-            except Exception:
-                pass
-            return path.stem.replace("_", " ").replace("-", " ").strip().title()
-
-        candidates: list[Path] = []
-        if user_docs.exists():
-            candidates.extend(sorted(user_docs.glob("*.md")))
-        # If user docs are empty, fall back to a minimal curated landing page
-        if not candidates:
-            for fallback in (root_docs / "INDEX.md", root_docs / "README.md"):
-                if fallback.exists():
-                    candidates.append(fallback)
-        entries: list[tuple[str, Path, str]] = [(_title_for(p), p, _category_for(p)) for p in candidates]
-        # Group by category with alphabetical sort inside categories
-        from collections import defaultdict as _defaultdict
-        grouped: dict[str, list[tuple[str, Path]]] = _defaultdict(list)
-        for title, path, cat in entries:
-            grouped[cat].append((title, path))
-        ordered_cats = sorted(grouped.keys(), key=lambda s: (s != "User", s))
+        if self._docs_index is None:
+            # Docs were requested before the background preload finished
+            self._docs_index = DocsIndex.build()
         first = True
-        for cat in ordered_cats:
-            entries = sorted(grouped[cat], key=lambda t: t[0].lower())
+        for category, entries in self._docs_index.grouped():
             if first:
                 # For the very first category, add items without a header so row 0 is a real doc
-                for title, path in entries:
-                    item = QtWidgets.QListWidgetItem(title)
-                    item.setData(QtCore.Qt.ItemDataRole.UserRole, str(path))
+                for entry in entries:
+                    item = QtWidgets.QListWidgetItem(entry.title)
+                    item.setData(QtCore.Qt.ItemDataRole.UserRole, str(entry.path))
                     self.docs_list.addItem(item)
                 first = False
                 continue
             # Insert a non-selectable header before subsequent groups
-            header = QtWidgets.QListWidgetItem(cat)
+            header = QtWidgets.QListWidgetItem(category)
             f = header.font(); f.setBold(True)
             header.setFont(f)
             header.setFlags(QtCore.Qt.ItemFlag.NoItemFlags)
             header.setData(QtCore.Qt.ItemDataRole.UserRole, "")
             self.docs_list.addItem(header)
-            for title, path in entries:
-                item = QtWidgets.QListWidgetItem(f"  {title}")
-                item.setData(QtCore.Qt.ItemDataRole.UserRole, str(path))
+            for entry in entries:
+                item = QtWidgets.QListWidgetItem(f"  {entry.title}")
+                item.setData(QtCore.Qt.ItemDataRole.UserRole, str(entry.path))
                 self.docs_list.addItem(item)
+        if self.docs_filter is not None and self.docs_filter.text().strip():
+            self._on_docs_filter_changed(self.docs_filter.text())
+
+    def _on_docs_filter_changed(self, text: str) -> None:
+        """Hide guides that do not match every search term (titles and full text)."""
+        if self.docs_list is None:
+            return
+        ranked: list[str] = []
+        if self._docs_index is None or not text.strip():
+            matches = None
+        else:
+            ranked = [str(entry.path) for entry in self._docs_index.search(text)]
+            matches = set(ranked)
+        header: QtWidgets.QListWidgetItem | None = None
+        header_has_match = False
+        for row in range(self.docs_list.count()):
+            item = self.docs_list.item(row)
+            path = item.data(QtCore.Qt.ItemDataRole.UserRole)
+            if not path:
+                if header is not None:
+                    header.setHidden(not header_has_match)
+                header, header_has_match = item, False
+                continue
+            visible = matches is None or str(path) in matches
+            item.setHidden(not visible)
+            header_has_match = header_has_match or visible
+        if header is not None:
+            header.setHidden(not header_has_match)
+        # Keep the viewer in step with the filter: jump to the best-ranked visible guide
+        current = self.docs_list.currentItem()
+        if ranked and (current is None or current.isHidden()):
+            for row in range(self.docs_list.count()):
+                if str(self.docs_list.item(row).data(QtCore.Qt.ItemDataRole.UserRole)) == ranked[0]:
+                    self.docs_list.setCurrentRow(row)
+                    break
 
     def _on_max_points_changed(self, value: int) -> None:
         self._plot_max_points = int(value)
@@ -2213,8 +2639,11 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         """Schedule a deferred plot refresh to avoid blocking during rapid changes."""
         self._refresh_timer.start()  # Restarts the timer if already running
     
+    @timed("plot.refresh")
     def _refresh_plot(self) -> None:
         """Refresh plot with current normalization mode."""
+        # Peak markers sit at the previous display heights; they are rebuilt on demand
+        self._clear_peak_markers()
         # Batch plot updates to avoid incremental redraws during refresh
         try:
             self.plot.begin_bulk_update()
@@ -2482,7 +2911,7 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         # NIST collections: reassign colours and redraw visible sets
         try:
             self._nist_palette_index = 0
-            if hasattr(self, "nist_lines_panel") and self.nist_lines_panel is not None:
+            if self._nist_lines_panel is not None:
                 for cid in self.nist_lines_panel.get_collections():
                     color = self._next_nist_color()
                     if cid in self._nist_collections:
@@ -3284,7 +3713,12 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
         self._log("Remote Import", f"Successfully imported {count} dataset(s)")
 
     # ----------------------------- History helpers ----------------------
+    def _on_history_dock_visibility(self, visible: bool) -> None:
+        if visible and not self._history_loaded:
+            self._refresh_history_view()
+
     def _refresh_history_view(self) -> None:
+        self._history_loaded = True
         entries = []
         try:
             # Apply active search text if available
@@ -3362,6 +3796,8 @@ class SpectraMainWindow(QtWidgets.QMainWindow):
     def _on_inspector_tab_changed(self, index: int) -> None:
         """Update merge preview when the Math tab becomes visible."""
         try:
+            if self.inspector_tabs.widget(index) is getattr(self, "_remote_data_tab", None):
+                self._ensure_remote_data_panel()
             if self.inspector_tabs.tabText(index) == "Math":
                 self._update_merge_preview()
         except Exception:
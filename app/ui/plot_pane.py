@@ -17,6 +17,7 @@ except Exception:  # pragma: no cover
     pg = None  # type: ignore[assignment]
 
 from app.qt_compat import get_qt
+from app.services.spectrum_storage import envelope, is_read_only_mapping
 from app.ui.themes import ThemeDefinition, get_theme_definition
 from .palettes import DEFAULT_PALETTE_KEY, PaletteDefinition, load_palette_definitions
 
@@ -27,6 +28,11 @@ _: Any
 QtCore, QtGui, QtWidgets, _ = get_qt()
 
 
+def _retain(values: np.ndarray) -> np.ndarray:
+    # Mapped spectra are read-only; keep the view rather than copying the file into RAM
+    return values if is_read_only_mapping(values) else np.array(values, copy=True)
+
+
 @dataclass
 class TraceStyle:
     """Styling parameters for plot traces."""
@@ -142,19 +148,19 @@ class PlotPane(QtWidgets.QWidget):
         if key in self._traces:
             trace = self._traces[key]
             trace["alias"] = alias
-            trace["x_nm"] = np.array(x_nm, copy=True)
-            trace["y"] = np.array(y, copy=True)
+            trace["x_nm"] = _retain(x_nm)
+            trace["y"] = _retain(y)
             trace["style"] = style
-            trace["sigma"] = np.array(uncertainty, copy=True) if uncertainty is not None else None
-            trace["flags"] = np.array(quality_flags, copy=True) if quality_flags is not None else None
+            trace["sigma"] = _retain(uncertainty) if uncertainty is not None else None
+            trace["flags"] = _retain(quality_flags) if quality_flags is not None else None
             self._apply_style(key)
             self._update_curve(key)
             return
 
         # Create PlotDataItem without performance options that trigger bugs in pyqtgraph 0.13.7
         curve = pg.PlotDataItem()
-        x_copy = np.array(x_nm, copy=True)
-        y_copy = np.array(y, copy=True)
+        x_copy = _retain(x_nm)
+        y_copy = _retain(y)
         self._traces[key] = {
             "alias": alias,
             "x_nm": x_copy,
@@ -162,8 +168,8 @@ class PlotPane(QtWidgets.QWidget):
             "item": curve,
             "style": style,
             "visible": True,
-            "sigma": (np.array(uncertainty, copy=True) if uncertainty is not None else None),
-            "flags": (np.array(quality_flags, copy=True) if quality_flags is not None else None),
+            "sigma": (_retain(uncertainty) if uncertainty is not None else None),
+            "flags": (_retain(quality_flags) if quality_flags is not None else None),
             "err_item": None,
             "flag_items": [],
         }
@@ -533,33 +539,8 @@ class PlotPane(QtWidgets.QWidget):
     def _downsample_peak(
         self, x: np.ndarray, y: np.ndarray, max_points: int
     ) -> tuple[np.ndarray, np.ndarray]:
-        n = len(x)
-        if n <= max_points:
-            return x, y
-        step = int(np.ceil(n / max_points))
-        if step <= 1:
-            return x, y
-        trim = n - (n % step)
-        if trim <= 0:
-            return x[::step], y[::step]
-        xr = x[:trim].reshape(-1, step)
-        yr = y[:trim].reshape(-1, step)
-        x_bin = xr[:, 0]
-        y_min = yr.min(axis=1)
-        y_max = yr.max(axis=1)
-        out_n = x_bin.size * 2
-        xo = np.empty(out_n, dtype=x.dtype)
-        yo = np.empty(out_n, dtype=y.dtype)
-        xo[0::2] = x_bin
-        xo[1::2] = x_bin
-        yo[0::2] = y_min
-        yo[1::2] = y_max
-        if trim < n:
-            tail_x = x[trim:]
-            tail_y = y[trim:]
-            xo = np.concatenate([xo, tail_x])
-            yo = np.concatenate([yo, tail_y])
-        return xo, yo
+        # Chunked min/max envelope: mapped traces are decimated without a full read into RAM
+        return envelope(x, y, max_points)
 
     def _redraw_units(self) -> None:
         for key in self._traces:
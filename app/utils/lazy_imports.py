@@ -0,0 +1,47 @@
+"""Helpers for probing and deferring heavy optional imports.
+
+``importlib.util.find_spec("astroquery.nist")`` imports the ``astroquery``
+package (and with it most of astropy) just to answer "is this installed?".
+:func:`module_available` answers the same question by walking the package
+directories on disk, so provider/dependency checks stay cheap at startup.
+"""
+from __future__ import annotations
+
+import importlib.machinery
+import importlib.util
+from pathlib import Path
+import sys
+
+
+def module_available(name: str) -> bool:
+    """Return True if ``name`` can be imported, without importing any part of it."""
+    if name in sys.modules:
+        return True
+    head, _, tail = name.partition(".")
+    try:
+        spec = importlib.util.find_spec(head)
+    except (ImportError, ValueError):
+        return False
+    if spec is None:
+        return False
+    if not tail:
+        return True
+    if head in sys.modules:
+        # The parent is already loaded, so find_spec on the full name is cheap
+        try:
+            return importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            return False
+
+    suffixes = importlib.machinery.all_suffixes()
+    locations = [Path(loc) for loc in (spec.submodule_search_locations or [])]
+    for part in tail.split("."):
+        packages = [loc / part for loc in locations if (loc / part).is_dir()]
+        if packages:
+            locations = packages
+            continue
+        # A plain module can only be the last component
+        if part != tail.rsplit(".", 1)[-1]:
+            return False
+        return any((loc / f"{part}{suffix}").exists() for loc in locations for suffix in suffixes)
+    return True
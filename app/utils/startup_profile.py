@@ -0,0 +1,59 @@
+"""Per-phase startup timings for ``python -m app.main --profile-startup``.
+
+Each phase records wall time and how many modules it imported, which makes it
+easy to spot an eager import sneaking back into the launch path. The profiler
+is a no-op unless enabled, so ``main()`` can wrap phases unconditionally.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import sys
+import time
+from typing import Iterator, List
+
+# Optional modules we expect to stay unloaded until the user needs them
+HEAVY_MODULES = ("astropy", "astroquery", "requests", "pandas", "pyhdf", "osgeo")
+
+
+@dataclass
+class StartupPhase:
+    name: str
+    seconds: float
+    modules_imported: int
+
+
+@dataclass
+class StartupProfiler:
+    enabled: bool = False
+    phases: List[StartupPhase] = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter, repr=False)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                StartupPhase(name, time.perf_counter() - start, len(sys.modules) - modules_before)
+            )
+
+    def mark(self, name: str) -> None:
+        """Record an instantaneous milestone measured from profiler creation."""
+        if self.enabled:
+            self.phases.append(StartupPhase(name, time.perf_counter() - self._origin, 0))
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        width = max((len(p.name) for p in self.phases), default=0)
+        for p in self.phases:
+            imported = f"  (+{p.modules_imported} modules)" if p.modules_imported else ""
+            lines.append(f"  {p.name:<{width}}  {p.seconds * 1000.0:8.1f} ms{imported}")
+        loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+        lines.append(f"  heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+        return "\n".join(lines)
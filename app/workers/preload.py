@@ -0,0 +1,46 @@
+"""Startup preloading of the Docs index and bundled reference datasets.
+
+The main window starts this worker on a QThread right after construction so
+the Docs and Reference panes are ready by the time a user opens them.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.qt_compat import get_qt
+from app.services import ReferenceLibrary
+from app.services.docs_index import DocsIndex
+
+QtCore, QtGui, QtWidgets, _ = get_qt()  # type: ignore[misc]
+
+# Dynamic Signal/Slot resolution for PySide6/PyQt6 compatibility
+Signal = getattr(QtCore, "Signal", None)  # type: ignore[attr-defined]
+if Signal is None:  # pragma: no cover - compatibility shim
+    Signal = getattr(QtCore, "pyqtSignal")  # type: ignore[attr-defined]
+
+Slot = getattr(QtCore, "Slot", None)  # type: ignore[attr-defined]
+if Slot is None:  # pragma: no cover - compatibility shim
+    Slot = getattr(QtCore, "pyqtSlot")  # type: ignore[attr-defined]
+
+
+class PreloadWorker(QtCore.QObject):  # type: ignore[name-defined]
+    """Build the :class:`DocsIndex` and warm the reference library cache."""
+
+    finished = Signal(object)  # type: ignore[misc]
+    failed = Signal(str)  # type: ignore[misc]
+
+    def __init__(self, reference_library: ReferenceLibrary | None = None, docs_root: Path | None = None) -> None:
+        super().__init__()
+        self._reference_library = reference_library
+        self._docs_root = docs_root
+
+    @Slot()  # type: ignore[misc]
+    def run(self) -> None:
+        try:
+            if self._reference_library is not None:
+                self._reference_library.preload()
+            index = DocsIndex.build(self._docs_root)
+        except Exception as exc:  # pragma: no cover - defensive
+            self.failed.emit(str(exc))  # type: ignore[attr-defined]
+            return
+        self.finished.emit(index)  # type: ignore[attr-defined]
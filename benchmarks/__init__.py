@@ -0,0 +1 @@
+"""Performance benchmarks for Spectra's hot paths (``python -m benchmarks``)."""
@@ -0,0 +1,85 @@
+"""Command line entry point: ``python -m benchmarks``.
+
+Examples::
+
+    python -m benchmarks                          # quick profile, compare to baseline
+    python -m benchmarks -k ingest --profile full # only ingest cases, 1e4–1e7 rows
+    python -m benchmarks --output results.json    # archive machine-readable results
+    python -m benchmarks --update-baseline        # accept current timings
+
+Exit status is 1 when any case regresses past ``--tolerance``.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+from . import cases  # noqa: F401 - registers the benchmark cases
+from .harness import PROFILES, compare, format_comparison, load_results, run_suite, save_results, select_cases
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("-k", "--filter", action="append", default=[], help="Substring of case names to run (repeatable)")
+    parser.add_argument("--profile", choices=PROFILES, default="quick", help="Size tier to run (default: quick)")
+    parser.add_argument("--output", type=Path, help="Write results JSON to this path")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--no-compare", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument("--update-baseline", action="store_true", help="Merge these results into the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.50, help="Allowed fractional slowdown (default: 0.50)")
+    parser.add_argument("--no-normalise", action="store_true", help="Do not scale by the machine calibration run")
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    selected = select_cases(args.filter)
+    if args.list:
+        for case in selected:
+            sizes = ", ".join(str(s) for s in case.sizes[args.profile])
+            print(f"{case.name:<28} [{sizes}]  {case.description}")
+        return 0
+    if not selected:
+        print("No benchmark cases match the filter", file=sys.stderr)
+        return 2
+
+    payload = run_suite(selected, profile=args.profile, log=print)
+    if args.output:
+        save_results(payload, args.output)
+
+    baseline = load_results(args.baseline) if args.baseline.exists() else None
+    if args.update_baseline:
+        # Cases that could not run here should not become part of the baseline
+        payload = {key: value for key, value in payload.items() if key != "errors"}
+        if baseline is not None and baseline.get("profile") == payload["profile"]:
+            merged = dict(baseline)
+            merged["results"] = {**baseline.get("results", {}), **payload["results"]}
+            merged["machine"] = payload["machine"]
+            merged["created"] = payload["created"]
+            payload = merged
+        save_results(payload, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if args.no_compare or baseline is None:
+        return 0
+    comparisons = compare(payload, baseline, tolerance=args.tolerance, normalise=not args.no_normalise)
+    print()
+    print(format_comparison(comparisons))
+    regressions = [c for c in comparisons if c.regressed]
+    # A case that has a baseline but now errors is a regression too
+    broken = sorted(key for key in payload.get("errors", {}) if key in baseline.get("results", {}))
+    if regressions or broken:
+        if broken:
+            print(f"\nFailed to run: {', '.join(broken)}", file=sys.stderr)
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
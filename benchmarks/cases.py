@@ -0,0 +1,229 @@
+"""Benchmark cases for ingest, units, analysis, math, storage, plotting and startup.
+
+Every input is synthesised on the fly in the harness scratch directory, so the
+suite needs nothing beyond the app's own dependencies. Sizes are rows/points
+unless the case says otherwise.
+"""
+from __future__ import annotations
+
+from itertools import count
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+from typing import Callable
+
+import numpy as np
+
+from .harness import benchmark
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Plot and startup cases import Qt; never try to reach a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+INGEST_QUICK = (10_000, 100_000)
+INGEST_FULL = (10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _spectrum_arrays(size: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(size)
+    x = np.linspace(400.0, 2500.0, size)
+    y = 1.0 + 0.2 * np.sin(x / 37.0) + 0.01 * rng.standard_normal(size)
+    return x, y
+
+
+def _write_columns(path: Path, header: str, x: np.ndarray, y: np.ndarray, sep: str) -> None:
+    # np.savetxt formats row by row; building the text in bulk keeps 1e7-row setup tolerable
+    body = np.char.add(np.char.add(x.astype("U24"), sep), y.astype("U24"))
+    with path.open("w", encoding="utf-8") as handle:
+        if header:
+            handle.write(header + "\n")
+        handle.write("\n".join(body.tolist()))
+        handle.write("\n")
+
+
+def _ingest_runner(path: Path) -> Callable[[], object]:
+    from app.services import DataIngestService, UnitsService
+
+    service = DataIngestService(UnitsService())
+    return lambda: service.ingest(path)
+
+
+# ----------------------------------------------------------------------
+@benchmark("ingest.csv", quick=INGEST_QUICK, full=INGEST_FULL, repeat=3)
+def ingest_csv(size: int, workdir: Path) -> Callable[[], object]:
+    """DataIngestService.ingest on a two-column CSV."""
+    x, y = _spectrum_arrays(size)
+    path = workdir / "spectrum.csv"
+    _write_columns(path, "wavelength(nm),absorbance", x, y, ",")
+    return _ingest_runner(path)
+
+
+@benchmark("ingest.fits", quick=INGEST_QUICK, full=INGEST_FULL, repeat=3)
+def ingest_fits(size: int, workdir: Path) -> Callable[[], object]:
+    """DataIngestService.ingest on a binary-table FITS spectrum."""
+    from astropy.io import fits
+
+    x, y = _spectrum_arrays(size)
+    columns = [
+        fits.Column(name="WAVELENGTH", array=x, format="D", unit="nm"),
+        fits.Column(name="FLUX", array=y, format="D", unit="erg/s/cm2/angstrom"),
+    ]
+    path = workdir / "spectrum.fits"
+    fits.HDUList([fits.PrimaryHDU(), fits.BinTableHDU.from_columns(columns)]).writeto(path)
+    return _ingest_runner(path)
+
+
+@benchmark("ingest.jcamp", quick=INGEST_QUICK, full=INGEST_FULL, repeat=3)
+def ingest_jcamp(size: int, workdir: Path) -> Callable[[], object]:
+    """DataIngestService.ingest on an AFFN (X,Y) JCAMP-DX file."""
+    x, y = _spectrum_arrays(size)
+    wavenumber = 1e7 / x[::-1]
+    path = workdir / "spectrum.jdx"
+    header = "\n".join(
+        [
+            "##TITLE=Benchmark",
+            "##JCAMP-DX=4.24",
+            "##DATA TYPE=INFRARED SPECTRUM",
+            "##XUNITS=1/CM",
+            "##YUNITS=ABSORBANCE",
+            f"##NPOINTS={size}",
+            "##XYDATA=(X,Y)",
+        ]
+    )
+    _write_columns(path, header, wavenumber, y, ",")
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write("##END=\n")
+    return _ingest_runner(path)
+
+
+@benchmark("units.convert_arrays", quick=(100_000, 1_000_000), full=(100_000, 1_000_000, 10_000_000))
+def units_convert_arrays(size: int, workdir: Path) -> Callable[[], object]:
+    """UnitsService.convert_arrays nm/transmittance -> cm^-1/absorbance."""
+    from app.services import UnitsService
+
+    units = UnitsService()
+    x, y = _spectrum_arrays(size)
+    y = np.clip(y / 2.0, 1e-6, 1.0)
+    return lambda: units.convert_arrays(x, y, "nm", "transmittance", "cm^-1", "absorbance")
+
+
+@benchmark("analysis.find_peaks", quick=(100_000, 1_000_000), full=(100_000, 1_000_000, 10_000_000))
+def analysis_find_peaks(size: int, workdir: Path) -> Callable[[], object]:
+    """find_peaks full line list (no thresholds) on a noisy N-point trace."""
+    from app.utils.analysis import find_peaks
+
+    x, y = _spectrum_arrays(size)
+    return lambda: find_peaks(x, y)
+
+
+@benchmark("math.average", quick=(4, 16), full=(4, 16, 64))
+def math_average(size: int, workdir: Path) -> Callable[[], object]:
+    """MathService.average over N spectra of 20k points on offset grids."""
+    from app.services import MathService, Spectrum, UnitsService
+
+    service = MathService(UnitsService())
+    spectra = []
+    for i in range(size):
+        x, y = _spectrum_arrays(20_000)
+        spectra.append(
+            Spectrum.create(f"s{i}", x + 0.01 * i, y + 0.001 * i, x_unit="nm", y_unit="absorbance")
+        )
+    return lambda: service.average(spectra)
+
+
+@benchmark("store.record", quick=(1_000, 10_000), full=(1_000, 10_000, 100_000), repeat=3)
+def store_record(size: int, workdir: Path) -> Callable[[], object]:
+    """LocalStore.record of one small file into an index of N entries."""
+    from app.services import LocalStore
+
+    store = LocalStore(base_dir=workdir / "store")
+    store.data_dir.mkdir(parents=True, exist_ok=True)
+    items = {
+        f"{i:064x}": {
+            "sha256": f"{i:064x}",
+            "filename": f"file{i}.csv",
+            "stored_path": str(workdir / f"file{i}.csv"),
+            "original_path": str(workdir / f"file{i}.csv"),
+            "bytes": 1024,
+            "units": {"x": "nm", "y": "absorbance"},
+            "source": {"ingest": {"importer": "CsvImporter"}},
+            "created": "2025-01-01T00:00:00+00:00",
+            "updated": "2025-01-01T00:00:00+00:00",
+        }
+        for i in range(size)
+    }
+    store.index_path.write_text(json.dumps({"version": 1, "items": items}), encoding="utf-8")
+    counter = count()
+
+    def _run() -> object:
+        path = workdir / f"new-{next(counter)}.csv"
+        path.write_text(f"wavelength(nm),absorbance\n500,{path.name}\n", encoding="utf-8")
+        return store.record(path, x_unit="nm", y_unit="absorbance")
+
+    return _run
+
+
+@benchmark("plot.downsample_peak", quick=(1_000_000,), full=(1_000_000, 10_000_000))
+def plot_downsample_peak(size: int, workdir: Path) -> Callable[[], object]:
+    """PlotPane._downsample_peak min/max decimation to the default point cap."""
+    from app.ui.plot_pane import PlotPane
+
+    x, y = _spectrum_arrays(size)
+    # The method does not touch instance state, so no Qt widget is needed
+    return lambda: PlotPane._downsample_peak(None, x, y, PlotPane.DEFAULT_MAX_POINTS)  # type: ignore[arg-type]
+
+
+@benchmark("linelist.cache_lookup", quick=(100, 1_000), full=(100, 1_000, 10_000))
+def linelist_cache_lookup(size: int, workdir: Path) -> Callable[[], object]:
+    """LineListCache.get: 50 hits + 50 misses against a cache of N entries."""
+    from app.services.line_list_cache import LineListCache
+
+    cache = LineListCache(workdir / "line_lists")
+    lines = [{"wavelength_nm": 400.0 + i, "relative_intensity": 1.0} for i in range(200)]
+    for i in range(size):
+        cache.set("Fe", 1, 300.0 + i, 800.0 + i, {"lines": lines})
+    step = max(size // 50, 1)
+    hits = [(300.0 + i, 800.0 + i) for i in range(0, size, step)][:50]
+    misses = [(-1.0 - i, 1.0) for i in range(50)]
+
+    def _run() -> object:
+        found = [cache.get("Fe", 1, lo, hi) for lo, hi in hits]
+        found += [cache.get("Fe", 1, lo, hi) for lo, hi in misses]
+        return found
+
+    return _run
+
+
+_COLD_START_SCRIPT = """
+from app.qt_compat import get_qt
+_, _, QtWidgets, _ = get_qt()
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+from app.main import SpectraMainWindow
+window = SpectraMainWindow()
+window.show()
+app.processEvents()
+window.close()
+"""
+
+
+@benchmark("startup.cold_start", quick=(1,), repeat=3, warmup=False)
+def startup_cold_start(size: int, workdir: Path) -> Callable[[], object]:
+    """Fresh interpreter to first shown main window (offscreen Qt)."""
+    env = {
+        **os.environ,
+        "QT_QPA_PLATFORM": "offscreen",
+        "SPECTRA_DISABLE_PERSISTENCE": "1",
+        "PYTHONPATH": str(REPO_ROOT),
+    }
+
+    def _run() -> object:
+        return subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT],
+            cwd=REPO_ROOT,
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+    return _run
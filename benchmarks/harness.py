@@ -0,0 +1,270 @@
+"""Tiny benchmark harness: registry, timing, JSON results and baseline gates.
+
+Cases register a *setup* function with :func:`benchmark`. Setup receives the
+problem size and a scratch directory, builds whatever synthetic inputs it
+needs (untimed) and returns the zero-argument callable that is timed. Each
+case lists sizes per profile: ``quick`` is what CI and the pre-merge gate run,
+``full`` adds the 1e6–1e7 row tiers that take minutes.
+
+Results are plain JSON so they can be archived, diffed or plotted. When
+comparing against a baseline recorded on another machine, timings are scaled
+by a calibration workload (numpy sort + pure-Python loop) measured alongside
+every run, which keeps a faster/slower box from reading as a regression.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+import platform
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+PROFILES = ("quick", "full")
+# Stop repeating a case once this much wall time has been spent on it...
+TIME_BUDGET_S = 5.0
+# ...but keep sampling fast cases for at least this long so best-of-N is stable
+MIN_TIME_S = 0.5
+MAX_REPEATS = 200
+
+SetupFn = Callable[[int, Path], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    setup: SetupFn
+    sizes: Mapping[str, Sequence[int]]
+    repeat: int = 5  # minimum timed runs; fast cases sample for MIN_TIME_S
+    warmup: bool = True
+    description: str = ""
+
+
+@dataclass
+class Measurement:
+    case: str
+    size: int
+    times_s: List[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}[{self.size}]"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "case": self.case,
+            "size": self.size,
+            "repeats": len(self.times_s),
+            "min_s": min(self.times_s),
+            "median_s": statistics.median(self.times_s),
+            "mean_s": statistics.fmean(self.times_s),
+        }
+
+
+REGISTRY: Dict[str, Case] = {}
+
+
+def benchmark(
+    name: str,
+    *,
+    quick: Sequence[int],
+    full: Sequence[int] | None = None,
+    repeat: int = 5,
+    warmup: bool = True,
+) -> Callable[[SetupFn], SetupFn]:
+    """Register ``setup`` as benchmark ``name`` with per-profile sizes."""
+
+    def _decorator(setup: SetupFn) -> SetupFn:
+        doc = (setup.__doc__ or "").strip().splitlines()
+        REGISTRY[name] = Case(
+            name=name,
+            setup=setup,
+            sizes={"quick": tuple(quick), "full": tuple(full if full is not None else quick)},
+            repeat=repeat,
+            warmup=warmup,
+            description=doc[0] if doc else "",
+        )
+        return setup
+
+    return _decorator
+
+
+# ----------------------------------------------------------------------
+def calibrate() -> float:
+    """Best-of-N seconds for a fixed numpy + interpreter workload on this machine.
+
+    Cases are compared on their fastest run, so the calibration uses its
+    fastest run too; a median of a few runs swings with scheduler noise.
+    """
+
+    rng = np.random.default_rng(0)
+    data = rng.random(1_000_000)
+
+    def _work() -> None:
+        np.sort(data)
+        total = 0
+        for i in range(300_000):
+            total += i
+
+    timings = []
+    for _ in range(7):
+        start = time.perf_counter()
+        _work()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(case: Case, size: int, workdir: Path) -> Measurement:
+    run = case.setup(size, workdir)
+    result = Measurement(case.name, size)
+    spent = 0.0
+    if case.warmup:
+        start = time.perf_counter()
+        run()
+        spent += time.perf_counter() - start
+    while True:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        result.times_s.append(elapsed)
+        spent += elapsed
+        done = len(result.times_s)
+        if spent > TIME_BUDGET_S or done >= MAX_REPEATS:
+            break
+        if done >= case.repeat and spent >= MIN_TIME_S:
+            break
+    return result
+
+
+def select_cases(patterns: Iterable[str] | None = None) -> List[Case]:
+    patterns = [p for p in (patterns or []) if p]
+    cases = sorted(REGISTRY.values(), key=lambda c: c.name)
+    if not patterns:
+        return cases
+    return [c for c in cases if any(p in c.name for p in patterns)]
+
+
+def run_suite(
+    cases: Sequence[Case],
+    *,
+    profile: str = "quick",
+    log: Callable[[str], None] | None = None,
+) -> Dict[str, Any]:
+    """Run ``cases`` for ``profile`` and return a JSON-ready results payload."""
+
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile {profile!r}; expected one of {PROFILES}")
+    results: Dict[str, Dict[str, Any]] = {}
+    # A case that cannot run here (missing optional dependency, broken wheel)
+    # is reported rather than aborting the whole suite
+    errors: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory(prefix="spectra-bench-") as tmp:
+        for case in cases:
+            for size in case.sizes[profile]:
+                key = Measurement(case.name, size).key
+                workdir = Path(tmp) / f"{case.name}-{size}"
+                workdir.mkdir(parents=True, exist_ok=True)
+                try:
+                    measurement = measure(case, size, workdir)
+                except Exception as exc:
+                    errors[key] = f"{type(exc).__name__}: {exc}"
+                    if log is not None:
+                        log(f"{key:<40} ERROR {errors[key]}")
+                    continue
+                results[key] = measurement.as_dict()
+                if log is not None:
+                    log(f"{key:<40} median {results[key]['median_s'] * 1e3:10.2f} ms")
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "profile": profile,
+        "machine": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "calibration_s": calibrate(),
+        },
+        "results": results,
+        "errors": errors,
+    }
+
+
+# ----------------------------------------------------------------------
+@dataclass(frozen=True)
+class Comparison:
+    key: str
+    baseline_s: float
+    current_s: float
+    ratio: float
+    regressed: bool
+
+
+def compare(
+    current: Mapping[str, Any],
+    baseline: Mapping[str, Any],
+    *,
+    tolerance: float = 0.50,
+    min_delta_s: float = 0.002,
+    normalise: bool = True,
+) -> List[Comparison]:
+    """Compare best-of-N (``min_s``) timings; a case regresses when it is slower
+    by more than ``tolerance`` (fractional) *and* by more than ``min_delta_s``
+    seconds. The minimum is far less sensitive to a busy machine than the
+    median, which is still recorded for trend plots.
+
+    Keys missing from either side are skipped, so adding a case never fails
+    the gate until a baseline that includes it is recorded.
+    """
+
+    scale = 1.0
+    if normalise:
+        cur_cal = current.get("machine", {}).get("calibration_s")
+        base_cal = baseline.get("machine", {}).get("calibration_s")
+        if cur_cal and base_cal:
+            scale = float(base_cal) / float(cur_cal)
+
+    comparisons: List[Comparison] = []
+    base_results = baseline.get("results", {})
+    for key, entry in sorted(current.get("results", {}).items()):
+        base_entry = base_results.get(key)
+        if base_entry is None:
+            continue
+        base_s = float(base_entry["min_s"])
+        cur_s = float(entry["min_s"]) * scale
+        ratio = cur_s / base_s if base_s > 0 else float("inf")
+        regressed = ratio > 1.0 + tolerance and (cur_s - base_s) > min_delta_s
+        comparisons.append(Comparison(key, base_s, cur_s, ratio, regressed))
+    return comparisons
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    lines = [f"{'case':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}"]
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(
+            f"{c.key:<40} {c.baseline_s * 1e3:12.2f} {c.current_s * 1e3:12.2f} {c.ratio:7.2f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    if payload.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path} uses benchmark schema {payload.get('schema')!r}, expected {SCHEMA_VERSION}")
+    return payload
+
+
+def save_results(payload: Mapping[str, Any], path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2, sort_keys=True)
+        handle.write("\n")
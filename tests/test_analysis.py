@@ -2,7 +2,10 @@ import numpy as np
 from numpy.typing import NDArray
 
 from app.utils.analysis import (
+    PEAK_DTYPE,
     find_local_maxima,
+    find_peaks,
+    peak_prominences,
     peak_near,
     centroid,
     fwhm,
@@ -56,3 +59,65 @@ def test_find_local_maxima_basic():
     idxs = np.nonzero(m)[0]
     # Expect peaks at positions 1, 3, 5
     assert list(idxs) == [1, 3, 5]
+
+
+def test_find_local_maxima_window_and_nan_handling():
+    y = np.array([0, 1, 5, 1, 0, 3, 4, 0, 0], dtype=float)
+    # window=2 compares against two samples on each side
+    assert list(np.nonzero(find_local_maxima(y, window=2))[0]) == [2, 6]
+    # Windows touching a NaN never qualify
+    y_nan = np.array([0, 2, 0, 1, np.nan, 0, 3, 0], dtype=float)
+    assert list(np.nonzero(find_local_maxima(y_nan, window=1))[0]) == [1, 6]
+
+
+def test_peak_prominences_match_topographic_definition():
+    # Small peak (2) sits in the valley between two larger ones; its base is
+    # the higher of the two surrounding minima (1 on the left, 0.5 on the right).
+    y = np.array([0, 5, 1, 2, 0.5, 4, 0], dtype=float)
+    prom = peak_prominences(y, np.array([1, 3, 5]))
+    assert np.allclose(prom, [5.0, 1.0, 3.5])
+
+
+def test_peak_prominences_match_brute_force_on_random_walks():
+    def reference(y: NDArray[np.floating], i: int) -> float:
+        bases = []
+        for side in (y[i::-1], y[i:]):
+            side = side[np.isfinite(side)]
+            higher = np.nonzero(side > y[i])[0]
+            bases.append(side[: higher[0] if higher.size else side.size].min())
+        return float(y[i] - max(bases))
+
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        # Long monotonic climbs make the base searches span many peaks
+        y = np.cumsum(rng.normal(0.05, 1.0, size=400))
+        y[rng.random(y.size) < 0.03] = np.nan
+        peaks = np.nonzero(find_local_maxima(y, window=1))[0]
+        expected = [reference(y, i) for i in peaks]
+        assert np.allclose(peak_prominences(y, peaks), expected)
+
+
+def test_find_peaks_measures_all_lines_in_bulk():
+    rng = np.random.default_rng(1)
+    x = np.linspace(400.0, 700.0, 30001)
+    centres = [450.0, 520.0, 610.0]
+    y = sum(_gaussian(x, mu, 1.5, amp) for mu, amp in zip(centres, [1.0, 0.6, 0.8]))
+    y = y + 0.1 + rng.normal(0.0, 0.01, size=x.size)
+
+    peaks = find_peaks(x, y, min_snr=10.0)
+
+    assert peaks.dtype == PEAK_DTYPE
+    assert peaks.size == 3
+    assert np.allclose(peaks["centroid"], centres, atol=0.05)
+    # Widths are measured at half prominence, so the 0.1 baseline drops out
+    assert np.allclose(peaks["fwhm"], 2.35482 * 1.5, atol=0.1)
+    assert np.all(peaks["snr"] > 10.0)
+    assert np.allclose(peaks["prominence"], [1.0, 0.6, 0.8], atol=0.08)
+
+
+def test_find_peaks_limits_and_empty_input():
+    x = np.linspace(0.0, 10.0, 1001)
+    y = _gaussian(x, 3.0, 0.2, 1.0) + _gaussian(x, 7.0, 0.2, 0.5)
+    top = find_peaks(x, y, max_peaks=1)
+    assert top.size == 1 and abs(top["x"][0] - 3.0) < 0.02
+    assert find_peaks(x[:2], y[:2]).size == 0
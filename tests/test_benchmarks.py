@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.harness import Case, compare, measure
+
+
+def _payload(calibration: float, **medians: float) -> dict:
+    return {
+        "schema": 1,
+        "machine": {"calibration_s": calibration},
+        "results": {key: {"min_s": value, "median_s": value} for key, value in medians.items()},
+    }
+
+
+def test_measure_collects_at_least_requested_repeats(tmp_path: Path) -> None:
+    calls: list[int] = []
+
+    def _setup(size: int, workdir: Path):
+        assert workdir == tmp_path
+        return lambda: calls.append(size)
+
+    result = measure(Case("noop", _setup, {"quick": (3,)}, repeat=4), 3, tmp_path)
+
+    assert result.key == "noop[3]"
+    assert len(result.times_s) >= 4
+    assert len(calls) == len(result.times_s) + 1  # one untimed warm-up call
+    assert set(result.as_dict()) >= {"min_s", "median_s", "mean_s", "repeats"}
+
+
+def test_compare_flags_regressions_and_normalises_machine_speed() -> None:
+    baseline = _payload(0.02, **{"a[1]": 0.100, "b[1]": 0.100, "tiny[1]": 0.0001})
+    current = _payload(0.02, **{"a[1]": 0.200, "b[1]": 0.110, "tiny[1]": 0.0010, "new[1]": 1.0})
+
+    by_key = {c.key: c for c in compare(current, baseline, tolerance=0.5)}
+
+    assert by_key["a[1]"].regressed
+    assert not by_key["b[1]"].regressed
+    # Ten times slower but under the absolute noise floor
+    assert not by_key["tiny[1]"].regressed
+    # Cases without a baseline are not judged
+    assert "new[1]" not in by_key
+
+    # The same timings on a machine twice as slow are not a regression
+    slow_machine = _payload(0.04, **{"a[1]": 0.200})
+    assert not compare(slow_machine, baseline, tolerance=0.5)[0].regressed
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.docs_index import DocsIndex
+from app.services.reference_library import ReferenceLibrary
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_docs_index_titles_categories_and_cached_text(tmp_path: Path) -> None:
+    _write(tmp_path / "user" / "units.md", "# Units reference\n\nConvert nanometres to wavenumber.\n")
+    _write(tmp_path / "user" / "untitled_guide.md", "No heading here.\n")
+
+    index = DocsIndex.build(tmp_path)
+
+    assert len(index) == 2
+    titles = {entry.title for entry in index.entries}
+    assert titles == {"Units reference", "Untitled Guide"}
+    assert {entry.category for entry in index.entries} == {"User"}
+    entry = index.entry_for(tmp_path / "user" / "units.md")
+    assert entry is not None and "wavenumber" in entry.text
+    assert not entry.is_stale()
+
+
+def test_docs_index_search_matches_all_terms_by_prefix(tmp_path: Path) -> None:
+    _write(tmp_path / "user" / "flags.md", "# Quality flags\n\nUncertainty arrays travel with spectra.\n")
+    _write(tmp_path / "user" / "primer.md", "# Primer\n\nUncertainty is mentioned here. Uncertainty again.\n")
+    _write(tmp_path / "user" / "remote.md", "# Remote data\n\nSearch MAST archives.\n")
+
+    index = DocsIndex.build(tmp_path)
+
+    hits = [entry.title for entry in index.search("uncert")]
+    assert set(hits) == {"Quality flags", "Primer"}
+    # Both terms must match, and the title hit ranks first
+    assert [entry.title for entry in index.search("flag uncert")] == ["Quality flags"]
+    assert [entry.title for entry in index.search("qual")] == ["Quality flags"]
+    assert index.search("nonexistentterm") == []
+    assert len(index.search("  ")) == 3
+
+
+def test_reference_library_preload_fills_cache() -> None:
+    library = ReferenceLibrary()
+    assert library.preload() == 4
+    assert len(library._cache) == 4
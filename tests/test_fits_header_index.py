@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from app.services import FitsHeaderIndex, LocalStore
+from app.services.fits_header_index import read_fits_headers
+
+SAMPLES = Path("samples/fits data")
+
+
+def test_read_fits_headers_skips_data_blocks():
+    headers = read_fits_headers(SAMPLES / "jupiter__9408090029N_vo.fits")
+    assert len(headers) == 2
+    assert headers[0]["OBJECT"] == "Jupiter"
+    assert headers[1]["XTENSION"] == "BINTABLE"
+    assert headers[1]["TTYPE1"] == "WAVE"
+
+
+def test_index_queries_and_reuses_cache(tmp_path: Path):
+    cache = tmp_path / "fits_headers.json"
+    index = FitsHeaderIndex(roots=[SAMPLES], cache_path=cache)
+    assert index.refresh() == len(index) > 0
+
+    tess = index.query(instrument="tess photometer")
+    assert tess and all(r.target == "TIC 388857263" for r in tess)
+    jupiter = index.query(target="jupiter")
+    assert len(jupiter) == 1
+    assert jupiter[0].telescope == "EUVE"
+    # TDMIN1/TDMAX1 are in Angstrom (70.05-699.8)
+    assert abs(jupiter[0].wavelength_min_nm - 7.005) < 1e-6
+    assert index.query(target="jupiter", wavelength_nm=(60.0, 100.0)) == jupiter
+    assert index.query(target="jupiter", wavelength_nm=500.0) == []
+    assert "TESS" in index.distinct("telescope")
+
+    warm = FitsHeaderIndex(roots=[SAMPLES], cache_path=cache)
+    assert len(warm) == len(index)
+    assert warm.refresh() == 0
+    assert warm.query(target="jupiter") == jupiter
+
+
+def test_index_uses_store_digests(tmp_path: Path):
+    store = LocalStore(base_dir=tmp_path / "store")
+    entry = store.record(SAMPLES / "jupiter__9408090029N_vo.fits", x_unit="nm", y_unit="absorbance")
+
+    index = FitsHeaderIndex(store, roots=[], cache_path=tmp_path / "cache.json")
+    index.refresh()
+
+    record = index.record_for(Path(entry["stored_path"]))
+    assert record is not None
+    assert record.sha256 == entry["sha256"]
+    assert record.target == "Jupiter"
+
+
+def test_index_skips_unreadable_files(tmp_path: Path):
+    (tmp_path / "folder.fits").mkdir()
+    # A complete header block without SIMPLE = T is not FITS
+    (tmp_path / "garbage.fits").write_bytes(b"END".ljust(2880))
+    good = SAMPLES / "jupiter__9408090029N_vo.fits"
+
+    index = FitsHeaderIndex(roots=[], cache_path=tmp_path / "cache.json")
+
+    assert index.refresh([tmp_path / "folder.fits", tmp_path / "garbage.fits", good]) == 1
+    assert index.record_for(good) is not None and len(index) == 1
@@ -0,0 +1,126 @@
+"""Single-pass fan-out of multi-order / multi-extension FITS products."""
+
+from pathlib import Path
+import importlib.util
+
+import numpy as np
+import pytest
+
+from app.services import DataIngestService, UnitsService
+from app.services.importers import FitsImporter
+
+pytestmark = pytest.mark.skipif(
+    importlib.util.find_spec("astropy.io.fits") is None,
+    reason="astropy is required for FITS ingestion tests",
+)
+
+def _write_echelle_table(path: Path, orders: int, npix: int, wave_unit: str = "nm") -> np.ndarray:
+    """BINTABLE with one echelle order per row in vector columns."""
+    from astropy.io import fits
+
+    wave = np.array([np.linspace(500 + 100 * o, 590 + 100 * o, npix) for o in range(orders)])
+    flags = np.zeros((orders, npix), dtype=np.int32)
+    flags[:, 0] = 1
+    columns = [
+        fits.Column(name="WAVELENGTH", array=wave, format=f"{npix}D", unit=wave_unit),
+        fits.Column(name="FLUX", array=wave / 1000.0, format=f"{npix}D"),
+        fits.Column(name="FLUX_ERROR", array=np.full((orders, npix), 0.01), format=f"{npix}D"),
+        fits.Column(name="DQ", array=flags, format=f"{npix}J"),
+    ]
+    table = fits.BinTableHDU.from_columns(columns, name="ECHELLE")
+    table.header["OBJECT"] = "Echelle star"
+    fits.HDUList([fits.PrimaryHDU(), table]).writeto(path)
+    return wave
+
+
+def _write_spextool_cube(path: Path, orders: int, npix: int) -> np.ndarray:
+    """Primary image shaped (orders, 4, N): wavelength, flux, error, flags."""
+    from astropy.io import fits
+
+    cube = np.zeros((orders, 4, npix), dtype=np.float32)
+    for o in range(orders):
+        cube[o, 0] = np.linspace(1.0 + o, 1.9 + o, npix)
+        cube[o, 1] = 2.0 + o
+        cube[o, 2] = 0.1
+    cube[:, 3, -1] = 2
+    primary = fits.PrimaryHDU(cube)
+    primary.header["XUNITS"] = "um"
+    primary.header["ORDERS"] = ",".join(str(3 + o) for o in range(orders))
+    primary.header["OBJECT"] = "Cube star"
+    primary.writeto(path)
+    return cube
+
+
+def test_echelle_table_fans_out_orders_with_uncertainty_and_flags(tmp_path: Path):
+    path = tmp_path / "echelle.fits"
+    wave = _write_echelle_table(path, orders=6, npix=50)
+
+    spectra = DataIngestService(UnitsService()).ingest(path)
+
+    assert len(spectra) == 6
+    assert [s.metadata["fits_member"]["order"] for s in spectra] == [1, 2, 3, 4, 5, 6]
+    assert len({s.name for s in spectra}) == 6
+    for spectrum, expected in zip(spectra, wave):
+        np.testing.assert_allclose(spectrum.x, expected)
+        np.testing.assert_allclose(spectrum.uncertainty, 0.01)
+        assert spectrum.quality_flags is not None
+        assert spectrum.quality_flags[0] != 0 and not spectrum.quality_flags[1:].any()
+        assert spectrum.metadata["ingest"]["bundle_member"].startswith("hdu1-order")
+
+
+def test_bundle_members_lowercase_units_like_single_spectra(tmp_path: Path):
+    single = tmp_path / "single.fits"
+    _write_echelle_table(single, orders=1, npix=20, wave_unit="PIXEL")
+    multi = tmp_path / "multi.fits"
+    _write_echelle_table(multi, orders=3, npix=20, wave_unit="PIXEL")
+
+    assert FitsImporter().read(single).x_unit == "pixel"
+    result = FitsImporter().read(multi)
+    assert result.x_unit == "pixel"
+    assert [m["x_unit"] for m in result.metadata["bundle"]["members"]] == ["pixel"] * 3
+
+
+def test_spextool_cube_orders_and_wavelength_window(tmp_path: Path):
+    path = tmp_path / "cube.fits"
+    _write_spextool_cube(path, orders=3, npix=40)
+
+    result = FitsImporter().read(path)
+    members = result.metadata["bundle"]["members"]
+    assert result.metadata["bundle"]["format"] == "fits-multi-extension"
+    assert [m["metadata"]["fits_member"]["order"] for m in members] == [3, 4, 5]
+    assert all(m["x_unit"] == "um" for m in members)
+    np.testing.assert_allclose(members[1]["y"], 3.0)
+    np.testing.assert_allclose(members[1]["uncertainty"], 0.1, rtol=1e-6)
+    assert members[2]["quality_flags"][-1] != 0
+
+    # 1.2-1.5 um only overlaps the first order
+    windowed = FitsImporter().read(path, wavelength_range=(1200.0, 1500.0))
+    assert "bundle" not in windowed.metadata
+    assert windowed.metadata["fits_member"]["order"] == 3
+    assert windowed.x.min() >= 1.2 and windowed.x.max() <= 1.5
+    assert windowed.uncertainty is not None and windowed.uncertainty.size == windowed.x.size
+
+
+def test_plain_float_columns_are_mapped_from_the_file(tmp_path: Path):
+    from astropy.io import fits
+
+    path = tmp_path / "table.fits"
+    wave = np.linspace(400.0, 700.0, 500)
+    flux = np.linspace(1.0, 2.0, 500, dtype=np.float32)
+    columns = [
+        fits.Column(name="WAVELENGTH", array=wave, format="D", unit="nm"),
+        fits.Column(name="FLUX", array=flux, format="E"),
+        fits.Column(name="FLUX_ERROR", array=np.full(500, 7, dtype=np.int16), format="I"),
+    ]
+    fits.HDUList([fits.PrimaryHDU(), fits.BinTableHDU.from_columns(columns)]).writeto(path)
+
+    result = FitsImporter().read(path)
+
+    # Float columns page in from the file on demand; the integer one is copied as floats
+    assert isinstance(result.x.base, np.memmap) and isinstance(result.y.base, np.memmap)
+    assert not isinstance(result.uncertainty.base, np.memmap)
+    np.testing.assert_array_equal(result.x, wave)
+    np.testing.assert_array_equal(result.y, flux)
+    spectrum = DataIngestService(UnitsService()).ingest(path)[0]
+    np.testing.assert_allclose(spectrum.y, flux)
+    assert spectrum.y.dtype.isnative
@@ -5,7 +5,7 @@ import importlib.util
 import numpy as np
 import pytest
 
-from app.services import DataIngestService, UnitsService
+from app.services import DataIngestService, Spectrum, UnitsService
 from app.services.importers import FitsImporter
 
 
@@ -92,6 +92,34 @@ def test_fits_importer_handles_tess_lightcurve():
     assert result.x.size == result.y.size
 
 
+def test_fits_importer_wavelength_range_reads_window_only():
+    if importlib.util.find_spec("astropy.io.fits") is None:
+        pytest.skip("astropy is required for FITS ingestion tests")
+
+    path = Path(
+        "samples/fits data/SpeX 0.7-5.3 Micron Medium-Resolution Spectrograph and Imager/C-J4.5IIIa_C26j6_HD70138.fits"
+    )
+    importer = FitsImporter()
+    full = importer.read(path)
+    window = importer.read(path, wavelength_range=(1500.0, 1000.0))
+
+    assert window.x_unit == "um"
+    assert 0 < window.x.size < full.x.size
+    assert window.x.min() >= 1.0 and window.x.max() <= 1.5
+    selection = window.metadata["fits_selection"]
+    assert selection["wavelength_range_nm"] == [1000.0, 1500.0]
+    assert selection["total_points"] == full.x.size
+    start = int(np.searchsorted(full.x, window.x[0]))
+    np.testing.assert_array_equal(window.y, full.y[start : start + window.y.size])
+
+
+def test_ingest_wavelength_range_crops_non_fits_importers():
+    service = build_ingest_service()
+    spectrum = service.ingest(Path("samples/sample_spectrum.csv"), wavelength_range=(450.0, 550.0))[0]
+    assert spectrum.x.size > 0
+    assert spectrum.x.min() >= 450.0 and spectrum.x.max() <= 550.0
+
+
 def test_export_bundle_csv_roundtrip(tmp_path: Path):
     service = build_ingest_service()
     bundle_path = tmp_path / "bundle.csv"
@@ -114,3 +142,63 @@ def test_export_bundle_csv_roundtrip(tmp_path: Path):
         assert spectrum.x_unit == "nm"
         assert spectrum.y_unit == "absorbance"
         assert spectrum.metadata.get("ingest", {}).get("bundle_member")
+
+
+def test_ingest_wavelength_range_crops_every_bundle_member(tmp_path: Path):
+    from app.services.provenance_service import ProvenanceService
+
+    x = np.array([400.0, 410.0, 420.0, 430.0])
+    units = {"x_unit": "nm", "y_unit": "absorbance"}
+    first = Spectrum.create(
+        "first", x, x / 100.0, uncertainty=np.full(4, 0.01), quality_flags=np.arange(4, dtype=np.uint8), **units
+    )
+    second = Spectrum.create("second", x[::-1], x / 50.0, **units)
+    path = ProvenanceService().write_binary_bundle(tmp_path / "bundle.npz", [first, second])
+
+    spectra = build_ingest_service().ingest(path, wavelength_range=(405.0, 425.0))
+
+    assert [s.x.tolist() for s in spectra] == [[410.0, 420.0], [420.0, 410.0]]
+    assert spectra[0].y.tolist() == [4.1, 4.2]
+    assert spectra[1].y.tolist() == [8.2, 8.4]
+    assert spectra[0].uncertainty.tolist() == [0.01, 0.01]
+    assert spectra[0].quality_flags.tolist() == [1, 2]
+    assert spectra[0].metadata["wavelength_range_nm"] == [405.0, 425.0]
+
+
+class _Float32Importer:
+    def read(self, path: Path):
+        from app.services.importers import ImporterResult
+
+        x = np.linspace(1.0, 2.0, 8, dtype=np.float32)
+        return ImporterResult(
+            name=path.stem,
+            x=x,
+            y=np.sin(x).astype(np.float32),
+            x_unit="um",
+            y_unit="absorbance",
+            uncertainty=np.full(8, 0.1, dtype=np.float32),
+        )
+
+
+def test_precision_policy_keeps_float32_sources(tmp_path: Path):
+    service = build_ingest_service()
+    service.register_importer({".f32"}, _Float32Importer())
+    path = tmp_path / "detector.f32"
+    path.write_bytes(b"\0")
+
+    default = service.ingest(path)[0]
+    single = service.ingest(path, precision="source")[0]
+
+    assert default.y.dtype == np.float64
+    assert single.y.dtype == np.float32 and single.uncertainty.dtype == np.float32
+    assert single.x.dtype == np.float64 and np.allclose(single.x, default.x)
+    assert single.nbytes < default.nbytes
+
+    units = service.units_service
+    x_disp, y_disp, _ = units.convert(single, "cm^-1", "transmittance")
+    x_ref, y_ref, _ = units.convert(default, "cm^-1", "transmittance")
+    assert y_disp.dtype == np.float32 and x_disp.dtype == np.float64
+    assert np.allclose(y_disp, y_ref, rtol=1e-6) and np.array_equal(x_disp, x_ref)
+
+    with pytest.raises(ValueError):
+        service.ingest(path, precision="half")
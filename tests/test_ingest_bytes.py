@@ -0,0 +1,77 @@
+"""ingest_bytes parses payloads in memory and stores them without temp files."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+from pathlib import Path
+import tempfile
+
+import numpy as np
+import pytest
+
+from app.services import DataIngestService, ProvenanceService, UnitsService
+from app.services.store import LocalStore
+
+SAMPLE_FITS = Path("samples/fits data/jupiter__9408090029N_vo.fits")
+
+
+@pytest.fixture()
+def no_temp_files(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("ingest_bytes should not spill to a temporary file")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", _fail)
+
+
+def test_csv_payload_goes_straight_into_the_store(tmp_path: Path, no_temp_files: None):
+    payload = b"wavelength_nm,absorbance\n400,0.1\n500,0.2\n600,0.3\n"
+    store = LocalStore(base_dir=tmp_path / "store")
+    service = DataIngestService(UnitsService(), store=store)
+
+    spectrum = service.ingest_bytes(memoryview(payload), suggested_name="remote_product.csv")[0]
+
+    np.testing.assert_allclose(spectrum.x, [400.0, 500.0, 600.0])
+    record = spectrum.metadata["cache_record"]
+    assert record["sha256"] == hashlib.sha256(payload).hexdigest()
+    assert record["original_path"] == "remote_product.csv"
+    assert Path(record["stored_path"]).read_bytes() == payload
+
+
+def test_payload_type_is_sniffed_without_a_name(no_temp_files: None):
+    payload = b"##TITLE=Remote\n##XUNITS=1/CM\n##XYDATA=(X,Y)\n4000,0.1\n3000,0.2\n##END=\n"
+
+    spectrum = DataIngestService(UnitsService()).ingest_bytes(payload)[0]
+
+    assert spectrum.name == "Remote"
+    with pytest.raises(ValueError, match="Unable to determine file type"):
+        DataIngestService(UnitsService()).ingest_bytes(b"just some words")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("astropy.io.fits") is None, reason="astropy is required")
+def test_fits_payload_matches_file_ingest(no_temp_files: None):
+    service = DataIngestService(UnitsService())
+    from_file = service.ingest(SAMPLE_FITS)[0]
+
+    from_bytes = service.ingest_bytes(bytearray(SAMPLE_FITS.read_bytes()), extension="fits")[0]
+
+    np.testing.assert_array_equal(from_bytes.x, from_file.x)
+    np.testing.assert_array_equal(from_bytes.y, from_file.y)
+
+
+def test_payload_never_vouches_for_a_same_named_file_on_disk(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, no_temp_files: None
+):
+    payload = b"wavelength_nm,absorbance\n400,0.1\n500,0.2\n600,0.3\n"
+    monkeypatch.chdir(tmp_path)
+    # An unrelated file of the same name and size in the working directory
+    (tmp_path / "spectrum.csv").write_bytes(payload.replace(b"0.3", b"0.9"))
+    store = LocalStore(base_dir=tmp_path / "store")
+
+    spectrum = DataIngestService(UnitsService(), store=store).ingest_bytes(payload, suggested_name="spectrum.csv")[0]
+
+    assert spectrum.source_path is None
+    record = spectrum.metadata["cache_record"]
+    assert "mtime_ns" not in record and "inode" not in record
+    export = ProvenanceService().export_bundle([spectrum], tmp_path / "bundle" / "manifest.json")
+    assert export["sources_dir"] is None
@@ -18,3 +18,61 @@ def test_jcamp_ingest_fixture():
     assert np.allclose(spectrum.x, expected_nm)
     assert spectrum.metadata["source_units"] == {"x": "cm^-1", "y": "absorbance"}
 
+
+
+def test_jcamp_asdf_compressed_table(tmp_path: Path):
+    # Y = 10, 12, 15, 15, 15, 14 | 14 (Y-check), 10, 0, 0, -5; DUP 'T' repeats '%'
+    path = tmp_path / "compressed.jdx"
+    path.write_text(
+        "##TITLE=Compressed\n"
+        "##JCAMP-DX=4.24\n"
+        "##XUNITS=1/CM\n"
+        "##YUNITS=ABSORBANCE\n"
+        "##FIRSTX=1000\n"
+        "##LASTX=1009\n"
+        "##YFACTOR=0.5\n"
+        "##NPOINTS=10\n"
+        "##XYDATA=(X++(Y..Y))\n"
+        "1000A0KL%Tj\n"
+        "1006A4m@%e\n"
+        "##END=\n"
+    )
+
+    from app.services.importers import JcampImporter
+
+    result = JcampImporter().read(path)
+
+    assert result.metadata["jcamp_data"]["compressed"] is True
+    assert result.metadata["jcamp_data"]["ycheck_failures"] == 0
+    np.testing.assert_allclose(result.y, np.array([10, 12, 15, 15, 15, 14, 10, 0, 0, -5]) * 0.5)
+    np.testing.assert_allclose(result.x, np.arange(1000.0, 1010.0))
+    assert result.x_unit == "cm^-1"
+
+
+def test_jcamp_x_from_line_abscissae_and_link_bundle(tmp_path: Path):
+    path = tmp_path / "link.jdx"
+    block = (
+        "##TITLE={title}\n"
+        "##XUNITS=NANOMETERS\n"
+        "##FIRSTX=400\n"
+        "##LASTX=407\n"
+        "##NPOINTS=8\n"
+        "##XYDATA=(X++(Y..Y))\n"
+        "400 1 2 3 4 $$ first half\n"
+        "404 {tail}\n"
+        "##END=\n"
+    )
+    path.write_text(
+        "##TITLE=Linked pair\n##DATA TYPE=LINK\n##BLOCKS=2\n"
+        + block.format(title="Sample", tail="5 6 7 8")
+        + block.format(title="Reference", tail="5+6-7.5E1 8")
+        + "##END=\n"
+    )
+
+    spectra = DataIngestService(UnitsService()).ingest(path)
+
+    assert [s.name for s in spectra] == ["Sample", "Reference"]
+    np.testing.assert_allclose(spectra[0].x, np.arange(400.0, 408.0))
+    np.testing.assert_allclose(spectra[0].y, np.arange(1.0, 9.0))
+    np.testing.assert_allclose(spectra[1].y, [1, 2, 3, 4, 5, 6, -75, 8])
+    assert spectra[1].metadata["ingest"]["bundle_member"] == "block2"
@@ -0,0 +1,76 @@
+"""Chunked single-pass reduction of MODIS surface reflectance bands."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services import DataIngestService, UnitsService
+from app.services.importers import ModisHdfImporter
+from app.services.importers.modis_hdf_importer import BandStatistics
+
+FILL = -28672
+
+
+@pytest.fixture
+def pyhdf_sd():
+    # Only the HDF round trip needs pyhdf; the statistics tests are pure numpy
+    return pytest.importorskip("pyhdf.SD")
+
+
+def _write_mod09(pyhdf_sd, path: Path, rows: int = 90, cols: int = 70) -> dict[str, np.ndarray]:
+    rng = np.random.default_rng(7)
+    sd = pyhdf_sd.SD(str(path), pyhdf_sd.SDC.WRITE | pyhdf_sd.SDC.CREATE | pyhdf_sd.SDC.TRUNC)
+    bands: dict[str, np.ndarray] = {}
+    for index in range(1, 8):
+        raw = rng.integers(200 * index, 200 * index + 3000, size=(rows, cols)).astype(np.int16)
+        raw[rng.random((rows, cols)) < 0.1] = FILL
+        raw[0, :5] = 16000  # out of range
+        name = f"sur_refl_b0{index}"
+        sds = sd.create(name, pyhdf_sd.SDC.INT16, raw.shape)
+        sds[:] = raw
+        sds.endaccess()
+        bands[name] = raw
+    sd.end()
+    return bands
+
+
+def _reference(raw: np.ndarray) -> tuple[float, float, int]:
+    valid = raw[(raw >= 0) & (raw <= 10000)] * 0.0001
+    median = np.median(valid)
+    return median, 1.4826 * np.median(np.abs(valid - median)) / np.sqrt(valid.size), valid.size
+
+
+def test_modis_chunked_statistics_match_full_band(tmp_path: Path, pyhdf_sd):
+    path = tmp_path / "MOD09GA.A2024001.h10v05.hdf"
+    bands = _write_mod09(pyhdf_sd, path)
+
+    result = ModisHdfImporter(chunk_rows=7, max_workers=4).read(path)
+
+    assert result.metadata["ingest_backend"] == "pyhdf"
+    assert np.all(np.diff(result.x) > 0)
+    names = sorted(bands, key=lambda n: result.metadata["band_centres_nm"][n])
+    for position, name in enumerate(names):
+        median, sigma, count = _reference(bands[name])
+        assert result.y[position] == pytest.approx(median, abs=1e-12)
+        assert result.uncertainty[position] == pytest.approx(sigma, abs=1e-12)
+        assert result.metadata["valid_counts"][name] == count
+
+    spectrum = DataIngestService(UnitsService()).ingest(path)[0]
+    assert spectrum.uncertainty is not None and spectrum.uncertainty.shape == spectrum.x.shape
+
+
+def test_band_statistics_float_sketch_and_exact():
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0, 10000, size=50_001)
+    approx, exact = BandStatistics(), BandStatistics(exact=True)
+    for tile in np.array_split(values, 9):
+        approx.add(tile)
+        exact.add(tile)
+
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    assert exact.result()[0] == median
+    assert exact.result()[1] == pytest.approx(1.4826 * mad / np.sqrt(values.size))
+    assert abs(approx.result()[0] - median) <= 0.05
+    assert approx.result()[2] == values.size
@@ -0,0 +1,51 @@
+"""Content sniffing picks the importer and feeds it the buffer it read."""
+
+from pathlib import Path
+
+import pytest
+
+from app.services import DataIngestService, UnitsService
+
+JCAMP = "##TITLE=Sniffed\n##JCAMP-DX=4.24\n##XUNITS=1/CM\n##XYDATA=(X,Y)\n4000,0.1\n3000,0.2\n##END=\n"
+
+
+def test_content_beats_misleading_extension(tmp_path: Path):
+    path = tmp_path / "exported.txt"
+    path.write_text(JCAMP)
+    exo = tmp_path / "transit.dat"
+    exo.write_text("# JWST NIRSpec\nCENTRALWAVELNG,BANDWIDTH,FLAM\n1.0,0.1,5\n1.1,0.1,6\n")
+
+    service = DataIngestService(UnitsService())
+
+    assert service.ingest(path)[0].metadata["ingest"]["importer"] == "JcampImporter"
+    assert service.ingest(exo)[0].metadata["ingest"]["importer"] == "ExoplanetCsvImporter"
+
+
+def test_unknown_extension_needs_a_signature(tmp_path: Path):
+    service = DataIngestService(UnitsService())
+    recognised = tmp_path / "spectrum.ir"
+    recognised.write_text(JCAMP)
+    plain = tmp_path / "notes.md"
+    plain.write_text("400,1\n500,2\n")
+
+    assert service.ingest(recognised)[0].name == "Sniffed"
+    with pytest.raises(ValueError, match="No importer registered"):
+        service.ingest(plain)
+
+
+def test_text_importers_reuse_the_sniffed_buffer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "trace.csv"
+    path.write_text("wavelength_nm,absorbance\n400,0.1\n500,0.2\n600,0.3\n")
+    opened: list[Path] = []
+    real_open = Path.open
+
+    def counting_open(self: Path, *args, **kwargs):
+        if self == path:
+            opened.append(self)
+        return real_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", counting_open)
+    spectrum = DataIngestService(UnitsService()).ingest(path)[0]
+
+    assert spectrum.x.size == 3
+    assert len(opened) == 1
@@ -0,0 +1,63 @@
+"""Startup should not import heavy optional dependencies until they are used."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.utils.lazy_imports import module_available
+from app.utils.startup_profile import StartupProfiler
+
+
+def _loaded_after(statement: str) -> set[str]:
+    repo_root = Path(__file__).parent.parent
+    script = (
+        "import sys\n"
+        f"{statement}\n"
+        "heavy = ('astropy', 'astroquery', 'requests', 'pandas', 'pyhdf')\n"
+        "print(','.join(name for name in heavy if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=repo_root,
+        env={**os.environ, "PYTHONPATH": str(repo_root)},
+        check=True,
+    )
+    return {name for name in result.stdout.strip().split(",") if name}
+
+
+def test_service_imports_defer_heavy_dependencies() -> None:
+    assert _loaded_after(
+        "from app.services import DataIngestService, RemoteDataService, UnitsService\n"
+        "DataIngestService(UnitsService())\n"
+        "RemoteDataService.__name__"
+    ) == set()
+
+
+def test_service_exports_list_every_lazy_name() -> None:
+    import app.services as services
+
+    assert sorted(services.__all__) == sorted(services._EXPORTS)
+
+
+def test_module_available_probes_without_importing() -> None:
+    assert module_available("json")
+    assert module_available("app.services.importers.fits_importer")
+    assert not module_available("app.services.no_such_module")
+    assert not module_available("definitely_not_installed_pkg.sub")
+
+
+def test_startup_profiler_records_phases_only_when_enabled() -> None:
+    disabled = StartupProfiler()
+    with disabled.phase("noop"):
+        pass
+    assert disabled.phases == []
+
+    profiler = StartupProfiler(enabled=True)
+    with profiler.phase("import"):
+        import json  # noqa: F401
+    profiler.mark("ready")
+    assert [phase.name for phase in profiler.phases] == ["import", "ready"]
+    assert "import" in profiler.report()
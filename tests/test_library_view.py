@@ -118,3 +118,44 @@ def test_library_view_populates_and_summarises_remote_history(tmp_path, monkeypa
         window.close()
         window.deleteLater()
         app.processEvents()
+
+
+def test_library_filter_uses_fits_header_index(tmp_path, monkeypatch):
+    if SpectraMainWindow is None or QtWidgets is None or LocalStore is None or main_mod is None:
+        pytest.skip(f"Qt stack unavailable: {_qt_import_error}")
+
+    app = _ensure_app()
+    empty_samples = tmp_path / "samples"
+    empty_samples.mkdir()
+    monkeypatch.setattr(main_mod, "SAMPLES_DIR", empty_samples)
+
+    window = SpectraMainWindow(knowledge_log_service=KnowledgeLogService(log_path=tmp_path / "log.md"))
+    try:
+        window.store = LocalStore(base_dir=tmp_path / "store")
+        fits_path = Path("samples/fits data/jupiter__9408090029N_vo.fits")
+        window.store.record(fits_path, x_unit="nm", y_unit="absorbance")
+        window.store.record(Path(__file__).resolve().parent / "data" / "mini.csv", x_unit="nm", y_unit="absorbance")
+        window._refresh_library_view()
+        app.processEvents()
+
+        def visible() -> list[str]:
+            return [item.text(0) for item in window._library_items() if not item.isHidden()]
+
+        assert sorted(visible()) == ["jupiter__9408090029N_vo.fits", "mini.csv"]
+        jupiter = next(item for item in window._library_items() if item.text(0) == fits_path.name)
+        assert "Target: Jupiter" in jupiter.toolTip(0)
+
+        window.library_search.setText("euve")
+        assert visible() == [fits_path.name]
+        window.library_search.setText("50-100nm")
+        assert visible() == [fits_path.name]
+        window.library_search.setText("500nm")
+        assert visible() == []
+        window.library_search.setText("MINI")
+        assert visible() == ["mini.csv"]
+        window.library_search.clear()
+        assert len(visible()) == 2
+    finally:
+        window.close()
+        window.deleteLater()
+        app.processEvents()
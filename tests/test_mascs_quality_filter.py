@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from tools.mascs_quality_filter import SpectrumQuality, range_key, select_best_by_range
+
+
+def _quality(product_id: str, low: float, score: float) -> SpectrumQuality:
+    return SpectrumQuality(
+        csv_path=Path(f"{product_id}.csv"),
+        product_id=product_id,
+        detector="VIS",
+        product_type="DDR",
+        wavelength_range=(low, low + 300.0),
+        quality_score=score,
+    )
+
+
+def test_select_best_by_range_keeps_top_spectrum_per_bin() -> None:
+    qualities = [_quality("a", 320.0, 40.0), _quality("b", 350.0, 75.0)]
+
+    selected = select_best_by_range(qualities, n_per_range=1)
+
+    assert range_key(qualities[0]) == "300-400"
+    assert [q.product_id for q in selected] == ["b"]
@@ -110,3 +110,22 @@ def test_math_with_different_grid_densities():
     # Should have ~100 points (the finer grid)
     assert result.x.size > 50
 
+
+
+def test_create_takes_ownership_and_derivative_shares_grid():
+    x = np.linspace(400.0, 500.0, 50)
+    y = np.sin(x / 5.0)
+    copied = Spectrum.create("copied", x, y, x_unit="nm", y_unit="absorbance")
+    owned = Spectrum.create("owned", x, y, x_unit="nm", y_unit="absorbance", copy=False)
+
+    assert not np.shares_memory(copied.y, y)
+    assert owned.x is x and owned.y is y
+    assert not owned.y.flags.writeable and not copied.x.flags.writeable
+
+    math = MathService(UnitsService())
+    result, info = math.derivative(owned)
+    assert info["status"] == "ok"
+    assert result.x is owned.x
+
+    derived = owned.derive("scaled", owned.x, owned.y * 2.0, {"name": "scale"})
+    assert derived.x is owned.x and derived.parents == (owned.id,)
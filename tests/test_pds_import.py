@@ -137,3 +137,119 @@ def test_pds_wavelength_unit_detection(sample_dir: Path):
     # First member should also have nm
     members = result.metadata["bundle"]["members"]
     assert members[0]["x_unit"] == "nm"
+
+
+def test_pds_table_engine_follows_label_offsets(sample_dir: Path):
+    """Fixed-width offsets are used when they fit; 1995low overflows at 1000 nm."""
+    high = sample_dir / "1995high.tab"
+    low = sample_dir / "1995low.tab"
+    if not high.exists() or not low.exists():
+        pytest.skip("Sample file not found")
+
+    assert CsvImporter().read(high).metadata["pds_table"]["engine"] == "fixed-width"
+    low_result = CsvImporter().read(low)
+    assert low_result.metadata["pds_table"]["engine"] == "whitespace"
+    assert low_result.metadata["pds_table"]["rows"] == 1875
+
+
+def test_pds_binary_table_is_memory_mapped(tmp_path: Path, ingest_service: DataIngestService):
+    """MSB_IEEE_REAL / LSB_INTEGER columns after a one-record header."""
+    rows = np.zeros(
+        50, dtype=np.dtype({"names": ["wl", "flux", "flag"], "formats": [">f8", ">f4", "<i2"], "offsets": [0, 8, 12], "itemsize": 16})
+    )
+    rows["wl"] = np.linspace(1.0, 2.0, 50)
+    rows["flux"] = np.arange(50, dtype=np.float32) / 10
+    rows["flag"] = 7
+    (tmp_path / "spec.dat").write_bytes(b"H" * 16 + rows.tobytes())
+    (tmp_path / "spec.lbl").write_text(
+        """PDS_VERSION_ID = PDS3
+RECORD_BYTES = 16
+^TABLE = ("SPEC.DAT", 2)
+TARGET_NAME = MARS
+PRODUCT_NAME = "BINARY TEST"
+OBJECT = TABLE
+  INTERCHANGE_FORMAT = BINARY
+  ROWS = 50
+  ROW_BYTES = 16
+  OBJECT = COLUMN
+    NAME = "WAVELENGTH"
+    COLUMN_NUMBER = 1
+    UNIT = "MICROMETER"
+    DATA_TYPE = MSB_IEEE_REAL
+    START_BYTE = 1
+    BYTES = 8
+  END_OBJECT = COLUMN
+  OBJECT = COLUMN
+    NAME = "MARS REFLECTANCE"
+    COLUMN_NUMBER = 2
+    DATA_TYPE = MSB_IEEE_REAL
+    START_BYTE = 9
+    BYTES = 4
+  END_OBJECT = COLUMN
+  OBJECT = COLUMN
+    NAME = "MARS QUALITY"
+    COLUMN_NUMBER = 3
+    DATA_TYPE = LSB_INTEGER
+    START_BYTE = 13
+    BYTES = 2
+  END_OBJECT = COLUMN
+END_OBJECT = TABLE
+END
+"""
+    )
+
+    result = CsvImporter().read(tmp_path / "spec.dat")
+
+    assert result.metadata["pds_table"]["engine"] == "binary"
+    members = result.metadata["bundle"]["members"]
+    np.testing.assert_allclose(members[0]["x"], rows["wl"])
+    np.testing.assert_allclose(members[0]["y"], rows["flux"])
+    np.testing.assert_array_equal(members[1]["y"], 7)
+
+    spectra = ingest_service.ingest(tmp_path / "spec.dat")
+    assert len(spectra) == 2
+    np.testing.assert_allclose(spectra[0].x, rows["wl"] * 1000)
+
+
+def _write_character_table(tmp_path: Path, flux_text: list[bytes]) -> Path:
+    rows = np.zeros(len(flux_text), dtype=np.dtype({"names": ["wl", "flux"], "formats": [">f8", "S8"], "offsets": [0, 8], "itemsize": 16}))
+    rows["wl"] = np.linspace(1.0, 2.0, len(flux_text))
+    rows["flux"] = flux_text
+    (tmp_path / "chars.dat").write_bytes(rows.tobytes())
+    (tmp_path / "chars.lbl").write_text(
+        f"""PDS_VERSION_ID = PDS3
+^TABLE = "CHARS.DAT"
+OBJECT = TABLE
+  INTERCHANGE_FORMAT = BINARY
+  ROWS = {len(flux_text)}
+  ROW_BYTES = 16
+  OBJECT = COLUMN
+    NAME = "WAVELENGTH"
+    COLUMN_NUMBER = 1
+    UNIT = "MICROMETER"
+    DATA_TYPE = MSB_IEEE_REAL
+    START_BYTE = 1
+    BYTES = 8
+  END_OBJECT = COLUMN
+  OBJECT = COLUMN
+    NAME = "MARS REFLECTANCE"
+    COLUMN_NUMBER = 2
+    DATA_TYPE = CHARACTER
+    START_BYTE = 9
+    BYTES = 8
+  END_OBJECT = COLUMN
+END_OBJECT = TABLE
+END
+"""
+    )
+    return tmp_path / "chars.dat"
+
+
+def test_pds_binary_character_column_is_decoded_or_rejected(tmp_path: Path):
+    path = _write_character_table(tmp_path, [b"  0.25", b"  0.50", b"  0.75"])
+    members = CsvImporter().read(path).metadata["bundle"]["members"]
+    np.testing.assert_allclose(members[0]["y"], [0.25, 0.5, 0.75])
+
+    path = _write_character_table(tmp_path, [b"CLOUDY", b"CLEAR", b"CLEAR"])
+    with pytest.raises(ValueError, match="MARS REFLECTANCE"):
+        CsvImporter().read(path)
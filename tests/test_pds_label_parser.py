@@ -163,3 +163,92 @@ def test_missing_file_returns_none(tmp_path: Path):
     missing = tmp_path / "does_not_exist.lbl"
     label = parse_pds_label(missing)
     assert label is None
+
+
+def test_parse_odl_builds_nested_tree():
+    """GROUP/OBJECT nesting, sets, pointers and units survive tokenising."""
+    from app.services.pds_label_parser import parse_odl
+
+    root = parse_odl(
+        'PDS_VERSION_ID = PDS3 /* comment with = and "quotes" */\n'
+        '^TABLE = ("DATA.TAB", 1201 <BYTES>)\n'
+        "TARGET_NAME = {JUPITER, 'SATURN'}\n"
+        'GROUP = GEOMETRY\n'
+        '  PHASE_ANGLE = 6.8 <DEG>\n'
+        '  OBJECT = TABLE\n'
+        '    DESCRIPTION = "Spans\n      two lines"\n'
+        '    OBJECT = COLUMN\n'
+        '      NAME = FLUX\n'
+        '      UNIT = "W/m**2/nm"\n'
+        '    END_OBJECT = COLUMN\n'
+        '  END_OBJECT\n'
+        'END_GROUP = GEOMETRY\n'
+        'END\n'
+        'IGNORED = 1\n'
+    )
+
+    assert root.get("pds_version_id") == "PDS3"
+    assert root.get("^TABLE") == ["DATA.TAB", "1201"]
+    assert root.units["^TABLE"] == "BYTES"
+    assert root.get("TARGET_NAME") == ["JUPITER", "SATURN"]
+    assert root.get("IGNORED") is None
+
+    group = root.children[0]
+    assert (group.kind, group.name) == ("GROUP", "GEOMETRY")
+    assert group.units["PHASE_ANGLE"] == "DEG"
+    table = root.find("TABLE")
+    assert table is group.children[0]
+    assert "two lines" in table.get("DESCRIPTION")
+    assert [column.get("UNIT") for column in root.find_all("COLUMN")] == ["W/m**2/nm"]
+
+
+def test_parse_label_resolves_structure_and_pointer(tmp_path: Path):
+    """Columns in a ^STRUCTURE file are merged and byte pointers honoured."""
+    (tmp_path / "COLS.FMT").write_text(
+        "OBJECT = COLUMN\n  NAME = WAVELENGTH\n  COLUMN_NUMBER = 1\n  UNIT = MICROMETER\n"
+        "  DATA_TYPE = MSB_IEEE_REAL\n  START_BYTE = 1\n  BYTES = 4\nEND_OBJECT = COLUMN\n"
+    )
+    label_path = tmp_path / "product.lbl"
+    label_path.write_text(
+        "PDS_VERSION_ID = PDS3\nRECORD_BYTES = 8\n"
+        '^TABLE = ("PRODUCT.DAT", 17 <BYTES>)\n'
+        "OBJECT = TABLE\n  INTERCHANGE_FORMAT = BINARY\n  ROWS = 3\n  ROW_BYTES = 8\n"
+        '  ^STRUCTURE = "cols.fmt"\n'
+        "  OBJECT = COLUMN\n    NAME = \"REFLECTANCE\"\n    COLUMN_NUMBER = 2\n"
+        "    DATA_TYPE = MSB_IEEE_REAL\n    START_BYTE = 5\n    BYTES = 4\n  END_OBJECT = COLUMN\n"
+        "END_OBJECT = TABLE\nEND\n"
+    )
+
+    label = parse_pds_label(label_path)
+    assert label is not None
+    assert (label.data_file, label.table_offset) == ("PRODUCT.DAT", 16)
+    assert label.interchange_format == "BINARY"
+    assert [c.name for c in label.columns] == ["WAVELENGTH", "REFLECTANCE"]
+    assert label.columns[0].unit == "MICROMETER"
+
+
+def test_label_cache_reuses_tree_until_file_changes(tmp_path: Path, monkeypatch):
+    """Unchanged labels are tokenised once; a rewrite invalidates the entry."""
+    import os
+
+    from app.services import pds_label_parser
+
+    pds_label_parser._reset_odl_cache()
+    calls = []
+    real_parse = pds_label_parser.parse_odl
+    monkeypatch.setattr(pds_label_parser, "parse_odl", lambda text: calls.append(text) or real_parse(text))
+
+    label_path = tmp_path / "cached.lbl"
+    label_path.write_text("PDS_VERSION_ID = PDS3\nTARGET_NAME = MARS\nEND\n")
+    first = parse_pds_label(label_path)
+    second = parse_pds_label(label_path)
+    assert first is not None and second is not None
+    assert first is not second  # callers get their own PDSLabel
+    assert first.target_names == second.target_names == ["Mars"]
+    assert len(calls) == 1
+
+    label_path.write_text("PDS_VERSION_ID = PDS3\nTARGET_NAME = VENUS\nEND\n")
+    stat = label_path.stat()
+    os.utime(label_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert parse_pds_label(label_path).target_names == ["Venus"]
+    assert len(calls) == 2
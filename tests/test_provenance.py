@@ -1,5 +1,7 @@
 import csv
+import hashlib
 import json
+import os
 from pathlib import Path
 
 import numpy as np
@@ -116,3 +118,116 @@ def test_composite_csv_mean(tmp_path: Path) -> None:
     result = importer.read(composite_path)
     assert np.allclose(result.x, np.array([500.0, 510.0, 520.0]))
     assert np.allclose(result.y, np.array([2.0, 2.0, 2.0]))
+
+
+def test_chunked_csv_writers_match_csv_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.services import provenance_service
+
+    monkeypatch.setattr(provenance_service, 'CSV_CHUNK_ROWS', 4)
+    y = np.array([0.1, np.nan, -2.5e-7, 3.0, np.inf, 1e16, 7.25, -0.0, 42.0, 1 / 3], dtype=np.float64)
+    spec_a = Spectrum.create('lamp, "a"', np.linspace(400.0, 409.0, 10), y, x_unit='nm', y_unit='absorbance')
+    spec_b = Spectrum.create('lamp-b', np.array([500.0, 501.0, 502.0]), np.array([1.0, 2.0, 3.0], dtype=np.float32), x_unit='nm', y_unit='absorbance')
+    service = ProvenanceService(max_workers=2)
+
+    wide_path = service.write_wide_csv(tmp_path / 'wide.csv', [spec_a, spec_b])
+    with wide_path.open('r', encoding='utf-8', newline='') as handle:
+        rows = list(csv.reader(row for row in handle if not row.startswith('#')))
+    assert len(rows) == 11
+    assert rows[1] == ['400.0', '0.1', '500.0', '1.0']
+    assert rows[4][2:] == ['', ''] and rows[10][1] == repr(1 / 3)
+
+    combined = tmp_path / 'combined.csv'
+    service._write_csv(combined, [spec_a, spec_b])
+    expected = tmp_path / 'expected.csv'
+    with expected.open('w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['wavelength_nm', 'intensity', 'spectrum_id', 'spectrum_name', 'point_index', 'x_unit', 'y_unit'])
+        for spec in (spec_a, spec_b):
+            for idx, (x_val, y_val) in enumerate(zip(spec.x, spec.y)):
+                writer.writerow([float(x_val), float(y_val), spec.id, spec.name, idx, spec.x_unit, spec.y_unit])
+    assert combined.read_bytes() == expected.read_bytes()
+
+    written = service._write_per_spectrum_csvs(tmp_path / 'spectra', [spec_a, spec_b])
+    lines = written[spec_a.id].read_text(encoding='utf-8').splitlines()
+    assert lines[0] == 'wavelength_nm,intensity'
+    assert lines[1:] == [f"{float(x)},{float(v)}" for x, v in zip(spec_a.x, spec_a.y)]
+
+
+def test_binary_bundle_round_trips_provenance(tmp_path: Path) -> None:
+    from app.services import DataIngestService, UnitsService
+
+    x = np.linspace(400.0, 450.0, 20)
+    source = Spectrum.create(
+        'lamp',
+        x,
+        np.cos(x),
+        x_unit='nm',
+        y_unit='absorbance',
+        metadata={'instrument': 'bench'},
+        uncertainty=np.full(x.size, 0.05),
+        quality_flags=np.arange(x.size) % 2,
+        value_dtype='float32',
+    )
+    scaled = source.derive('lamp x2', source.x, source.y * 2.0, {'name': 'scale', 'factor': 2.0})
+    service = ProvenanceService()
+
+    export = service.export_bundle([source, scaled], tmp_path / 'bundle' / 'manifest.json', binary_formats=['npz'])
+    npz_path = export['binary_paths']['npz']
+    manifest = json.loads(export['manifest_path'].read_text(encoding='utf-8'))
+    assert manifest['binary_exports'] == {'npz': 'manifest.npz'}
+
+    restored = DataIngestService(UnitsService(), precision='source').ingest(npz_path)
+
+    assert [spec.name for spec in restored] == ['lamp', 'lamp x2']
+    first, second = restored
+    assert first.y.dtype == np.float32 and np.array_equal(first.y, source.y)
+    assert np.array_equal(first.uncertainty, source.uncertainty)
+    assert np.array_equal(first.quality_flags, source.quality_flags)
+    assert second.parents == (source.id,)
+    assert second.transforms == scaled.transforms
+    assert second.metadata['bundle_member']['id'] == scaled.id
+    assert second.metadata['instrument'] == 'bench'
+    assert second.metadata['provenance_manifest']['sources'][1]['id'] == scaled.id
+
+
+@pytest.mark.parametrize('fmt, module', [('parquet', 'pyarrow'), ('hdf5', 'h5py')])
+def test_optional_binary_formats_round_trip(tmp_path: Path, fmt: str, module: str) -> None:
+    pytest.importorskip(module)
+    from app.services import DataIngestService, UnitsService
+    from app.services.binary_bundle import BINARY_SUFFIXES
+
+    spec = Spectrum.create('lamp', np.array([400.0, 401.0, 402.0]), np.array([1.0, 2.0, 3.0]), x_unit='nm', y_unit='absorbance')
+    path = ProvenanceService().write_binary_bundle(tmp_path / f'bundle{BINARY_SUFFIXES[fmt]}', [spec], fmt=fmt)
+
+    restored = DataIngestService(UnitsService()).ingest(path)
+    assert np.array_equal(restored[0].y, spec.y)
+    assert restored[0].metadata['bundle_member']['id'] == spec.id
+
+
+def test_export_reuses_store_digests_and_links_sources(tmp_path: Path) -> None:
+    from app.services import DataIngestService, LocalStore, UnitsService
+
+    source = tmp_path / 'lamp.csv'
+    source.write_text('wavelength,intensity\n400,1\n401,2\n402,3\n', encoding='utf-8')
+    ingest = DataIngestService(UnitsService(), store=LocalStore(base_dir=tmp_path / 'store'))
+    spectrum = ingest.ingest(source)[0]
+    recorded = spectrum.metadata['cache_record']['sha256']
+    service = ProvenanceService(max_workers=2)
+
+    # A digest already in the store record is trusted as long as it still describes the file
+    stale = spectrum.with_metadata(cache_record={**spectrum.metadata['cache_record'], 'sha256': 'from-store'})
+    assert service.create_manifest([stale])['sources'][0]['checksum_sha256'] == 'from-store'
+    # An in-place edit that keeps the size still invalidates the record; the
+    # mtime is pushed forward in case the filesystem clock is coarse
+    before = source.stat()
+    source.write_text('wavelength,intensity\n400,1\n401,2\n402,9\n', encoding='utf-8')
+    assert source.stat().st_size == before.st_size
+    os.utime(source, ns=(before.st_atime_ns, before.st_mtime_ns + 1_000_000))
+    rehashed = service.create_manifest([stale])['sources'][0]['checksum_sha256']
+    assert rehashed not in ('from-store', recorded)
+    assert rehashed == hashlib.sha256(source.read_bytes()).hexdigest()
+
+    export = service.export_bundle([spectrum], tmp_path / 'bundle' / 'manifest.json')
+    copied = export['sources_dir'] / f"lamp-{spectrum.id}.csv"
+    assert copied.read_bytes() == source.read_bytes()
+    assert copied.stat().st_ino == source.stat().st_ino
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+import zipfile
+
+import numpy as np
+import pytest
+
+from app.services import Spectrum, detach_session_arrays, load_session, save_session
+from app.services.session_service import SessionWriter
+from app.services.spectrum_storage import is_memory_mapped
+
+
+def _spectra() -> list[Spectrum]:
+    x = np.linspace(400.0, 700.0, 256)
+    source = Spectrum.create(
+        name="lamp",
+        x=x,
+        y=np.cos(x / 20.0),
+        x_unit="nm",
+        y_unit="absorbance",
+        metadata={"instrument": "bench", "exposure": np.float64(1.5)},
+        source_path=Path("lamp.csv"),
+        uncertainty=np.full(x.size, 0.02),
+        quality_flags=np.zeros(x.size, dtype=np.uint8),
+        value_dtype="float32",
+    )
+    scaled = source.derive("lamp x2", source.x, source.y * 2.0, {"name": "scale", "factor": 2.0})
+    return [source, scaled]
+
+
+def test_session_round_trips_spectra_and_provenance(tmp_path: Path) -> None:
+    spectra = _spectra()
+
+    path = save_session(tmp_path / "work.spectra", spectra)
+    restored = load_session(path).spectra
+
+    assert [spec.id for spec in restored] == [spec.id for spec in spectra]
+    for original, loaded in zip(spectra, restored):
+        assert loaded.name == original.name
+        assert loaded.y.dtype == original.y.dtype
+        assert np.array_equal(loaded.x, original.x)
+        assert np.array_equal(loaded.y, original.y)
+        assert loaded.parents == original.parents
+        assert [dict(t) for t in loaded.transforms] == [dict(t) for t in original.transforms]
+    assert restored[0].metadata["exposure"] == 1.5
+    assert restored[0].source_path == Path("lamp.csv")
+    assert np.array_equal(restored[0].quality_flags, spectra[0].quality_flags)
+
+
+def test_loaded_arrays_are_mapped_from_the_session_file(tmp_path: Path) -> None:
+    path = save_session(tmp_path / "work.spectra", _spectra())
+
+    restored = load_session(path).spectra
+
+    assert all(spec.is_memory_mapped for spec in restored)
+    assert is_memory_mapped(restored[0].uncertainty)
+    assert restored[0].x.ctypes.data % 64 == 0
+    with pytest.raises(ValueError):
+        restored[0].y[0] = 0.0
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+
+
+def test_ui_state_is_kept_and_failed_writes_leave_no_file(tmp_path: Path) -> None:
+    spectra = _spectra()
+    ui = {"colors": {spectra[0].id: "#ff0000"}, "visibility": {spectra[1].id: False}, "normalization": "Max"}
+
+    state = load_session(save_session(tmp_path / "work.spectra", spectra, ui))
+    assert state.ui == ui
+
+    target = tmp_path / "broken.spectra"
+    with pytest.raises(RuntimeError):
+        with SessionWriter(target) as writer:
+            writer.add(spectra[0])
+            raise RuntimeError("interrupted")
+    assert not target.exists() and not list(tmp_path.glob("*.part"))
+
+
+def test_saving_over_a_loaded_session_detaches_its_arrays(tmp_path: Path) -> None:
+    path = save_session(tmp_path / "work.spectra", _spectra())
+    loaded = load_session(path).spectra
+    assert detach_session_arrays(loaded, tmp_path / "other.spectra")[0] is loaded[0]
+
+    detached = detach_session_arrays(loaded, path)
+    # Nothing may keep the archive mapped while it is replaced
+    del loaded
+    assert not any(spec.is_memory_mapped for spec in detached)
+    scaled = [spec.derive(spec.name, spec.x, spec.y * 3.0, {"name": "scale"}) for spec in detached]
+    save_session(path, scaled)
+
+    reloaded = load_session(path).spectra
+    assert [spec.id for spec in reloaded] == [spec.id for spec in scaled]
+    assert np.allclose(reloaded[0].y, detached[0].y * 3.0)
+    assert np.array_equal(reloaded[1].x, detached[1].x)
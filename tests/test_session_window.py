@@ -0,0 +1,91 @@
+"""Saving a session from the main window over the file it was opened from."""
+from pathlib import Path
+import os
+
+import numpy as np
+import pytest
+
+try:
+    from app.main import SpectraMainWindow
+    from app.qt_compat import get_qt
+except ImportError as exc:
+    SpectraMainWindow = None
+    _qt_import_error = exc
+    QtCore = QtGui = QtWidgets = None
+else:
+    _qt_import_error = None
+    QtCore, QtGui, QtWidgets, _ = get_qt()
+
+from app.services import KnowledgeLogService, Spectrum, save_session
+from app.services.spectrum_storage import is_memory_mapped
+
+
+def _ensure_app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
+
+
+def _held_arrays(window) -> list:
+    arrays = []
+    for spectrum in window.overlay_service.list():
+        arrays.extend(getattr(spectrum, name) for name in ("x", "y", "uncertainty", "quality_flags"))
+    for trace in window.plot._traces.values():
+        arrays.extend(trace.get(name) for name in ("x_nm", "y", "sigma", "flags"))
+        arrays.extend((trace["item"].xData, trace["item"].yData))
+    return [array for array in arrays if isinstance(array, np.ndarray)]
+
+
+def test_saving_over_the_open_session_releases_every_mapping(tmp_path: Path, monkeypatch) -> None:
+    if SpectraMainWindow is None or QtWidgets is None:
+        pytest.skip(f"Qt stack unavailable: {_qt_import_error}")
+
+    app = _ensure_app()
+    log_service = KnowledgeLogService(log_path=tmp_path / "history.md", author="pytest")
+    window = SpectraMainWindow(knowledge_log_service=log_service)
+    x = np.linspace(400.0, 700.0, 300)
+    path = save_session(
+        tmp_path / "work.spectra",
+        [
+            Spectrum.create(
+                name="lamp",
+                x=x,
+                y=np.sin(x / 30.0),
+                x_unit="nm",
+                y_unit="absorbance",
+                uncertainty=np.full(x.size, 0.01),
+                quality_flags=np.zeros(x.size, dtype=np.uint8),
+            )
+        ],
+    )
+
+    try:
+        window._restore_session(path)
+        # A derived spectrum sharing the mapped x axis is drawn as well
+        loaded = window.overlay_service.list()[0]
+        derived = loaded.derive("lamp x2", loaded.x, loaded.y * 2.0, {"name": "scale", "factor": 2.0})
+        window.overlay_service.add(derived)
+        window._add_spectrum(derived)
+        app.processEvents()
+        # Quality flags are drawn straight from the mapped session arrays
+        assert any(is_memory_mapped(trace["flags"]) for trace in window.plot._traces.values())
+
+        mapped_at_save = []
+
+        def checked_save(target, spectra, ui):
+            mapped_at_save.append(any(is_memory_mapped(array) for array in _held_arrays(window)))
+            return save_session(target, spectra, ui)
+
+        monkeypatch.setattr(QtWidgets.QFileDialog, "getSaveFileName", lambda *args, **kwargs: (str(path), ""))
+        monkeypatch.setattr("app.ui.main_window.save_session", checked_save)
+        window.save_session()
+
+        # Nothing the window holds may still map the file being replaced
+        assert mapped_at_save == [False]
+        assert len(window.overlay_service.list()) == 2
+    finally:
+        window.close()
+        window.deleteLater()
+        app.processEvents()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, cast
+
+import numpy as np
+import pytest
+
+from app.services import LocalStore, OverlayService, Spectrum, UnitsService
+from app.services import spectrum_storage
+
+
+def _spectrum(points: int = 1000) -> Spectrum:
+    x = np.linspace(400.0, 700.0, points)
+    return Spectrum.create(
+        name="long",
+        x=x,
+        y=np.sin(x / 10.0),
+        x_unit="nm",
+        y_unit="absorbance",
+        uncertainty=np.full(points, 0.01),
+        quality_flags=np.zeros(points, dtype=np.uint8),
+    )
+
+
+def test_map_spectrum_backs_arrays_with_read_only_files(tmp_path: Path) -> None:
+    store = LocalStore(base_dir=tmp_path)
+    spectrum = _spectrum()
+
+    mapped = store.map_spectrum(spectrum)
+
+    assert mapped.id == spectrum.id
+    assert mapped.is_memory_mapped and not spectrum.is_memory_mapped
+    assert np.array_equal(mapped.y, spectrum.y)
+    assert np.array_equal(mapped.quality_flags, spectrum.quality_flags)
+    with pytest.raises(ValueError):
+        mapped.y[0] = 1.0
+    entry = store.load_index()["arrays"][spectrum.id]
+    assert entry["points"] == 1000
+    assert (Path(entry["directory"]) / "x.npy").exists()
+    assert store.map_spectrum(mapped) is mapped
+
+
+def test_derive_shares_unchanged_mapped_arrays(tmp_path: Path) -> None:
+    mapped = LocalStore(base_dir=tmp_path).map_spectrum(_spectrum())
+
+    derived = mapped.derive("scaled", mapped.x, mapped.y * 2.0, {"name": "scale"})
+
+    assert np.shares_memory(derived.x, mapped.x)
+    assert not spectrum_storage.is_memory_mapped(derived.y)
+
+
+def test_chunked_reductions_match_full_array(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(spectrum_storage, "CHUNK_SIZE", 7)
+    x = np.linspace(0.0, 10.0, 50)
+    y = np.cos(x) - 0.3
+    y[[3, 13, 14, 20]] = np.nan
+
+    finite = np.isfinite(y)
+    area, samples = spectrum_storage.abs_trapezoid(x, y)
+    assert samples == finite.sum()
+    assert np.isclose(area, np.trapezoid(np.abs(y[finite]), x[finite]))
+    assert np.isclose(spectrum_storage.abs_max(y, x), np.nanmax(np.abs(y)))
+
+    xs, ys = spectrum_storage.envelope(x, y, 10)
+    assert xs.size == ys.size <= 20
+    assert np.isclose(np.nanmax(ys), np.nanmax(y)) and np.isclose(np.nanmin(ys), np.nanmin(y))
+
+
+def test_overlay_decimates_mapped_spectrum(tmp_path: Path) -> None:
+    mapped = LocalStore(base_dir=tmp_path).map_spectrum(_spectrum(5000))
+    overlay = OverlayService(UnitsService())
+    overlay.add(mapped)
+
+    view = overlay.overlay([mapped.id], "nm", "absorbance", normalization="Max", max_points=100)[0]
+    metadata = cast(Dict[str, Any], view["metadata"])
+
+    assert metadata["decimation"] == {"points": 5000, "max_points": 100, "kept": 200}
+    assert np.isclose(np.max(np.abs(np.asarray(view["y"]))), 1.0)
+    assert np.isclose(metadata["normalization"]["scale"], np.max(np.abs(mapped.y)))
+
+
+def test_large_ingest_streams_into_store_and_releases_on_removal(tmp_path: Path) -> None:
+    from app.services import DataIngestService
+
+    source = tmp_path / "long.csv"
+    rows = "".join(f"{1.0 + i * 1e-3:.4f},{(i % 7) * 0.1:.2f}\n" for i in range(500))
+    source.write_text("wavelength (um),intensity\n" + rows)
+    store = LocalStore(base_dir=tmp_path / "store")
+    service = DataIngestService(UnitsService(), store=store, map_threshold_bytes=1024)
+
+    spectrum = service.ingest(source)[0]
+
+    assert spectrum.is_memory_mapped
+    assert np.allclose(spectrum.x[:2], [1000.0, 1001.0])
+    directory = store.data_dir / "arrays" / spectrum.id
+    assert store.load_index()["arrays"][spectrum.id]["points"] == 500
+    assert store.release_arrays(spectrum.id)
+    assert not directory.exists()
+    assert spectrum.id not in store.load_index()["arrays"]
+
+
+def test_prune_arrays_drops_unindexed_directories(tmp_path: Path) -> None:
+    store = LocalStore(base_dir=tmp_path)
+    kept = store.map_spectrum(_spectrum())
+    orphan = store.data_dir / "arrays" / "orphan"
+    orphan.mkdir()
+    (orphan / "x.npy").write_bytes(b"")
+
+    assert store.prune_arrays() == 1
+    assert not orphan.exists()
+    assert kept.id in store.load_index()["arrays"]
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+
+from app import telemetry
+from app.services import UnitsService
+
+
+def _fresh(enabled: bool) -> telemetry.Telemetry:
+    telemetry.TELEMETRY.reset()
+    return telemetry.configure(enabled, trace=False)
+
+
+def test_disabled_telemetry_records_nothing():
+    previous = telemetry.TELEMETRY.enabled
+    try:
+        tel = _fresh(False)
+        with telemetry.span("noop") as timing:
+            timing.set(rows=1)
+        UnitsService().convert_arrays(np.arange(3.0) + 1, np.ones(3), "nm", "absorbance", "nm", "absorbance")
+        assert tel.summary() == {}
+    finally:
+        telemetry.configure(previous)
+
+
+def test_spans_aggregate_into_histograms_and_chrome_trace(tmp_path):
+    previous = telemetry.TELEMETRY.enabled
+    try:
+        tel = _fresh(True)
+        units = UnitsService()
+        for _ in range(3):
+            units.convert_arrays(np.arange(1.0, 11.0), np.ones(10), "nm", "absorbance", "cm^-1", "absorbance")
+        try:
+            with telemetry.span("failing.op"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        summary = tel.summary()
+        convert = summary["units.convert_arrays"]
+        assert convert["count"] == 3
+        assert 0.0 < convert["min_s"] <= convert["p50_s"] <= convert["max_s"]
+        assert sum(convert["buckets_us"].values()) == 3
+
+        trace_path = tel.export_chrome_trace(tmp_path / "trace.json")
+        events = json.loads(trace_path.read_text(encoding="utf-8"))["traceEvents"]
+        assert {event["ph"] for event in events} == {"X"}
+        failing = [event for event in events if event["name"] == "failing.op"]
+        assert failing and failing[0]["args"]["error"] == "ValueError"
+
+        summary_path = tel.export_json(tmp_path / "summary.json")
+        assert "units.convert_arrays" in json.loads(summary_path.read_text(encoding="utf-8"))["spans"]
+    finally:
+        telemetry.TELEMETRY.reset()
+        telemetry.configure(previous)
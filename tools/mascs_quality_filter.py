@@ -21,9 +21,11 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Callable, List
 
 import numpy as np
 import pandas as pd
@@ -96,8 +98,15 @@ def load_spectrum_csv(csv_path: Path) -> tuple[np.ndarray, np.ndarray] | None:
         return None
 
 
-def analyze_spectrum(csv_path: Path) -> SpectrumQuality | None:
-    """Analyze a single spectrum and compute quality metrics."""
+def analyze_spectrum(
+    csv_path: Path,
+    data: tuple[np.ndarray, np.ndarray] | None = None,
+) -> SpectrumQuality | None:
+    """Analyze a single spectrum and compute quality metrics.
+
+    ``data`` passes (wavelength, flux) that are already in memory, e.g. from
+    the decoder, so the CSV is not read back.
+    """
     
     # Parse filename for metadata
     name = csv_path.stem
@@ -119,7 +128,7 @@ def analyze_spectrum(csv_path: Path) -> SpectrumQuality | None:
     )
     
     # Load spectrum
-    result = load_spectrum_csv(csv_path)
+    result = data if data is not None else load_spectrum_csv(csv_path)
     if result is None:
         return None
     
@@ -157,33 +166,55 @@ def analyze_spectrum(csv_path: Path) -> SpectrumQuality | None:
     return quality
 
 
-def rank_spectra(csv_files: List[Path], verbose: bool = True) -> List[SpectrumQuality]:
-    """Analyze and rank all spectra by quality."""
+def rank_spectra(
+    csv_files: List[Path],
+    verbose: bool = True,
+    workers: int | None = None,
+) -> List[SpectrumQuality]:
+    """Analyze and rank all spectra by quality.
+
+    Files are analysed on a process pool of ``workers`` processes (default:
+    one per CPU); ``workers=1`` stays in this process.
+    """
     
     print(f"Analyzing {len(csv_files)} spectra...")
     
-    qualities: List[SpectrumQuality] = []
-    for csv_file in csv_files:
-        quality = analyze_spectrum(csv_file)
-        if quality:
-            qualities.append(quality)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(csv_files) < 2:
+        results = map(analyze_spectrum, csv_files)
+        qualities = [q for q in results if q]
+    else:
+        chunksize = max(1, len(csv_files) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            qualities = [q for q in pool.map(analyze_spectrum, csv_files, chunksize=chunksize) if q]
     
     # Sort by score (descending)
     qualities.sort(key=lambda q: q.quality_score, reverse=True)
     
     if verbose:
-        print(f"\nAnalyzed {len(qualities)} valid spectra")
-        print("\nTop 10 spectra:")
-        print("-" * 100)
-        print(f"{'Rank':<6} {'Product ID':<35} {'Detector':<8} {'Points':<8} {'Range (nm)':<20} {'Score':<8}")
-        print("-" * 100)
-        for i, q in enumerate(qualities[:10], 1):
-            wl_range = f"{q.wavelength_range[0]:.0f}-{q.wavelength_range[1]:.0f}"
-            print(f"{i:<6} {q.product_id:<35} {q.detector:<8} {q.num_points:<8} {wl_range:<20} {q.quality_score:<8.1f}")
+        print_ranking(qualities)
     
     return qualities
 
 
+def print_ranking(qualities: List[SpectrumQuality], top: int = 10) -> None:
+    """Print the best ``top`` entries of score-sorted ``qualities``."""
+    print(f"\nAnalyzed {len(qualities)} valid spectra")
+    print(f"\nTop {top} spectra:")
+    print("-" * 100)
+    print(f"{'Rank':<6} {'Product ID':<35} {'Detector':<8} {'Points':<8} {'Range (nm)':<20} {'Score':<8}")
+    print("-" * 100)
+    for i, q in enumerate(qualities[:top], 1):
+        wl_range = f"{q.wavelength_range[0]:.0f}-{q.wavelength_range[1]:.0f}"
+        print(f"{i:<6} {q.product_id:<35} {q.detector:<8} {q.num_points:<8} {wl_range:<20} {q.quality_score:<8.1f}")
+
+
+def range_key(quality: SpectrumQuality) -> str:
+    """100 nm bin of the spectrum's short-wavelength end, e.g. ``"200-300"``."""
+    min_wl = int(quality.wavelength_range[0] / 100) * 100
+    return f"{min_wl}-{min_wl+100}"
+
+
 def select_best_by_range(
     qualities: List[SpectrumQuality],
     detector: str | None = None,
@@ -200,79 +231,109 @@ def select_best_by_range(
     
     for q in qualities:
         # Bin into 100nm ranges
-        min_wl = int(q.wavelength_range[0] / 100) * 100
-        range_key = f"{min_wl}-{min_wl+100}"
-        
-        if range_key not in range_groups:
-            range_groups[range_key] = []
-        range_groups[range_key].append(q)
+        range_groups.setdefault(range_key(q), []).append(q)
     
     # Select top N from each range
     selected: List[SpectrumQuality] = []
-    for range_key, group in sorted(range_groups.items()):
+    for _key, group in sorted(range_groups.items()):
         group.sort(key=lambda q: q.quality_score, reverse=True)
         selected.extend(group[:n_per_range])
     
     return selected
 
 
+class GridAccumulator:
+    """Running per-bin statistics of spectra interpolated onto one grid.
+
+    Keeps a sum, a count and Welford's mean/M2 per grid point, so spectra
+    can be added one at a time and dropped immediately.
+    """
+
+    def __init__(self, wavelength_grid: np.ndarray):
+        self.grid = wavelength_grid
+        self.total = np.zeros_like(wavelength_grid)
+        self.counts = np.zeros(wavelength_grid.shape, dtype=np.int64)
+        self._mean = np.zeros_like(wavelength_grid)
+        self._m2 = np.zeros_like(wavelength_grid)
+
+    def add(self, wl: np.ndarray, flux: np.ndarray) -> None:
+        interp_flux = np.interp(self.grid, wl, flux, left=np.nan, right=np.nan)
+        valid = np.isfinite(interp_flux)
+        x = interp_flux[valid]
+        self.total[valid] += x
+        self.counts[valid] += 1
+        delta = x - self._mean[valid]
+        self._mean[valid] += delta / self.counts[valid]
+        self._m2[valid] += delta * (x - self._mean[valid])
+
+    def result(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(wavelength, mean, standard error, count) for bins with data.
+
+        The standard error is NaN where only one spectrum contributes.
+        """
+        valid = self.counts > 0
+        counts = self.counts[valid]
+        mean = self.total[valid] / counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(counts > 1, self._m2[valid] / (counts - 1), np.nan)
+            stderr = np.sqrt(variance / counts)
+        return self.grid[valid], mean, stderr, counts
+
+
 def merge_spectra(
     qualities: List[SpectrumQuality],
     output_path: Path,
     wavelength_grid: np.ndarray | None = None,
+    loader: Callable[[SpectrumQuality], tuple[np.ndarray, np.ndarray] | None] | None = None,
 ) -> None:
-    """Merge multiple spectra into a single high-resolution composite."""
+    """Merge multiple spectra into a single high-resolution composite.
+
+    ``loader`` returns a spectrum's (wavelength, flux); the default reads
+    its CSV. Each spectrum is loaded once and folded into a
+    :class:`GridAccumulator`, so memory does not grow with the number of
+    spectra. The output carries the standard error of each bin's mean.
+    """
     
     print(f"\nMerging {len(qualities)} spectra...")
+    if not qualities:
+        return
     
-    # Load all spectra
-    all_wl: List[np.ndarray] = []
-    all_flux: List[np.ndarray] = []
+    # Determine wavelength grid from the ranges found while ranking
+    if wavelength_grid is None:
+        min_wl = min(q.wavelength_range[0] for q in qualities)
+        max_wl = max(q.wavelength_range[1] for q in qualities)
+        # 0.5 nm resolution
+        wavelength_grid = np.arange(min_wl, max_wl + 0.5, 0.5)
     
+    # Interpolate and accumulate each spectrum onto the common grid
+    accumulator = GridAccumulator(wavelength_grid)
     for q in qualities:
-        result = load_spectrum_csv(q.csv_path)
+        result = loader(q) if loader is not None else load_spectrum_csv(q.csv_path)
         if result:
             wl, flux = result
             valid = (flux > 0) & np.isfinite(flux)
-            all_wl.append(wl[valid])
-            all_flux.append(flux[valid])
-    
-    # Determine wavelength grid
-    if wavelength_grid is None:
-        min_wl = min(wl.min() for wl in all_wl)
-        max_wl = max(wl.max() for wl in all_wl)
-        # 0.5 nm resolution
-        wavelength_grid = np.arange(min_wl, max_wl + 0.5, 0.5)
-    
-    # Interpolate and average all spectra onto common grid
-    merged_flux = np.zeros_like(wavelength_grid)
-    counts = np.zeros_like(wavelength_grid)
-    
-    for wl, flux in zip(all_wl, all_flux):
-        # Interpolate onto grid
-        interp_flux = np.interp(wavelength_grid, wl, flux, left=np.nan, right=np.nan)
-        valid = np.isfinite(interp_flux)
-        merged_flux[valid] += interp_flux[valid]
-        counts[valid] += 1
+            accumulator.add(wl[valid], flux[valid])
     
-    # Average
-    valid = counts > 0
-    merged_flux[valid] /= counts[valid]
+    grid, merged_flux, stderr, counts = accumulator.result()
+    if grid.size == 0:
+        print("No overlapping data to merge")
+        return
     
     # Write output
     with output_path.open('w') as f:
         f.write("# Merged MESSENGER MASCS composite spectrum\n")
         f.write(f"# Created from {len(qualities)} observations\n")
         f.write("# Units: wavelength_nm, reflectance_or_radiance\n")
+        f.write("# stderr: standard error of the mean per bin (nan for a single spectrum)\n")
         f.write("#\n")
-        f.write("wavelength_nm,flux\n")
+        f.write("wavelength_nm,flux,stderr,n_spectra\n")
         
-        for wl, flux in zip(wavelength_grid[valid], merged_flux[valid]):
-            f.write(f"{wl:.2f},{flux:.6e}\n")
+        for wl, flux, err, n in zip(grid, merged_flux, stderr, counts):
+            f.write(f"{wl:.2f},{flux:.6e},{err:.6e},{n}\n")
     
     print(f"✓ Merged spectrum saved to {output_path}")
-    print(f"  Wavelength range: {wavelength_grid[valid].min():.1f}-{wavelength_grid[valid].max():.1f} nm")
-    print(f"  Total points: {valid.sum()}")
+    print(f"  Wavelength range: {grid.min():.1f}-{grid.max():.1f} nm")
+    print(f"  Total points: {grid.size}")
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -283,6 +344,7 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--detector", choices=["UVVS", "VIRS"], help="Filter by detector")
     parser.add_argument("--merge", action="store_true", help="Merge selected spectra")
     parser.add_argument("--output", type=Path, default=Path("merged_spectrum.csv"), help="Output file for merge")
+    parser.add_argument("--workers", type=int, help="Processes used for ranking (default: one per CPU)")
     
     args = parser.parse_args(argv)
     
@@ -297,7 +359,7 @@ def main(argv: list[str] | None = None) -> int:
     print(f"Found {len(csv_files)} CSV files")
     
     # Rank all spectra
-    qualities = rank_spectra(csv_files, verbose=args.rank)
+    qualities = rank_spectra(csv_files, verbose=args.rank, workers=args.workers)
     
     # Select best if requested
     if args.select_best:
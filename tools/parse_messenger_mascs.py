@@ -13,6 +13,10 @@ Usage:
 
 The script reads the PDS label, locates the .DAT file, and extracts
 wavelength + flux/reflectance data into a clean CSV format.
+
+Tables are memory-mapped through big-endian structured dtypes built from the
+.FMT byte offsets, so each column is decoded for every row at once and a
+volume conversion is limited by disk reads rather than per-value unpacking.
 """
 from __future__ import annotations
 
@@ -20,20 +24,36 @@ import argparse
 import re
 import struct
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
+# MASCS tables store MSB_IEEE_REAL values
+MSB_FLOAT = ">f4"
+# Rows decoded per block when reducing large tables
+CHUNK_ROWS = 65536
+# Grating steps within this distance above a bin's first wavelength are averaged
+BIN_WIDTH_NM = 0.15
+
 
 def parse_fmt_file(fmt_path: Path) -> Dict[str, Tuple[int, int, str]]:
     """
     Parse a PDS .FMT file to extract column definitions.
     
-    Returns dict mapping column name to (byte_offset, bytes, data_type)
+    Returns dict mapping column name to (byte_offset, bytes, data_type).
+    Results are cached per file and modification time; batch runs share a
+    handful of format files across thousands of products.
     """
+    stat = fmt_path.stat()
+    return dict(_parse_fmt_cached(str(fmt_path.resolve()), stat.st_mtime_ns))
+
+
+@lru_cache(maxsize=64)
+def _parse_fmt_cached(fmt_path: str, _mtime_ns: int) -> Tuple[Tuple[str, Tuple[int, int, str]], ...]:
     columns = {}
-    content = fmt_path.read_text(encoding="utf-8", errors="ignore")
+    content = Path(fmt_path).read_text(encoding="utf-8", errors="ignore")
     
     # Look for COLUMN definitions
     # Format: OBJECT = COLUMN ... NAME = ... BYTES = ... START_BYTE = ... DATA_TYPE = ...
@@ -56,51 +76,87 @@ def parse_fmt_file(fmt_path: Path) -> Dict[str, Tuple[int, int, str]]:
             data_type = type_match.group(1).strip()
             columns[name] = (start_byte, byte_size, data_type)
     
-    return columns
+    return tuple(columns.items())
+
+
+def find_format_file(dat_path: Path, label: "PDSLabel") -> Dict[str, Tuple[int, int, str]] | None:
+    """Locate and parse the label's ^STRUCTURE file.
+
+    Searches the data directory and up to five parents (PDS volumes keep
+    format files in a LABEL directory near the root), as given and lowercased.
+    """
+    if not label.format_file:
+        return None
+    search_dirs = [dat_path.parent, *list(dat_path.parent.parents)[:5]]
+    for parent in search_dirs:
+        for name in dict.fromkeys((label.format_file, label.format_file.lower())):
+            fmt_path = parent / name
+            if not fmt_path.exists():
+                continue
+            try:
+                columns = parse_fmt_file(fmt_path)
+            except Exception as e:
+                print(f"  Warning: Could not parse format file: {e}")
+                continue
+            print(f"  Using format file: {fmt_path.name}")
+            return columns
+    return None
+
 
+def open_table(dat_path: Path, label: "PDSLabel", fields: Dict[str, Tuple[int, Any]]) -> np.ndarray:
+    """
+    Memory-map the rows of ``dat_path`` as a structured array.
+
+    ``fields`` maps a field name to (byte offset in the row, dtype); dtypes
+    may be sub-arrays such as ``(">f4", 512)``. Rows missing from a truncated
+    file are dropped.
+    """
+    if label.row_bytes <= 0:
+        raise ValueError("Label does not define ROW_BYTES")
+    dtype = np.dtype({
+        "names": list(fields),
+        "formats": [fmt for _, fmt in fields.values()],
+        "offsets": [offset for offset, _ in fields.values()],
+        "itemsize": label.row_bytes,
+    })
+    rows = min(label.rows, dat_path.stat().st_size // label.row_bytes)
+    if rows <= 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(dat_path, dtype=dtype, mode="r", shape=(rows,))
 
-def auto_detect_wavelength_offset(data: bytes, row_bytes: int, num_rows: int = 100) -> Tuple[int, int]:
+
+def auto_detect_wavelength_offset(data: bytes | np.ndarray, row_bytes: int, num_rows: int = 100) -> Tuple[int, int]:
     """
     Auto-detect wavelength and radiance column offsets by scanning for reasonable values.
     
+    Every 4-byte aligned offset in the first 300 bytes of a row is decoded for
+    all ``num_rows`` rows at once; the offset holding the most plausible UVVS
+    wavelengths (50-1000 nm) wins and radiance is taken from the next float.
+
     Returns: (wavelength_offset, radiance_offset) or raises ValueError
     """
-    candidates = []
-    
-    # Try every 4-byte aligned offset as potential wavelength column
-    for wl_offset in range(0, min(row_bytes - 8, 300), 4):
-        valid_count = 0
-        wl_values = []
-        
-        for i in range(min(num_rows, num_rows)):
-            offset = i * row_bytes + wl_offset
-            if offset + 4 > len(data):
-                break
-            
-            try:
-                wl = struct.unpack('>f', data[offset:offset+4])[0]
-                # Valid wavelength range: 50-1000 nm for all UVVS channels
-                # FUV: 115-190, MUV: 160-320, VIS: 250-600
-                if 50 < wl < 1000 and not np.isnan(wl):
-                    valid_count += 1
-                    wl_values.append(wl)
-            except:
-                continue
-        
-        # If >40% of rows have valid wavelengths, this is a candidate
-        if valid_count > num_rows * 0.4:
-            # Check if wavelengths are reasonably monotonic
-            if len(wl_values) > 5:
-                # Look for radiance column nearby (typically next few floats)
-                for rad_offset in range(wl_offset + 4, min(wl_offset + 60, row_bytes - 4), 4):
-                    candidates.append((wl_offset, rad_offset, valid_count))
-    
-    if candidates:
-        # Return the candidate with most valid wavelengths
-        candidates.sort(key=lambda x: x[2], reverse=True)
-        return candidates[0][0], candidates[0][1]
-    
-    raise ValueError("Could not auto-detect wavelength column")
+    scan_bytes = max(min(row_bytes - 8, 300), 0)
+    offsets = np.arange(0, scan_bytes, 4)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    rows = min(num_rows, raw.size // row_bytes) if row_bytes > 0 else 0
+    if offsets.size == 0 or rows == 0:
+        raise ValueError("Could not auto-detect wavelength column")
+
+    window = int(offsets[-1]) + 4
+    table = raw[: rows * row_bytes].reshape(rows, row_bytes)
+    valid_count = np.zeros(offsets.size, dtype=np.int64)
+    for start in range(0, rows, CHUNK_ROWS):
+        # FUV: 115-190, MUV: 160-320, VIS: 250-600 nm; NaN fails both tests
+        wl = np.ascontiguousarray(table[start:start + CHUNK_ROWS, :window]).view(MSB_FLOAT)
+        valid_count += np.count_nonzero((wl > 50) & (wl < 1000), axis=0)
+
+    # >40% of rows valid, a few samples and room for a radiance column after it
+    eligible = (valid_count > num_rows * 0.4) & (valid_count > 5) & (offsets + 8 < row_bytes)
+    if not eligible.any():
+        raise ValueError("Could not auto-detect wavelength column")
+    best = int(np.argmax(np.where(eligible, valid_count, -1)))
+    wl_offset = int(offsets[best])
+    return wl_offset, wl_offset + 4
 
 
 @dataclass
@@ -189,38 +245,7 @@ def parse_uvvcdr_sci(dat_path: Path, label: PDSLabel, debug: bool = False) -> Tu
         diagnose_binary_structure(dat_path, label)
         raise SystemExit(0)
     
-    # Read binary data
-    data = dat_path.read_bytes()
-    
-    # Try to find and parse .FMT file
-    fmt_columns = None
-    if label.format_file:
-        # Look for format file in parent directories (go up to 5 levels)
-        search_dirs = [dat_path.parent]
-        current = dat_path.parent
-        for _ in range(5):
-            if current.parent != current:
-                current = current.parent
-                search_dirs.append(current)
-        
-        for parent in search_dirs:
-            fmt_path = parent / label.format_file
-            if fmt_path.exists():
-                try:
-                    fmt_columns = parse_fmt_file(fmt_path)
-                    print(f"  Using format file: {fmt_path.name}")
-                    break
-                except Exception as e:
-                    print(f"  Warning: Could not parse format file: {e}")
-            # Also try lowercase
-            fmt_path_lower = parent / label.format_file.lower()
-            if fmt_path_lower.exists():
-                try:
-                    fmt_columns = parse_fmt_file(fmt_path_lower)
-                    print(f"  Using format file: {fmt_path_lower.name}")
-                    break
-                except Exception as e:
-                    print(f"  Warning: Could not parse format file: {e}")
+    fmt_columns = find_format_file(dat_path, label)
     
     # Determine column offsets
     wl_offset = None
@@ -241,66 +266,57 @@ def parse_uvvcdr_sci(dat_path: Path, label: PDSLabel, debug: bool = False) -> Tu
     if wl_offset is None or rad_offset is None:
         print(f"  Auto-detecting column offsets...")
         try:
-            wl_offset, rad_offset = auto_detect_wavelength_offset(data, label.row_bytes, label.rows)
+            raw = np.memmap(dat_path, dtype=np.uint8, mode="r")
+            wl_offset, rad_offset = auto_detect_wavelength_offset(raw, label.row_bytes, label.rows)
             print(f"  Found: wavelength @ byte {wl_offset}, radiance @ byte {rad_offset}")
         except ValueError as e:
             raise ValueError(f"Could not locate spectral data columns: {e}")
     
-    # Parse data
-    wavelengths = []
-    radiances = []
+    table = open_table(dat_path, label, {
+        "wavelength": (wl_offset, MSB_FLOAT),
+        "radiance": (rad_offset, MSB_FLOAT),
+    })
+    wl_array = table["wavelength"].astype(np.float64)
+    rad_array = table["radiance"].astype(np.float64)
     
-    for i in range(label.rows):
-        offset = i * label.row_bytes
-        row = data[offset:offset + label.row_bytes]
-        
-        try:
-            wl = struct.unpack('>f', row[wl_offset:wl_offset+4])[0]
-            rad = struct.unpack('>f', row[rad_offset:rad_offset+4])[0]
-            
-            # Filter invalid values
-            if 0 < wl < 10000 and not np.isnan(rad) and rad > 0:
-                wavelengths.append(wl)
-                radiances.append(rad)
-        except Exception:
-            continue
+    # Filter invalid values (NaN fails every comparison)
+    valid = (wl_array > 0) & (wl_array < 10000) & (rad_array > 0)
+    wl_array = wl_array[valid]
+    rad_array = rad_array[valid]
     
-    if not wavelengths:
+    if wl_array.size == 0:
         raise ValueError(f"No valid spectral data found in {dat_path}")
     
-    # Clean up zigzag/triangle scan patterns
     # The grating scans up and down, creating duplicate wavelength measurements
-    # We'll bin by wavelength and average measurements
-    wl_array = np.array(wavelengths)
-    rad_array = np.array(radiances)
-    
-    # Sort by wavelength
-    sort_idx = np.argsort(wl_array)
-    wl_sorted = wl_array[sort_idx]
-    rad_sorted = rad_array[sort_idx]
-    
-    # Bin to ~0.5 nm resolution (typical MASCS resolution)
-    # This averages multiple measurements at similar wavelengths
-    unique_wls = []
-    unique_rads = []
+    return bin_by_wavelength(wl_array, rad_array)
+
+
+def bin_by_wavelength(wavelengths: np.ndarray, values: np.ndarray,
+                      width: float = BIN_WIDTH_NM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average measurements at similar wavelengths (~0.3 nm MASCS resolution).
+
+    Samples are sorted once; each bin starts at the smallest wavelength not
+    yet binned and takes every sample up to ``width`` nm above it. Bin
+    boundaries come from ``searchsorted`` and the means from ``np.add.reduceat``.
+    """
+    order = np.argsort(wavelengths, kind="stable")
+    wl_sorted = wavelengths[order]
+    val_sorted = values[order]
     
+    # End of the bin that would start at each sample
+    bin_end = np.searchsorted(wl_sorted, wl_sorted + width, side="right").tolist()
+    starts = []
     i = 0
-    while i < len(wl_sorted):
-        wl_bin = wl_sorted[i]
-        # Find all measurements within 0.3 nm of this wavelength
-        mask = (wl_sorted >= wl_bin - 0.15) & (wl_sorted <= wl_bin + 0.15)
-        
-        # Average measurements in this bin
-        bin_wl = np.mean(wl_sorted[mask])
-        bin_rad = np.mean(rad_sorted[mask])
-        
-        unique_wls.append(bin_wl)
-        unique_rads.append(bin_rad)
-        
-        # Skip to next bin
-        i = np.where(mask)[0][-1] + 1
-    
-    return np.array(unique_wls), np.array(unique_rads)
+    while i < len(bin_end):
+        starts.append(i)
+        i = bin_end[i]
+    
+    starts_arr = np.asarray(starts, dtype=np.intp)
+    counts = np.diff(np.append(starts_arr, wl_sorted.size))
+    bin_wl = np.add.reduceat(wl_sorted, starts_arr) / counts
+    bin_val = np.add.reduceat(val_sorted, starts_arr) / counts
+    return bin_wl, bin_val
 
 
 def parse_virs_ddr(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, np.ndarray]:
@@ -311,10 +327,11 @@ def parse_virs_ddr(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, np.ndar
     - NIR: 256 pixels covering ~300-1450 nm  
     - VIS: 512 pixels covering ~300-1050 nm
     
+    The I/F arrays of all rows are read as one ``(rows, pixels)`` block per
+    chunk; pixels outside (0, 1) count as missing (zero) in the average.
+    
     Returns: (wavelength_nm, reflectance)
     """
-    data = dat_path.read_bytes()
-    
     # Determine if NIR or VIS based on product ID
     is_nir = 'NIR' in label.product_id.upper() or 'ND' in label.product_id.upper()
     num_pixels = 256 if is_nir else 512
@@ -328,18 +345,7 @@ def parse_virs_ddr(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, np.ndar
         # VIS: ~300-1050 nm, 512 pixels  
         wavelengths = np.linspace(300, 1050, num_pixels)
     
-    # Try to parse format file to get exact offsets
-    fmt_columns = None
-    if label.format_file:
-        for parent in [dat_path.parent, dat_path.parent.parent, dat_path.parent.parent.parent, dat_path.parent.parent.parent.parent]:
-            fmt_path = parent / label.format_file
-            if fmt_path.exists():
-                try:
-                    fmt_columns = parse_fmt_file(fmt_path)
-                    print(f"  Using format file: {fmt_path.name}")
-                    break
-                except Exception as e:
-                    print(f"  Warning: Could not parse format file: {e}")
+    fmt_columns = find_format_file(dat_path, label)
     
     # Find IOF spectrum data offset
     iof_offset = 48  # Default from VIRSND.FMT
@@ -353,35 +359,28 @@ def parse_virs_ddr(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, np.ndar
                 iof_offset = offset
                 print(f"  I/F array at byte {iof_offset}")
     
-    # Average multiple spectra from all rows
-    all_spectra = []
-    
-    for i in range(label.rows):
-        row_offset = i * label.row_bytes
-        spectrum_offset = row_offset + iof_offset
-        
-        try:
-            # Read array of floats
-            spectrum = np.zeros(num_pixels)
-            for j in range(num_pixels):
-                byte_off = spectrum_offset + (j * 4)
-                if byte_off + 4 <= len(data):
-                    val = struct.unpack('>f', data[byte_off:byte_off+4])[0]
-                    # Filter invalid/saturated pixels (1e32 = invalid)
-                    if 0 < val < 1 and not np.isnan(val):
-                        spectrum[j] = val
-            
-            # Only keep spectra with valid data
-            if np.sum(spectrum > 0) > num_pixels * 0.1:  # At least 10% valid
-                all_spectra.append(spectrum)
-        except Exception:
-            continue
+    if iof_offset + num_pixels * 4 > label.row_bytes:
+        raise ValueError(
+            f"I/F array at byte {iof_offset} ({num_pixels} pixels) overruns ROW_BYTES={label.row_bytes}"
+        )
+    table = open_table(dat_path, label, {"iof": (iof_offset, (MSB_FLOAT, (num_pixels,)))})
     
-    if not all_spectra:
+    # Average multiple spectra from all rows
+    total = np.zeros(num_pixels)
+    kept = 0
+    for start in range(0, len(table), CHUNK_ROWS):
+        spectra = table["iof"][start:start + CHUNK_ROWS].astype(np.float64)
+        # Filter invalid/saturated pixels (1e32 = invalid, NaN fails both tests)
+        valid = (spectra > 0) & (spectra < 1)
+        # Only keep spectra with at least 10% valid pixels
+        keep = np.count_nonzero(valid, axis=1) > num_pixels * 0.1
+        total += np.where(valid, spectra, 0.0)[keep].sum(axis=0)
+        kept += int(np.count_nonzero(keep))
+    
+    if kept == 0:
         raise ValueError(f"No valid VIRS spectra found in {dat_path}")
     
-    # Average all spectra
-    avg_spectrum = np.mean(all_spectra, axis=0)
+    avg_spectrum = total / kept
     
     # Filter out zero/invalid pixels
     valid_mask = avg_spectrum > 0
@@ -402,23 +401,7 @@ def parse_uvvddr_surface(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, n
     
     Returns: (wavelength_nm, reflectance)
     """
-    data = dat_path.read_bytes()
-    
-    # Try to parse format file
-    fmt_columns = None
-    if label.format_file:
-        for parent in [dat_path.parent, dat_path.parent.parent, dat_path.parent.parent.parent, dat_path.parent.parent.parent.parent]:
-            fmt_path = parent / label.format_file
-            if fmt_path.exists():
-                try:
-                    fmt_columns = parse_fmt_file(fmt_path)
-                    print(f"  Using format file: {fmt_path.name}")
-                    break
-                except Exception as e:
-                    print(f"  Warning: Could not parse format file: {e}")
-    
-    wavelengths = []
-    reflectances = []
+    fmt_columns = find_format_file(dat_path, label)
     
     # Determine offsets
     wl_offset = None
@@ -437,38 +420,30 @@ def parse_uvvddr_surface(dat_path: Path, label: PDSLabel) -> Tuple[np.ndarray, n
     if wl_offset is None:
         print(f"  Auto-detecting surface reflectance columns...")
         # For surface DDR, wavelength typically in first 100 bytes
-        for offset in range(0, 100, 4):
-            try:
-                wl = struct.unpack('>f', data[offset:offset+4])[0]
-                if 200 < wl < 400:  # MUV range
-                    wl_offset = offset
-                    iof_offset = offset + 4  # Reflectance typically next
-                    print(f"  Found: wavelength @ byte {wl_offset}, I/F @ byte {iof_offset}")
-                    break
-            except:
-                continue
-    
-    if wl_offset is None:
+        with dat_path.open("rb") as handle:
+            head = handle.read(100)
+        head_values = np.frombuffer(head[: len(head) // 4 * 4], dtype=MSB_FLOAT)
+        muv = np.flatnonzero((head_values > 200) & (head_values < 400))  # MUV range
+        if muv.size:
+            wl_offset = int(muv[0]) * 4
+            iof_offset = wl_offset + 4  # Reflectance typically next
+            print(f"  Found: wavelength @ byte {wl_offset}, I/F @ byte {iof_offset}")
+    
+    if wl_offset is None or iof_offset is None:
         raise ValueError("Could not locate wavelength/reflectance columns")
     
-    for i in range(label.rows):
-        offset = i * label.row_bytes
-        row = data[offset:offset + label.row_bytes]
-        
-        try:
-            wl = struct.unpack('>f', row[wl_offset:wl_offset+4])[0]
-            iof = struct.unpack('>f', row[iof_offset:iof_offset+4])[0]
-            
-            if 0 < wl < 10000 and not np.isnan(iof) and iof >= 0:
-                wavelengths.append(wl)
-                reflectances.append(iof)
-        except Exception:
-            continue
+    table = open_table(dat_path, label, {
+        "wavelength": (wl_offset, MSB_FLOAT),
+        "iof": (iof_offset, MSB_FLOAT),
+    })
+    wavelengths = table["wavelength"].astype(np.float64)
+    reflectances = table["iof"].astype(np.float64)
     
-    if not wavelengths:
+    valid = (wavelengths > 0) & (wavelengths < 10000) & (reflectances >= 0)
+    if not valid.any():
         raise ValueError(f"No valid reflectance data found in {dat_path}")
     
-    return np.array(wavelengths), np.array(reflectances)
+    return wavelengths[valid], reflectances[valid]
 
 
 def write_csv(output_path: Path, wavelengths: np.ndarray, values: np.ndarray,
@@ -501,6 +476,36 @@ def write_csv(output_path: Path, wavelengths: np.ndarray, values: np.ndarray,
             f.write(f"{wl:.4f},{val:.6e}\n")
 
 
+def is_science_label(path: Path) -> bool:
+    """Science products only; header (HDR) labels are skipped."""
+    return "_sci.lbl" in path.name.lower()
+
+
+def locate_data_file(lbl_path: Path, label: PDSLabel) -> Path:
+    """The label's ^TABLE file next to it, as named or lowercased."""
+    dat_path = lbl_path.parent / label.data_file
+    if not dat_path.exists():
+        # Try lowercase
+        dat_path = lbl_path.parent / label.data_file.lower()
+    if not dat_path.exists():
+        raise FileNotFoundError(f"Data file not found: {label.data_file}")
+    return dat_path
+
+
+def decode_product(label: PDSLabel, dat_path: Path) -> Tuple[np.ndarray, np.ndarray, str]:
+    """Decode one product; returns (wavelength_nm, values, value_type)."""
+    if label.detector_id == "VIRS" and label.product_type == "DDR":
+        wavelengths, values = parse_virs_ddr(dat_path, label)
+        return wavelengths, values, "reflectance"
+    if label.product_type == "CDR" and label.detector_id == "UVVS":
+        wavelengths, values = parse_uvvcdr_sci(dat_path, label)
+        return wavelengths, values, "radiance"
+    if label.product_type == "DDR" and "UVVSSCID_SUR" in (label.format_file or ""):
+        wavelengths, values = parse_uvvddr_surface(dat_path, label)
+        return wavelengths, values, "reflectance"
+    raise ValueError(f"Unsupported product: {label.product_type} {label.detector_id}")
+
+
 def process_file(lbl_path: Path, output_path: Path | None = None) -> Path:
     """Process a single PDS label + data file pair."""
     
@@ -508,12 +513,7 @@ def process_file(lbl_path: Path, output_path: Path | None = None) -> Path:
     label = PDSLabel.from_file(lbl_path)
     
     # Locate data file
-    dat_path = lbl_path.parent / label.data_file
-    if not dat_path.exists():
-        # Try lowercase
-        dat_path = lbl_path.parent / label.data_file.lower()
-    if not dat_path.exists():
-        raise FileNotFoundError(f"Data file not found: {label.data_file}")
+    dat_path = locate_data_file(lbl_path, label)
     
     # Determine output path
     if output_path is None:
@@ -526,17 +526,7 @@ def process_file(lbl_path: Path, output_path: Path | None = None) -> Path:
     print(f"  Rows: {label.rows}")
     
     # Parse based on product type and detector
-    if label.detector_id == "VIRS" and label.product_type == "DDR":
-        wavelengths, values = parse_virs_ddr(dat_path, label)
-        value_type = "reflectance"
-    elif label.product_type == "CDR" and label.detector_id == "UVVS":
-        wavelengths, values = parse_uvvcdr_sci(dat_path, label)
-        value_type = "radiance"
-    elif label.product_type == "DDR" and "UVVSSCID_SUR" in (label.format_file or ""):
-        wavelengths, values = parse_uvvddr_surface(dat_path, label)
-        value_type = "reflectance"
-    else:
-        raise ValueError(f"Unsupported product: {label.product_type} {label.detector_id}")
+    wavelengths, values, value_type = decode_product(label, dat_path)
     
     # Write CSV
     write_csv(output_path, wavelengths, values, label, value_type)
@@ -551,7 +541,7 @@ def batch_process(directory: Path, recursive: bool = True) -> List[Path]:
     lbl_files = sorted(directory.glob(pattern))
     
     # Filter to only SCI files (skip HDR)
-    lbl_files = [f for f in lbl_files if "_sci.lbl" in f.name.lower()]
+    lbl_files = [f for f in lbl_files if is_science_label(f)]
     
     print(f"Found {len(lbl_files)} science label files")
     
@@ -4,12 +4,22 @@ Native Python PDS downloader - no external dependencies required.
 
 Recursively downloads files from PDS archives using only requests and urllib.
 Replacement for wget-based downloader that works on all platforms without additional installs.
+
+Runs are incremental: a JSON manifest in the output directory remembers the
+size, ETag/Last-Modified and sha256 of every file, so a re-sync only transfers
+files the server reports as changed and resumes interrupted downloads.
 """
 
 import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable
 from urllib.parse import urljoin, urlparse
 import time
 
@@ -20,6 +30,9 @@ except ImportError:
     print("Install with: pip install requests")
     sys.exit(1)
 
+MANIFEST_NAME = ".pds_manifest.json"
+CHUNK_BYTES = 1024 * 1024
+
 # PDS dataset definitions - MASCS optical spectroscopy ONLY
 DATASETS = {
     # MESSENGER MASCS - Mercury/Venus OPTICAL SPECTROMETERS ONLY
@@ -58,12 +71,66 @@ DATASETS = {
 }
 
 
+class SyncManifest:
+    """What previous runs fetched, keyed by URL, persisted as JSON.
+
+    Each entry records the local path, size, ``ETag``/``Last-Modified``
+    validators and sha256 of a completed file. Entries with ``partial`` set
+    describe an interrupted download whose ``.part`` file can be resumed.
+    """
+
+    def __init__(self, path: Path, save_every: int = 50):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8")).get("files", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable manifest {path}: {e}")
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def update(self, url: str, **entry) -> None:
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty += 1
+            due = self._dirty >= self.save_every
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"version": 1, "files": self._entries}, indent=1, sort_keys=True)
+            self._dirty = 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
 class PDSDownloader:
-    """Recursive PDS archive downloader using requests - MASCS optical spectroscopy only."""
+    """Recursive PDS archive downloader using requests - MASCS optical spectroscopy only.
+
+    Directory listings and file downloads run on two bounded thread pools.
+    A :class:`SyncManifest` in the output directory makes re-runs
+    incremental: unchanged files are confirmed with conditional requests
+    (``304 Not Modified``) and interrupted downloads resume with ``Range``.
+    """
     
     def __init__(self, base_url: str, output_dir: Path, max_size_gb: float = None, 
                  file_types: list = None, dry_run: bool = False,
-                 required_patterns: list = None, exclude_patterns: list = None):
+                 required_patterns: list = None, exclude_patterns: list = None,
+                 max_workers: int = 4, listing_workers: int = 4,
+                 manifest_path: Path | None = None,
+                 on_complete: Callable[[Path], None] | None = None):
         self.base_url = base_url.rstrip('/')
         self.output_dir = output_dir
         self.max_size_bytes = int(max_size_gb * 1024**3) if max_size_gb else None
@@ -71,12 +138,23 @@ class PDSDownloader:
         self.required_patterns = required_patterns or []
         self.exclude_patterns = exclude_patterns or []
         self.dry_run = dry_run
+        self.max_workers = max(1, max_workers)
+        self.listing_workers = max(1, listing_workers)
+        self.manifest = SyncManifest(manifest_path or output_dir / MANIFEST_NAME)
+        # Called from worker threads with each file that is present locally
+        self.on_complete = on_complete
         
         self.total_downloaded = 0
         self.file_count = 0
         self.skipped_count = 0
+        self.unchanged_count = 0
+        self.resumed_count = 0
         self.filtered_count = 0
         self.visited_urls = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()  # quota exhausted: start nothing new
+        self._abort = threading.Event()  # interrupted: leave .part files for resume
+        self._local = threading.local()
     
     def should_download_file(self, filename: str) -> bool:
         """Check if file matches our STRICT criteria."""
@@ -129,98 +207,212 @@ class PDSDownloader:
         
         return files, dirs
     
+    def _session(self) -> "requests.Session":
+        # One keep-alive session per worker thread
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+    
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def _reserve(self, size: int) -> bool:
+        """Claim ``size`` bytes of the quota; stops the crawl when exhausted."""
+        with self._lock:
+            if self.max_size_bytes and (self.total_downloaded + size) > self.max_size_bytes:
+                if not self._stop.is_set():
+                    print(f"  🛑 Quota reached ({self.total_downloaded / 1024**3:.2f} GB)")
+                self._stop.set()
+                return False
+            self.total_downloaded += size
+            return True
+    
     def download_file(self, url: str) -> bool:
-        """Download a single file."""
+        """Download a single file, skipping it if the manifest shows it unchanged."""
         try:
+            if self._stop.is_set():
+                return False
             # Get relative path from base URL
             rel_path = url.replace(self.base_url, '').lstrip('/')
             output_path = self.output_dir / rel_path
-            
-            # Check if already exists
-            if output_path.exists():
-                print(f"  ⏭️  Skip (exists): {rel_path}")
-                self.skipped_count += 1
-                return True
+            part_path = output_path.with_name(output_path.name + ".part")
+            entry = self.manifest.get(url)
             
             if self.dry_run:
-                print(f"  📄 Would download: {rel_path}")
-                self.file_count += 1
+                if output_path.exists():
+                    print(f"  ⏭️  Skip (exists): {rel_path}")
+                    self._count("skipped_count")
+                else:
+                    print(f"  📄 Would download: {rel_path}")
+                    self._count("file_count")
                 return True
             
-            # Make HEAD request to get file size
-            head_resp = requests.head(url, allow_redirects=True, timeout=10)
-            if head_resp.status_code != 200:
-                print(f"  ⚠️  Skip (not found): {rel_path}")
-                return False
+            session = self._session()
+            headers = {}
+            resume_from = 0
+            if output_path.exists():
+                if entry is None or entry.get("partial") or entry.get("size") != output_path.stat().st_size:
+                    # Fetched before the manifest existed (or edited locally)
+                    return self._adopt_existing(url, rel_path, output_path)
+                if not (entry.get("etag") or entry.get("last_modified")):
+                    return self._adopt_existing(url, rel_path, output_path)
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+            elif part_path.exists() and entry and entry.get("partial"):
+                validator = entry.get("etag") or entry.get("last_modified")
+                if validator:
+                    resume_from = part_path.stat().st_size
+                    headers["Range"] = f"bytes={resume_from}-"
+                    headers["If-Range"] = validator
             
-            file_size = int(head_resp.headers.get('content-length', 0))
+            with session.get(url, headers=headers, stream=True, timeout=30) as resp:
+                if resp.status_code == 304:
+                    print(f"  ⏭️  Unchanged: {rel_path}")
+                    self._count("unchanged_count")
+                    self._notify(output_path)
+                    return True
+                if resp.status_code == 404:
+                    print(f"  ⚠️  Skip (not found): {rel_path}")
+                    return False
+                resp.raise_for_status()
+                if resp.status_code != 206:
+                    resume_from = 0  # server ignored Range or the file changed
+                
+                remaining = int(resp.headers.get('content-length', 0))
+                if not self._reserve(remaining):
+                    return False
+                
+                validators = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+                self.manifest.update(url, path=rel_path, partial=True, **validators)
+                
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                digest = hashlib.sha256()
+                if resume_from:
+                    _hash_file(part_path, digest)
+                with open(part_path, 'ab' if resume_from else 'wb') as f:
+                    for chunk in resp.iter_content(chunk_size=CHUNK_BYTES):
+                        if self._abort.is_set():
+                            print(f"  ⏸️  Interrupted: {rel_path} (will resume)")
+                            return False
+                        f.write(chunk)
+                        digest.update(chunk)
             
-            # Check quota
-            if self.max_size_bytes and (self.total_downloaded + file_size) > self.max_size_bytes:
-                print(f"  🛑 Quota reached ({self.total_downloaded / 1024**3:.2f} GB)")
+            file_size = part_path.stat().st_size
+            if remaining and file_size != resume_from + remaining:
+                print(f"  ❌ Incomplete: {rel_path} ({file_size} of {resume_from + remaining} bytes, will resume)")
                 return False
+            os.replace(part_path, output_path)
+            self.manifest.update(url, path=rel_path, size=file_size, sha256=digest.hexdigest(), **validators)
             
-            # Download file
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            resp = requests.get(url, stream=True, timeout=30)
-            resp.raise_for_status()
-            
-            with open(output_path, 'wb') as f:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            self.total_downloaded += file_size
-            self.file_count += 1
+            self._count("file_count")
+            if resume_from:
+                self._count("resumed_count")
             size_mb = file_size / 1024**2
-            print(f"  ✅ Downloaded: {rel_path} ({size_mb:.2f} MB)")
+            note = f", resumed at {resume_from / 1024**2:.2f} MB" if resume_from else ""
+            print(f"  ✅ Downloaded: {rel_path} ({size_mb:.2f} MB{note})")
+            self._notify(output_path)
             return True
             
         except Exception as e:
             print(f"  ❌ Error downloading {url}: {e}")
             return False
     
-    def crawl_directory(self, url: str, depth: int = 0) -> bool:
-        """Recursively crawl directory and download files."""
-        # Avoid infinite loops
-        if url in self.visited_urls:
-            return True
-        self.visited_urls.add(url)
-        
-        # Check quota
-        if self.max_size_bytes and self.total_downloaded >= self.max_size_bytes:
-            print(f"  🛑 Quota reached, stopping crawl")
+    def _adopt_existing(self, url: str, rel_path: str, output_path: Path) -> bool:
+        """Record a local file in the manifest, re-downloading it if the size differs."""
+        head_resp = self._session().head(url, allow_redirects=True, timeout=10)
+        if head_resp.status_code != 200:
+            print(f"  ⚠️  Skip (not found): {rel_path}")
             return False
-        
+        remote_size = int(head_resp.headers.get('content-length', -1))
+        if remote_size != output_path.stat().st_size:
+            output_path.unlink()
+            return self.download_file(url)
+        digest = hashlib.sha256()
+        _hash_file(output_path, digest)
+        self.manifest.update(
+            url,
+            path=rel_path,
+            size=remote_size,
+            sha256=digest.hexdigest(),
+            etag=head_resp.headers.get("ETag"),
+            last_modified=head_resp.headers.get("Last-Modified"),
+        )
+        print(f"  ⏭️  Skip (exists): {rel_path}")
+        self._count("skipped_count")
+        self._notify(output_path)
+        return True
+    
+    def _notify(self, path: Path) -> None:
+        if self.on_complete is not None:
+            self.on_complete(path)
+    
+    def _list_directory(self, url: str, depth: int) -> tuple[list[str], list[str]]:
         indent = "  " * depth
         rel_path = url.replace(self.base_url, '').lstrip('/') or '/'
         print(f"{indent}📁 Scanning: {rel_path}")
-        
         try:
-            resp = requests.get(url, timeout=15)
+            resp = self._session().get(url, timeout=15)
             resp.raise_for_status()
-            
-            files, subdirs = self.parse_directory_listing(resp.text, url)
-            
-            # Download files in this directory
-            for file_url in files:
-                filename = file_url.split('/')[-1]
-                if self.should_download_file(filename):
-                    if not self.download_file(file_url):
-                        # Check if quota reached
-                        if self.max_size_bytes and self.total_downloaded >= self.max_size_bytes:
-                            return False
-            
-            # Recurse into subdirectories
-            for subdir_url in subdirs:
-                if not self.crawl_directory(subdir_url, depth + 1):
-                    return False  # Quota reached
-            
-            return True
-            
+            # Resolve links against the final (redirected, slash-terminated) URL
+            return self.parse_directory_listing(resp.text, resp.url)
         except Exception as e:
             print(f"{indent}❌ Error scanning {url}: {e}")
-            return True  # Continue with other directories
+            return [], []  # Continue with other directories
+    
+    def crawl_directory(self, url: str, depth: int = 0) -> bool:
+        """Crawl ``url`` and its subdirectories, downloading matching files.
+
+        Listings are fetched ``listing_workers`` at a time and every accepted
+        file is queued on the download pool as soon as its directory is read.
+        Returns False if the size quota stopped the crawl.
+        """
+        with ThreadPoolExecutor(self.listing_workers, thread_name_prefix="pds-list") as listings, \
+                ThreadPoolExecutor(self.max_workers, thread_name_prefix="pds-get") as downloads:
+            pending = {}
+            downloads_queued = []
+            
+            def visit(dir_url: str, dir_depth: int) -> None:
+                # Avoid infinite loops
+                if dir_url in self.visited_urls:
+                    return
+                self.visited_urls.add(dir_url)
+                pending[listings.submit(self._list_directory, dir_url, dir_depth)] = dir_depth
+            
+            visit(url, depth)
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        dir_depth = pending.pop(future)
+                        if self._stop.is_set():
+                            print(f"  🛑 Quota reached, stopping crawl")
+                            continue
+                        files, subdirs = future.result()
+                        for file_url in files:
+                            filename = file_url.split('/')[-1]
+                            if self.should_download_file(filename):
+                                downloads_queued.append(downloads.submit(self.download_file, file_url))
+                        for subdir_url in subdirs:
+                            visit(subdir_url, dir_depth + 1)
+                for future in downloads_queued:
+                    future.result()
+            except BaseException:
+                # Drop queued downloads and stop running ones at the next chunk
+                self._stop.set()
+                self._abort.set()
+                raise
+            finally:
+                downloads.shutdown(wait=True, cancel_futures=True)
+                self.manifest.save()
+        
+        return not self._stop.is_set()
     
     def run(self):
         """Start the download process."""
@@ -230,17 +422,19 @@ class PDSDownloader:
             print(f"Size limit: {self.max_size_bytes / 1024**3:.2f} GB")
         if self.file_types:
             print(f"File types: {', '.join(self.file_types)}")
+        print(f"Workers: {self.max_workers} downloads, {self.listing_workers} listings")
         print()
         
         start_time = time.time()
-        self.crawl_directory(self.base_url)
+        self.crawl_directory(self.base_url + '/')
         elapsed = time.time() - start_time
         
         print()
         print("=" * 60)
         print("DOWNLOAD SUMMARY")
         print("=" * 60)
-        print(f"Files downloaded: {self.file_count}")
+        print(f"Files downloaded: {self.file_count} ({self.resumed_count} resumed)")
+        print(f"Files unchanged since last sync: {self.unchanged_count}")
         print(f"Files skipped (existing): {self.skipped_count}")
         print(f"Files filtered (non-MASCS/engineering): {self.filtered_count}")
         print(f"Total size: {self.total_downloaded / 1024**3:.2f} GB")
@@ -248,6 +442,12 @@ class PDSDownloader:
         print("=" * 60)
 
 
+def _hash_file(path: Path, digest) -> None:
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(chunk)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Download MESSENGER MASCS data from PDS archives (native Python, no wget required)",
@@ -263,6 +463,9 @@ Examples:
   # Dry run to preview what would be downloaded
   python pds_downloader_native.py --dataset uvvs_cdr --output-dir test --dry-run
 
+  # Re-run later to fetch only new or changed files (8 parallel downloads)
+  python pds_downloader_native.py --dataset uvvs_cdr --output-dir samples/SOLAR_SYSTEM/Mercury_bulk --workers 8
+
 Available datasets: uvvs_cdr, virs_cdr, uvvs_edr, virs_edr
         """
     )
@@ -277,6 +480,12 @@ Available datasets: uvvs_cdr, virs_cdr, uvvs_edr, virs_edr
                         help="Preview what would be downloaded without downloading")
     parser.add_argument("--target", default="mercury",
                         help="Target body (for display only)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Concurrent file downloads (default: 4)")
+    parser.add_argument("--listing-workers", type=int, default=4,
+                        help="Concurrent directory listings (default: 4)")
+    parser.add_argument("--manifest", type=Path,
+                        help=f"Sync manifest path (default: <output-dir>/{MANIFEST_NAME})")
     
     args = parser.parse_args()
     
@@ -303,7 +512,10 @@ Available datasets: uvvs_cdr, virs_cdr, uvvs_edr, virs_edr
         file_types=dataset_info.get('file_types'),
         required_patterns=dataset_info.get('required_patterns'),
         exclude_patterns=dataset_info.get('exclude_patterns'),
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        max_workers=args.workers,
+        listing_workers=args.listing_workers,
+        manifest_path=args.manifest,
     )
     
     try:
@@ -9,6 +9,13 @@ This script automates the entire workflow:
 4. Merge best spectra
 5. Copy to solar_system sample folder
 
+Steps 1-4 run in one process as concurrent stages joined by bounded
+queues: each product is decoded as soon as its label and data file have
+landed, scored straight from the decoded arrays and offered to a running
+top-N selection, so the run finishes shortly after the last download. A
+checkpoint file in the download directory records every scored product and
+lets an interrupted run resume without decoding them again.
+
 Usage:
   # Mercury surface reflectance (complete pipeline)
   python tools/pipeline_master.py --target mercury --auto
@@ -22,26 +29,329 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import heapq
+import itertools
+import json
+import os
+import queue
 import shutil
-import subprocess
+import threading
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any, Callable, Iterable
 
+import numpy as np
 
-def run_command(cmd: list[str], description: str, dry_run: bool = False) -> int:
-    """Run a command and print status."""
-    print("\n" + "=" * 70)
-    print(f"STEP: {description}")
-    print("=" * 70)
-    print(f"Command: {' '.join(cmd)}")
-    
-    if dry_run:
-        print("[DRY RUN - not executing]")
-        return 0
-    
-    result = subprocess.run(cmd)
-    if result.returncode != 0:
-        print(f"\n⚠️  Command failed with exit code {result.returncode}")
-    return result.returncode
+try:
+    from tools import mascs_quality_filter as quality_filter
+    from tools import parse_messenger_mascs as mascs
+except ImportError:  # run as a script: tools/ itself is on sys.path
+    import mascs_quality_filter as quality_filter
+    import parse_messenger_mascs as mascs
+
+CHECKPOINT_NAME = ".pipeline_checkpoint.json"
+_STOP = object()
+
+
+@dataclass
+class Product:
+    """One product moving between stages."""
+    key: str  # label path relative to the download directory
+    stamp: int  # data file mtime_ns; a re-synced file invalidates the checkpoint
+    csv_path: Path
+    wavelengths: np.ndarray | None = None
+    values: np.ndarray | None = None
+    quality: quality_filter.SpectrumQuality | None = None
+
+
+class Checkpoint:
+    """Scored products of earlier runs, keyed by label path and data mtime."""
+
+    def __init__(self, path: Path, fresh: bool = False, save_every: int = 25):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._entries: dict[str, dict[str, Any]] = {}
+        if path.exists() and not fresh:
+            try:
+                self._entries = json.loads(path.read_text(encoding="utf-8")).get("products", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable checkpoint {path}: {e}")
+
+    def get(self, key: str, stamp: int) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.get("stamp") != stamp:
+            return None
+        return entry
+
+    def record(self, key: str, stamp: int, quality: quality_filter.SpectrumQuality | None,
+               error: str | None = None) -> None:
+        entry: dict[str, Any] = {"stamp": stamp}
+        if quality is not None:
+            fields = asdict(quality)
+            fields["csv_path"] = str(quality.csv_path)
+            entry["quality"] = fields
+        if error is not None:
+            entry["error"] = error
+        with self._lock:
+            self._entries[key] = entry
+            self._dirty += 1
+            due = self._dirty >= self.save_every
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"version": 1, "products": self._entries}, indent=1, sort_keys=True)
+            self._dirty = 0
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(payload, encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def restore(entry: dict[str, Any]) -> quality_filter.SpectrumQuality | None:
+        fields = entry.get("quality")
+        if fields is None:
+            return None
+        fields = dict(fields, csv_path=Path(fields["csv_path"]))
+        fields["wavelength_range"] = tuple(fields["wavelength_range"])
+        return quality_filter.SpectrumQuality(**fields)
+
+
+class ProductPairer:
+    """Release a science label once both it and its data file are on disk.
+
+    Downloads finish in any order, so whichever half arrives second
+    releases the product.
+    """
+
+    def __init__(self, emit: Callable[[Path], None]):
+        self._emit = emit
+        self._lock = threading.Lock()
+        self._waiting: dict[Path, Path] = {}  # lowercased data path -> label
+        self._released: set[Path] = set()
+
+    def __call__(self, path: Path) -> None:
+        ready = None
+        with self._lock:
+            if mascs.is_science_label(path):
+                data_file = mascs.PDSLabel.from_file(path).data_file
+                if data_file:
+                    data_path = path.parent / data_file
+                    if data_path.exists() or data_path.with_name(data_file.lower()).exists():
+                        ready = path
+                    else:
+                        self._waiting[_fold(data_path)] = path
+            else:
+                ready = self._waiting.pop(_fold(path), None)
+            if ready is not None:
+                if ready in self._released:
+                    ready = None
+                else:
+                    self._released.add(ready)
+        if ready is not None:
+            self._emit(ready)
+
+
+def _fold(path: Path) -> Path:
+    return path.with_name(path.name.lower())
+
+
+class TopNSelector:
+    """Running equivalent of ``select_best_by_range``.
+
+    Keeps the best ``n`` spectra of each 100 nm range in a min-heap; only
+    their arrays stay in memory.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self._heaps: dict[str, list] = {}
+        self._order = itertools.count()
+
+    def offer(self, product: Product) -> None:
+        quality = product.quality
+        arrays = None
+        if product.wavelengths is not None:
+            arrays = (product.wavelengths, product.values)
+        heap = self._heaps.setdefault(quality_filter.range_key(quality), [])
+        item = (quality.quality_score, next(self._order), quality, arrays)
+        if len(heap) < self.n:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def selected(self) -> list[quality_filter.SpectrumQuality]:
+        selected = []
+        for _, heap in sorted(self._heaps.items()):
+            selected.extend(q for _, _, q, _ in sorted(heap, key=lambda item: item[0], reverse=True))
+        return selected
+
+    def load(self, quality: quality_filter.SpectrumQuality) -> tuple[np.ndarray, np.ndarray] | None:
+        """Arrays kept from decoding, or the CSV for checkpointed products."""
+        for heap in self._heaps.values():
+            for _, _, q, arrays in heap:
+                if q is quality and arrays is not None:
+                    return arrays
+        return quality_filter.load_spectrum_csv(quality.csv_path)
+
+
+def _run_stage(name: str, workers: int, handle: Callable[[Any], Iterable[Any]],
+               inbox: queue.Queue, outbox: queue.Queue) -> list[threading.Thread]:
+    """Start ``workers`` threads feeding ``handle(item)`` results to ``outbox``."""
+    def work() -> None:
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                return
+            try:
+                outputs = list(handle(item))
+            except Exception as e:  # keep draining so upstream never blocks
+                print(f"  ❌ {name} failed: {e}")
+                continue
+            for result in outputs:
+                outbox.put(result)
+
+    threads = [threading.Thread(target=work, name=f"{name}-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _close_after(threads: list[threading.Thread], outbox: queue.Queue, consumers: int) -> threading.Thread:
+    """Send one stop marker per consumer once ``threads`` have finished."""
+    def close() -> None:
+        for thread in threads:
+            thread.join()
+        for _ in range(consumers):
+            outbox.put(_STOP)
+
+    closer = threading.Thread(target=close, daemon=True)
+    closer.start()
+    return closer
+
+
+class StreamingPipeline:
+    """Download -> decode -> score -> select, one product at a time."""
+
+    def __init__(self, args: argparse.Namespace, datasets: list[str]):
+        self.args = args
+        self.datasets = datasets
+        self.download_dir: Path = args.download_dir
+        self.checkpoint = Checkpoint(self.download_dir / CHECKPOINT_NAME, fresh=args.fresh)
+        self.selector = TopNSelector(args.top_n)
+        self.qualities: list[quality_filter.SpectrumQuality] = []
+        self.decoded = 0
+        self.resumed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    # -- stage 1: sources ----------------------------------------------
+    def _download(self, emit: Callable[[Any], None]) -> None:
+        try:
+            from tools import pds_downloader_native as downloader
+        except ImportError:
+            import pds_downloader_native as downloader
+
+        pairer = ProductPairer(emit)
+        for dataset in self.datasets:
+            info = downloader.DATASETS[dataset]
+            print(f"\n⬇️  Downloading {dataset}: {info['description']}")
+            downloader.PDSDownloader(
+                base_url=info["url"],
+                output_dir=self.download_dir,
+                max_size_gb=float(self.args.max_size.rstrip("Gg")),
+                file_types=info.get("file_types"),
+                required_patterns=info.get("required_patterns"),
+                exclude_patterns=info.get("exclude_patterns"),
+                max_workers=self.args.download_workers,
+                on_complete=pairer,
+            ).run()
+
+    def _scan(self, emit: Callable[[Any], None]) -> None:
+        if self.args.skip_parse:
+            for csv_path in sorted(self.download_dir.rglob("*_sci.csv")):
+                key = str(csv_path.relative_to(self.download_dir))
+                emit(Product(key, csv_path.stat().st_mtime_ns, csv_path))
+            return
+        # PDS volumes name files in upper case; match .lbl and .LBL alike
+        for lbl_path in sorted(self.download_dir.rglob("*")):
+            if mascs.is_science_label(lbl_path):
+                emit(lbl_path)
+
+    # -- stage 2: decode -----------------------------------------------
+    def _decode(self, item: Path | Product) -> list[Product]:
+        if isinstance(item, Product):  # existing CSV (--skip-parse)
+            return [item]
+        key = str(item.relative_to(self.download_dir))
+        stamp = None
+        try:
+            label = mascs.PDSLabel.from_file(item)
+            dat_path = mascs.locate_data_file(item, label)
+            stamp = dat_path.stat().st_mtime_ns
+            entry = self.checkpoint.get(key, stamp)
+            if entry is not None:
+                with self._lock:
+                    self.resumed += 1
+                quality = Checkpoint.restore(entry)
+                return [Product(key, stamp, Path(), quality=quality)] if quality else []
+            wavelengths, values, value_type = mascs.decode_product(label, dat_path)
+        except Exception as e:
+            print(f"  ❌ {item.name}: {e}")
+            with self._lock:
+                self.failed += 1
+            if stamp is not None:
+                self.checkpoint.record(key, stamp, None, error=str(e))
+            return []
+        csv_path = item.parent / f"{item.stem}.csv"
+        mascs.write_csv(csv_path, wavelengths, values, label, value_type)
+        with self._lock:
+            self.decoded += 1
+        return [Product(key, stamp, csv_path, wavelengths, values)]
+
+    # -- stage 3: score ------------------------------------------------
+    def _score(self, product: Product) -> list[Product]:
+        if product.quality is None:
+            data = None
+            if product.wavelengths is not None:
+                data = (product.wavelengths, product.values)
+            product.quality = quality_filter.analyze_spectrum(product.csv_path, data=data)
+            self.checkpoint.record(product.key, product.stamp, product.quality)
+        return [product] if product.quality is not None else []
+
+    # ------------------------------------------------------------------
+    def run(self) -> list[quality_filter.SpectrumQuality]:
+        """Run all stages; returns every scored spectrum, best first."""
+        args = self.args
+        size = max(1, args.queue_size)
+        decode_q: queue.Queue = queue.Queue(size)
+        score_q: queue.Queue = queue.Queue(size)
+        results: queue.Queue = queue.Queue(size)
+
+        source = self._scan if args.skip_download else self._download
+        source_thread = threading.Thread(target=source, args=(decode_q.put,), name="source", daemon=True)
+        source_thread.start()
+        decoders = _run_stage("decode", args.decode_workers, self._decode, decode_q, score_q)
+        scorers = _run_stage("score", args.score_workers, self._score, score_q, results)
+        _close_after([source_thread], decode_q, len(decoders))
+        _close_after(decoders, score_q, len(scorers))
+        _close_after(scorers, results, 1)
+
+        try:
+            # Stage 4: accumulate into the merge selection as products arrive
+            while (product := results.get()) is not _STOP:
+                self.qualities.append(product.quality)
+                self.selector.offer(product)
+        finally:
+            self.checkpoint.save()
+
+        self.qualities.sort(key=lambda q: q.quality_score, reverse=True)
+        print(f"\nDecoded {self.decoded}, resumed {self.resumed} from checkpoint, {self.failed} failed")
+        return self.qualities
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -100,6 +410,35 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Show what would be done without executing",
     )
+    parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=4,
+        help="Concurrent file downloads (default: 4)",
+    )
+    parser.add_argument(
+        "--decode-workers",
+        type=int,
+        default=2,
+        help="Threads decoding binary products (default: 2)",
+    )
+    parser.add_argument(
+        "--score-workers",
+        type=int,
+        default=1,
+        help="Threads scoring decoded spectra (default: 1)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=64,
+        help="Products buffered between stages (default: 64)",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore the checkpoint and reprocess every product",
+    )
     
     args = parser.parse_args(argv)
     
@@ -135,76 +474,38 @@ def main(argv: list[str] | None = None) -> int:
             print("Aborted")
             return 1
     
-    # Step 1: Download
-    if not args.skip_download:
-        for dataset in datasets:
-            cmd = [
-                "python", "tools/pds_downloader_native.py",
-                "--dataset", dataset,
-                "--target", args.target,
-                "--output-dir", str(args.download_dir),
-                "--max-size", args.max_size.rstrip('G'),  # Native downloader expects just the number
-            ]
-            if args.dry_run:
-                cmd.append("--dry-run")
-            
-            result = run_command(
-                cmd,
-                f"Downloading {dataset}",
-                dry_run=False,  # pds_downloader_native.py has its own dry-run
-            )
-            if result != 0:
-                return result
-    else:
-        print("\n⏭️  Skipping download (using existing data)")
-    
-    # Step 2: Parse to CSV
-    if not args.skip_parse:
-        cmd = [
-            "python", "tools/parse_messenger_mascs.py",
-            str(args.download_dir),
-            "--batch",
-        ]
-        result = run_command(
-            cmd,
-            "Converting binary files to CSV",
-            dry_run=args.dry_run,
-        )
-        if result != 0 and not args.dry_run:
-            return result
-    else:
-        print("\n⏭️  Skipping CSV conversion (using existing CSVs)")
+    composite_path = args.output_dir / f"{args.target}_composite.csv"
+    if args.dry_run:
+        print("[DRY RUN - not executing]")
+        print(f"Stages: download ({args.download_workers} workers) -> decode ({args.decode_workers})"
+              f" -> score ({args.score_workers}) -> merge top {args.top_n} per range")
+        print(f"Checkpoint: {args.download_dir / CHECKPOINT_NAME}")
+        print(f"Composite: {composite_path}")
+        return 0
     
-    # Step 3: Rank and select best
-    cmd = [
-        "python", "tools/mascs_quality_filter.py",
-        "--input", str(args.download_dir),
-        "--rank",
-    ]
-    result = run_command(
-        cmd,
-        "Ranking spectra by quality",
-        dry_run=args.dry_run,
-    )
-    if result != 0 and not args.dry_run:
-        return result
+    # Steps 1-4: download, convert, rank and select as one streaming run
+    print("\n" + "=" * 70)
+    print("STEP: Download -> convert -> rank (streaming)")
+    print("=" * 70)
+    if args.skip_download:
+        print("⏭️  Skipping download (using existing data)")
+    if args.skip_parse:
+        print("⏭️  Skipping CSV conversion (using existing CSVs)")
+    args.download_dir.mkdir(parents=True, exist_ok=True)
+    pipeline = StreamingPipeline(args, datasets)
+    qualities = pipeline.run()
+    if not qualities:
+        print("\n⚠️  No valid spectra were produced")
+        return 1
+    quality_filter.print_ranking(qualities)
     
     # Step 4: Merge best spectra
-    composite_path = args.output_dir / f"{args.target}_composite.csv"
-    cmd = [
-        "python", "tools/mascs_quality_filter.py",
-        "--input", str(args.download_dir),
-        "--select-best", str(args.top_n),
-        "--merge",
-        "--output", str(composite_path),
-    ]
-    result = run_command(
-        cmd,
-        f"Merging top {args.top_n} spectra per range",
-        dry_run=args.dry_run,
-    )
-    if result != 0 and not args.dry_run:
-        return result
+    print("\n" + "=" * 70)
+    print(f"STEP: Merging top {args.top_n} spectra per range")
+    print("=" * 70)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    selected = pipeline.selector.selected()
+    quality_filter.merge_spectra(selected, composite_path, loader=pipeline.selector.load)
     
     # Step 5: Copy to solar_system folder
     if not args.dry_run:
@@ -212,10 +513,8 @@ def main(argv: list[str] | None = None) -> int:
         print("STEP: Copying to solar_system folder")
         print("=" * 70)
         
-        args.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Find best individual spectra by detector
-        csv_files = list(args.download_dir.rglob("*_sci.csv"))
+        # Best individual spectra by detector (qualities are sorted by score)
+        csv_files = [q.csv_path for q in qualities]
         
         # Copy composite as visible
         if composite_path.exists():
@@ -226,7 +525,6 @@ def main(argv: list[str] | None = None) -> int:
         # Find and copy best VIRS IR spectrum
         virs_files = [f for f in csv_files if 'virsnd' in f.name.lower()]
         if virs_files:
-            # Use first one (already sorted by quality in previous step)
             src = virs_files[0]
             dest = args.output_dir / f"{args.target}_ir.csv"
             shutil.copy2(src, dest)